@@ -28,10 +28,13 @@ from invokeai.app.services.image_files.image_files_disk import DiskImageFileStor
 from invokeai.app.services.image_moves.image_moves_default import ImageMoveService
 from invokeai.app.services.image_records.image_records_sqlite import SqliteImageRecordStorage
 from invokeai.app.services.images.images_default import ImageService
+from invokeai.app.services.invocation_cache.invocation_cache_base import InvocationCacheBase
 from invokeai.app.services.invocation_cache.invocation_cache_memory import MemoryInvocationCache
+from invokeai.app.services.invocation_cache.invocation_cache_sqlite import SqliteInvocationCache
 from invokeai.app.services.invocation_services import InvocationServices
 from invokeai.app.services.invocation_stats.invocation_stats_default import InvocationStatsService
 from invokeai.app.services.invoker import Invoker
+from invokeai.app.services.model_hash_cache.model_hash_cache_sqlite import SqliteModelHashCache
 from invokeai.app.services.model_images.model_images_default import ModelImageFileStorageDisk
 from invokeai.app.services.model_manager.model_manager_default import ModelManagerService
 from invokeai.app.services.model_records.model_records_sql import ModelRecordServiceSQL
@@ -39,6 +42,7 @@ from invokeai.app.services.model_relationship_records.model_relationship_records
     SqliteModelRelationshipRecordStorage,
 )
 from invokeai.app.services.model_relationships.model_relationships_default import ModelRelationshipsService
+from invokeai.app.services.model_scan_cache.model_scan_cache_sqlite import SqliteModelScanCache
 from invokeai.app.services.names.names_default import SimpleNameService
 from invokeai.app.services.object_serializer.object_serializer_disk import ObjectSerializerDisk
 from invokeai.app.services.object_serializer.object_serializer_forward_cache import ObjectSerializerForwardCache
@@ -47,6 +51,7 @@ from invokeai.app.services.session_processor.session_processor_default import (
     DefaultSessionRunner,
 )
 from invokeai.app.services.session_queue.session_queue_sqlite import SqliteSessionQueue
+from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
 from invokeai.app.services.shared.sqlite.sqlite_util import init_db
 from invokeai.app.services.style_preset_images.style_preset_images_disk import StylePresetImageFileStorageDisk
 from invokeai.app.services.style_preset_records.style_preset_records_sqlite import SqliteStylePresetRecordsStorage
@@ -107,7 +112,7 @@ class ApiDependencies:
         if output_folder is None:
             raise ValueError("Output folder is not set")
 
-        image_files = DiskImageFileStorage(f"{output_folder}/images")
+        image_files = DiskImageFileStorage(f"{output_folder}/images", max_write_workers=config.image_write_workers)
 
         model_images_folder = config.models_path
         style_presets_folder = config.style_presets_path
@@ -128,12 +133,27 @@ class ApiDependencies:
         board_images = BoardImagesService()
         board_records = SqliteBoardRecordStorage(db=db)
         boards = BoardService()
-        events = FastAPIEventService(event_handler_id, loop=loop)
+        events = FastAPIEventService(
+            event_handler_id, loop=loop, progress_event_interval=configuration.progress_event_interval
+        )
         bulk_download = BulkDownloadService()
         image_records = SqliteImageRecordStorage(db=db)
         image_moves = ImageMoveService(db=db, image_files=image_files, config=configuration, logger=logger)
         images = ImageService()
-        invocation_cache = MemoryInvocationCache(max_cache_size=config.node_cache_size)
+        invocation_cache: InvocationCacheBase
+        if config.node_cache_type == "sqlite":
+            invocation_cache_db = SqliteDatabase(
+                db_path=None if config.use_memory_db else config.invocation_cache_db_path,
+                logger=logger,
+                verbose=config.log_sql,
+            )
+            invocation_cache = SqliteInvocationCache(
+                db=invocation_cache_db,
+                max_cache_size=config.node_cache_size,
+                max_age=config.node_cache_max_age_hours * 3600 if config.node_cache_max_age_hours else None,
+            )
+        else:
+            invocation_cache = MemoryInvocationCache(max_cache_size=config.node_cache_size)
         tensors = ObjectSerializerForwardCache(
             ObjectSerializerDisk[torch.Tensor](
                 output_folder / "tensors",
@@ -165,6 +185,8 @@ class ApiDependencies:
             model_record_service=model_record_service,
             download_queue=download_queue_service,
             events=events,
+            hash_cache=SqliteModelHashCache(db=db),
+            scan_cache=SqliteModelScanCache(db=db),
         )
         external_generation = ExternalGenerationService(
             providers={
@@ -1,10 +1,11 @@
+import asyncio
 from typing import Optional, Union
 
 from fastapi import Body, HTTPException, Path, Query
 from fastapi.routing import APIRouter
 from pydantic import BaseModel, Field
 
-from invokeai.app.api.auth_dependencies import CurrentUserOrDefault
+from invokeai.app.api.auth_dependencies import AdminUserOrDefault, CurrentUserOrDefault
 from invokeai.app.api.dependencies import ApiDependencies
 from invokeai.app.api.routers.image_move_maintenance import assert_image_move_maintenance_inactive
 from invokeai.app.services.board_records.board_records_common import BoardChanges, BoardRecordOrderBy, BoardVisibility
@@ -16,6 +17,10 @@ from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 boards_router = APIRouter(prefix="/v1/boards", tags=["boards"])
 
 
+class RepairBoardStatsResult(BaseModel):
+    repaired_boards: int = Field(description="The number of boards whose image counts or cover image were wrong.")
+
+
 class DeleteBoardResult(BaseModel):
     board_id: str = Field(description="The id of the board that was deleted.")
     deleted_board_images: list[str] = Field(
@@ -223,3 +228,19 @@ async def list_all_board_image_names(
         ]
 
     return image_names
+
+
+@boards_router.post(
+    "/repair_stats",
+    operation_id="repair_board_stats",
+    response_model=RepairBoardStatsResult,
+)
+async def repair_board_stats(_: AdminUserOrDefault) -> RepairBoardStatsResult:
+    """Recomputes the stored image counts and cover images of all boards from their images.
+
+    The stats are kept up to date as images change, so this is only needed if they were changed outside the app, e.g.
+    by editing the database by hand.
+    """
+    # Reads every board's images, which may take a while
+    repaired_boards = await asyncio.to_thread(ApiDependencies.invoker.services.boards.repair_stats)
+    return RepairBoardStatsResult(repaired_boards=repaired_boards)
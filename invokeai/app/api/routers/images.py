@@ -1,10 +1,13 @@
+import hashlib
 import io
 import json
+import os
 import traceback
+from email.utils import formatdate, parsedate_to_datetime
 from typing import ClassVar, Optional
 
 from fastapi import BackgroundTasks, Body, HTTPException, Path, Query, Request, Response, UploadFile
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.routing import APIRouter
 from PIL import Image
 from pydantic import BaseModel, Field, model_validator
@@ -26,7 +29,9 @@ from invokeai.app.invocations.fields import MetadataField
 from invokeai.app.services.image_records.image_records_common import (
     ImageCategory,
     ImageNamesResult,
+    ImageRecord,
     ImageRecordChanges,
+    InvalidImageCursorException,
     ResourceOrigin,
 )
 from invokeai.app.services.images.images_common import (
@@ -36,7 +41,7 @@ from invokeai.app.services.images.images_common import (
     StarredImagesResult,
     UnstarredImagesResult,
 )
-from invokeai.app.services.shared.pagination import OffsetPaginatedResults
+from invokeai.app.services.shared.pagination import KeysetPaginatedResults, OffsetPaginatedResults
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 from invokeai.app.util.controlnet_utils import heuristic_resize_fast
 from invokeai.backend.image_util.util import np_to_pil, pil_to_np
@@ -352,7 +357,8 @@ async def get_image_workflow(
         404: {"description": "Image not found"},
     },
 )
-async def get_image_full(
+def get_image_full(
+    request: Request,
     image_name: str = Path(description="The name of full-resolution image file to get"),
 ) -> Response:
     """Gets a full-resolution image file.
@@ -361,17 +367,13 @@ async def get_image_full(
     via <img src> tags which cannot send Bearer tokens. Image names are UUIDs,
     providing security through unguessability. Returns 409 while image storage
     maintenance is active.
+
+    The file is streamed, and supports conditional and range requests.
     """
     assert_image_move_maintenance_inactive()
 
     try:
-        path = ApiDependencies.invoker.services.images.get_path(image_name)
-        with open(path, "rb") as f:
-            content = f.read()
-        response = Response(content, media_type="image/png")
-        response.headers["Cache-Control"] = f"max-age={IMAGE_MAX_AGE}"
-        response.headers["Content-Disposition"] = f'inline; filename="{image_name}"'
-        return response
+        return _get_image_file_response(request, image_name, "image/png", thumbnail=False)
     except Exception:
         raise HTTPException(status_code=404)
 
@@ -388,7 +390,8 @@ async def get_image_full(
         404: {"description": "Image not found"},
     },
 )
-async def get_image_thumbnail(
+def get_image_thumbnail(
+    request: Request,
     image_name: str = Path(description="The name of thumbnail image file to get"),
 ) -> Response:
     """Gets a thumbnail image file.
@@ -397,20 +400,74 @@ async def get_image_thumbnail(
     via <img src> tags which cannot send Bearer tokens. Image names are UUIDs,
     providing security through unguessability. Returns 409 while image storage
     maintenance is active.
+
+    The file is streamed, and supports conditional and range requests.
     """
     assert_image_move_maintenance_inactive()
 
     try:
-        path = ApiDependencies.invoker.services.images.get_path(image_name, thumbnail=True)
-        with open(path, "rb") as f:
-            content = f.read()
-        response = Response(content, media_type="image/webp")
-        response.headers["Cache-Control"] = f"max-age={IMAGE_MAX_AGE}"
-        return response
+        return _get_image_file_response(request, image_name, "image/webp", thumbnail=True)
     except Exception:
         raise HTTPException(status_code=404)
 
 
+def _get_image_etag(image_record: ImageRecord, thumbnail: bool, stat_result: os.stat_result) -> str:
+    """Gets a strong ETag for an image file.
+
+    Image names are never reused, so the image record's creation time identifies the image. The file size is included
+    so that a regenerated file gets a new ETag.
+    """
+    variant = "thumbnail" if thumbnail else "full"
+    key = f"{image_record.image_name}:{variant}:{image_record.created_at}:{stat_result.st_size}"
+    return f'"{hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+def _is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """Checks a request's conditional headers. If-None-Match takes precedence over If-Modified-Since."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match uses the weak comparison
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
+def _get_image_file_response(request: Request, image_name: str, media_type: str, thumbnail: bool) -> Response:
+    """Streams an image file, or responds with 304 Not Modified if the client's cached copy is current.
+
+    Range requests are handled by the FileResponse. The image record is read once for both the path and the ETag.
+    This blocks on the database and on the image's pending background write, so the handlers are plain functions
+    that FastAPI runs in its threadpool.
+    """
+    image_record = ApiDependencies.invoker.services.images.get_record(image_name)
+    path = ApiDependencies.invoker.services.images.get_path(image_name, thumbnail, image_record=image_record)
+    stat_result = os.stat(path)
+    etag = _get_image_etag(image_record, thumbnail, stat_result)
+    headers = {
+        "Cache-Control": f"max-age={IMAGE_MAX_AGE}",
+        "ETag": etag,
+        "Last-Modified": formatdate(stat_result.st_mtime, usegmt=True),
+    }
+    if _is_not_modified(request, etag, stat_result.st_mtime):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path,
+        media_type=media_type,
+        headers=headers,
+        filename=None if thumbnail else image_name,
+        content_disposition_type="inline",
+        stat_result=stat_result,
+    )
+
+
 @images_router.get(
     "/i/{image_name}/urls",
     operation_id="get_image_urls",
@@ -479,6 +536,57 @@ async def list_image_dtos(
     return image_dtos
 
 
+@images_router.get(
+    "/cursor",
+    operation_id="list_image_dtos_by_cursor",
+    response_model=KeysetPaginatedResults[ImageDTO],
+)
+async def list_image_dtos_by_cursor(
+    current_user: CurrentUserOrDefault,
+    image_origin: Optional[ResourceOrigin] = Query(default=None, description="The origin of images to list."),
+    categories: Optional[list[ImageCategory]] = Query(default=None, description="The categories of image to include."),
+    is_intermediate: Optional[bool] = Query(default=None, description="Whether to list intermediate images."),
+    board_id: Optional[str] = Query(
+        default=None,
+        description="The board id to filter by. Use 'none' to find images without a board.",
+    ),
+    cursor: Optional[str] = Query(
+        default=None, description="The cursor returned with the previous page. Omit to get the first page."
+    ),
+    limit: int = Query(default=10, ge=1, description="The number of images per page"),
+    order_dir: SQLiteDirection = Query(default=SQLiteDirection.Descending, description="The order of sort"),
+    starred_first: bool = Query(default=True, description="Whether to sort by starred images first"),
+    search_term: Optional[str] = Query(default=None, description="The term to search for"),
+    include_total: bool = Query(
+        default=False, description="Whether to count the total number of images. Only needed for the first page."
+    ),
+) -> KeysetPaginatedResults[ImageDTO]:
+    """Gets a page of image DTOs for the current user. Unlike list_image_dtos, deep pages are as fast as the first."""
+
+    # Validate that the caller can read from this board before listing its images.
+    # "none" is a sentinel for uncategorized images and is handled by the SQL layer.
+    if board_id is not None and board_id != "none":
+        _assert_board_read_access(board_id, current_user)
+
+    try:
+        return ApiDependencies.invoker.services.images.get_many_by_cursor(
+            cursor=cursor,
+            limit=limit,
+            starred_first=starred_first,
+            order_dir=order_dir,
+            image_origin=image_origin,
+            categories=categories,
+            is_intermediate=is_intermediate,
+            board_id=board_id,
+            search_term=search_term,
+            user_id=current_user.user_id,
+            is_admin=current_user.is_admin,
+            include_total=include_total,
+        )
+    except InvalidImageCursorException:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @images_router.post("/delete", operation_id="delete_images_from_list", response_model=DeleteImagesResult)
 async def delete_images_from_list(
     current_user: CurrentUserOrDefault,
@@ -648,6 +756,11 @@ async def download_images_from_list(
     board_id: Optional[str] = Body(
         default=None, description="The board from which image should be downloaded", embed=True
     ),
+    stream: bool = Body(
+        default=False,
+        description="Whether to stream the zip file from the download endpoint as it is built, instead of preparing it in the background",
+        embed=True,
+    ),
 ) -> ImagesDownloaded:
     if (image_names is None or len(image_names) == 0) and board_id is None:
         raise HTTPException(status_code=400, detail="No images or board id specified.")
@@ -665,6 +778,12 @@ async def download_images_from_list(
 
     bulk_download_item_id: str = ApiDependencies.invoker.services.bulk_download.generate_item_id(board_id)
 
+    if stream:
+        bulk_download_item_name = ApiDependencies.invoker.services.bulk_download.create_stream(
+            image_names, board_id, bulk_download_item_id, current_user.user_id
+        )
+        return ImagesDownloaded(bulk_download_item_name=bulk_download_item_name)
+
     background_tasks.add_task(
         ApiDependencies.invoker.services.bulk_download.handler,
         image_names,
@@ -692,11 +811,13 @@ async def get_bulk_download_item(
     current_user: CurrentUserOrDefault,
     background_tasks: BackgroundTasks,
     bulk_download_item_name: str = Path(description="The bulk_download_item_name of the bulk download item to get"),
-) -> FileResponse:
+) -> Response:
     """Gets a bulk download zip file.
 
     Requires authentication.  The caller must be the user who initiated the
     download (tracked by the bulk download service) or an admin.
+
+    Streamed bulk downloads are sent as the zip file is built.
     """
     try:
         # Verify the caller owns this download (or is an admin)
@@ -704,6 +825,14 @@ async def get_bulk_download_item(
         if owner is not None and owner != current_user.user_id and not current_user.is_admin:
             raise HTTPException(status_code=403, detail="Not authorized to access this download")
 
+        stream = ApiDependencies.invoker.services.bulk_download.get_stream(bulk_download_item_name)
+        if stream is not None:
+            return StreamingResponse(
+                stream,
+                media_type="application/zip",
+                headers={"Content-Disposition": f'inline; filename="{bulk_download_item_name}"'},
+            )
+
         path = ApiDependencies.invoker.services.bulk_download.get_path(bulk_download_item_name)
 
         response = FileResponse(
@@ -1,6 +1,7 @@
 # Copyright (c) 2023 Lincoln D. Stein
 """FastAPI route for model configuration records."""
 
+import asyncio
 import contextlib
 import io
 import pathlib
@@ -1464,3 +1465,28 @@ async def delete_orphaned_models(
     errors = {path: status for path, status in results.items() if status != "deleted"}
 
     return DeleteOrphanedModelsResponse(deleted=deleted, errors=errors)
+
+
+class RehashModelsResponse(BaseModel):
+    """Response from rehashing the installed models."""
+
+    changed: dict[str, str] = Field(description="The keys of models whose hash changed, with their new hash")
+
+
+@model_manager_router.post(
+    "/sync/rehash",
+    operation_id="rehash_models",
+    response_model=RehashModelsResponse,
+)
+async def rehash_models(_: AdminUserOrDefault) -> RehashModelsResponse:
+    """Recompute the hashes of all installed models and update any that have changed.
+
+    Files that have not changed since they were last hashed are not read again. Cached hashes of files that no longer
+    exist or have changed are removed first.
+
+    Returns:
+        Response listing the models whose hash changed
+    """
+    # Hashing reads the model files, which may take a while
+    changed = await asyncio.to_thread(ApiDependencies.invoker.services.model_manager.install.rehash_models)
+    return RehashModelsResponse(changed=changed)
@@ -9,6 +9,7 @@ from invokeai.app.api.dependencies import ApiDependencies
 from invokeai.app.api.routers.image_move_maintenance import assert_image_move_maintenance_inactive
 from invokeai.app.services.session_processor.session_processor_common import SessionProcessorStatus
 from invokeai.app.services.session_queue.session_queue_common import (
+    QUEUE_ITEM_STATUS,
     Batch,
     BatchStatus,
     CancelAllExceptCurrentResult,
@@ -27,6 +28,7 @@ from invokeai.app.services.session_queue.session_queue_common import (
     SessionQueueStatus,
 )
 from invokeai.app.services.shared.graph import Graph, GraphExecutionState
+from invokeai.app.services.shared.pagination import CursorPaginatedResults
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 
 session_queue_router = APIRouter(prefix="/v1/queue", tags=["queue"])
@@ -143,6 +145,41 @@ async def list_all_queue_items(
         raise HTTPException(status_code=500, detail=f"Unexpected error while listing all queue items: {e}")
 
 
+@session_queue_router.get(
+    "/{queue_id}/list",
+    operation_id="list_queue_items",
+    responses={
+        200: {"model": CursorPaginatedResults[SessionQueueItem]},
+    },
+)
+async def list_queue_items(
+    current_user: CurrentUserOrDefault,
+    queue_id: str = Path(description="The queue id to perform this operation on"),
+    limit: int = Query(default=50, ge=1, description="The number of items to fetch"),
+    status: Optional[QUEUE_ITEM_STATUS] = Query(default=None, description="The status of items to fetch"),
+    cursor: Optional[int] = Query(default=None, description="The item_id of the last item of the previous page"),
+    priority: int = Query(default=0, description="The priority of the last item of the previous page"),
+    destination: Optional[str] = Query(default=None, description="The destination of queue items to fetch"),
+) -> CursorPaginatedResults[SessionQueueItem]:
+    """Gets a page of queue items, ordered by priority and then by item id"""
+    try:
+        result = ApiDependencies.invoker.services.session_queue.list_queue_items(
+            queue_id=queue_id,
+            limit=limit,
+            priority=priority,
+            cursor=cursor,
+            status=status,
+            destination=destination,
+        )
+        # Sanitize items for non-admin users
+        items = [
+            sanitize_queue_item_for_user(item, current_user.user_id, current_user.is_admin) for item in result.items
+        ]
+        return CursorPaginatedResults(items=items, limit=result.limit, has_more=result.has_more)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Unexpected error while listing queue items: {e}")
+
+
 @session_queue_router.get(
     "/{queue_id}/item_ids",
     operation_id="get_queue_item_ids",
@@ -14,6 +14,7 @@ from invokeai.app.services.events.events_common import (
     BulkDownloadCompleteEvent,
     BulkDownloadErrorEvent,
     BulkDownloadEventBase,
+    BulkDownloadProgressEvent,
     BulkDownloadStartedEvent,
     DownloadCancelledEvent,
     DownloadCompleteEvent,
@@ -96,7 +97,12 @@ MODEL_EVENTS = {
     ModelInstallErrorEvent,
 }
 
-BULK_DOWNLOAD_EVENTS = {BulkDownloadStartedEvent, BulkDownloadCompleteEvent, BulkDownloadErrorEvent}
+BULK_DOWNLOAD_EVENTS = {
+    BulkDownloadStartedEvent,
+    BulkDownloadProgressEvent,
+    BulkDownloadCompleteEvent,
+    BulkDownloadErrorEvent,
+}
 WORKFLOW_EVENTS = {WorkflowCreatedEvent, WorkflowUpdatedEvent, WorkflowDeletedEvent}
 
 
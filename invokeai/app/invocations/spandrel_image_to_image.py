@@ -57,15 +57,8 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
         )
 
     @classmethod
-    def upscale_image(
-        cls,
-        image: Image.Image,
-        tile_size: int,
-        spandrel_model: SpandrelImageToImageModel,
-        is_canceled: Callable[[], bool],
-        step_callback: Callable[[int, int], None],
-    ) -> Image.Image:
-        # Compute the image tiles.
+    def calc_tiles(cls, image: Image.Image, tile_size: int) -> list[Tile]:
+        """Compute the image tiles, sorted left-to-right, top-to-bottom."""
         if tile_size > 0:
             min_overlap = 20
             tiles = calc_tiles_min_overlap(
@@ -77,7 +70,6 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
             )
         else:
             # No tiling. Generate a single tile that covers the entire image.
-            min_overlap = 0
             tiles = [
                 Tile(
                     coords=TBLR(top=0, bottom=image.height, left=0, right=image.width),
@@ -89,6 +81,40 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
         # over tiles left-to-right, top-to-bottom.
         tiles = sorted(tiles, key=lambda x: x.coords.left)
         tiles = sorted(tiles, key=lambda x: x.coords.top)
+        return tiles
+
+    @classmethod
+    def calc_max_batch_size(
+        cls,
+        image: Image.Image,
+        tile_size: int,
+        spandrel_model: SpandrelImageToImageModel,
+        working_memory_budget: int,
+    ) -> int:
+        """Calculate how many tiles can be run through the model at once within the working memory budget."""
+        if TorchDevice.choose_torch_device().type == "cpu":
+            # Batching doesn't speed up inference on the CPU.
+            return 1
+        tile_memory = max(
+            spandrel_model.estimate_working_memory(
+                tile.coords.bottom - tile.coords.top, tile.coords.right - tile.coords.left
+            )
+            for tile in cls.calc_tiles(image, tile_size)
+        )
+        return max(1, working_memory_budget // tile_memory)
+
+    @classmethod
+    def upscale_image(
+        cls,
+        image: Image.Image,
+        tile_size: int,
+        spandrel_model: SpandrelImageToImageModel,
+        is_canceled: Callable[[], bool],
+        step_callback: Callable[[int, int], None],
+        max_batch_size: int = 1,
+    ) -> Image.Image:
+        # Compute the image tiles.
+        tiles = cls.calc_tiles(image, tile_size)
 
         # Prepare input image for inference.
         image_tensor = SpandrelImageToImageModel.pil_to_tensor(image)
@@ -103,46 +129,84 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
             (height * scale, width * scale, channels), dtype=torch.uint8, device=torch.device("cpu")
         )
 
-        image_tensor = image_tensor.to(device=TorchDevice.choose_torch_device(), dtype=spandrel_model.dtype)
+        device = TorchDevice.choose_torch_device()
+        image_tensor = image_tensor.to(device=device, dtype=spandrel_model.dtype)
+
+        # Group consecutive tiles of the same shape into batches. Tiles overlap, and later tiles overwrite the overlap of
+        # earlier ones, so the tiles must be merged into the output tensor in their original order.
+        batches: list[list[tuple[Tile, Tile]]] = []
+        for tile, scaled_tile in zip(tiles, scaled_tiles, strict=True):
+            if (
+                batches
+                and len(batches[-1]) < max_batch_size
+                and cls._tile_shape(batches[-1][0][0]) == cls._tile_shape(tile)
+            ):
+                batches[-1].append((tile, scaled_tile))
+            else:
+                batches.append([(tile, scaled_tile)])
+
+        # On CUDA, output tiles are copied to the host on a separate stream, overlapping with the next batch's compute.
+        copy_stream = torch.cuda.Stream(device) if device.type == "cuda" else None  # type: ignore[no-untyped-call]
 
-        # Run the model on each tile.
-        pbar = tqdm(list(zip(tiles, scaled_tiles, strict=True)), desc="Upscaling Tiles")
+        pbar = tqdm(total=len(tiles), desc="Upscaling Tiles")
 
         # Update progress, starting with 0.
         step_callback(0, pbar.total)
 
-        for tile, scaled_tile in pbar:
+        def merge_batch(batch: list[tuple[Tile, Tile]], output_tiles: torch.Tensor) -> None:
+            for (_, scaled_tile), output_tile in zip(batch, output_tiles, strict=True):
+                # Merge the output tile into the output tensor.
+                # We only keep half of the overlap on the top and left side of the tile. We do this in case there are
+                # edge artifacts. We don't bother with any 'blending' in the current implementation - for most
+                # upscalers it seems unnecessary, but we may find a need in the future.
+                top_overlap = scaled_tile.overlap.top // 2
+                left_overlap = scaled_tile.overlap.left // 2
+                output_tensor[
+                    scaled_tile.coords.top + top_overlap : scaled_tile.coords.bottom,
+                    scaled_tile.coords.left + left_overlap : scaled_tile.coords.right,
+                    :,
+                ] = output_tile[top_overlap:, left_overlap:, :]
+
+                pbar.update(1)
+                step_callback(pbar.n, pbar.total)
+
+        # The previous batch, whose output tiles are still being copied to the host.
+        pending: tuple[list[tuple[Tile, Tile]], torch.Tensor, torch.cuda.Event | None] | None = None
+
+        for batch in batches:
             # Exit early if the invocation has been canceled.
             if is_canceled():
                 raise CanceledException
 
-            # Extract the current tile from the input tensor.
-            input_tile = image_tensor[:, :, tile.coords.top : tile.coords.bottom, tile.coords.left : tile.coords.right]
-
-            # Run the model on the tile.
-            output_tile = spandrel_model.run(input_tile)
-
-            # Convert the output tile into the output tensor's format.
-            # (N, C, H, W) -> (C, H, W)
-            output_tile = output_tile.squeeze(0)
-            # (C, H, W) -> (H, W, C)
-            output_tile = output_tile.permute(1, 2, 0)
-            output_tile = output_tile.clamp(0, 1)
-            output_tile = (output_tile * 255).to(dtype=torch.uint8, device=torch.device("cpu"))
-
-            # Merge the output tile into the output tensor.
-            # We only keep half of the overlap on the top and left side of the tile. We do this in case there are
-            # edge artifacts. We don't bother with any 'blending' in the current implementation - for most upscalers
-            # it seems unnecessary, but we may find a need in the future.
-            top_overlap = scaled_tile.overlap.top // 2
-            left_overlap = scaled_tile.overlap.left // 2
-            output_tensor[
-                scaled_tile.coords.top + top_overlap : scaled_tile.coords.bottom,
-                scaled_tile.coords.left + left_overlap : scaled_tile.coords.right,
-                :,
-            ] = output_tile[top_overlap:, left_overlap:, :]
-
-            step_callback(pbar.n + 1, pbar.total)
+            # Extract the batch's tiles from the input tensor.
+            input_tiles = torch.cat(
+                [
+                    image_tensor[:, :, tile.coords.top : tile.coords.bottom, tile.coords.left : tile.coords.right]
+                    for tile, _ in batch
+                ]
+            )
+
+            # Run the model on the tiles.
+            output_tiles = spandrel_model.run(input_tiles)
+
+            # Convert the output tiles into the output tensor's format, on the device.
+            # (N, C, H, W) -> (N, H, W, C)
+            output_tiles = output_tiles.permute(0, 2, 3, 1)
+            output_tiles = output_tiles.clamp(0, 1)
+            output_tiles = (output_tiles * 255).to(dtype=torch.uint8)
+
+            # Start copying the output tiles to the host, then merge the previous batch while they are copied.
+            host_output_tiles, copied = cls._copy_to_host(output_tiles, copy_stream)
+            if pending is not None:
+                cls._wait_for_copy(pending[2])
+                merge_batch(pending[0], pending[1])
+            pending = (batch, host_output_tiles, copied)
+
+        if pending is not None:
+            cls._wait_for_copy(pending[2])
+            merge_batch(pending[0], pending[1])
+
+        pbar.close()
 
         # Convert the output tensor to a PIL image.
         np_image = output_tensor.detach().numpy().astype(np.uint8)
@@ -150,6 +214,32 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
 
         return pil_image
 
+    @staticmethod
+    def _tile_shape(tile: Tile) -> tuple[int, int]:
+        return (tile.coords.bottom - tile.coords.top, tile.coords.right - tile.coords.left)
+
+    @staticmethod
+    def _copy_to_host(
+        tensor: torch.Tensor, copy_stream: torch.cuda.Stream | None
+    ) -> tuple[torch.Tensor, torch.cuda.Event | None]:
+        """Copy a tensor to the host. On CUDA, the copy runs asynchronously and the returned event marks its end."""
+        if copy_stream is None:
+            return tensor.to(device=torch.device("cpu")), None
+
+        copy_stream.wait_stream(torch.cuda.current_stream(tensor.device))
+        with torch.cuda.stream(copy_stream):
+            host_tensor = tensor.to(device=torch.device("cpu"), non_blocking=True)
+            copied = torch.cuda.Event()  # type: ignore[no-untyped-call]
+            copied.record(copy_stream)
+        # Keep the device memory from being reused before the copy has finished
+        tensor.record_stream(copy_stream)
+        return host_tensor, copied
+
+    @staticmethod
+    def _wait_for_copy(copied: torch.cuda.Event | None) -> None:
+        if copied is not None:
+            copied.synchronize()
+
     @torch.no_grad()
     def invoke(self, context: InvocationContext) -> ImageOutput:
         # Images are converted to RGB, because most models don't support an alpha channel. In the future, we may want to
@@ -162,13 +252,16 @@ class SpandrelImageToImageInvocation(BaseInvocation, WithMetadata, WithBoard):
                 percentage=step / total_steps,
             )
 
+        working_memory_budget = int(context.config.get().device_working_mem_gb * 2**30)
+
         # Do the upscaling.
         with context.models.load(self.image_to_image_model) as spandrel_model:
             assert isinstance(spandrel_model, SpandrelImageToImageModel)
 
-            # Upscale the image
+            # Upscale the image, running as many tiles at once as fit in the device's working memory
+            max_batch_size = self.calc_max_batch_size(image, self.tile_size, spandrel_model, working_memory_budget)
             pil_image = self.upscale_image(
-                image, self.tile_size, spandrel_model, context.util.is_canceled, step_callback
+                image, self.tile_size, spandrel_model, context.util.is_canceled, step_callback, max_batch_size
             )
 
         image_dto = context.images.save(image=pil_image)
@@ -213,6 +306,8 @@ class SpandrelImageToImageAutoscaleInvocation(SpandrelImageToImageInvocation):
                 percentage=step / total_steps,
             )
 
+        working_memory_budget = int(context.config.get().device_working_mem_gb * 2**30)
+
         # Do the upscaling.
         with context.models.load(self.image_to_image_model) as spandrel_model:
             assert isinstance(spandrel_model, SpandrelImageToImageModel)
@@ -227,6 +322,7 @@ class SpandrelImageToImageAutoscaleInvocation(SpandrelImageToImageInvocation):
                 spandrel_model,
                 context.util.is_canceled,
                 functools.partial(step_callback, iteration),
+                self.calc_max_batch_size(image, self.tile_size, spandrel_model, working_memory_budget),
             )
 
             # Some models don't upscale the image, but we have no way to know this in advance. We'll check if the model
@@ -245,6 +341,7 @@ class SpandrelImageToImageAutoscaleInvocation(SpandrelImageToImageInvocation):
                         spandrel_model,
                         context.util.is_canceled,
                         functools.partial(step_callback, iteration),
+                        self.calc_max_batch_size(pil_image, self.tile_size, spandrel_model, working_memory_budget),
                     )
 
                     # Sanity check to prevent excessive or infinite loops. All known upscaling models are at least 2x.
@@ -36,6 +36,30 @@ from invokeai.backend.tiles.tiles import (
 from invokeai.backend.tiles.utils import TBLR
 from invokeai.backend.util.devices import TorchDevice
 
+# The peak UNet working memory for one region, per pixel (in image space) and per byte of element size. It covers the
+# unconditioned and conditioned forward passes of classifier-free guidance, and is a conservative estimate for SD1.5 and
+# SDXL.
+UNET_REGION_WORKING_MEMORY_SCALING_CONSTANT = 1600
+
+
+def get_max_region_batch_size(device: torch.device, dtype: torch.dtype, latent_height: int, latent_width: int) -> int:
+    """Get the number of regions of the given size that fit in the free working memory for a single UNet forward pass.
+
+    Regions are only batched on CUDA devices, where the free memory can be measured.
+    """
+    if device.type != "cuda":
+        return 1
+    free_memory, _ = torch.cuda.mem_get_info(device)
+    region_working_memory = (
+        latent_height
+        * LATENT_SCALE_FACTOR
+        * latent_width
+        * LATENT_SCALE_FACTOR
+        * dtype.itemsize
+        * UNET_REGION_WORKING_MEMORY_SCALING_CONSTANT
+    )
+    return max(1, free_memory // region_working_memory)
+
 
 def crop_controlnet_data(control_data: ControlNetData, latent_region: TBLR) -> ControlNetData:
     """Crop a ControlNetData object to a region."""
@@ -272,6 +296,11 @@ class TiledMultiDiffusionDenoiseLatents(BaseInvocation):
                 seed=seed,
             )
 
+            # Tiles of the same size are denoised together, in batches that fit in the free working memory.
+            max_region_batch_size = get_max_region_batch_size(
+                device=device, dtype=unet.dtype, latent_height=latent_tile_height, latent_width=latent_tile_width
+            )
+
             # Run Multi-Diffusion denoising.
             result_latents = pipeline.multi_diffusion_denoise(
                 multi_diffusion_conditioning=multi_diffusion_conditioning,
@@ -282,6 +311,7 @@ class TiledMultiDiffusionDenoiseLatents(BaseInvocation):
                 timesteps=timesteps,
                 init_timestep=init_timestep,
                 callback=step_callback,
+                max_region_batch_size=max_region_batch_size,
             )
 
         result_latents = result_latents.to("cpu")
@@ -42,6 +42,14 @@ class BoardImageRecordStorageBase(ABC):
         """Gets an image's board id, if it has one."""
         pass
 
+    @abstractmethod
+    def get_boards_for_images(
+        self,
+        image_names: list[str],
+    ) -> dict[str, str]:
+        """Gets the board ids for a list of images. Images that are not on a board are omitted."""
+        pass
+
     @abstractmethod
     def get_image_count_for_board(
         self,
@@ -57,3 +65,20 @@ class BoardImageRecordStorageBase(ABC):
     ) -> int:
         """Gets the number of assets for a board."""
         pass
+
+    @abstractmethod
+    def get_counts_for_boards(
+        self,
+        board_ids: list[str],
+    ) -> dict[str, tuple[int, int]]:
+        """Gets the numbers of images and assets for a list of boards, as (image_count, asset_count) tuples."""
+        pass
+
+    @abstractmethod
+    def repair_board_stats(self) -> int:
+        """Recomputes the stored stats of every board from its images. Returns the number of boards that were wrong.
+
+        The stats are kept up to date by triggers, so this is only needed to repair them, e.g. after the database was
+        edited by hand. It reads every board's images.
+        """
+        pass
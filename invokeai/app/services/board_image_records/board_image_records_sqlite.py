@@ -1,3 +1,4 @@
+import json
 import sqlite3
 from typing import Optional, cast
 
@@ -151,6 +152,22 @@ class SqliteBoardImageRecordStorage(BoardImageRecordStorageBase):
             return None
         return cast(str, result[0])
 
+    def get_boards_for_images(
+        self,
+        image_names: list[str],
+    ) -> dict[str, str]:
+        with self._db.read_transaction() as cursor:
+            cursor.execute(
+                """--sql
+                    SELECT image_name, board_id
+                    FROM board_images
+                    WHERE image_name IN (SELECT value FROM json_each(?));
+                    """,
+                (json.dumps(image_names),),
+            )
+            result = cast(list[sqlite3.Row], cursor.fetchall())
+        return {row[0]: row[1] for row in result}
+
     def get_image_count_for_board(self, board_id: str) -> int:
         with self._db.transaction() as cursor:
             # Convert the enum values to unique list of strings
@@ -188,3 +205,71 @@ class SqliteBoardImageRecordStorage(BoardImageRecordStorageBase):
             )
             count = cast(int, cursor.fetchone()[0])
         return count
+
+    def get_counts_for_boards(self, board_ids: list[str]) -> dict[str, tuple[int, int]]:
+        with self._db.read_transaction() as cursor:
+            # The board ids are passed as a single JSON array, so all boards are read in one query
+            cursor.execute(
+                """--sql
+                    SELECT board_id, image_count, asset_count
+                    FROM board_stats
+                    WHERE board_id IN (SELECT value FROM json_each(?));
+                    """,
+                (json.dumps(board_ids),),
+            )
+            result = cast(list[sqlite3.Row], cursor.fetchall())
+        counts = {row[0]: (cast(int, row[1]), cast(int, row[2])) for row in result}
+        return {board_id: counts.get(board_id, (0, 0)) for board_id in board_ids}
+
+    def repair_board_stats(self) -> int:
+        image_category_strings = [c.value for c in set(IMAGE_CATEGORIES)]
+        asset_category_strings = [c.value for c in set(ASSETS_CATEGORIES)]
+        image_placeholders = ",".join("?" * len(image_category_strings))
+        asset_placeholders = ",".join("?" * len(asset_category_strings))
+        with self._db.transaction() as cursor:
+            # Recompute every board's stats from its images, ranking cover images as get_most_recent_image_for_board()
+            cursor.execute(
+                f"""--sql
+                    SELECT
+                        boards.board_id,
+                        COALESCE(SUM(images.is_intermediate = FALSE AND images.image_category IN ( {image_placeholders} )), 0),
+                        COALESCE(SUM(images.is_intermediate = FALSE AND images.image_category IN ( {asset_placeholders} )), 0),
+                        (
+                            SELECT cover_images.image_name
+                            FROM images AS cover_images
+                            JOIN board_images AS cover_board_images
+                                ON cover_images.image_name = cover_board_images.image_name
+                            WHERE cover_board_images.board_id = boards.board_id
+                            AND cover_images.is_intermediate = FALSE
+                            ORDER BY
+                                cover_images.starred DESC,
+                                cover_images.created_at DESC,
+                                cover_images.image_name DESC
+                            LIMIT 1
+                        )
+                    FROM boards
+                    LEFT JOIN board_images ON board_images.board_id = boards.board_id
+                    LEFT JOIN images ON board_images.image_name = images.image_name
+                    GROUP BY boards.board_id;
+                    """,
+                (*image_category_strings, *asset_category_strings),
+            )
+            expected = {row[0]: (row[1], row[2], row[3]) for row in cast(list[sqlite3.Row], cursor.fetchall())}
+
+            cursor.execute(
+                """--sql
+                    SELECT board_id, image_count, asset_count, cover_image_name
+                    FROM board_stats;
+                    """
+            )
+            actual = {row[0]: (row[1], row[2], row[3]) for row in cast(list[sqlite3.Row], cursor.fetchall())}
+
+            drifted = [(board_id, *stats) for board_id, stats in expected.items() if actual.get(board_id) != stats]
+            cursor.executemany(
+                """--sql
+                    INSERT OR REPLACE INTO board_stats (board_id, image_count, asset_count, cover_image_name)
+                    VALUES (?, ?, ?, ?);
+                    """,
+                drifted,
+            )
+        return len(drifted)
@@ -68,3 +68,8 @@ class BoardServiceABC(ABC):
     ) -> list[BoardDTO]:
         """Gets all boards for a specific user, including shared boards. Admin users see all boards."""
         pass
+
+    @abstractmethod
+    def repair_stats(self) -> int:
+        """Recomputes the stored image counts and cover images of every board. Returns the number of boards repaired."""
+        pass
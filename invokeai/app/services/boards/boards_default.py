@@ -1,4 +1,6 @@
-from invokeai.app.services.board_records.board_records_common import BoardChanges, BoardRecordOrderBy
+from typing import Optional
+
+from invokeai.app.services.board_records.board_records_common import BoardChanges, BoardRecord, BoardRecordOrderBy
 from invokeai.app.services.boards.boards_base import BoardServiceABC
 from invokeai.app.services.boards.boards_common import BoardDTO, board_record_to_dto
 from invokeai.app.services.invoker import Invoker
@@ -22,14 +24,7 @@ class BoardService(BoardServiceABC):
 
     def get_dto(self, board_id: str) -> BoardDTO:
         board_record = self.__invoker.services.board_records.get(board_id)
-        cover_image = self.__invoker.services.image_records.get_most_recent_image_for_board(board_record.board_id)
-        if cover_image:
-            cover_image_name = cover_image.image_name
-        else:
-            cover_image_name = None
-        image_count = self.__invoker.services.board_image_records.get_image_count_for_board(board_id)
-        asset_count = self.__invoker.services.board_image_records.get_asset_count_for_board(board_id)
-        return board_record_to_dto(board_record, cover_image_name, image_count, asset_count)
+        return self._get_board_dtos([board_record], is_admin=False)[0]
 
     def update(
         self,
@@ -37,15 +32,7 @@ class BoardService(BoardServiceABC):
         changes: BoardChanges,
     ) -> BoardDTO:
         board_record = self.__invoker.services.board_records.update(board_id, changes)
-        cover_image = self.__invoker.services.image_records.get_most_recent_image_for_board(board_record.board_id)
-        if cover_image:
-            cover_image_name = cover_image.image_name
-        else:
-            cover_image_name = None
-
-        image_count = self.__invoker.services.board_image_records.get_image_count_for_board(board_id)
-        asset_count = self.__invoker.services.board_image_records.get_asset_count_for_board(board_id)
-        return board_record_to_dto(board_record, cover_image_name, image_count, asset_count)
+        return self._get_board_dtos([board_record], is_admin=False)[0]
 
     def delete(self, board_id: str) -> None:
         self.__invoker.services.board_records.delete(board_id)
@@ -63,25 +50,7 @@ class BoardService(BoardServiceABC):
         board_records = self.__invoker.services.board_records.get_many(
             user_id, is_admin, order_by, direction, offset, limit, include_archived
         )
-        board_dtos = []
-        for r in board_records.items:
-            cover_image = self.__invoker.services.image_records.get_most_recent_image_for_board(r.board_id)
-            if cover_image:
-                cover_image_name = cover_image.image_name
-            else:
-                cover_image_name = None
-
-            image_count = self.__invoker.services.board_image_records.get_image_count_for_board(r.board_id)
-            asset_count = self.__invoker.services.board_image_records.get_asset_count_for_board(r.board_id)
-
-            # For admin users, include owner username
-            owner_username = None
-            if is_admin:
-                owner = self.__invoker.services.users.get(r.user_id)
-                if owner:
-                    owner_username = owner.display_name or owner.email
-
-            board_dtos.append(board_record_to_dto(r, cover_image_name, image_count, asset_count, owner_username))
+        board_dtos = self._get_board_dtos(board_records.items, is_admin)
 
         return OffsetPaginatedResults[BoardDTO](items=board_dtos, offset=offset, limit=limit, total=len(board_dtos))
 
@@ -96,24 +65,35 @@ class BoardService(BoardServiceABC):
         board_records = self.__invoker.services.board_records.get_all(
             user_id, is_admin, order_by, direction, include_archived
         )
+        return self._get_board_dtos(board_records, is_admin)
+
+    def repair_stats(self) -> int:
+        repaired_count = self.__invoker.services.board_image_records.repair_board_stats()
+        if repaired_count > 0:
+            self.__invoker.services.logger.warning(
+                f"Repaired the image counts and cover images of {repaired_count} boards"
+            )
+        return repaired_count
+
+    def _get_board_dtos(self, board_records: list[BoardRecord], is_admin: bool) -> list[BoardDTO]:
+        """Builds the DTOs for a list of boards, reading their cover images and counts from their stored stats."""
+        board_ids = [r.board_id for r in board_records]
+        cover_image_names = self.__invoker.services.image_records.get_most_recent_image_names_for_boards(board_ids)
+        counts = self.__invoker.services.board_image_records.get_counts_for_boards(board_ids)
+
+        # For admin users, include owner username. Boards mostly belong to a few users, so each is only fetched once.
+        owner_usernames: dict[str, Optional[str]] = {}
+        if is_admin:
+            for user_id in {r.user_id for r in board_records}:
+                owner = self.__invoker.services.users.get(user_id)
+                owner_usernames[user_id] = (owner.display_name or owner.email) if owner else None
+
         board_dtos = []
         for r in board_records:
-            cover_image = self.__invoker.services.image_records.get_most_recent_image_for_board(r.board_id)
-            if cover_image:
-                cover_image_name = cover_image.image_name
-            else:
-                cover_image_name = None
-
-            image_count = self.__invoker.services.board_image_records.get_image_count_for_board(r.board_id)
-            asset_count = self.__invoker.services.board_image_records.get_asset_count_for_board(r.board_id)
-
-            # For admin users, include owner username
-            owner_username = None
-            if is_admin:
-                owner = self.__invoker.services.users.get(r.user_id)
-                if owner:
-                    owner_username = owner.display_name or owner.email
-
-            board_dtos.append(board_record_to_dto(r, cover_image_name, image_count, asset_count, owner_username))
-
+            image_count, asset_count = counts[r.board_id]
+            board_dtos.append(
+                board_record_to_dto(
+                    r, cover_image_names.get(r.board_id), image_count, asset_count, owner_usernames.get(r.user_id)
+                )
+            )
         return board_dtos
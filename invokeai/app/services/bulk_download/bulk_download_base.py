@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Iterator, Optional
 
 
 class BulkDownloadBase(ABC):
@@ -22,6 +22,34 @@ class BulkDownloadBase(ABC):
         :param user_id: The ID of the user who initiated the download.
         """
 
+    @abstractmethod
+    def create_stream(
+        self,
+        image_names: Optional[list[str]],
+        board_id: Optional[str],
+        bulk_download_item_id: Optional[str],
+        user_id: str = "system",
+    ) -> str:
+        """
+        Register a bulk download that is streamed to the client as it is built, instead of being written to disk.
+        A stream that is not fetched in time is forgotten.
+
+        :param image_names: A list of image names to include in the zip file.
+        :param board_id: The ID of the board. If provided, all images associated with the board will be included in the zip file.
+        :param bulk_download_item_id: The bulk_download_item_id that will be used to fetch the stream, if none is provided a uuid will be generated.
+        :param user_id: The ID of the user who initiated the download.
+        :return: The name of the bulk download item.
+        """
+
+    @abstractmethod
+    def get_stream(self, bulk_download_item_name: str) -> Optional[Iterator[bytes]]:
+        """
+        Start a streamed bulk download. A stream can only be fetched once.
+
+        :param bulk_download_item_name: The name of the bulk download item.
+        :return: An iterator over the chunks of the zip file, or None if the item is not a pending stream.
+        """
+
     @abstractmethod
     def get_path(self, bulk_download_item_name: str) -> str:
         """
@@ -4,7 +4,7 @@ DEFAULT_BULK_DOWNLOAD_ID = "default"
 class BulkDownloadException(Exception):
     """Exception raised when a bulk download fails."""
 
-    def __init__(self, message="Bulk download failed"):
+    def __init__(self, message: str = "Bulk download failed") -> None:
         super().__init__(message)
         self.message = message
 
@@ -12,7 +12,7 @@ class BulkDownloadException(Exception):
 class BulkDownloadTargetException(BulkDownloadException):
     """Exception raised when a bulk download target is not found."""
 
-    def __init__(self, message="The bulk download target was not found"):
+    def __init__(self, message: str = "The bulk download target was not found") -> None:
         super().__init__(message)
         self.message = message
 
@@ -20,6 +20,6 @@ class BulkDownloadTargetException(BulkDownloadException):
 class BulkDownloadParametersException(BulkDownloadException):
     """Exception raised when a bulk download parameter is invalid."""
 
-    def __init__(self, message="No image names or board ID provided"):
+    def __init__(self, message: str = "No image names or board ID provided") -> None:
         super().__init__(message)
         self.message = message
@@ -1,7 +1,9 @@
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Optional, Union
-from zipfile import ZipFile
+from typing import Iterator, Optional, Union
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
 
 from invokeai.app.services.board_records.board_records_common import BoardRecordNotFoundException
 from invokeai.app.services.bulk_download.bulk_download_base import BulkDownloadBase
@@ -16,6 +18,56 @@ from invokeai.app.services.images.images_common import ImageDTO
 from invokeai.app.services.invoker import Invoker
 from invokeai.app.util.misc import uuid_string
 
+# The size of the chunks a streamed zip file is sent in. A progress event is emitted for each chunk.
+STREAM_CHUNK_SIZE = 2**20
+
+# How long a streamed bulk download can wait to be fetched before it is forgotten.
+STREAM_TTL_SECONDS = 10 * 60
+
+
+@dataclass
+class _BulkDownloadStream:
+    """A streamed bulk download that has been requested, but not yet fetched."""
+
+    image_names: Optional[list[str]]
+    board_id: Optional[str]
+    bulk_download_item_id: str
+    user_id: str
+    created_at: float = field(default_factory=time.monotonic)
+
+    def is_expired(self) -> bool:
+        return time.monotonic() - self.created_at > STREAM_TTL_SECONDS
+
+
+class _ZipStreamBuffer:
+    """A write-only file object that holds the bytes written by a ZipFile until they are sent.
+
+    It cannot seek or tell, so ZipFile writes each member's sizes in a data descriptor after its contents instead of
+    going back to patch its header.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def take(self) -> bytes:
+        """Returns and clears the buffered bytes."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        self.size = 0
+        return data
+
 
 class BulkDownloadService(BulkDownloadBase):
     def start(self, invoker: Invoker) -> None:
@@ -27,6 +79,7 @@ class BulkDownloadService(BulkDownloadBase):
         self._bulk_downloads_folder.mkdir(parents=True, exist_ok=True)
         # Track which user owns each download so the fetch endpoint can enforce ownership
         self._download_owners: dict[str, str] = {}
+        self._streams: dict[str, _BulkDownloadStream] = {}
 
     def handler(
         self,
@@ -45,15 +98,7 @@ class BulkDownloadService(BulkDownloadBase):
         self._signal_job_started(bulk_download_id, bulk_download_item_id, bulk_download_item_name, user_id)
 
         try:
-            image_dtos: list[ImageDTO] = []
-
-            if board_id:
-                image_dtos = self._board_handler(board_id)
-            elif image_names:
-                image_dtos = self._image_handler(image_names)
-            else:
-                raise BulkDownloadParametersException()
-
+            image_dtos = self._get_image_dtos(image_names, board_id)
             bulk_download_item_name: str = self._create_zip_file(image_dtos, bulk_download_item_id)
             self._signal_job_completed(bulk_download_id, bulk_download_item_id, bulk_download_item_name, user_id)
         except (
@@ -68,8 +113,64 @@ class BulkDownloadService(BulkDownloadBase):
             self._invoker.services.logger.error("Problem bulk downloading images.")
             raise e
 
+    def create_stream(
+        self,
+        image_names: Optional[list[str]],
+        board_id: Optional[str],
+        bulk_download_item_id: Optional[str],
+        user_id: str = "system",
+    ) -> str:
+        if not board_id and not image_names:
+            raise BulkDownloadParametersException()
+
+        self._evict_expired_streams()
+        bulk_download_item_id = bulk_download_item_id or uuid_string()
+        bulk_download_item_name = bulk_download_item_id + ".zip"
+        self._download_owners[bulk_download_item_name] = user_id
+        self._streams[bulk_download_item_name] = _BulkDownloadStream(
+            image_names=image_names, board_id=board_id, bulk_download_item_id=bulk_download_item_id, user_id=user_id
+        )
+        return bulk_download_item_name
+
+    def get_stream(self, bulk_download_item_name: str) -> Optional[Iterator[bytes]]:
+        self._evict_expired_streams()
+        stream = self._streams.pop(bulk_download_item_name, None)
+        if stream is None:
+            return None
+
+        bulk_download_id: str = DEFAULT_BULK_DOWNLOAD_ID
+        self._signal_job_started(
+            bulk_download_id, stream.bulk_download_item_id, bulk_download_item_name, stream.user_id
+        )
+        try:
+            # Fetch the images before the response starts, so that a missing image fails the request outright
+            image_dtos = self._get_image_dtos(stream.image_names, stream.board_id)
+        except Exception as e:
+            self._download_owners.pop(bulk_download_item_name, None)
+            self._signal_job_failed(
+                bulk_download_id, stream.bulk_download_item_id, bulk_download_item_name, e, stream.user_id
+            )
+            raise
+
+        return self._stream_zip_file(image_dtos, bulk_download_id, stream, bulk_download_item_name)
+
+    def _evict_expired_streams(self) -> None:
+        """Forget the streams that were never fetched, e.g. because the client went away after requesting them."""
+        for bulk_download_item_name, stream in list(self._streams.items()):
+            if stream.is_expired():
+                del self._streams[bulk_download_item_name]
+                self._download_owners.pop(bulk_download_item_name, None)
+
+    def _get_image_dtos(self, image_names: Optional[list[str]], board_id: Optional[str]) -> list[ImageDTO]:
+        if board_id:
+            return self._board_handler(board_id)
+        elif image_names:
+            return self._image_handler(image_names)
+        else:
+            raise BulkDownloadParametersException()
+
     def _image_handler(self, image_names: list[str]) -> list[ImageDTO]:
-        return [self._invoker.services.images.get_dto(image_name) for image_name in image_names]
+        return self._invoker.services.images.get_dtos(image_names)
 
     def _board_handler(self, board_id: str) -> list[ImageDTO]:
         image_names = self._invoker.services.board_image_records.get_all_board_image_names_for_board(
@@ -106,6 +207,75 @@ class BulkDownloadService(BulkDownloadBase):
 
         return str(zip_file_name)
 
+    def _stream_zip_file(
+        self,
+        image_dtos: list[ImageDTO],
+        bulk_download_id: str,
+        stream: _BulkDownloadStream,
+        bulk_download_item_name: str,
+    ) -> Iterator[bytes]:
+        """
+        Build a zip file containing the given images, yielding it in chunks as it is built.
+
+        The images are stored uncompressed, as they are already compressed, and nothing is written to disk.
+        """
+        buffer = _ZipStreamBuffer()
+        images_written = 0
+        bytes_written = 0
+
+        def send() -> bytes:
+            nonlocal bytes_written
+            data = buffer.take()
+            bytes_written += len(data)
+            self._signal_job_progress(
+                bulk_download_id,
+                stream.bulk_download_item_id,
+                bulk_download_item_name,
+                images_written,
+                len(image_dtos),
+                bytes_written,
+                stream.user_id,
+            )
+            return data
+
+        try:
+            with ZipFile(buffer, "w", compression=ZIP_STORED) as zip_file:
+                for image_dto in image_dtos:
+                    image_zip_path = Path(image_dto.image_category.value) / image_dto.image_name
+                    image_disk_path = self._invoker.services.images.get_path(image_dto.image_name)
+                    zip_info = ZipInfo.from_file(image_disk_path, arcname=image_zip_path)
+                    zip_info.compress_type = ZIP_STORED
+                    with open(image_disk_path, "rb") as src, zip_file.open(zip_info, "w") as dest:
+                        while data := src.read(STREAM_CHUNK_SIZE):
+                            dest.write(data)
+                            if buffer.size >= STREAM_CHUNK_SIZE:
+                                yield send()
+                    images_written += 1
+            # Closing the zip file writes the central directory
+            yield send()
+        except GeneratorExit:
+            # The response was closed before the zip file was complete, e.g. because the client disconnected
+            self._signal_job_failed(
+                bulk_download_id,
+                stream.bulk_download_item_id,
+                bulk_download_item_name,
+                BulkDownloadException("The bulk download was closed before it was complete"),
+                stream.user_id,
+            )
+            raise
+        except BaseException as e:
+            self._signal_job_failed(
+                bulk_download_id, stream.bulk_download_item_id, bulk_download_item_name, e, stream.user_id
+            )
+            self._invoker.services.logger.error("Problem streaming bulk download.")
+            raise
+        finally:
+            self._download_owners.pop(bulk_download_item_name, None)
+
+        self._signal_job_completed(
+            bulk_download_id, stream.bulk_download_item_id, bulk_download_item_name, stream.user_id
+        )
+
     # from https://stackoverflow.com/questions/7406102/create-sane-safe-filename-from-any-unsafe-string
     def _clean_string_to_path_safe(self, s: str) -> str:
         """Clean a string to be path safe."""
@@ -125,6 +295,28 @@ class BulkDownloadService(BulkDownloadBase):
                 bulk_download_id, bulk_download_item_id, bulk_download_item_name, user_id=user_id
             )
 
+    def _signal_job_progress(
+        self,
+        bulk_download_id: str,
+        bulk_download_item_id: str,
+        bulk_download_item_name: str,
+        images_written: int,
+        total_images: int,
+        bytes_written: int,
+        user_id: str = "system",
+    ) -> None:
+        """Signal that a chunk of a streamed bulk download has been sent."""
+        if self._invoker:
+            self._invoker.services.events.emit_bulk_download_progress(
+                bulk_download_id,
+                bulk_download_item_id,
+                bulk_download_item_name,
+                images_written,
+                total_images,
+                bytes_written,
+                user_id=user_id,
+            )
+
     def _signal_job_completed(
         self,
         bulk_download_id: str,
@@ -145,7 +337,7 @@ class BulkDownloadService(BulkDownloadBase):
         bulk_download_id: str,
         bulk_download_item_id: str,
         bulk_download_item_name: str,
-        exception: Exception,
+        exception: BaseException,
         user_id: str = "system",
     ) -> None:
         """Signal that a bulk download job has failed."""
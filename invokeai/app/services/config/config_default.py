@@ -24,6 +24,7 @@ from invokeai.frontend.cli.arg_parser import InvokeAIArgs
 INIT_FILE = Path("invokeai.yaml")
 API_KEYS_FILE = Path("api_keys.yaml")
 DB_FILE = Path("invokeai.db")
+INVOCATION_CACHE_DB_FILE = Path("invocation_cache.db")
 LEGACY_INIT_FILE = Path("invokeai.init")
 PRECISION = Literal["auto", "float16", "bfloat16", "float32"]
 ATTENTION_TYPE = Literal["auto", "normal", "xformers", "sliced", "torch-sdp"]
@@ -32,6 +33,8 @@ LOG_FORMAT = Literal["plain", "color", "syslog", "legacy"]
 LOG_LEVEL = Literal["debug", "info", "warning", "error", "critical"]
 SESSION_QUEUE_MODE = Literal["FIFO", "round_robin"]
 IMAGE_SUBFOLDER_STRATEGY = Literal["flat", "date", "type", "hash"]
+NODE_CACHE_TYPE = Literal["memory", "sqlite"]
+MODEL_CACHE_EVICTION_POLICY = Literal["lru", "lfu", "greedy_dual", "load_time"]
 CONFIG_SCHEMA_VERSION = "4.0.3"
 # Path prefixes owned by real routes/mounts. A `base_url` starting with one of these would collide
 # with routing and silently brick the server, so it is rejected during validation.
@@ -106,6 +109,8 @@ class InvokeAIAppConfig(BaseSettings):
         device_working_mem_gb: The amount of working memory to keep available on the compute device (in GB). Has no effect if running on CPU. If you are experiencing OOM errors, try increasing this value.
         enable_partial_loading: Enable partial loading of models. This enables models to run with reduced VRAM requirements (at the cost of slower speed) by streaming the model from RAM to VRAM as its used. In some edge cases, partial loading can cause models to run more slowly if they were previously being fully loaded into VRAM.
         keep_ram_copy_of_weights: Whether to keep a full RAM copy of a model's weights when the model is loaded in VRAM. Keeping a RAM copy increases average RAM usage, but speeds up model switching and LoRA patching (assuming there is sufficient RAM). Set this to False if RAM pressure is consistently high.
+        model_cache_eviction_policy: The policy used to choose which models are dropped from the RAM cache to make room. `lru` drops the least recently used model, `lfu` the least frequently used, `greedy_dual` the model with the lowest load time per byte (aged so that unused models eventually go), and `load_time` the model that is quickest to load again relative to how long it has been idle.<br>Valid values: `lru`, `lfu`, `greedy_dual`, `load_time`
+        model_prefetch_queue_items: Number of upcoming queue items whose models are loaded into the RAM cache in the background while the current item runs. Models are only prefetched if they fit in the cache without dropping other models. Set to 0 (the default) to disable prefetching.
         ram: DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_ram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.
         vram: DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_vram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.
         lazy_offload: DEPRECATED: This setting is no longer used. Lazy-offloading is enabled by default. This config setting will be removed once the new model cache behavior is stable.
@@ -117,6 +122,7 @@ class InvokeAIAppConfig(BaseSettings):
         attention_slice_size: Slice size, valid when attention_type=="sliced".<br>Valid values: `auto`, `balanced`, `max`, `1`, `2`, `3`, `4`, `5`, `6`, `7`, `8`
         force_tiled_decode: Whether to enable tiled VAE decode (reduces memory consumption with some performance penalty).
         pil_compress_level: The compress_level setting of PIL.Image.save(), used for PNG encoding. All settings are lossless. 0 = no compression, 1 = fastest with slightly larger filesize, 9 = slowest with smallest filesize. 1 is typically the best setting.
+        image_write_workers: Number of background threads used to encode and write generated images and thumbnails. If 0, images are written on the generation thread before the node completes.
         max_queue_size: Maximum number of items in the session queue.
         session_queue_mode: Session queue mode. Use 'FIFO' for traditional first-in-first-out, or 'round_robin' to serve each user's jobs in turn. In single-user mode, FIFO is always used regardless of this setting.<br>Valid values: `FIFO`, `round_robin`
         clear_queue_on_startup: Empties session queue on startup. If true, disables `max_queue_history`.
@@ -124,9 +130,14 @@ class InvokeAIAppConfig(BaseSettings):
         allow_nodes: List of nodes to allow. Omit to allow all.
         deny_nodes: List of nodes to deny. Omit to deny none.
         node_cache_size: How many cached nodes to keep in memory.
+        node_cache_type: Where to store cached node outputs. 'memory' keeps them in RAM for the lifetime of the process. 'sqlite' persists them to a database in the `db_dir`, so they survive restarts.<br>Valid values: `memory`, `sqlite`
+        node_cache_max_age_hours: The maximum age of a cached node output in hours. Older outputs are evicted. If unset, outputs are only evicted when the cache is full. Only used when `node_cache_type` is 'sqlite'.
         hashing_algorithm: Model hashing algorthim for model installs. 'blake3_multi' is best for SSDs. 'blake3_single' is best for spinning disk HDDs. 'random' disables hashing, instead assigning a UUID to models. Useful when using a memory db to reduce model installation time, or if you don't care about storing stable hashes for models. Alternatively, any other hashlib algorithm is accepted, though these are not nearly as performant as blake3.<br>Valid values: `blake3_multi`, `blake3_single`, `random`, `md5`, `sha1`, `sha224`, `sha256`, `sha384`, `sha512`, `blake2b`, `blake2s`, `sha3_224`, `sha3_256`, `sha3_384`, `sha3_512`, `shake_128`, `shake_256`
+        hashing_concurrency: Maximum number of models hashed at once when rehashing the model library. Raise this for SSDs; keep it at 1 for spinning disk HDDs.
+        download_segments: Number of connections used to download each large model file. If the server supports range requests, a file is split into this many byte ranges that are fetched at once. 1 downloads each file over a single connection.
         remote_api_tokens: List of regular expression and token pairs used when downloading models from URLs. The download URL is tested against the regex, and if it matches, the token is provided in as a Bearer token.
         scan_models_on_startup: Scan the models directory on startup, registering orphaned models. This is typically only used in conjunction with `use_memory_db` for testing purposes.
+        scan_models_interval: Re-scan the models directory at this interval in seconds while the app is running, registering models that were added and warning about models that went missing. Directories that have not changed since the last scan are not listed again. Leave unset to disable.
         unsafe_disable_picklescan: UNSAFE. Disable the picklescan security check during model installation. Recommended only for development and testing purposes. This will allow arbitrary code execution during model installation, so should never be used in production.
         allow_unknown_models: Allow installation of models that we are unable to identify. If enabled, models will be marked as `unknown` in the database, and will not have any metadata associated with them. If disabled, unknown models will be rejected during installation.
         multiuser: Enable multiuser support. When disabled, the application runs in single-user mode using a default system account with administrator privileges. When enabled, requires user authentication and authorization.
@@ -141,6 +152,7 @@ class InvokeAIAppConfig(BaseSettings):
         external_seedream_base_url: Base URL override for Seedream image generation.
         base_url: Public base path when running behind a reverse proxy under a sub-path, e.g. `/invoke`. Set only when the proxy PRESERVES the sub-path (the backend receives `/invoke/api/...`). Leave unset when the proxy strips the sub-path or when serving at the domain root.
         forwarded_allow_ips: Comma-separated list of IPs (or `*`) allowed to set X-Forwarded-* headers. Set to the reverse proxy's IP. Only used when `base_url` is set.
+        progress_event_interval: Minimum time in seconds between progress events sent for the same invocation. Progress events that arrive in between are coalesced, and only the latest one is sent. Set to 0 to send every progress event.
     """
 
     _root: Optional[Path] = PrivateAttr(default=None)
@@ -164,6 +176,7 @@ class InvokeAIAppConfig(BaseSettings):
     ssl_keyfile:         Optional[Path] = Field(default=None,               description="SSL key file for HTTPS. See https://www.uvicorn.dev/settings/#https.")
     base_url:             Optional[str] = Field(default=None,               description="Public base path when running behind a reverse proxy under a sub-path, e.g. `/invoke`. Required when the proxy PRESERVES the sub-path (the backend receives `/invoke/api/...`); optional when the proxy strips it (set it anyway so openapi/docs URLs are correct). Leave unset when serving at the domain root. Normalized to a single leading slash with no trailing slash.")
     forwarded_allow_ips:            str = Field(default="127.0.0.1",        description="Comma-separated list of IPs (or `*`) allowed to set X-Forwarded-* headers. Set to the reverse proxy's IP. Only used when `base_url` is set.")
+    progress_event_interval:      float = Field(default=0.1, ge=0,          description="Minimum time in seconds between progress events sent for the same invocation. Progress events that arrive in between are coalesced, and only the latest one is sent. Set to 0 to send every progress event.")
 
     # MISC FEATURES
     log_tokenization:              bool = Field(default=False,              description="Enable logging of parsed prompt tokens.")
@@ -204,6 +217,8 @@ class InvokeAIAppConfig(BaseSettings):
     device_working_mem_gb:        float = Field(default=3,                  description="The amount of working memory to keep available on the compute device (in GB). Has no effect if running on CPU. If you are experiencing OOM errors, try increasing this value.")
     enable_partial_loading:        bool = Field(default=True,               description="Enable partial loading of models. This enables models to run with reduced VRAM requirements (at the cost of slower speed) by streaming the model from RAM to VRAM as its used. In some edge cases, partial loading can cause models to run more slowly if they were previously being fully loaded into VRAM.")
     keep_ram_copy_of_weights:      bool = Field(default=True,               description="Whether to keep a full RAM copy of a model's weights when the model is loaded in VRAM. Keeping a RAM copy increases average RAM usage, but speeds up model switching and LoRA patching (assuming there is sufficient RAM). Set this to False if RAM pressure is consistently high.")
+    model_cache_eviction_policy: MODEL_CACHE_EVICTION_POLICY = Field(default="lru", description="The policy used to choose which models are dropped from the RAM cache to make room. `lru` drops the least recently used model, `lfu` the least frequently used, `greedy_dual` the model with the lowest load time per byte (aged so that unused models eventually go), and `load_time` the model that is quickest to load again relative to how long it has been idle.")
+    model_prefetch_queue_items:     int = Field(default=0, ge=0,            description="Number of upcoming queue items whose models are loaded into the RAM cache in the background while the current item runs. Models are only prefetched if they fit in the cache without dropping other models. Set to 0 (the default) to disable prefetching.")
     # Deprecated CACHE configs
     ram:                Optional[float] = Field(default=None, gt=0,         description="DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_ram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.")
     vram:               Optional[float] = Field(default=None, ge=0,         description="DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_vram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.")
@@ -222,6 +237,7 @@ class InvokeAIAppConfig(BaseSettings):
     attention_slice_size: ATTENTION_SLICE_SIZE = Field(default="auto",      description='Slice size, valid when attention_type=="sliced".')
     force_tiled_decode:            bool = Field(default=False,              description="Whether to enable tiled VAE decode (reduces memory consumption with some performance penalty).")
     pil_compress_level:             int = Field(default=1,                  description="The compress_level setting of PIL.Image.save(), used for PNG encoding. All settings are lossless. 0 = no compression, 1 = fastest with slightly larger filesize, 9 = slowest with smallest filesize. 1 is typically the best setting.")
+    image_write_workers:            int = Field(default=0, ge=0,            description="Number of background threads used to encode and write generated images and thumbnails. If 0, images are written on the generation thread before the node completes.")
     max_queue_size:                 int = Field(default=10000, gt=0,        description="Maximum number of items in the session queue.")
     session_queue_mode: SESSION_QUEUE_MODE = Field(default="round_robin",   description="Session queue mode. Use 'FIFO' for traditional first-in-first-out, or 'round_robin' to serve each user's jobs in turn. In single-user mode, FIFO is always used regardless of this setting.")
     clear_queue_on_startup:        bool = Field(default=False,              description="Empties session queue on startup. If true, disables `max_queue_history`.")
@@ -231,11 +247,16 @@ class InvokeAIAppConfig(BaseSettings):
     allow_nodes:    Optional[list[str]] = Field(default=None,               description="List of nodes to allow. Omit to allow all.")
     deny_nodes:     Optional[list[str]] = Field(default=None,               description="List of nodes to deny. Omit to deny none.")
     node_cache_size:                int = Field(default=512,                description="How many cached nodes to keep in memory.")
+    node_cache_type:    NODE_CACHE_TYPE = Field(default="memory",           description="Where to store cached node outputs. 'memory' keeps them in RAM for the lifetime of the process. 'sqlite' persists them to a database in the `db_dir`, so they survive restarts.")
+    node_cache_max_age_hours: Optional[float] = Field(default=None, gt=0,   description="The maximum age of a cached node output in hours. Older outputs are evicted. If unset, outputs are only evicted when the cache is full. Only used when `node_cache_type` is 'sqlite'.")
 
     # MODEL INSTALL
     hashing_algorithm: HASHING_ALGORITHMS = Field(default="blake3_single",  description="Model hashing algorthim for model installs. 'blake3_multi' is best for SSDs. 'blake3_single' is best for spinning disk HDDs. 'random' disables hashing, instead assigning a UUID to models. Useful when using a memory db to reduce model installation time, or if you don't care about storing stable hashes for models. Alternatively, any other hashlib algorithm is accepted, though these are not nearly as performant as blake3.")
+    hashing_concurrency:            int = Field(default=1, ge=1,            description="Maximum number of models hashed at once when rehashing the model library. Raise this for SSDs; keep it at 1 for spinning disk HDDs.")
+    download_segments:              int = Field(default=1, ge=1,            description="Number of connections used to download each large model file. If the server supports range requests, a file is split into this many byte ranges that are fetched at once. 1 downloads each file over a single connection.")
     remote_api_tokens: Optional[list[URLRegexTokenPair]] = Field(default=None, description="List of regular expression and token pairs used when downloading models from URLs. The download URL is tested against the regex, and if it matches, the token is provided in as a Bearer token.")
     scan_models_on_startup:        bool = Field(default=False,              description="Scan the models directory on startup, registering orphaned models. This is typically only used in conjunction with `use_memory_db` for testing purposes.")
+    scan_models_interval: Optional[float] = Field(default=None, gt=0,       description="Re-scan the models directory at this interval in seconds while the app is running, registering models that were added and warning about models that went missing. Directories that have not changed since the last scan are not listed again. Leave unset to disable.")
     unsafe_disable_picklescan:     bool = Field(default=False,              description="UNSAFE. Disable the picklescan security check during model installation. Recommended only for development and testing purposes. This will allow arbitrary code execution during model installation, so should never be used in production.")
     allow_unknown_models:          bool = Field(default=True,              description="Allow installation of models that we are unable to identify. If enabled, models will be marked as `unknown` in the database, and will not have any metadata associated with them. If disabled, unknown models will be rejected during installation.")
 
@@ -385,6 +406,13 @@ class InvokeAIAppConfig(BaseSettings):
         assert db_dir is not None
         return db_dir / DB_FILE
 
+    @property
+    def invocation_cache_db_path(self) -> Path:
+        """Path to the invocation_cache.db file used by the 'sqlite' node cache, resolved to an absolute path.."""
+        db_dir = self._resolve(self.db_dir)
+        assert db_dir is not None
+        return db_dir / INVOCATION_CACHE_DB_FILE
+
     @property
     def legacy_conf_path(self) -> Path:
         """Path to directory of legacy configuration files (e.g. v1-inference.yaml), resolved to an absolute path.."""
@@ -10,6 +10,7 @@ from typing import Any, Callable, List, Optional, Set, Union
 from pydantic import BaseModel, Field, PrivateAttr
 from pydantic.networks import AnyHttpUrl
 
+from invokeai.backend.model_hash.model_hash import HASHING_ALGORITHMS
 from invokeai.backend.model_manager.metadata import RemoteModelFile
 
 
@@ -167,6 +168,9 @@ class DownloadJob(DownloadJobBase):
     source: AnyHttpUrl = Field(description="Where to download from. Specific types specified in child classes.")
     access_token: Optional[str] = Field(default=None, description="authorization token for protected resources")
     priority: int = Field(default=10, description="Queue priority; lower values are higher priority")
+    hash_algorithm: Optional[HASHING_ALGORITHMS] = Field(
+        default=None, description="If set, the file is hashed with this algorithm as it is downloaded"
+    )
 
     # set internally during download process
     job_started: Optional[str] = Field(default=None, description="Timestamp for when the download job started")
@@ -181,6 +185,10 @@ class DownloadJob(DownloadJobBase):
     expected_total_bytes: Optional[int] = Field(default=None, description="Expected total size of the download")
     resume_required: bool = Field(default=False, description="True if server refused resume; restart required")
     resume_message: Optional[str] = Field(default=None, description="Message explaining why resume is required")
+    content_hash: Optional[str] = Field(
+        default=None,
+        description="Digest of the downloaded file with hash_algorithm, without the algorithm prefix, if it was computed during the download",
+    )
     resume_from_scratch: bool = Field(
         default=False,
         description="True if resume metadata existed but the partial file was missing and the download restarted from the beginning",
@@ -260,6 +268,7 @@ class DownloadQueueServiceBase(ABC):
         on_complete: Optional[DownloadEventHandler] = None,
         on_cancelled: Optional[DownloadEventHandler] = None,
         on_error: Optional[DownloadExceptionHandler] = None,
+        hash_algorithm: Optional[HASHING_ALGORITHMS] = None,
     ) -> MultiFileDownloadJob:
         """
         Create and enqueue a multifile download job.
@@ -273,6 +282,8 @@ class DownloadQueueServiceBase(ABC):
          you will need to pass the job to submit_multifile_download().
         :param on_start, on_progress, on_complete, on_error: Callbacks for the indicated
          events.
+        :param hash_algorithm: If provided, each file is hashed as it is downloaded, and
+         the digest is stored in the content_hash of its part.
         :returns: A MultiFileDownloadJob object for monitoring the state of the download.
 
         The `dest` argument is a Path object pointing to a directory. All downloads
@@ -6,13 +6,15 @@ import re
 import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 from queue import Empty, PriorityQueue
 from shutil import disk_usage
-from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Set
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional, Set
 from urllib.parse import urlparse
 
 import requests
+from pydantic import BaseModel, Field
 from pydantic.networks import AnyHttpUrl
 from requests import HTTPError
 from tqdm import tqdm
@@ -31,6 +33,7 @@ from invokeai.app.services.download.download_base import (
     UnknownJobIDException,
 )
 from invokeai.app.util.misc import get_iso_timestamp
+from invokeai.backend.model_hash.model_hash import HASHING_ALGORITHMS, FileHasher, ModelHash
 from invokeai.backend.model_manager.metadata import RemoteModelFile
 from invokeai.backend.util.logging import InvokeAILogger
 
@@ -40,6 +43,47 @@ if TYPE_CHECKING:
 # Maximum number of bytes to download during each call to requests.iter_content()
 DOWNLOAD_CHUNK_SIZE = 100000
 
+# Minimum number of bytes fetched by each connection of a segmented download. Smaller files use fewer segments.
+SEGMENT_MIN_SIZE = 32 * 2**20
+
+
+class DownloadSegment(BaseModel):
+    """A byte range of a segmented download."""
+
+    start: int = Field(description="Offset of the first byte of the segment")
+    end: int = Field(description="Offset of the last byte of the segment")
+    written: int = Field(default=0, description="Bytes of the segment written to disk so far")
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start + 1
+
+    @property
+    def complete(self) -> bool:
+        return self.written >= self.size
+
+
+class SegmentedDownloadState(BaseModel):
+    """Resume state of a segmented download, saved next to its preallocated `.downloading` file."""
+
+    total_bytes: int = Field(description="Total file size (bytes)")
+    etag: Optional[str] = Field(default=None, description="ETag from the remote server, if available")
+    last_modified: Optional[str] = Field(default=None, description="Last-Modified from the remote server, if available")
+    segments: List[DownloadSegment] = Field(description="The byte ranges of the file, fetched concurrently")
+
+    @classmethod
+    def split(
+        cls, total_bytes: int, segment_count: int, etag: Optional[str], last_modified: Optional[str]
+    ) -> "SegmentedDownloadState":
+        """Split a file into `segment_count` byte ranges of (nearly) equal size."""
+        bounds = [total_bytes * i // segment_count for i in range(segment_count + 1)]
+        segments = [DownloadSegment(start=bounds[i], end=bounds[i + 1] - 1) for i in range(segment_count)]
+        return cls(total_bytes=total_bytes, etag=etag, last_modified=last_modified, segments=segments)
+
+    @property
+    def bytes(self) -> int:
+        return sum(s.written for s in self.segments)
+
 
 class DownloadQueueService(DownloadQueueServiceBase):
     """Class for queued download of models."""
@@ -74,6 +118,7 @@ class DownloadQueueService(DownloadQueueServiceBase):
         self._requests = requests_session or requests.Session()
         self._accept_download_requests = False
         self._max_parallel_dl = max_parallel_dl
+        self._segment_count = self._app_config.download_segments
 
     def start(self, *args: Any, **kwargs: Any) -> None:
         """Start the download worker threads."""
@@ -179,6 +224,7 @@ class DownloadQueueService(DownloadQueueServiceBase):
         on_complete: Optional[DownloadEventHandler] = None,
         on_cancelled: Optional[DownloadEventHandler] = None,
         on_error: Optional[DownloadExceptionHandler] = None,
+        hash_algorithm: Optional[HASHING_ALGORITHMS] = None,
     ) -> MultiFileDownloadJob:
         mfdj = MultiFileDownloadJob(dest=dest, id=self._next_id())
         mfdj.set_callbacks(
@@ -197,6 +243,7 @@ class DownloadQueueService(DownloadQueueServiceBase):
                 source=url,
                 dest=path,
                 access_token=access_token or self._lookup_access_token(url),
+                hash_algorithm=hash_algorithm,
             )
             job.id = self._next_id()  # pre-assign ID so _download_part2parent can be keyed by ID
             if part.size and part.size > 0:
@@ -338,10 +385,12 @@ class DownloadQueueService(DownloadQueueServiceBase):
         """Do the actual download."""
 
         url = job.canonical_url or str(job.source)
-        header = {"Authorization": f"Bearer {job.access_token}"} if job.access_token else {}
+        auth_header = {"Authorization": f"Bearer {job.access_token}"} if job.access_token else {}
+        header = dict(auth_header)
         had_resume_metadata = bool(job.etag or job.last_modified)
         open_mode = "wb"
         resume_from = 0
+        job.content_hash = None
 
         if not job.dest.is_dir():
             job.download_path = job.dest
@@ -411,6 +460,17 @@ class DownloadQueueService(DownloadQueueServiceBase):
                     f"(candidates={len(candidates)})"
                 )
 
+        if job.download_path and (segment_state := self._load_segment_state(job.download_path)):
+            # The in-progress file is preallocated, so its size says nothing about how much has been downloaded.
+            self._logger.info(f"{job.download_path}: partial segmented download found. Resuming")
+            job.bytes = segment_state.bytes
+            job.total_bytes = job.expected_total_bytes = segment_state.total_bytes
+            job.etag = segment_state.etag or job.etag
+            job.last_modified = segment_state.last_modified or job.last_modified
+            self._signal_job_started(job)
+            self._download_segments(job, url, auth_header, segment_state)
+            return
+
         if resume_from == 0:
             job.bytes = 0
             if had_resume_metadata:
@@ -553,9 +613,20 @@ class DownloadQueueService(DownloadQueueServiceBase):
             self._logger.error(f"Download failed from {host}: HTTP {status} {reason}")
             raise HTTPError(reason)
 
+        if (segment_count := self._get_segment_count(resp, resume_from, job.total_bytes)) > 1:
+            resp.close()
+            self._logger.debug(f"{job.source}: Downloading {job.download_path} in {segment_count} segments")
+            segment_state = SegmentedDownloadState.split(job.total_bytes, segment_count, job.etag, job.last_modified)
+            with open(in_progress_path, "wb") as file:
+                file.truncate(job.total_bytes)
+            self._save_segment_state(job.download_path, segment_state)
+            self._download_segments(job, url, auth_header, segment_state)
+            return
+
         self._logger.debug(f"{job.source}: Downloading {job.download_path}")
         report_delta = job.total_bytes / 100  # report every 1% change
         last_report_bytes = 0
+        hasher = self._get_file_hasher(job, in_progress_path, resume_from)
 
         # DOWNLOAD LOOP
         with open(in_progress_path, open_mode) as file:
@@ -563,6 +634,8 @@ class DownloadQueueService(DownloadQueueServiceBase):
                 if job.cancelled:
                     raise DownloadJobCancelledException("Job was cancelled at caller's request")
 
+                if hasher is not None:
+                    hasher.update(data)
                 job.bytes += file.write(data)
                 if (job.bytes - last_report_bytes >= report_delta) or (job.bytes >= job.total_bytes):
                     last_report_bytes = job.bytes
@@ -577,6 +650,161 @@ class DownloadQueueService(DownloadQueueServiceBase):
         # if we get here we are done and can rename the file to the original dest
         self._logger.debug(f"{job.source}: saved to {job.download_path} (bytes={job.bytes})")
         in_progress_path.rename(job.download_path)
+        if hasher is not None:
+            job.content_hash = hasher.hexdigest()
+
+    def _get_file_hasher(self, job: DownloadJob, in_progress_path: Path, resume_from: int) -> Optional[FileHasher]:
+        """Return a hasher for the job's file, if it asked for one, that has been fed any part already on disk."""
+        if job.hash_algorithm is None or (hasher := ModelHash.get_file_hasher(job.hash_algorithm)) is None:
+            return None
+        if resume_from > 0:
+            # Only the prefix downloaded before the resume has to be read back
+            with open(in_progress_path, "rb") as file:
+                remaining = resume_from
+                while remaining > 0 and (data := file.read(min(DOWNLOAD_CHUNK_SIZE * 10, remaining))):
+                    hasher.update(data)
+                    remaining -= len(data)
+        return hasher
+
+    def _get_segment_count(self, resp: requests.Response, resume_from: int, total_bytes: int) -> int:
+        """Return the number of segments to download a file in, or 1 to download it over a single connection."""
+        if self._segment_count < 2 or resume_from > 0 or resp.status_code != 200:
+            return 1
+        # The segments are fetched with range requests, which must address the bytes of the file as stored
+        if resp.headers.get("Accept-Ranges", "").lower() != "bytes" or resp.headers.get("Content-Encoding"):
+            return 1
+        return max(1, min(self._segment_count, total_bytes // SEGMENT_MIN_SIZE))
+
+    def _download_segments(
+        self, job: DownloadJob, url: str, header: Dict[str, str], segment_state: SegmentedDownloadState
+    ) -> None:
+        """Download the incomplete segments of a file concurrently, each into its own region of the `.downloading` file."""
+        assert job.download_path
+        download_path = job.download_path
+        in_progress_path = self._in_progress_path(download_path)
+        progress_lock = threading.Lock()
+        report_delta = job.total_bytes / 100  # report every 1% change
+        last_report_bytes = job.bytes
+        failed = threading.Event()
+
+        def on_segment_data(segment: DownloadSegment, size: int) -> None:
+            nonlocal last_report_bytes
+            with progress_lock:
+                segment.written += size
+                job.bytes = segment_state.bytes
+                if (job.bytes - last_report_bytes >= report_delta) or (job.bytes >= job.total_bytes):
+                    last_report_bytes = job.bytes
+                    self._save_segment_state(download_path, segment_state)
+                    self._signal_job_progress(job)
+
+        pending = [s for s in segment_state.segments if not s.complete]
+        with ThreadPoolExecutor(max_workers=max(len(pending), 1), thread_name_prefix="download_segment") as executor:
+            futures = [
+                executor.submit(
+                    self._download_segment, job, url, header, segment_state, segment, on_segment_data, failed
+                )
+                for segment in pending
+            ]
+            wait(futures)
+
+        with progress_lock:
+            self._save_segment_state(download_path, segment_state)
+
+        # A cancellation takes precedence, so that a paused job stays resumable
+        errors = [e for f in futures if (e := f.exception()) is not None]
+        for error in errors:
+            if isinstance(error, DownloadJobCancelledException):
+                raise error
+        if errors:
+            raise errors[0]
+
+        if segment_state.bytes < segment_state.total_bytes:
+            job.resume_required = True
+            job.resume_message = "Download interrupted. Resume required."
+            job.pause()
+            raise DownloadJobCancelledException("Download interrupted. Resume required.")
+
+        self._logger.debug(f"{job.source}: saved to {job.download_path} (bytes={job.bytes})")
+        in_progress_path.rename(download_path)
+        self._segment_state_path(download_path).unlink(missing_ok=True)
+
+    def _download_segment(
+        self,
+        job: DownloadJob,
+        url: str,
+        header: Dict[str, str],
+        segment_state: SegmentedDownloadState,
+        segment: DownloadSegment,
+        on_data: Callable[[DownloadSegment, int], None],
+        failed: threading.Event,
+    ) -> None:
+        """Download the rest of one segment of a file. Runs in its own thread."""
+        assert job.download_path
+        segment_header = dict(header)
+        segment_header["Range"] = f"bytes={segment.start + segment.written}-{segment.end}"
+        if segment_state.etag:
+            segment_header["If-Range"] = segment_state.etag
+        elif segment_state.last_modified:
+            segment_header["If-Range"] = segment_state.last_modified
+
+        try:
+            with self._requests.get(url, headers=segment_header, stream=True) as resp:
+                if resp.status_code == 200:
+                    # The file changed since the download started, or the server ignored the range
+                    job.resume_required = True
+                    job.resume_message = "Resume refused by server. Restart required."
+                    job.pause()
+                    raise DownloadJobCancelledException("Resume refused by server. Restart required.")
+                if resp.status_code != 206:
+                    host = urlparse(str(resp.url or url)).netloc
+                    self._logger.error(f"Download failed from {host}: HTTP {resp.status_code} {resp.reason}")
+                    raise HTTPError(resp.reason)
+                self._write_segment(job, resp, segment, on_data, failed)
+        except BaseException:
+            failed.set()
+            raise
+
+    def _write_segment(
+        self,
+        job: DownloadJob,
+        resp: requests.Response,
+        segment: DownloadSegment,
+        on_data: Callable[[DownloadSegment, int], None],
+        failed: threading.Event,
+    ) -> None:
+        """Write a segment's response into its region of the `.downloading` file, stopping if another segment failed."""
+        assert job.download_path
+        with open(self._in_progress_path(job.download_path), "r+b") as file:
+            file.seek(segment.start + segment.written)
+            for data in resp.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if job.cancelled:
+                    raise DownloadJobCancelledException("Job was cancelled at caller's request")
+                if failed.is_set():
+                    return
+                on_data(segment, file.write(data[: segment.size - segment.written]))
+                if segment.complete:
+                    break
+
+    def _segment_state_path(self, path: Path) -> Path:
+        return path.with_name(path.name + ".downloading.segments")
+
+    def _load_segment_state(self, path: Path) -> Optional[SegmentedDownloadState]:
+        """Load the resume state of a segmented download, if there is one with a matching `.downloading` file."""
+        state_path = self._segment_state_path(path)
+        in_progress_path = self._in_progress_path(path)
+        try:
+            segment_state = SegmentedDownloadState.model_validate_json(state_path.read_text())
+            if in_progress_path.stat().st_size != segment_state.total_bytes:
+                return None
+        except (OSError, ValueError):
+            return None
+        return segment_state
+
+    def _save_segment_state(self, path: Path, segment_state: SegmentedDownloadState) -> None:
+        state_path = self._segment_state_path(path)
+        tmp_path = state_path.with_name(state_path.name + ".tmp")
+        tmp_path.write_text(segment_state.model_dump_json())
+        tmp_path.replace(state_path)
 
     def _validate_filename(self, directory: str, filename: str) -> bool:
         pc_name_max = get_pc_name_max(directory)
@@ -639,7 +867,9 @@ class DownloadQueueService(DownloadQueueServiceBase):
             return
         if job.download_path:
             in_progress_path = self._in_progress_path(job.download_path)
-            if in_progress_path.exists():
+            if segment_state := self._load_segment_state(job.download_path):
+                job.bytes = segment_state.bytes
+            elif in_progress_path.exists():
                 job.bytes = in_progress_path.stat().st_size
         job.status = DownloadJobStatus.PAUSED
         self._execute_cb(job, "on_cancelled")
@@ -665,6 +895,7 @@ class DownloadQueueService(DownloadQueueServiceBase):
         self._logger.debug(f"Cleaning up leftover files from cancelled download job {job.download_path}")
         try:
             if job.download_path:
+                self._segment_state_path(job.download_path).unlink(missing_ok=True)
                 partial_file = self._in_progress_path(job.download_path)
                 partial_file.unlink()
         except OSError as excp:
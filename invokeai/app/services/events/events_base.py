@@ -1,12 +1,14 @@
 # Copyright (c) 2022 Kyle Schouviller (https://github.com/kyle0654)
 
 
-from typing import TYPE_CHECKING, Optional
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterator, Optional
 
 from invokeai.app.services.events.events_common import (
     BatchEnqueuedEvent,
     BulkDownloadCompleteEvent,
     BulkDownloadErrorEvent,
+    BulkDownloadProgressEvent,
     BulkDownloadStartedEvent,
     DownloadCancelledEvent,
     DownloadCompleteEvent,
@@ -54,12 +56,33 @@ if TYPE_CHECKING:
     from invokeai.backend.model_manager.taxonomy import SubModelType
 
 
+class DeferredThreadEvents:
+    """The events of a thread, held back from the point they were deferred until they are sent.
+
+    This stand-in does not hold anything back.
+    """
+
+    @contextmanager
+    def send(self) -> Iterator[None]:
+        """Sends the events dispatched within this context, from any thread, in the place of the deferral. The events
+        the deferring thread dispatched since are sent after them."""
+        yield
+
+
 class EventServiceBase:
     """Basic event bus, to have an empty stand-in when not needed"""
 
     def dispatch(self, event: "EventBase") -> None:
         pass
 
+    def defer_thread_events(self) -> DeferredThreadEvents:
+        """Holds back the events the calling thread dispatches from now on, until the returned deferral is sent.
+
+        This lets a thread hand off an event to another thread, e.g. one that waits for a background task, without
+        the thread's later events overtaking it.
+        """
+        return DeferredThreadEvents()
+
     # region: Invocation
 
     def emit_invocation_started(self, queue_item: "SessionQueueItem", invocation: "BaseInvocation") -> None:
@@ -240,6 +263,29 @@ class EventServiceBase:
             BulkDownloadStartedEvent.build(bulk_download_id, bulk_download_item_id, bulk_download_item_name, user_id)
         )
 
+    def emit_bulk_download_progress(
+        self,
+        bulk_download_id: str,
+        bulk_download_item_id: str,
+        bulk_download_item_name: str,
+        images_written: int,
+        total_images: int,
+        bytes_written: int,
+        user_id: str = "system",
+    ) -> None:
+        """Emitted as a streamed bulk image download sends each chunk of the zip file"""
+        self.dispatch(
+            BulkDownloadProgressEvent.build(
+                bulk_download_id,
+                bulk_download_item_id,
+                bulk_download_item_name,
+                images_written,
+                total_images,
+                bytes_written,
+                user_id,
+            )
+        )
+
     def emit_bulk_download_complete(
         self,
         bulk_download_id: str,
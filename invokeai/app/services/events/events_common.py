@@ -746,6 +746,38 @@ class BulkDownloadStartedEvent(BulkDownloadEventBase):
         )
 
 
+@payload_schema.register
+class BulkDownloadProgressEvent(BulkDownloadEventBase):
+    """Event model for bulk_download_progress"""
+
+    __event_name__ = "bulk_download_progress"
+
+    images_written: int = Field(description="The number of images written to the zip file so far")
+    total_images: int = Field(description="The total number of images in the zip file")
+    bytes_written: int = Field(description="The number of bytes of the zip file sent so far")
+
+    @classmethod
+    def build(
+        cls,
+        bulk_download_id: str,
+        bulk_download_item_id: str,
+        bulk_download_item_name: str,
+        images_written: int,
+        total_images: int,
+        bytes_written: int,
+        user_id: str = "system",
+    ) -> "BulkDownloadProgressEvent":
+        return cls(
+            bulk_download_id=bulk_download_id,
+            bulk_download_item_id=bulk_download_item_id,
+            bulk_download_item_name=bulk_download_item_name,
+            images_written=images_written,
+            total_images=total_images,
+            bytes_written=bytes_written,
+            user_id=user_id,
+        )
+
+
 @payload_schema.register
 class BulkDownloadCompleteEvent(BulkDownloadEventBase):
     """Event model for bulk_download_complete"""
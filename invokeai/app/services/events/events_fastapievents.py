@@ -1,19 +1,61 @@
 import asyncio
 import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
 
 from fastapi_events.dispatcher import dispatch
 
-from invokeai.app.services.events.events_base import EventServiceBase
-from invokeai.app.services.events.events_common import EventBase
+from invokeai.app.services.events.events_base import DeferredThreadEvents, EventServiceBase
+from invokeai.app.services.events.events_common import EventBase, InvocationEventBase, InvocationProgressEvent
+
+
+class _FastAPIDeferredThreadEvents(DeferredThreadEvents):
+    def __init__(self, service: "FastAPIEventService", thread_id: int) -> None:
+        self._service = service
+        self.thread_id = thread_id
+        self.events: list[EventBase] = []
+        """The events dispatched within `send()`."""
+        self.is_sent = False
+
+    @contextmanager
+    def send(self) -> Iterator[None]:
+        previous = self._service._get_sending_deferral()
+        self._service._set_sending_deferral(self)
+        try:
+            yield
+        finally:
+            self._service._set_sending_deferral(previous)
+            self._service._send_deferred_events(self)
 
 
 class FastAPIEventService(EventServiceBase):
-    def __init__(self, event_handler_id: int, loop: asyncio.AbstractEventLoop) -> None:
+    def __init__(
+        self, event_handler_id: int, loop: asyncio.AbstractEventLoop, progress_event_interval: float = 0
+    ) -> None:
         self.event_handler_id = event_handler_id
         self._queue = asyncio.Queue[EventBase | None]()
         self._stop_event = threading.Event()
         self._loop = loop
 
+        # Progress events are sent at most once per interval for each invocation. Progress events that arrive in
+        # between replace the pending one, so only the latest is sent. A progress event without an image keeps the
+        # image of the event it replaces, so a preview is never lost to a later step that has no preview.
+        self._progress_event_interval = progress_event_interval
+        self._pending_progress_events: dict[tuple[int, str], InvocationProgressEvent] = {}
+        self._last_progress_event_times: dict[tuple[int, str], float] = {}
+        self._progress_events_lock = threading.Lock()
+        self.coalesced_event_count = 0
+        """The number of progress events that were replaced by a later progress event before they were sent."""
+        self.dropped_event_count = 0
+        """The number of progress events that were not sent because their invocation had already finished."""
+
+        # Events held back by deferrals, in the order they were dispatched, by the thread that deferred them. The
+        # deferrals themselves are in the list, to mark where their events go.
+        self._held_events: dict[int, list[Union[EventBase, _FastAPIDeferredThreadEvents]]] = {}
+        self._held_events_lock = threading.Lock()
+        self._sending_deferral = threading.local()
+
         # We need to store a reference to the task so it doesn't get GC'd
         # See: https://docs.python.org/3/library/asyncio-task.html#creating-tasks
         self._background_tasks: set[asyncio.Task[None]] = set()
@@ -32,8 +74,97 @@ class FastAPIEventService(EventServiceBase):
             # The event loop was closed during shutdown. Events can no longer be dispatched;
             # silently drop this one so the generation thread can wind down cleanly.
             return
+        with self._held_events_lock:
+            deferral = self._get_sending_deferral()
+            if deferral is not None:
+                deferral.events.append(event)
+                return
+            held_events = self._held_events.get(threading.get_ident())
+            if held_events:
+                held_events.append(event)
+                return
+        self._send(event)
+
+    def defer_thread_events(self) -> DeferredThreadEvents:
+        deferral = _FastAPIDeferredThreadEvents(self, threading.get_ident())
+        with self._held_events_lock:
+            self._held_events.setdefault(deferral.thread_id, []).append(deferral)
+        return deferral
+
+    def _get_sending_deferral(self) -> Optional[_FastAPIDeferredThreadEvents]:
+        return getattr(self._sending_deferral, "deferral", None)
+
+    def _set_sending_deferral(self, deferral: Optional[_FastAPIDeferredThreadEvents]) -> None:
+        self._sending_deferral.deferral = deferral
+
+    def _send_deferred_events(self, deferral: _FastAPIDeferredThreadEvents) -> None:
+        """Marks the deferral as sent, and sends the held events of its thread up to the first deferral not yet sent."""
+        with self._held_events_lock:
+            deferral.is_sent = True
+            held_events = self._held_events.get(deferral.thread_id, [])
+            while held_events:
+                item = held_events[0]
+                if isinstance(item, _FastAPIDeferredThreadEvents):
+                    if not item.is_sent:
+                        break
+                    for event in item.events:
+                        self._send(event)
+                else:
+                    self._send(item)
+                held_events.pop(0)
+            if not held_events:
+                self._held_events.pop(deferral.thread_id, None)
+
+    def _send(self, event: EventBase) -> None:
+        if self._loop.is_closed():
+            return
+        if self._progress_event_interval > 0:
+            if isinstance(event, InvocationProgressEvent):
+                self._coalesce_progress_event(event)
+                return
+            if isinstance(event, InvocationEventBase):
+                # The invocation has finished - a pending progress event must not be sent after this event
+                self._drop_progress_event(event)
         self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
 
+    def _coalesce_progress_event(self, event: InvocationProgressEvent) -> None:
+        key = (event.item_id, event.invocation.id)
+        with self._progress_events_lock:
+            pending_event = self._pending_progress_events.get(key)
+            if pending_event is not None:
+                if event.image is None and pending_event.image is not None:
+                    event = event.model_copy(update={"image": pending_event.image})
+                self._pending_progress_events[key] = event
+                self.coalesced_event_count += 1
+                return
+            self._pending_progress_events[key] = event
+            last_time = self._last_progress_event_times.get(key)
+            delay = 0.0 if last_time is None else max(0.0, last_time + self._progress_event_interval - time.monotonic())
+        self._loop.call_soon_threadsafe(self._loop.call_later, delay, self._send_progress_event, key)
+
+    def _drop_progress_event(self, event: InvocationEventBase) -> None:
+        key = (event.item_id, event.invocation.id)
+        with self._progress_events_lock:
+            if self._pending_progress_events.pop(key, None) is not None:
+                self.dropped_event_count += 1
+            self._last_progress_event_times.pop(key, None)
+
+    def _send_progress_event(self, key: tuple[int, str]) -> None:
+        """Sends the pending progress event for an invocation. Runs on the event loop."""
+        with self._progress_events_lock:
+            event = self._pending_progress_events.pop(key, None)
+            if event is None:
+                return
+            now = time.monotonic()
+            self._last_progress_event_times[key] = now
+            # Forget invocations that haven't sent progress within the interval, e.g. ones that were canceled
+            stale_keys = [
+                k for k, t in self._last_progress_event_times.items() if now - t > self._progress_event_interval
+            ]
+            for stale_key in stale_keys:
+                del self._last_progress_event_times[stale_key]
+        self._queue.put_nowait(event)
+
     async def _dispatch_from_queue(self, stop_event: threading.Event):
         """Get events on from the queue and dispatch them, from the correct thread"""
         while not stop_event.is_set():
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 from PIL.Image import Image as PILImageType
 
@@ -56,6 +56,19 @@ class ImageFileStorageBase(ABC):
         """Saves an image and a 256x256 WEBP thumbnail. Returns a tuple of the image name, thumbnail name, and created timestamp."""
         pass
 
+    @abstractmethod
+    def flush(self, paths: Optional[list[Path]] = None) -> None:
+        """Blocks until pending image writes have landed on disk. If `paths` is given, only waits for those files.
+
+        Raises an ImageFileSaveException, caused by the write's error, if any of the writes failed."""
+        pass
+
+    @abstractmethod
+    def after_thread_writes(self, callback: Callable[[Optional[BaseException]], None]) -> None:
+        """Calls `callback` once the pending image writes queued by the calling thread have landed on disk, with the
+        error of the first write that failed, if any. The callback may run on another thread."""
+        pass
+
     @abstractmethod
     def delete(self, image_name: str, image_subfolder: str = "") -> None:
         """Deletes an image and its thumbnail (if one exists)."""
@@ -1,9 +1,12 @@
 # Copyright (c) 2022 Kyle Schouviller (https://github.com/kyle0654) and the InvokeAI Team
 import io
+import threading
 import zlib
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from pathlib import Path
 from queue import Queue
-from typing import Optional, Union
+from typing import Callable, Optional, Union
 
 from PIL import Image, PngImagePlugin
 from PIL.Image import Image as PILImageType
@@ -58,14 +61,42 @@ def _should_use_png_rle(image: PILImageType) -> bool:
         sample.close()
 
 
+@dataclass
+class _PendingWrite:
+    """An image (and its thumbnail) that has been handed to the background writer but is not yet on disk."""
+
+    future: Future[None]
+    image: PILImageType
+    thread_id: int
+    """The thread that queued the write."""
+
+
 class DiskImageFileStorage(ImageFileStorageBase):
-    """Stores images on disk"""
+    """Stores images on disk.
+
+    If `max_write_workers` is greater than 0, PNG encoding and thumbnail generation happen on a background thread pool,
+    so `save()` returns as soon as the write is queued. Until a write lands, `get()` serves the in-memory image and
+    `validate_path()`, `delete()` and `flush()` wait for it. If a write fails, the image's record is deleted, so that
+    no record is left without a file.
+    """
 
-    def __init__(self, output_folder: Union[str, Path]):
+    def __init__(self, output_folder: Union[str, Path], max_write_workers: int = 0):
         self.__cache: dict[Path, PILImageType] = {}
         self.__cache_ids = Queue[Path]()
+        self.__cache_lock = threading.Lock()
         self.__max_cache_size = 10  # TODO: get this from config
 
+        self.__pending: dict[Path, _PendingWrite] = {}
+        # The writes each thread queued that have not been waited for with after_thread_writes(). Successful writes
+        # are forgotten as they land, failed ones are kept until the thread collects their error.
+        self.__thread_writes: dict[int, set[Future[None]]] = {}
+        self.__pending_lock = threading.Lock()
+        self.__write_executor = (
+            ThreadPoolExecutor(max_workers=max_write_workers, thread_name_prefix="image_writer")
+            if max_write_workers > 0
+            else None
+        )
+
         self.__output_folder = output_folder if isinstance(output_folder, Path) else Path(output_folder)
         self.__thumbnails_folder = self.__output_folder / "thumbnails"
         # Validate required output folders at launch
@@ -74,6 +105,11 @@ class DiskImageFileStorage(ImageFileStorageBase):
     def start(self, invoker: Invoker) -> None:
         self.__invoker = invoker
 
+    def stop(self, invoker: Invoker) -> None:
+        if self.__write_executor is not None:
+            # Failed writes have already been reported
+            self.__write_executor.shutdown(wait=True)
+
     @property
     def image_root(self) -> Path:
         return self.__output_folder.resolve()
@@ -90,6 +126,10 @@ class DiskImageFileStorage(ImageFileStorageBase):
         try:
             image_path = self.get_path(image_name, image_subfolder=image_subfolder)
 
+            pending = self.__pending.get(image_path)
+            if pending is not None:
+                return pending.image
+
             cache_item = self.__get_cache(image_path)
             if cache_item:
                 return cache_item
@@ -113,9 +153,11 @@ class DiskImageFileStorage(ImageFileStorageBase):
         try:
             self.__validate_storage_folders()
             image_path = self.get_path(image_name, image_subfolder=image_subfolder)
+            thumbnail_path = self.get_path(image_name, thumbnail=True, image_subfolder=image_subfolder)
 
             # Ensure subfolder directories exist
             image_path.parent.mkdir(parents=True, exist_ok=True)
+            thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
 
             pnginfo = PngImagePlugin.PngInfo()
             info_dict = {}
@@ -133,40 +175,66 @@ class DiskImageFileStorage(ImageFileStorageBase):
             # When saving the image, the image object's info field is not populated. We need to set it
             image.info = info_dict
             compress_level = self.__invoker.services.configuration.pil_compress_level
-            save_options = {"compress_level": compress_level}
-            if compress_level == 1 and _should_use_png_rle(image):
-                save_options["compress_type"] = zlib.Z_RLE
-            image.save(
-                image_path,
-                "PNG",
-                pnginfo=pnginfo,
-                **save_options,
-            )
+        except Exception as e:
+            raise ImageFileSaveException from e
 
-            thumbnail_path = self.get_path(image_name, thumbnail=True, image_subfolder=image_subfolder)
+        if self.__write_executor is None:
+            try:
+                self.__write(image, image_path, thumbnail_path, pnginfo, compress_level, thumbnail_size)
+            except Exception as e:
+                raise ImageFileSaveException from e
+            return
 
-            # Ensure thumbnail subfolder directories exist
-            thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
+        # The caller may keep using its image object, so the writer encodes a private copy
+        image = image.copy()
+        with self.__pending_lock:
+            future = self.__write_executor.submit(
+                self.__write, image, image_path, thumbnail_path, pnginfo, compress_level, thumbnail_size
+            )
+            pending = _PendingWrite(future=future, image=image, thread_id=threading.get_ident())
+            self.__pending[image_path] = pending
+            self.__pending[thumbnail_path] = pending
+            self.__thread_writes.setdefault(pending.thread_id, set()).add(future)
+        future.add_done_callback(lambda f: self.__on_write_done(f, image_name, pending, [image_path, thumbnail_path]))
+
+    def flush(self, paths: Optional[list[Path]] = None) -> None:
+        error = self.__wait(self.__get_pending_futures(paths))
+        if error is not None:
+            raise ImageFileSaveException from error
+
+    def after_thread_writes(self, callback: Callable[[Optional[BaseException]], None]) -> None:
+        with self.__pending_lock:
+            futures = self.__thread_writes.pop(threading.get_ident(), set())
+        if not futures:
+            callback(None)
+            return
 
-            thumbnail_image = make_thumbnail(image, thumbnail_size)
-            thumbnail_image.save(thumbnail_path)
+        remaining = len(futures)
+        remaining_lock = threading.Lock()
 
-            self.__set_cache(image_path, image)
-            self.__set_cache(thumbnail_path, thumbnail_image)
-        except Exception as e:
-            raise ImageFileSaveException from e
+        def on_write_done(_: Future[None]) -> None:
+            nonlocal remaining
+            with remaining_lock:
+                remaining -= 1
+                if remaining > 0:
+                    return
+            callback(self.__wait(futures))
+
+        for future in futures:
+            future.add_done_callback(on_write_done)
 
     def delete(self, image_name: str, image_subfolder: str = "") -> None:
         try:
             image_path = self.get_path(image_name, image_subfolder=image_subfolder)
+            thumbnail_path = self.get_path(image_name, True, image_subfolder=image_subfolder)
+            # A failed write may have left a partial file behind, which is deleted all the same
+            self.__wait(self.__get_pending_futures([image_path, thumbnail_path]))
 
             if image_path.exists():
                 image_path.unlink()
             if image_path in self.__cache:
                 del self.__cache[image_path]
 
-            thumbnail_path = self.get_path(image_name, True, image_subfolder=image_subfolder)
-
             if thumbnail_path.exists():
                 thumbnail_path.unlink()
             if thumbnail_path in self.__cache:
@@ -218,6 +286,7 @@ class DiskImageFileStorage(ImageFileStorageBase):
     def validate_path(self, path: Union[str, Path]) -> bool:
         """Validates the path given for an image or thumbnail."""
         path = path if isinstance(path, Path) else Path(path)
+        self.__wait(self.__get_pending_futures([path]))
         return path.exists()
 
     def get_workflow(self, image_name: str, image_subfolder: str = "") -> str | None:
@@ -240,14 +309,73 @@ class DiskImageFileStorage(ImageFileStorageBase):
         for folder in folders:
             folder.mkdir(parents=True, exist_ok=True)
 
+    def __write(
+        self,
+        image: PILImageType,
+        image_path: Path,
+        thumbnail_path: Path,
+        pnginfo: PngImagePlugin.PngInfo,
+        compress_level: int,
+        thumbnail_size: int,
+    ) -> None:
+        """Encodes and writes an image and its thumbnail."""
+        save_options = {"compress_level": compress_level}
+        if compress_level == 1 and _should_use_png_rle(image):
+            save_options["compress_type"] = zlib.Z_RLE
+        image.save(
+            image_path,
+            "PNG",
+            pnginfo=pnginfo,
+            **save_options,
+        )
+
+        thumbnail_image = make_thumbnail(image, thumbnail_size)
+        thumbnail_image.save(thumbnail_path)
+
+        self.__set_cache(image_path, image)
+        self.__set_cache(thumbnail_path, thumbnail_image)
+
+    def __get_pending_futures(self, paths: Optional[list[Path]] = None) -> set[Future[None]]:
+        with self.__pending_lock:
+            if paths is None:
+                return {p.future for p in self.__pending.values()}
+            return {self.__pending[p].future for p in paths if p in self.__pending}
+
+    @staticmethod
+    def __wait(futures: set[Future[None]]) -> Optional[BaseException]:
+        """Waits for the writes, and returns the error of the first one that failed, if any."""
+        wait(futures)
+        return next((f.exception() for f in futures if f.exception() is not None), None)
+
+    def __on_write_done(self, future: Future[None], image_name: str, pending: _PendingWrite, paths: list[Path]) -> None:
+        error = future.exception()
+        with self.__pending_lock:
+            for path in paths:
+                if self.__pending.get(path) is pending:
+                    del self.__pending[path]
+            thread_writes = self.__thread_writes.get(pending.thread_id)
+            if error is None and thread_writes is not None:
+                thread_writes.discard(future)
+                if not thread_writes:
+                    del self.__thread_writes[pending.thread_id]
+        if error is not None:
+            self.__invoker.services.logger.error(f"Failed to write image {image_name}: {error}")
+            try:
+                self.__invoker.services.image_records.delete(image_name)
+            except Exception as e:
+                self.__invoker.services.logger.error(
+                    f"Failed to delete the record of unwritten image {image_name}: {e}"
+                )
+
     def __get_cache(self, image_name: Path) -> Optional[PILImageType]:
         return None if image_name not in self.__cache else self.__cache[image_name]
 
     def __set_cache(self, image_name: Path, image: PILImageType):
-        if image_name not in self.__cache:
-            self.__cache[image_name] = image
-            self.__cache_ids.put(image_name)  # TODO: this should refresh position for LRU cache
-            if len(self.__cache) > self.__max_cache_size:
-                cache_id = self.__cache_ids.get()
-                if cache_id in self.__cache:
-                    del self.__cache[cache_id]
+        with self.__cache_lock:
+            if image_name not in self.__cache:
+                self.__cache[image_name] = image
+                self.__cache_ids.put(image_name)  # TODO: this should refresh position for LRU cache
+                if len(self.__cache) > self.__max_cache_size:
+                    cache_id = self.__cache_ids.get()
+                    if cache_id in self.__cache:
+                        del self.__cache[cache_id]
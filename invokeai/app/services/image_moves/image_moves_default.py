@@ -226,6 +226,8 @@ class ImageMoveService:
         return ImageMoveResult(planned=planned, committed=committed, errors=errors)
 
     def startup_recovery(self) -> ImageMoveResult:
+        # Images still being written in the background must land before we plan moves for them
+        self.image_files.flush()
         with self._db.transaction() as cursor:
             cursor.execute(
                 """--sql
@@ -10,7 +10,7 @@ from invokeai.app.services.image_records.image_records_common import (
     ImageRecordChanges,
     ResourceOrigin,
 )
-from invokeai.app.services.shared.pagination import OffsetPaginatedResults
+from invokeai.app.services.shared.pagination import KeysetPaginatedResults, OffsetPaginatedResults
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 from invokeai.app.services.virtual_boards.virtual_boards_common import VirtualSubBoardDTO
 
@@ -25,6 +25,11 @@ class ImageRecordStorageBase(ABC):
         """Gets an image record."""
         pass
 
+    @abstractmethod
+    def get_by_names(self, image_names: list[str]) -> list[ImageRecord]:
+        """Gets the image records for a list of image names, in the same order. Raises if any is missing."""
+        pass
+
     @abstractmethod
     def get_metadata(self, image_name: str) -> Optional[MetadataField]:
         """Gets an image's metadata'."""
@@ -109,6 +114,33 @@ class ImageRecordStorageBase(ABC):
         """Gets the most recent image for a board."""
         pass
 
+    @abstractmethod
+    def get_most_recent_image_names_for_boards(self, board_ids: list[str]) -> dict[str, str]:
+        """Gets the name of the most recent image for each of a list of boards. Empty boards are omitted."""
+        pass
+
+    @abstractmethod
+    def get_many_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        starred_first: bool = True,
+        order_dir: SQLiteDirection = SQLiteDirection.Descending,
+        image_origin: Optional[ResourceOrigin] = None,
+        categories: Optional[list[ImageCategory]] = None,
+        is_intermediate: Optional[bool] = None,
+        board_id: Optional[str] = None,
+        search_term: Optional[str] = None,
+        user_id: Optional[str] = None,
+        is_admin: bool = False,
+        include_total: bool = False,
+    ) -> KeysetPaginatedResults[ImageRecord]:
+        """Gets a page of image records following the cursor, which is returned with the previous page.
+
+        The total number of matching records is only counted when include_total is set.
+        """
+        pass
+
     @abstractmethod
     def get_image_names(
         self,
@@ -98,6 +98,16 @@ class ImageRecordDeleteException(Exception):
         super().__init__(message)
 
 
+class InvalidImageCursorException(ValueError):
+    """Raised when a provided value is not a valid image pagination cursor.
+
+    Subclasses `ValueError`.
+    """
+
+    def __init__(self, message="Invalid image pagination cursor"):
+        super().__init__(message)
+
+
 IMAGE_DTO_COLS = ", ".join(
     [
         "images." + c
@@ -1,3 +1,6 @@
+import base64
+import binascii
+import json
 import sqlite3
 from datetime import datetime
 from typing import Optional, Union, cast
@@ -13,14 +16,143 @@ from invokeai.app.services.image_records.image_records_common import (
     ImageRecordDeleteException,
     ImageRecordNotFoundException,
     ImageRecordSaveException,
+    InvalidImageCursorException,
     ResourceOrigin,
     deserialize_image_record,
 )
-from invokeai.app.services.shared.pagination import OffsetPaginatedResults
+from invokeai.app.services.shared.pagination import KeysetPaginatedResults, OffsetPaginatedResults
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
 from invokeai.app.services.virtual_boards.virtual_boards_common import VirtualSubBoardDTO
 
+# The trigram tokenizer only indexes substrings of at least this many characters
+FTS_MIN_SEARCH_TERM_LENGTH = 3
+
+
+def _build_search_condition(search_term: str) -> tuple[str, list[Union[int, str, bool]]]:
+    """Builds the condition that filters images by a search term, and its parameters.
+
+    The search term is matched as a substring of the searchable metadata fields, the other strings and numbers in the
+    metadata, and the creation date, which are indexed in the image_search_fts table. Terms too short for the index are matched against the image_search table.
+    """
+    if len(search_term) >= FTS_MIN_SEARCH_TERM_LENGTH:
+        # Quote the term as a phrase, so it is matched literally rather than parsed as an FTS5 query
+        phrase = '"' + search_term.replace('"', '""') + '"'
+        condition = """--sql
+        AND images.image_name IN (
+            SELECT image_search.image_name
+            FROM image_search_fts
+            JOIN image_search ON image_search.id = image_search_fts.rowid
+            WHERE image_search_fts MATCH ?
+        )
+        """
+        return condition, [phrase]
+
+    condition = """--sql
+    AND images.image_name IN (
+        SELECT image_name
+        FROM image_search
+        WHERE positive_prompt LIKE ?
+        OR negative_prompt LIKE ?
+        OR model LIKE ?
+        OR seed LIKE ?
+        OR metadata_values LIKE ?
+        OR created_at LIKE ?
+    )
+    """
+    return condition, [f"%{search_term}%"] * 6
+
+
+def _build_filter_conditions(
+    image_origin: Optional[ResourceOrigin],
+    categories: Optional[list[ImageCategory]],
+    is_intermediate: Optional[bool],
+    board_id: Optional[str],
+    search_term: Optional[str],
+    user_id: Optional[str],
+    is_admin: bool,
+) -> tuple[str, list[Union[int, str, bool]]]:
+    """Builds the conditions that filter the gallery's images, and their parameters."""
+    query_conditions = ""
+    query_params: list[Union[int, str, bool]] = []
+
+    if image_origin is not None:
+        query_conditions += """--sql
+        AND images.image_origin = ?
+        """
+        query_params.append(image_origin.value)
+
+    if categories is not None:
+        # Convert the enum values to unique list of strings
+        category_strings = [c.value for c in set(categories)]
+        # Create the correct length of placeholders
+        placeholders = ",".join("?" * len(category_strings))
+
+        query_conditions += f"""--sql
+        AND images.image_category IN ( {placeholders} )
+        """
+
+        # Unpack the included categories into the query params
+        for c in category_strings:
+            query_params.append(c)
+
+    if is_intermediate is not None:
+        query_conditions += """--sql
+        AND images.is_intermediate = ?
+        """
+
+        query_params.append(is_intermediate)
+
+    # board_id of "none" is reserved for images without a board
+    if board_id == "none":
+        query_conditions += """--sql
+        AND board_images.board_id IS NULL
+        """
+        # For uncategorized images, filter by user_id to ensure per-user isolation
+        # Admin users can see all uncategorized images from all users
+        if user_id is not None and not is_admin:
+            query_conditions += """--sql
+            AND images.user_id = ?
+            """
+            query_params.append(user_id)
+    elif board_id is not None:
+        query_conditions += """--sql
+        AND board_images.board_id = ?
+        """
+        query_params.append(board_id)
+    elif user_id is not None and not is_admin:
+        # No board_id supplied — still enforce per-user isolation so
+        # non-admins cannot enumerate other users' images
+        query_conditions += """--sql
+        AND images.user_id = ?
+        """
+        query_params.append(user_id)
+
+    # Search term condition
+    if search_term:
+        search_condition, search_params = _build_search_condition(search_term)
+        query_conditions += search_condition
+        query_params.extend(search_params)
+
+    return query_conditions, query_params
+
+
+def _encode_cursor(row: sqlite3.Row) -> str:
+    """Encodes the sort key of an images row as an opaque pagination cursor."""
+    key = [int(row["starred"]), row["created_at"], row["image_name"]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[int, str, str]:
+    """Decodes a pagination cursor into the (starred, created_at, image_name) sort key it was encoded from."""
+    try:
+        starred, created_at, image_name = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+        raise InvalidImageCursorException from e
+    if not isinstance(starred, int) or not isinstance(created_at, str) or not isinstance(image_name, str):
+        raise InvalidImageCursorException
+    return starred, created_at, image_name
+
 
 class SqliteImageRecordStorage(ImageRecordStorageBase):
     def __init__(self, db: SqliteDatabase) -> None:
@@ -28,7 +160,7 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
         self._db = db
 
     def get(self, image_name: str) -> ImageRecord:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             try:
                 cursor.execute(
                     f"""--sql
@@ -47,8 +179,30 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
 
         return deserialize_image_record(dict(result))
 
+    def get_by_names(self, image_names: list[str]) -> list[ImageRecord]:
+        with self._db.read_transaction() as cursor:
+            try:
+                # The names are passed as a single JSON array, so there is no limit on how many can be fetched at once
+                cursor.execute(
+                    f"""--sql
+                    SELECT {IMAGE_DTO_COLS} FROM images
+                    WHERE image_name IN (SELECT value FROM json_each(?));
+                    """,
+                    (json.dumps(image_names),),
+                )
+
+                result = cast(list[sqlite3.Row], cursor.fetchall())
+            except sqlite3.Error as e:
+                raise ImageRecordNotFoundException from e
+
+        records = {row["image_name"]: deserialize_image_record(dict(row)) for row in result}
+        try:
+            return [records[image_name] for image_name in image_names]
+        except KeyError as e:
+            raise ImageRecordNotFoundException from e
+
     def get_user_id(self, image_name: str) -> Optional[str]:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT user_id FROM images
@@ -62,7 +216,7 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
             return cast(Optional[str], dict(result).get("user_id"))
 
     def get_metadata(self, image_name: str) -> Optional[MetadataField]:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             try:
                 cursor.execute(
                     """--sql
@@ -152,7 +306,7 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
         user_id: Optional[str] = None,
         is_admin: bool = False,
     ) -> OffsetPaginatedResults[ImageRecord]:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             # Manually build two queries - one for the count, one for the records
             count_query = """--sql
             SELECT COUNT(*)
@@ -168,71 +322,9 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
             WHERE 1=1
             """
 
-            query_conditions = ""
-            query_params: list[Union[int, str, bool]] = []
-
-            if image_origin is not None:
-                query_conditions += """--sql
-                AND images.image_origin = ?
-                """
-                query_params.append(image_origin.value)
-
-            if categories is not None:
-                # Convert the enum values to unique list of strings
-                category_strings = [c.value for c in set(categories)]
-                # Create the correct length of placeholders
-                placeholders = ",".join("?" * len(category_strings))
-
-                query_conditions += f"""--sql
-                AND images.image_category IN ( {placeholders} )
-                """
-
-                # Unpack the included categories into the query params
-                for c in category_strings:
-                    query_params.append(c)
-
-            if is_intermediate is not None:
-                query_conditions += """--sql
-                AND images.is_intermediate = ?
-                """
-
-                query_params.append(is_intermediate)
-
-            # board_id of "none" is reserved for images without a board
-            if board_id == "none":
-                query_conditions += """--sql
-                AND board_images.board_id IS NULL
-                """
-                # For uncategorized images, filter by user_id to ensure per-user isolation
-                # Admin users can see all uncategorized images from all users
-                if user_id is not None and not is_admin:
-                    query_conditions += """--sql
-                    AND images.user_id = ?
-                    """
-                    query_params.append(user_id)
-            elif board_id is not None:
-                query_conditions += """--sql
-                AND board_images.board_id = ?
-                """
-                query_params.append(board_id)
-            elif user_id is not None and not is_admin:
-                # No board_id supplied — still enforce per-user isolation so
-                # non-admins cannot enumerate other users' images
-                query_conditions += """--sql
-                AND images.user_id = ?
-                """
-                query_params.append(user_id)
-
-            # Search term condition
-            if search_term:
-                query_conditions += """--sql
-                AND (
-                    images.metadata LIKE ?
-                    OR images.created_at LIKE ?
-                )
-                """
-                query_params.append(f"%{search_term.lower()}%")
-                query_params.append(f"%{search_term.lower()}%")
+            query_conditions, query_params = _build_filter_conditions(
+                image_origin, categories, is_intermediate, board_id, search_term, user_id, is_admin
+            )
 
             if starred_first:
                 query_pagination = f"""--sql
@@ -264,6 +356,82 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
 
         return OffsetPaginatedResults(items=images, offset=offset, limit=limit, total=count)
 
+    def get_many_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        starred_first: bool = True,
+        order_dir: SQLiteDirection = SQLiteDirection.Descending,
+        image_origin: Optional[ResourceOrigin] = None,
+        categories: Optional[list[ImageCategory]] = None,
+        is_intermediate: Optional[bool] = None,
+        board_id: Optional[str] = None,
+        search_term: Optional[str] = None,
+        user_id: Optional[str] = None,
+        is_admin: bool = False,
+        include_total: bool = False,
+    ) -> KeysetPaginatedResults[ImageRecord]:
+        query_conditions, query_params = _build_filter_conditions(
+            image_origin, categories, is_intermediate, board_id, search_term, user_id, is_admin
+        )
+
+        # Seek past the last image of the previous page instead of skipping the rows before it with OFFSET, so deep
+        # pages cost the same as the first one. The image name breaks ties between images created at the same time.
+        page_conditions = ""
+        page_params: list[Union[int, str, bool]] = []
+        if cursor is not None:
+            starred, created_at, image_name = _decode_cursor(cursor)
+            comparison = "<" if order_dir is SQLiteDirection.Descending else ">"
+            if starred_first:
+                page_conditions = f"""--sql
+                AND (
+                    images.starred < ?
+                    OR (images.starred = ? AND (images.created_at, images.image_name) {comparison} (?, ?))
+                )
+                """
+                page_params = [starred, starred, created_at, image_name]
+            else:
+                page_conditions = f"""--sql
+                AND (images.created_at, images.image_name) {comparison} (?, ?)
+                """
+                page_params = [created_at, image_name]
+
+        order_by = f"images.created_at {order_dir.value}, images.image_name {order_dir.value}"
+        if starred_first:
+            order_by = f"images.starred DESC, {order_by}"
+
+        with self._db.read_transaction() as cursor_:
+            # Fetch one extra row to find out whether there is another page
+            cursor_.execute(
+                f"""--sql
+                SELECT {IMAGE_DTO_COLS}
+                FROM images
+                LEFT JOIN board_images ON board_images.image_name = images.image_name
+                WHERE 1=1{query_conditions}{page_conditions}
+                ORDER BY {order_by}
+                LIMIT ?;
+                """,
+                [*query_params, *page_params, limit + 1],
+            )
+            rows = cast(list[sqlite3.Row], cursor_.fetchall())
+
+            total: Optional[int] = None
+            if include_total:
+                cursor_.execute(
+                    f"""--sql
+                    SELECT COUNT(*)
+                    FROM images
+                    LEFT JOIN board_images ON board_images.image_name = images.image_name
+                    WHERE 1=1{query_conditions};
+                    """,
+                    query_params,
+                )
+                total = cast(int, cursor_.fetchone()[0])
+
+        next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        images = [deserialize_image_record(dict(r)) for r in rows[:limit]]
+        return KeysetPaginatedResults(items=images, limit=limit, next_cursor=next_cursor, total=total)
+
     def delete(self, image_name: str) -> None:
         with self._db.transaction() as cursor:
             try:
@@ -292,7 +460,7 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
                 raise ImageRecordDeleteException from e
 
     def get_intermediates_count(self, user_id: Optional[str] = None) -> int:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             query = "SELECT COUNT(*) FROM images WHERE is_intermediate = TRUE"
             params: list[str] = []
             if user_id is not None:
@@ -397,7 +565,7 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
         return created_at
 
     def get_most_recent_image_for_board(self, board_id: str) -> Optional[ImageRecord]:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT images.*
@@ -405,7 +573,7 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
                 JOIN board_images ON images.image_name = board_images.image_name
                 WHERE board_images.board_id = ?
                 AND images.is_intermediate = FALSE
-                ORDER BY images.starred DESC, images.created_at DESC
+                ORDER BY images.starred DESC, images.created_at DESC, images.image_name DESC
                 LIMIT 1;
                 """,
                 (board_id,),
@@ -418,6 +586,21 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
 
         return deserialize_image_record(dict(result))
 
+    def get_most_recent_image_names_for_boards(self, board_ids: list[str]) -> dict[str, str]:
+        with self._db.read_transaction() as cursor:
+            # Each board's cover image is kept up to date in board_stats
+            cursor.execute(
+                """--sql
+                SELECT board_id, cover_image_name
+                FROM board_stats
+                WHERE board_id IN (SELECT value FROM json_each(?))
+                AND cover_image_name IS NOT NULL;
+                """,
+                (json.dumps(board_ids),),
+            )
+            result = cast(list[sqlite3.Row], cursor.fetchall())
+        return {row[0]: row[1] for row in result}
+
     def get_image_names(
         self,
         starred_first: bool = True,
@@ -430,65 +613,11 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
         user_id: Optional[str] = None,
         is_admin: bool = False,
     ) -> ImageNamesResult:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             # Build query conditions (reused for both starred count and image names queries)
-            query_conditions = ""
-            query_params: list[Union[int, str, bool]] = []
-
-            if image_origin is not None:
-                query_conditions += """--sql
-                AND images.image_origin = ?
-                """
-                query_params.append(image_origin.value)
-
-            if categories is not None:
-                category_strings = [c.value for c in set(categories)]
-                placeholders = ",".join("?" * len(category_strings))
-                query_conditions += f"""--sql
-                AND images.image_category IN ( {placeholders} )
-                """
-                for c in category_strings:
-                    query_params.append(c)
-
-            if is_intermediate is not None:
-                query_conditions += """--sql
-                AND images.is_intermediate = ?
-                """
-                query_params.append(is_intermediate)
-
-            if board_id == "none":
-                query_conditions += """--sql
-                AND board_images.board_id IS NULL
-                """
-                # For uncategorized images, filter by user_id to ensure per-user isolation
-                # Admin users can see all uncategorized images from all users
-                if user_id is not None and not is_admin:
-                    query_conditions += """--sql
-                    AND images.user_id = ?
-                    """
-                    query_params.append(user_id)
-            elif board_id is not None:
-                query_conditions += """--sql
-                AND board_images.board_id = ?
-                """
-                query_params.append(board_id)
-            elif user_id is not None and not is_admin:
-                # No board_id supplied — still enforce per-user isolation so
-                # non-admins cannot enumerate other users' images
-                query_conditions += """--sql
-                AND images.user_id = ?
-                """
-                query_params.append(user_id)
-
-            if search_term:
-                query_conditions += """--sql
-                AND (
-                    images.metadata LIKE ?
-                    OR images.created_at LIKE ?
-                )
-                """
-                query_params.append(f"%{search_term.lower()}%")
-                query_params.append(f"%{search_term.lower()}%")
+            query_conditions, query_params = _build_filter_conditions(
+                image_origin, categories, is_intermediate, board_id, search_term, user_id, is_admin
+            )
 
             # Get starred count if starred_first is enabled
             starred_count = 0
@@ -531,7 +660,7 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
         user_id: Optional[str] = None,
         is_admin: bool = False,
     ) -> list[VirtualSubBoardDTO]:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             query_conditions = ""
             query_params: list[Union[int, str, bool]] = []
 
@@ -590,7 +719,7 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
         user_id: Optional[str] = None,
         is_admin: bool = False,
     ) -> ImageNamesResult:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             query_conditions = ""
             query_params: list[Union[int, str, bool]] = []
 
@@ -622,14 +751,9 @@ class SqliteImageRecordStorage(ImageRecordStorageBase):
                 query_params.append(user_id)
 
             if search_term:
-                query_conditions += """--sql
-                AND (
-                    images.metadata LIKE ?
-                    OR images.created_at LIKE ?
-                )
-                """
-                query_params.append(f"%{search_term.lower()}%")
-                query_params.append(f"%{search_term.lower()}%")
+                search_condition, search_params = _build_search_condition(search_term)
+                query_conditions += search_condition
+                query_params.extend(search_params)
 
             # Get starred count if starred_first is enabled
             starred_count = 0
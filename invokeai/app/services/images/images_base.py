@@ -12,7 +12,7 @@ from invokeai.app.services.image_records.image_records_common import (
     ResourceOrigin,
 )
 from invokeai.app.services.images.images_common import ImageDTO
-from invokeai.app.services.shared.pagination import OffsetPaginatedResults
+from invokeai.app.services.shared.pagination import KeysetPaginatedResults, OffsetPaginatedResults
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 
 
@@ -84,6 +84,11 @@ class ImageServiceABC(ABC):
         """Gets an image DTO."""
         pass
 
+    @abstractmethod
+    def get_dtos(self, image_names: list[str]) -> list[ImageDTO]:
+        """Gets the image DTOs for a list of image names, in the same order."""
+        pass
+
     @abstractmethod
     def get_metadata(self, image_name: str) -> Optional[MetadataField]:
         """Gets an image's metadata."""
@@ -100,8 +105,8 @@ class ImageServiceABC(ABC):
         pass
 
     @abstractmethod
-    def get_path(self, image_name: str, thumbnail: bool = False) -> str:
-        """Gets an image's path."""
+    def get_path(self, image_name: str, thumbnail: bool = False, image_record: Optional[ImageRecord] = None) -> str:
+        """Gets an image's path. If the caller already has the image's record, passing it skips reading it again."""
         pass
 
     @abstractmethod
@@ -132,6 +137,28 @@ class ImageServiceABC(ABC):
         """Gets a paginated list of image DTOs with starred images first when starred_first=True."""
         pass
 
+    @abstractmethod
+    def get_many_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        starred_first: bool = True,
+        order_dir: SQLiteDirection = SQLiteDirection.Descending,
+        image_origin: Optional[ResourceOrigin] = None,
+        categories: Optional[list[ImageCategory]] = None,
+        is_intermediate: Optional[bool] = None,
+        board_id: Optional[str] = None,
+        search_term: Optional[str] = None,
+        user_id: Optional[str] = None,
+        is_admin: bool = False,
+        include_total: bool = False,
+    ) -> KeysetPaginatedResults[ImageDTO]:
+        """Gets the page of image DTOs following the cursor returned with the previous page.
+
+        The total number of matching images is only counted when include_total is set.
+        """
+        pass
+
     @abstractmethod
     def delete(self, image_name: str):
         """Deletes an image."""
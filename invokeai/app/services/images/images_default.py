@@ -24,7 +24,7 @@ from invokeai.app.services.image_records.image_records_common import (
 from invokeai.app.services.images.images_base import ImageServiceABC
 from invokeai.app.services.images.images_common import ImageDTO, image_record_to_dto
 from invokeai.app.services.invoker import Invoker
-from invokeai.app.services.shared.pagination import OffsetPaginatedResults
+from invokeai.app.services.shared.pagination import KeysetPaginatedResults, OffsetPaginatedResults
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 
 
@@ -168,6 +168,27 @@ class ImageService(ImageServiceABC):
             self.__invoker.services.logger.error("Problem getting image DTO")
             raise e
 
+    def get_dtos(self, image_names: list[str]) -> list[ImageDTO]:
+        try:
+            image_records = self.__invoker.services.image_records.get_by_names(image_names)
+            board_ids = self.__invoker.services.board_image_records.get_boards_for_images(image_names)
+
+            return [
+                image_record_to_dto(
+                    image_record=r,
+                    image_url=self.__invoker.services.urls.get_image_url(r.image_name),
+                    thumbnail_url=self.__invoker.services.urls.get_image_url(r.image_name, True),
+                    board_id=board_ids.get(r.image_name),
+                )
+                for r in image_records
+            ]
+        except ImageRecordNotFoundException:
+            self.__invoker.services.logger.error("Image record not found")
+            raise
+        except Exception as e:
+            self.__invoker.services.logger.error("Problem getting image DTOs")
+            raise e
+
     def get_metadata(self, image_name: str) -> Optional[MetadataField]:
         try:
             return self.__invoker.services.image_records.get_metadata(image_name)
@@ -200,14 +221,15 @@ class ImageService(ImageServiceABC):
             self.__invoker.services.logger.error("Problem getting image graph")
             raise
 
-    def get_path(self, image_name: str, thumbnail: bool = False) -> str:
+    def get_path(self, image_name: str, thumbnail: bool = False, image_record: Optional[ImageRecord] = None) -> str:
         try:
-            record = self.__invoker.services.image_records.get(image_name)
-            return str(
-                self.__invoker.services.image_files.get_path(
-                    image_name, thumbnail, image_subfolder=record.image_subfolder
-                )
+            record = image_record or self.__invoker.services.image_records.get(image_name)
+            path = self.__invoker.services.image_files.get_path(
+                image_name, thumbnail, image_subfolder=record.image_subfolder
             )
+            # Callers read the file directly, so it must have landed on disk
+            self.__invoker.services.image_files.flush([path])
+            return str(path)
         except Exception as e:
             self.__invoker.services.logger.error("Problem getting image path")
             raise e
@@ -255,12 +277,15 @@ class ImageService(ImageServiceABC):
                 is_admin,
             )
 
+            board_ids = self.__invoker.services.board_image_records.get_boards_for_images(
+                [r.image_name for r in results.items]
+            )
             image_dtos = [
                 image_record_to_dto(
                     image_record=r,
                     image_url=self.__invoker.services.urls.get_image_url(r.image_name),
                     thumbnail_url=self.__invoker.services.urls.get_image_url(r.image_name, True),
-                    board_id=self.__invoker.services.board_image_records.get_board_for_image(r.image_name),
+                    board_id=board_ids.get(r.image_name),
                 )
                 for r in results.items
             ]
@@ -275,6 +300,60 @@ class ImageService(ImageServiceABC):
             self.__invoker.services.logger.error("Problem getting paginated image DTOs")
             raise e
 
+    def get_many_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 10,
+        starred_first: bool = True,
+        order_dir: SQLiteDirection = SQLiteDirection.Descending,
+        image_origin: Optional[ResourceOrigin] = None,
+        categories: Optional[list[ImageCategory]] = None,
+        is_intermediate: Optional[bool] = None,
+        board_id: Optional[str] = None,
+        search_term: Optional[str] = None,
+        user_id: Optional[str] = None,
+        is_admin: bool = False,
+        include_total: bool = False,
+    ) -> KeysetPaginatedResults[ImageDTO]:
+        try:
+            results = self.__invoker.services.image_records.get_many_by_cursor(
+                cursor=cursor,
+                limit=limit,
+                starred_first=starred_first,
+                order_dir=order_dir,
+                image_origin=image_origin,
+                categories=categories,
+                is_intermediate=is_intermediate,
+                board_id=board_id,
+                search_term=search_term,
+                user_id=user_id,
+                is_admin=is_admin,
+                include_total=include_total,
+            )
+
+            board_ids = self.__invoker.services.board_image_records.get_boards_for_images(
+                [r.image_name for r in results.items]
+            )
+            image_dtos = [
+                image_record_to_dto(
+                    image_record=r,
+                    image_url=self.__invoker.services.urls.get_image_url(r.image_name),
+                    thumbnail_url=self.__invoker.services.urls.get_image_url(r.image_name, True),
+                    board_id=board_ids.get(r.image_name),
+                )
+                for r in results.items
+            ]
+
+            return KeysetPaginatedResults[ImageDTO](
+                items=image_dtos,
+                limit=results.limit,
+                next_cursor=results.next_cursor,
+                total=results.total,
+            )
+        except Exception as e:
+            self.__invoker.services.logger.error("Problem getting cursor-paginated image DTOs")
+            raise e
+
     def delete(self, image_name: str):
         try:
             record = self.__invoker.services.image_records.get(image_name)
@@ -43,7 +43,7 @@ class InvocationCacheBase(ABC):
 
     @staticmethod
     @abstractmethod
-    def create_key(invocation: BaseInvocation) -> int:
+    def create_key(invocation: BaseInvocation) -> Union[int, str]:
         """Gets the key for the invocation's cache item"""
         pass
 
@@ -1,3 +1,5 @@
+from typing import Any
+
 from pydantic import BaseModel, Field
 
 
@@ -7,3 +9,31 @@ class InvocationCacheStatus(BaseModel):
     misses: int = Field(description="The number of cache misses")
     enabled: bool = Field(description="Whether the invocation cache is enabled")
     max_size: int = Field(description="The maximum size of the invocation cache")
+    index_size: int = Field(description="The number of referenced object names tracked for cache invalidation")
+
+
+def get_object_references(output: BaseModel) -> dict[str, str]:
+    """Gets the names of the stored objects referenced by an invocation output.
+
+    Objects are referenced by `*_name` fields, e.g. `image_name`, `latents_name`, `tensor_name`, `conditioning_name` or
+    `mask_name`. These are the names passed to the `on_deleted` callbacks of the images, tensors and conditioning
+    services, so they can be used to find the cached outputs to invalidate.
+
+    :param output: The invocation output.
+    :return: A mapping of referenced object name to the name of the field that references it.
+    """
+    references: dict[str, str] = {}
+
+    def _walk(data: Any) -> None:
+        if isinstance(data, dict):
+            for k, v in data.items():
+                if isinstance(v, str) and k.endswith("_name"):
+                    references[v] = k
+                else:
+                    _walk(v)
+        elif isinstance(data, list):
+            for v in data:
+                _walk(v)
+
+    _walk(output.model_dump(warnings=False))
+    return references
@@ -0,0 +1,266 @@
+import hashlib
+import sqlite3
+import time
+from typing import Optional, Union
+
+from pydantic import ValidationError
+
+from invokeai.app.invocations.baseinvocation import BaseInvocation, BaseInvocationOutput, InvocationRegistry
+from invokeai.app.services.invocation_cache.invocation_cache_base import InvocationCacheBase
+from invokeai.app.services.invocation_cache.invocation_cache_common import (
+    InvocationCacheStatus,
+    get_object_references,
+)
+from invokeai.app.services.invoker import Invoker
+from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
+
+# Bump this when the table layout changes. The cache is disposable, so a mismatch simply drops and recreates the table.
+CACHE_SCHEMA_VERSION = 2
+
+
+class SqliteInvocationCache(InvocationCacheBase):
+    """
+    An invocation cache that persists outputs to an SQLite database, so that they survive restarts.
+
+    Unlike the memory cache, keys are SHA-256 digests of the invocation, which are stable across processes.
+
+    Entries are evicted least-recently-used once `max_cache_size` is exceeded. If `max_age` is set, entries older than
+    that many seconds are treated as misses and pruned.
+
+    The names of the objects referenced by each output are stored in a separate table, indexed by name, so that
+    invalidating the outputs for a deleted image, tensor or conditioning object is an index lookup.
+
+    Outputs that reference tensors or conditioning are dropped on startup. Those services store their objects in
+    ephemeral directories, so the references would be dangling after a restart.
+
+    :param db: The database to store the cache in. This should not be the app database, to avoid lock contention.
+    :param max_cache_size: The maximum number of entries to keep. 0 disables the cache.
+    :param max_age: The maximum age of an entry in seconds. None disables age-based eviction.
+    """
+
+    _invoker: Invoker
+
+    def __init__(self, db: SqliteDatabase, max_cache_size: int = 0, max_age: Optional[float] = None) -> None:
+        self._db = db
+        self._max_cache_size = max_cache_size
+        self._max_age = max_age
+        self._disabled = False
+        self._hits = 0
+        self._misses = 0
+        # Monotonic access counter used for LRU ordering, seeded from the DB so ordering is kept across restarts.
+        self._last_access = 0
+        self._create_tables()
+
+    def _create_tables(self) -> None:
+        with self._db.transaction() as cursor:
+            cursor.execute("PRAGMA user_version;")
+            if cursor.fetchone()[0] != CACHE_SCHEMA_VERSION:
+                cursor.execute("DROP TABLE IF EXISTS invocation_cache_references;")
+                cursor.execute("DROP TABLE IF EXISTS invocation_cache;")
+                cursor.execute(f"PRAGMA user_version = {CACHE_SCHEMA_VERSION};")
+            cursor.execute(
+                """--sql
+                CREATE TABLE IF NOT EXISTS invocation_cache (
+                    key TEXT NOT NULL PRIMARY KEY,
+                    output TEXT NOT NULL,
+                    ephemeral INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    accessed_at INTEGER NOT NULL
+                );
+                """
+            )
+            cursor.execute(
+                """--sql
+                CREATE INDEX IF NOT EXISTS idx_invocation_cache_accessed_at ON invocation_cache(accessed_at);
+                """
+            )
+            cursor.execute(
+                """--sql
+                CREATE TABLE IF NOT EXISTS invocation_cache_references (
+                    name TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    PRIMARY KEY (name, key),
+                    FOREIGN KEY (key) REFERENCES invocation_cache(key) ON DELETE CASCADE
+                );
+                """
+            )
+            cursor.execute(
+                """--sql
+                CREATE INDEX IF NOT EXISTS idx_invocation_cache_references_key ON invocation_cache_references(key);
+                """
+            )
+            cursor.execute("SELECT MAX(accessed_at) FROM invocation_cache;")
+            self._last_access = cursor.fetchone()[0] or 0
+
+    def start(self, invoker: Invoker) -> None:
+        self._invoker = invoker
+        if self._max_cache_size == 0:
+            return
+        self._invoker.services.images.on_deleted(self._delete_by_match)
+        self._invoker.services.tensors.on_deleted(self._delete_by_match)
+        self._invoker.services.conditioning.on_deleted(self._delete_by_match)
+        with self._db.transaction() as cursor:
+            cursor.execute("DELETE FROM invocation_cache WHERE ephemeral = 1;")
+            deleted = cursor.rowcount
+            deleted += self._delete_expired(cursor)
+            deleted += self._delete_oldest_access(cursor)
+            cursor.execute("SELECT COUNT(*) FROM invocation_cache;")
+            count = cursor.fetchone()[0]
+        self._invoker.services.logger.info(
+            f"Loaded {count} persistent invocation cache entries (pruned {deleted} stale entries)"
+        )
+
+    def _next_access(self) -> int:
+        self._last_access += 1
+        return self._last_access
+
+    def get(self, key: Union[int, str]) -> Optional[BaseInvocationOutput]:
+        with self._db.transaction() as cursor:
+            if self._max_cache_size == 0 or self._disabled:
+                return None
+            cursor.execute(
+                """--sql
+                SELECT output, created_at
+                FROM invocation_cache
+                WHERE key = ?;
+                """,
+                (str(key),),
+            )
+            row = cursor.fetchone()
+            output: Optional[BaseInvocationOutput] = None
+            if row is not None and not self._is_expired(row["created_at"]):
+                try:
+                    output = InvocationRegistry.get_output_typeadapter().validate_json(row["output"])
+                except ValidationError:
+                    # The output class may have changed or been removed (e.g. an uninstalled custom node)
+                    output = None
+            if output is None:
+                self._misses += 1
+                if row is not None:
+                    cursor.execute("DELETE FROM invocation_cache WHERE key = ?;", (str(key),))
+                return None
+            self._hits += 1
+            cursor.execute(
+                "UPDATE invocation_cache SET accessed_at = ? WHERE key = ?;",
+                (self._next_access(), str(key)),
+            )
+            return output
+
+    def save(self, key: Union[int, str], invocation_output: BaseInvocationOutput) -> None:
+        with self._db.transaction() as cursor:
+            if self._max_cache_size == 0 or self._disabled:
+                return
+            references = get_object_references(invocation_output)
+            # Anything other than an image is a tensor or conditioning object, which does not survive a restart
+            ephemeral = any(field_name != "image_name" for field_name in references.values())
+            cursor.execute(
+                """--sql
+                INSERT OR IGNORE INTO invocation_cache (key, output, ephemeral, created_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?);
+                """,
+                (
+                    str(key),
+                    invocation_output.model_dump_json(warnings=False),
+                    ephemeral,
+                    time.time(),
+                    self._next_access(),
+                ),
+            )
+            if cursor.rowcount == 0:
+                return
+            cursor.executemany(
+                "INSERT OR IGNORE INTO invocation_cache_references (name, key) VALUES (?, ?);",
+                [(name, str(key)) for name in references],
+            )
+            self._delete_expired(cursor)
+            self._delete_oldest_access(cursor)
+
+    def _is_expired(self, created_at: float) -> bool:
+        return self._max_age is not None and created_at < time.time() - self._max_age
+
+    def _delete_expired(self, cursor: sqlite3.Cursor) -> int:
+        if self._max_age is None:
+            return 0
+        cursor.execute("DELETE FROM invocation_cache WHERE created_at < ?;", (time.time() - self._max_age,))
+        return cursor.rowcount
+
+    def _delete_oldest_access(self, cursor: sqlite3.Cursor) -> int:
+        cursor.execute(
+            """--sql
+            DELETE FROM invocation_cache
+            WHERE key IN (
+                SELECT key
+                FROM invocation_cache
+                ORDER BY accessed_at DESC
+                LIMIT -1 OFFSET ?
+            );
+            """,
+            (self._max_cache_size,),
+        )
+        return cursor.rowcount
+
+    def delete(self, key: Union[int, str]) -> None:
+        with self._db.transaction() as cursor:
+            if self._max_cache_size == 0:
+                return
+            cursor.execute("DELETE FROM invocation_cache WHERE key = ?;", (str(key),))
+
+    def clear(self) -> None:
+        with self._db.transaction() as cursor:
+            if self._max_cache_size == 0:
+                return
+            cursor.execute("DELETE FROM invocation_cache;")
+            self._misses = 0
+            self._hits = 0
+
+    @staticmethod
+    def create_key(invocation: BaseInvocation) -> str:
+        # The node version is included so that outputs persisted by an older implementation of a node are not reused.
+        invocation_json = invocation.model_dump_json(exclude={"id"}, warnings=False)
+        return hashlib.sha256(f"{invocation.UIConfig.version}:{invocation_json}".encode()).hexdigest()
+
+    def disable(self) -> None:
+        with self._db.transaction():
+            if self._max_cache_size == 0:
+                return
+            self._disabled = True
+
+    def enable(self) -> None:
+        with self._db.transaction():
+            if self._max_cache_size == 0:
+                return
+            self._disabled = False
+
+    def get_status(self) -> InvocationCacheStatus:
+        with self._db.transaction() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM invocation_cache;")
+            size = cursor.fetchone()[0] if self._max_cache_size > 0 else 0
+            cursor.execute("SELECT COUNT(DISTINCT name) FROM invocation_cache_references;")
+            index_size = cursor.fetchone()[0] if self._max_cache_size > 0 else 0
+            return InvocationCacheStatus(
+                hits=self._hits,
+                misses=self._misses,
+                enabled=not self._disabled and self._max_cache_size > 0,
+                size=size,
+                max_size=self._max_cache_size,
+                index_size=index_size,
+            )
+
+    def _delete_by_match(self, to_match: str) -> None:
+        with self._db.transaction() as cursor:
+            if self._max_cache_size == 0:
+                return
+            cursor.execute(
+                """--sql
+                DELETE FROM invocation_cache
+                WHERE key IN (
+                    SELECT key
+                    FROM invocation_cache_references
+                    WHERE name = ?
+                );
+                """,
+                (to_match,),
+            )
+            deleted = cursor.rowcount
+        if deleted:
+            self._invoker.services.logger.debug(f"Deleted {deleted} cached invocation outputs for {to_match}")
@@ -0,0 +1,76 @@
+import json
+import os
+from typing import Optional
+
+from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
+from invokeai.backend.model_hash.hash_cache import FileHashCache, FileIdentity
+
+
+class SqliteModelHashCache(FileHashCache):
+    """Stores model file digests in the app database, so unchanged files are not re-hashed on install or rehash.
+
+    There is one entry per file path and algorithm. It is replaced when the file is hashed again after changing.
+    """
+
+    def __init__(self, db: SqliteDatabase) -> None:
+        self._db = db
+
+    def get(self, file: FileIdentity, algorithm: str) -> Optional[str]:
+        with self._db.read_transaction() as cursor:
+            cursor.execute(
+                """--sql
+                SELECT digest FROM model_hash_cache
+                WHERE path = ? AND algorithm = ? AND size = ? AND mtime_ns = ? AND inode = ?;
+                """,
+                (file.path, algorithm, file.size, file.mtime_ns, file.inode),
+            )
+            row = cursor.fetchone()
+        return None if row is None else row[0]
+
+    def put(self, file: FileIdentity, algorithm: str, digest: str) -> None:
+        with self._db.transaction() as cursor:
+            cursor.execute(
+                """--sql
+                INSERT INTO model_hash_cache (path, algorithm, size, mtime_ns, inode, digest)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path, algorithm) DO UPDATE
+                  SET size = excluded.size,
+                      mtime_ns = excluded.mtime_ns,
+                      inode = excluded.inode,
+                      digest = excluded.digest,
+                      updated_at = STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW');
+                """,
+                (file.path, algorithm, file.size, file.mtime_ns, file.inode, digest),
+            )
+
+    def prune(self) -> int:
+        with self._db.read_transaction() as cursor:
+            cursor.execute(
+                """--sql
+                SELECT path, size, mtime_ns, inode FROM model_hash_cache;
+                """
+            )
+            rows = cursor.fetchall()
+
+        stale_paths: set[str] = set()
+        for path, size, mtime_ns, inode in rows:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stale_paths.add(path)
+                continue
+            if (stat.st_size, stat.st_mtime_ns, stat.st_ino) != (size, mtime_ns, inode):
+                stale_paths.add(path)
+
+        if not stale_paths:
+            return 0
+        with self._db.transaction() as cursor:
+            # The paths are passed as a single JSON array, so all entries are deleted in one statement
+            cursor.execute(
+                """--sql
+                DELETE FROM model_hash_cache
+                WHERE path IN (SELECT value FROM json_each(?));
+                """,
+                (json.dumps(sorted(stale_paths)),),
+            )
+            return cursor.rowcount
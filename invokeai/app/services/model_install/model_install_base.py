@@ -246,6 +246,20 @@ class ModelInstallServiceBase(ABC):
         will block indefinitely until the installs complete.
         """
 
+    @abstractmethod
+    def rehash_models(self) -> dict[str, str]:
+        """
+        Recompute the hashes of all installed models and update any that have changed.
+
+        Hash cache entries of files that no longer exist or have changed are removed first.
+
+        Models are hashed in parallel, with at most `hashing_concurrency` models being
+        read at once. Files that have not changed since they were last hashed are not
+        read again.
+
+        :returns: A mapping of the keys of models whose hash changed to their new hash.
+        """
+
     @abstractmethod
     def download_and_cache_model(self, source: str | AnyHttpUrl) -> Path:
         """
@@ -8,6 +8,7 @@ import re
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from copy import deepcopy
 from pathlib import Path
 from queue import Empty, Queue
@@ -41,6 +42,8 @@ from invokeai.app.services.model_install.model_install_common import (
 from invokeai.app.services.model_records import DuplicateModelException, ModelRecordServiceBase, UnknownModelException
 from invokeai.app.services.model_records.model_records_base import ModelRecordChanges
 from invokeai.app.util.misc import get_iso_timestamp
+from invokeai.backend.model_hash.hash_cache import FileHashCache, FileIdentity
+from invokeai.backend.model_hash.model_hash import ModelHash
 from invokeai.backend.model_manager.configs.base import Checkpoint_Config_Base
 from invokeai.backend.model_manager.configs.external_api import (
     ExternalApiModelConfig,
@@ -60,7 +63,7 @@ from invokeai.backend.model_manager.metadata import (
     RemoteModelFile,
 )
 from invokeai.backend.model_manager.metadata.metadata_base import HuggingFaceMetadata
-from invokeai.backend.model_manager.search import ModelSearch
+from invokeai.backend.model_manager.search import DirectoryStateCache, ModelSearch
 from invokeai.backend.model_manager.taxonomy import (
     BaseModelType,
     ModelFormat,
@@ -94,6 +97,8 @@ class ModelInstallService(ModelInstallServiceBase):
         download_queue: DownloadQueueServiceBase,
         event_bus: Optional["EventServiceBase"] = None,
         session: Optional[Session] = None,
+        hash_cache: Optional[FileHashCache] = None,
+        scan_cache: Optional[DirectoryStateCache] = None,
     ):
         """
         Initialize the installer object.
@@ -101,10 +106,15 @@ class ModelInstallService(ModelInstallServiceBase):
         :param app_config: InvokeAIAppConfig object
         :param record_store: Previously-opened ModelRecordService database
         :param event_bus: Optional EventService object
+        :param hash_cache: Optional cache of model file digests, used to avoid re-hashing unchanged files
+        :param scan_cache: Optional cache of directory listings, used to avoid re-listing unchanged directories when
+            scanning the models directory
         """
         self._app_config = app_config
         self._record_store = record_store
         self._event_bus = event_bus
+        self._hash_cache = hash_cache
+        self._scan_cache = scan_cache
         self._logger = InvokeAILogger.get_logger(name=self.__class__.__name__)
         self._install_jobs: List[ModelInstallJob] = []
         self._install_queue: Queue[ModelInstallJob] = Queue()
@@ -119,6 +129,10 @@ class ModelInstallService(ModelInstallServiceBase):
         self._running = False
         self._session = session
         self._install_thread: Optional[threading.Thread] = None
+        self._scan_thread: Optional[threading.Thread] = None
+        self._missing_model_keys: set[str] = set()
+        # Models being moved into the models directory, which must not be registered by a scan in the meantime
+        self._install_destinations: set[Path] = set()
         self._next_job_id = 0
 
     def _marker_path(self, tmpdir: Path) -> Path:
@@ -344,9 +358,12 @@ class ModelInstallService(ModelInstallServiceBase):
             # want to alert the user.
             for model in self._scan_for_missing_models():
                 self._logger.warning(f"Missing model file: {model.name} at {model.path}")
+                self._missing_model_keys.add(model.key)
 
             self._write_invoke_managed_models_dir_readme()
             self._restore_incomplete_installs_async()
+            if self.app_config.scan_models_interval is not None:
+                self._start_scan_thread(self.app_config.scan_models_interval)
 
     def stop(self, invoker: Optional[Invoker] = None) -> None:
         """Stop the installer thread; after this the object can be deleted and garbage collected."""
@@ -358,6 +375,9 @@ class ModelInstallService(ModelInstallServiceBase):
         self._download_cache.clear()
         assert self._install_thread is not None
         self._install_thread.join()
+        if self._scan_thread is not None:
+            self._scan_thread.join()
+            self._scan_thread = None
         self._running = False
 
     def _write_invoke_managed_models_dir_readme(self) -> None:
@@ -428,29 +448,35 @@ class ModelInstallService(ModelInstallServiceBase):
         info: AnyModelConfig = self._probe(Path(model_path), config)  # type: ignore
 
         dest_dir = self.app_config.models_path / info.key
+        with self._lock:
+            self._install_destinations.add(dest_dir.resolve())
         try:
-            if dest_dir.exists():
-                raise FileExistsError(
-                    f"Cannot install model {model_path.name} to {dest_dir}: destination already exists"
-                )
-            dest_dir.mkdir(parents=True)
-            dest_path = dest_dir / model_path.name if model_path.is_file() else dest_dir
-            if model_path.is_file():
-                self._move_with_retries(model_path, dest_path)  # Windows workaround TODO: fix root cause
-            elif model_path.is_dir():
-                # Move the contents of the directory, not the directory itself
-                for item in model_path.iterdir():
-                    move(item, dest_dir / item.name)
-        except FileExistsError as e:
-            raise DuplicateModelException(
-                f"A model named {model_path.name} is already installed at {dest_dir.as_posix()}"
-            ) from e
-
-        return self._register(
-            dest_path,
-            config,
-            info,
-        )
+            try:
+                if dest_dir.exists():
+                    raise FileExistsError(
+                        f"Cannot install model {model_path.name} to {dest_dir}: destination already exists"
+                    )
+                dest_dir.mkdir(parents=True)
+                dest_path = dest_dir / model_path.name if model_path.is_file() else dest_dir
+                if model_path.is_file():
+                    self._move_with_retries(model_path, dest_path)  # Windows workaround TODO: fix root cause
+                elif model_path.is_dir():
+                    # Move the contents of the directory, not the directory itself
+                    for item in model_path.iterdir():
+                        move(item, dest_dir / item.name)
+            except FileExistsError as e:
+                raise DuplicateModelException(
+                    f"A model named {model_path.name} is already installed at {dest_dir.as_posix()}"
+                ) from e
+
+            return self._register(
+                dest_path,
+                config,
+                info,
+            )
+        finally:
+            with self._lock:
+                self._install_destinations.discard(dest_dir.resolve())
 
     def heuristic_import(
         self,
@@ -899,6 +925,7 @@ class ModelInstallService(ModelInstallServiceBase):
 
         if job._install_tmpdir is not None:
             self._delete_install_marker(job._install_tmpdir)
+        self._seed_hash_cache(job)
 
         if job.inplace:
             key = self.register_path(job.local_path, job.config_in)
@@ -907,6 +934,19 @@ class ModelInstallService(ModelInstallServiceBase):
         job.config_out = self.record_store.get_model(key)
         self._signal_job_completed(job)
 
+    def _seed_hash_cache(self, job: ModelInstallJob) -> None:
+        """Record the hashes computed while the job's files were downloading, so they are not read again to hash them."""
+        if self._hash_cache is None:
+            return
+        for part in job.download_parts:
+            if part.content_hash is None or part.hash_algorithm is None or part.download_path is None:
+                continue
+            try:
+                identity = FileIdentity.from_path(part.download_path)
+            except OSError:
+                continue
+            self._hash_cache.put(identity, part.hash_algorithm, part.content_hash)
+
     def _register_external_model(self, job: ModelInstallJob) -> None:
         job.total_bytes = 0
         job.bytes = 0
@@ -986,6 +1026,41 @@ class ModelInstallService(ModelInstallServiceBase):
             install_job.set_error(excp)
         self._signal_job_errored(install_job)
 
+    def rehash_models(self) -> dict[str, str]:
+        if self._app_config.hashing_algorithm == "random":
+            self._logger.info("Model hashing is disabled, not rehashing models")
+            return {}
+
+        if self._hash_cache is not None:
+            pruned_count = self._hash_cache.prune()
+            if pruned_count > 0:
+                self._logger.info(f"Removed {pruned_count} stale entries from the model hash cache")
+
+        hasher = ModelHash(algorithm=self._app_config.hashing_algorithm, hash_cache=self._hash_cache)
+        models = [
+            m
+            for m in self.record_store.all_models()
+            if m.base != BaseModelType.External and m.format != ModelFormat.ExternalApi
+        ]
+        changed: dict[str, str] = {}
+        self._logger.info(f"Rehashing {len(models)} models")
+        with ThreadPoolExecutor(
+            max_workers=self._app_config.hashing_concurrency, thread_name_prefix="model_hasher"
+        ) as executor:
+            futures = {executor.submit(hasher.hash, self._app_config.models_path / m.path): m for m in models}
+            for future in as_completed(futures):
+                model = futures[future]
+                try:
+                    new_hash = future.result()
+                except Exception as e:
+                    self._logger.error(f"Failed to rehash model {model.name} ({model.key}): {e}")
+                    continue
+                if new_hash != model.hash:
+                    self._logger.info(f"Hash of model {model.name} ({model.key}) changed to {new_hash}")
+                    self.record_store.update_model(model.key, ModelRecordChanges(hash=new_hash))
+                    changed[model.key] = new_hash
+        return changed
+
     # --------------------------------------------------------------------------------------------
     # Internal functions that manage the models directory
     # --------------------------------------------------------------------------------------------
@@ -1013,22 +1088,41 @@ class ModelInstallService(ModelInstallServiceBase):
                 missing_models.append(model_config)
         return missing_models
 
-    def _register_orphaned_models(self) -> None:
+    def _get_active_install_paths(self) -> set[Path]:
+        """Gets the paths that unfinished install jobs read their models from or move them to."""
+        with self._lock:
+            jobs = [job for job in self._install_jobs if not job.in_terminal_state]
+            paths = set(self._install_destinations)
+        for job in jobs:
+            paths.add(job.local_path.resolve())
+            if job._install_tmpdir is not None:
+                paths.add(job._install_tmpdir.resolve())
+            if isinstance(job.source, LocalModelSource):
+                paths.add(Path(job.source.path).resolve())
+        return paths
+
+    def _register_orphaned_models(self) -> int:
         """Scan the invoke-managed models directory for orphaned models and registers them.
 
-        This is typically only used during testing with a new DB or when using the memory DB, because those are the
-        only situations in which we may have orphaned models in the models directory.
+        This is used during testing with a new DB or when using the memory DB, because those are the only situations
+        in which we may have orphaned models in the models directory, and by the periodic re-scan of the models
+        directory. Returns the number of models registered.
         """
+        registered_count = 0
         installed_model_paths = {
             (self._app_config.models_path / x.path).resolve() for x in self.record_store.all_models()
         }
 
         # The bool returned by this callback determines if the model is added to the list of models found by the search
         def on_model_found(model_path: Path) -> bool:
+            nonlocal registered_count
             resolved_path = model_path.resolve()
             # Already registered models should be in the list of found models, but not re-registered.
             if resolved_path in installed_model_paths:
                 return True
+            # Models that are being installed are registered by their install jobs
+            if any(resolved_path.is_relative_to(path) for path in self._get_active_install_paths()):
+                return False
             # Skip core models entirely - these aren't registered with the model manager.
             for special_directory in [
                 self.app_config.models_path / "core",
@@ -1040,15 +1134,45 @@ class ModelInstallService(ModelInstallServiceBase):
             try:
                 model_id = self.register_path(model_path)
                 self._logger.info(f"Registered {model_path.name} with id {model_id}")
+                registered_count += 1
             except DuplicateModelException:
                 # In case a duplicate models sneaks by, we will ignore this error - we "found" the model
                 pass
             return True
 
-        self._logger.info(f"Scanning {self._app_config.models_path} for orphaned models")
-        search = ModelSearch(on_model_found=on_model_found)
-        found_models = search.search(self._app_config.models_path)
-        self._logger.info(f"{len(found_models)} new models registered")
+        self._logger.debug(f"Scanning {self._app_config.models_path} for orphaned models")
+        # The temporary directories of unfinished installs are kept to resume them, and must not be registered
+        search = ModelSearch(
+            on_model_found=on_model_found,
+            directory_cache=self._scan_cache,
+            excluded_directory_prefixes=(TMPDIR_PREFIX,),
+        )
+        search.search(self._app_config.models_path)
+        if registered_count > 0:
+            self._logger.info(f"{registered_count} new models registered")
+        return registered_count
+
+    def _start_scan_thread(self, interval: float) -> None:
+        self._scan_thread = threading.Thread(target=self._scan_models_periodically, args=(interval,), daemon=True)
+        self._scan_thread.start()
+
+    def _scan_models_periodically(self, interval: float) -> None:
+        """Keep the model records in sync with the models directory until the service is stopped.
+
+        Models added to the models directory are registered. Models that went missing are reported once, but their
+        records are kept, because their files may be on a volume that isn't currently mounted.
+        """
+        while not self._stop_event.wait(interval):
+            try:
+                self._register_orphaned_models()
+                missing_models = self._scan_for_missing_models()
+            except Exception as e:
+                self._logger.error(f"Error scanning {self._app_config.models_path} for models: {e}")
+                continue
+            for model in missing_models:
+                if model.key not in self._missing_model_keys:
+                    self._logger.warning(f"Missing model file: {model.name} at {model.path}")
+            self._missing_model_keys = {model.key for model in missing_models}
 
     def _probe(self, model_path: Path, config: Optional[ModelRecordChanges] = None):
         config = config or ModelRecordChanges()
@@ -1060,6 +1184,7 @@ class ModelInstallService(ModelInstallServiceBase):
             override_fields=deepcopy(fields),
             hash_algo=hash_algo,
             allow_unknown=self.app_config.allow_unknown_models,
+            hash_cache=self._hash_cache,
         )
 
         if result.config is None:
@@ -1355,6 +1480,7 @@ class ModelInstallService(ModelInstallServiceBase):
             on_complete=self._download_complete_callback,
             on_error=self._download_error_callback,
             on_cancelled=self._download_cancelled_callback,
+            hash_algorithm=self._app_config.hashing_algorithm,
         )
 
     # ------------------------------------------------------------------
@@ -30,6 +30,18 @@ class ModelLoadServiceBase(ABC):
             events so they can be routed to that user's UI (defaults to the system user).
         """
 
+    @abstractmethod
+    def prefetch_model(self, model_config: AnyModelConfig, submodel_type: Optional[SubModelType] = None) -> bool:
+        """
+        Load a model into the RAM cache ahead of use, if it fits without dropping any cached models.
+
+        No model load events are emitted. Returns True if the model was loaded, False if it was already cached or
+        there was not enough room for it.
+
+        :param model_config: Model configuration record (as returned by ModelRecordBase.get_model())
+        :param submodel: For main (pipeline models), the submodel to fetch.
+        """
+
     @property
     @abstractmethod
     def ram_cache(self) -> ModelCache:
@@ -82,6 +82,14 @@ class ModelLoadService(ModelLoadServiceBase):
 
         return loaded_model
 
+    def prefetch_model(self, model_config: AnyModelConfig, submodel_type: Optional[SubModelType] = None) -> bool:
+        implementation, model_config, submodel_type = self._registry.get_implementation(model_config, submodel_type)  # type: ignore
+        return implementation(
+            app_config=self._app_config,
+            logger=self._logger,
+            ram_cache=self._ram_cache,
+        ).prefetch_model(model_config, submodel_type)
+
     def load_model_from_path(
         self, model_path: Path, loader: Optional[Callable[[Path], AnyModel]] = None
     ) -> LoadedModelWithoutConfig:
@@ -1,6 +1,7 @@
 # Copyright (c) 2023 Lincoln D. Stein and the InvokeAI Team
 
 from abc import ABC, abstractmethod
+from typing import Optional
 
 import torch
 from typing_extensions import Self
@@ -12,6 +13,7 @@ from invokeai.app.services.invoker import Invoker
 from invokeai.app.services.model_install.model_install_base import ModelInstallServiceBase
 from invokeai.app.services.model_load.model_load_base import ModelLoadServiceBase
 from invokeai.app.services.model_records.model_records_base import ModelRecordServiceBase
+from invokeai.backend.model_hash.hash_cache import FileHashCache
 
 
 class ModelManagerServiceBase(ABC):
@@ -31,6 +33,7 @@ class ModelManagerServiceBase(ABC):
         download_queue: DownloadQueueServiceBase,
         events: EventServiceBase,
         execution_device: torch.device,
+        hash_cache: Optional[FileHashCache] = None,
     ) -> Self:
         """
         Construct the model manager service instance.
@@ -16,8 +16,11 @@ from invokeai.app.services.model_load.model_load_base import ModelLoadServiceBas
 from invokeai.app.services.model_load.model_load_default import ModelLoadService
 from invokeai.app.services.model_manager.model_manager_base import ModelManagerServiceBase
 from invokeai.app.services.model_records.model_records_base import ModelRecordServiceBase
+from invokeai.backend.model_hash.hash_cache import FileHashCache
+from invokeai.backend.model_manager.load.model_cache.eviction_policy import build_eviction_policy
 from invokeai.backend.model_manager.load.model_cache.model_cache import ModelCache
 from invokeai.backend.model_manager.load.model_loader_registry import ModelLoaderRegistry
+from invokeai.backend.model_manager.search import DirectoryStateCache
 from invokeai.backend.util.devices import TorchDevice
 from invokeai.backend.util.logging import InvokeAILogger
 
@@ -76,6 +79,8 @@ class ModelManagerService(ModelManagerServiceBase):
         download_queue: DownloadQueueServiceBase,
         events: EventServiceBase,
         execution_device: Optional[torch.device] = None,
+        hash_cache: Optional[FileHashCache] = None,
+        scan_cache: Optional[DirectoryStateCache] = None,
     ) -> Self:
         """
         Construct the model manager service instance.
@@ -96,6 +101,7 @@ class ModelManagerService(ModelManagerServiceBase):
             log_memory_usage=app_config.log_memory_usage,
             logger=logger,
             keep_alive_minutes=app_config.model_cache_keep_alive_min,
+            eviction_policy=build_eviction_policy(app_config.model_cache_eviction_policy),
         )
         loader = ModelLoadService(
             app_config=app_config,
@@ -107,5 +113,7 @@ class ModelManagerService(ModelManagerServiceBase):
             record_store=model_record_service,
             download_queue=download_queue,
             event_bus=events,
+            hash_cache=hash_cache,
+            scan_cache=scan_cache,
         )
         return cls(store=model_record_service, install=installer, load=loader)
@@ -247,7 +247,7 @@ class ModelRecordServiceSQL(ModelRecordServiceBase):
 
         Exceptions: UnknownModelException
         """
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT config FROM models
@@ -262,7 +262,7 @@ class ModelRecordServiceSQL(ModelRecordServiceBase):
         return model
 
     def get_model_by_hash(self, hash: str) -> AnyModelConfig:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT config FROM models
@@ -282,7 +282,7 @@ class ModelRecordServiceSQL(ModelRecordServiceBase):
 
         :param key: Unique key for the model to be deleted
         """
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 select count(*) FROM models
@@ -315,7 +315,7 @@ class ModelRecordServiceSQL(ModelRecordServiceBase):
         If none of the optional filters are passed, will return all
         models in the database.
         """
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             assert isinstance(order_by, ModelRecordOrderBy)
             order_dir = "DESC" if direction == SQLiteDirection.Descending else "ASC"
             ordering = {
@@ -382,7 +382,7 @@ class ModelRecordServiceSQL(ModelRecordServiceBase):
 
     def search_by_path(self, path: Union[str, Path]) -> List[AnyModelConfig]:
         """Return models with the indicated path."""
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT config FROM models
@@ -395,7 +395,7 @@ class ModelRecordServiceSQL(ModelRecordServiceBase):
 
     def search_by_hash(self, hash: str) -> List[AnyModelConfig]:
         """Return models with the indicated hash."""
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT config FROM models
@@ -414,7 +414,7 @@ class ModelRecordServiceSQL(ModelRecordServiceBase):
         direction: SQLiteDirection = SQLiteDirection.Ascending,
     ) -> PaginatedResults[ModelSummary]:
         """Return a paginated summary listing of each model in the database."""
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             assert isinstance(order_by, ModelRecordOrderBy)
             order_dir = "DESC" if direction == SQLiteDirection.Descending else "ASC"
             ordering = {
@@ -429,7 +429,7 @@ class ModelRecordServiceSQL(ModelRecordServiceBase):
                 ModelRecordOrderBy.Path: "path",
             }
 
-            # Lock so that the database isn't updated while we're doing the two queries.
+            # The read transaction gives both queries the same snapshot, so the count matches the rows.
             # query1: get the total number of model configs
             cursor.execute(
                 """--sql
@@ -0,0 +1,78 @@
+import json
+import os
+from pathlib import Path
+
+from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
+from invokeai.backend.model_manager.search import DirectoryState, DirectoryStateCache
+
+
+class SqliteModelScanCache(DirectoryStateCache):
+    """Stores the directory listings of model searches in the app database, so unchanged directories are not listed
+    again when the models directory is re-scanned.
+
+    There is one entry per directory path. It is replaced when the directory is listed again after changing.
+    """
+
+    def __init__(self, db: SqliteDatabase) -> None:
+        self._db = db
+
+    def get_all(self, root: Path) -> dict[str, DirectoryState]:
+        root_path = str(root)
+        prefix = root_path.rstrip(os.sep) + os.sep
+        with self._db.read_transaction() as cursor:
+            # substr() rather than LIKE, which would treat % and _ in the path as wildcards
+            cursor.execute(
+                """--sql
+                SELECT path, mtime_ns, size, is_model, model_files, subdirectories
+                FROM model_scan_cache
+                WHERE path = ? OR substr(path, 1, length(?)) = ?;
+                """,
+                (root_path, prefix, prefix),
+            )
+            rows = cursor.fetchall()
+        return {
+            row[0]: DirectoryState(
+                mtime_ns=row[1],
+                size=row[2],
+                is_model=bool(row[3]),
+                model_files=tuple(json.loads(row[4])),
+                subdirectories=tuple(json.loads(row[5])),
+            )
+            for row in rows
+        }
+
+    def put_all(self, states: dict[str, DirectoryState]) -> None:
+        with self._db.transaction() as cursor:
+            cursor.executemany(
+                """--sql
+                INSERT INTO model_scan_cache (path, mtime_ns, size, is_model, model_files, subdirectories)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE
+                  SET mtime_ns = excluded.mtime_ns,
+                      size = excluded.size,
+                      is_model = excluded.is_model,
+                      model_files = excluded.model_files,
+                      subdirectories = excluded.subdirectories,
+                      updated_at = STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW');
+                """,
+                [
+                    (
+                        path,
+                        state.mtime_ns,
+                        state.size,
+                        state.is_model,
+                        json.dumps(state.model_files),
+                        json.dumps(state.subdirectories),
+                    )
+                    for path, state in states.items()
+                ],
+            )
+
+    def delete_all(self, paths: set[str]) -> None:
+        with self._db.transaction() as cursor:
+            cursor.executemany(
+                """--sql
+                DELETE FROM model_scan_cache WHERE path = ?;
+                """,
+                [(path,) for path in paths],
+            )
@@ -0,0 +1,177 @@
+from threading import Event as ThreadEvent
+from threading import Lock, Thread
+from typing import Any, Callable, Iterator, Optional
+
+from pydantic import BaseModel
+
+from invokeai.app.invocations.model import ModelIdentifierField
+from invokeai.app.services.invocation_services import InvocationServices
+from invokeai.app.services.session_queue.session_queue_common import DEFAULT_QUEUE_ID
+from invokeai.app.services.shared.graph import Graph
+from invokeai.backend.model_manager.load.model_cache.model_cache import CacheEntrySnapshot
+from invokeai.backend.model_manager.taxonomy import BaseModelType, ModelType, SubModelType
+
+# The submodels that a main model's loader node hands to downstream nodes, by base. Tokenizers and schedulers are cheap
+# to load and are not worth prefetching. Bases that are not listed here load their text encoders and VAE from separate
+# models, which appear in the graph in their own right.
+_MAIN_MODEL_SUBMODELS: dict[BaseModelType, tuple[SubModelType, ...]] = {
+    BaseModelType.StableDiffusion1: (SubModelType.UNet, SubModelType.TextEncoder, SubModelType.VAE),
+    BaseModelType.StableDiffusion2: (SubModelType.UNet, SubModelType.TextEncoder, SubModelType.VAE),
+    BaseModelType.StableDiffusionXL: (
+        SubModelType.UNet,
+        SubModelType.TextEncoder,
+        SubModelType.TextEncoder2,
+        SubModelType.VAE,
+    ),
+    BaseModelType.StableDiffusionXLRefiner: (SubModelType.UNet, SubModelType.TextEncoder2, SubModelType.VAE),
+}
+
+# Model types that are loaded whole, without a submodel type, by the nodes that use them.
+_WHOLE_MODEL_TYPES = {
+    ModelType.VAE,
+    ModelType.LoRA,
+    ModelType.ControlLoRa,
+    ModelType.ControlNet,
+    ModelType.T2IAdapter,
+    ModelType.IPAdapter,
+    ModelType.SpandrelImageToImage,
+}
+
+
+def get_model_identifiers(graph: Graph) -> list[ModelIdentifierField]:
+    """Get the models referenced by a graph's nodes, including those nested in other fields (e.g. LoRA lists)."""
+    identifiers: dict[tuple[str, Optional[SubModelType]], ModelIdentifierField] = {}
+    for node in graph.nodes.values():
+        for identifier in _iter_model_identifiers(node):
+            identifiers.setdefault((identifier.key, identifier.submodel_type), identifier)
+    return list(identifiers.values())
+
+
+def _iter_model_identifiers(value: Any) -> Iterator[ModelIdentifierField]:
+    if isinstance(value, ModelIdentifierField):
+        yield value
+    elif isinstance(value, BaseModel):
+        for field_name in type(value).model_fields:
+            yield from _iter_model_identifiers(getattr(value, field_name))
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_model_identifiers(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_model_identifiers(item)
+
+
+class ModelPrefetcher:
+    """Warms the model cache with the models used by upcoming queue items.
+
+    The session processor only loads a model when a node asks for it, so the next queue item's models are read from
+    disk after the current item finishes. The prefetcher peeks at the next pending queue items and loads their models
+    into the RAM cache on a background thread, so that the disk reads overlap with the current item's execution.
+
+    Prefetching never displaces a cached model: a model is only loaded if it fits in the RAM cache as-is, and it is
+    placed at the least-recently-used end of the cache so that it is the first to go if the current item needs room. The
+    room is reserved while the model is read from disk, and a foreground load cancels the prefetch if it needs that room.
+
+    The submodels to load for a model are learned from the cache keys that are actually requested while sessions run.
+    Models that have not been used since startup fall back to a best guess based on their type.
+    """
+
+    def __init__(self, services: InvocationServices, queue_items: int, queue_id: str = DEFAULT_QUEUE_ID) -> None:
+        self._services = services
+        self._queue_items = queue_items
+        self._queue_id = queue_id
+        self._wake_event = ThreadEvent()
+        self._stop_event = ThreadEvent()
+        self._thread: Optional[Thread] = None
+        self._unsubscribe: list[Callable[[], None]] = []
+        self._used_submodels: dict[str, set[Optional[SubModelType]]] = {}
+        self._used_submodels_lock = Lock()
+
+    def start(self) -> None:
+        ram_cache = self._services.model_manager.load.ram_cache
+        self._unsubscribe = [ram_cache.on_cache_hit(self._on_model_used), ram_cache.on_cache_miss(self._on_model_used)]
+        self._stop_event.clear()
+        self._thread = Thread(name="model_prefetcher", target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wake_event.set()
+        for unsubscribe in self._unsubscribe:
+            unsubscribe()
+        self._unsubscribe = []
+
+    def request_prefetch(self) -> None:
+        """Wake the prefetch thread to warm the cache for the current set of pending queue items."""
+        self._wake_event.set()
+
+    def prefetch(self) -> int:
+        """Load the models used by the next pending queue items into the RAM cache.
+
+        Returns the number of models that were loaded.
+        """
+        pending = self._services.session_queue.list_queue_items(
+            queue_id=self._queue_id, limit=self._queue_items, priority=0, status="pending"
+        )
+        loaded = 0
+        visited: set[tuple[str, Optional[SubModelType]]] = set()
+        for queue_item in pending.items:
+            for identifier in get_model_identifiers(queue_item.session.graph):
+                for submodel_type in self._get_submodel_types(identifier):
+                    if self._stop_event.is_set():
+                        return loaded
+                    if (identifier.key, submodel_type) in visited:
+                        continue
+                    visited.add((identifier.key, submodel_type))
+                    if self._prefetch_model(identifier, submodel_type):
+                        loaded += 1
+        return loaded
+
+    def _prefetch_model(self, identifier: ModelIdentifierField, submodel_type: Optional[SubModelType]) -> bool:
+        logger = self._services.logger
+        try:
+            config = self._services.model_manager.store.get_model(identifier.key)
+            prefetched = self._services.model_manager.load.prefetch_model(config, submodel_type)
+        except Exception as e:
+            # Nothing is lost if a prefetch fails - the model will be loaded as usual when a node needs it.
+            logger.debug(f"Failed to prefetch model {identifier.name} ({submodel_type}): {e}")
+            return False
+        if prefetched:
+            logger.debug(f"Prefetched model {identifier.name} ({submodel_type})")
+        return prefetched
+
+    def _get_submodel_types(self, identifier: ModelIdentifierField) -> tuple[Optional[SubModelType], ...]:
+        if identifier.submodel_type is not None:
+            return (identifier.submodel_type,)
+        with self._used_submodels_lock:
+            used = self._used_submodels.get(identifier.key)
+            if used:
+                return tuple(sorted(used, key=lambda s: s.value if s else ""))
+        if identifier.type is ModelType.Main:
+            return _MAIN_MODEL_SUBMODELS.get(identifier.base, (SubModelType.Transformer,))
+        if identifier.type in _WHOLE_MODEL_TYPES:
+            return (None,)
+        return ()
+
+    def _on_model_used(self, model_key: str, cache_snapshot: dict[str, CacheEntrySnapshot]) -> None:
+        # Cache keys are `<model_key>` or `<model_key>:<submodel>` - see `get_model_cache_key`.
+        key, _, submodel = model_key.partition(":")
+        try:
+            submodel_type = SubModelType(submodel) if submodel else None
+        except ValueError:
+            return
+        with self._used_submodels_lock:
+            self._used_submodels.setdefault(key, set()).add(submodel_type)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self._wake_event.wait()
+            self._wake_event.clear()
+            if self._stop_event.is_set():
+                break
+            try:
+                loaded = self.prefetch()
+                if loaded:
+                    self._services.logger.info(f"Prefetched {loaded} model(s) for upcoming queue items")
+            except Exception as e:
+                self._services.logger.error(f"Error while prefetching models: {e}")
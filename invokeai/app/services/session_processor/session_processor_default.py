@@ -16,6 +16,7 @@ from invokeai.app.services.events.events_common import (
 )
 from invokeai.app.services.invocation_stats.invocation_stats_common import GESStatsNotFoundError
 from invokeai.app.services.invoker import Invoker
+from invokeai.app.services.session_processor.model_prefetcher import ModelPrefetcher
 from invokeai.app.services.session_processor.session_processor_base import (
     InvocationServices,
     OnAfterRunNode,
@@ -250,7 +251,8 @@ class DefaultSessionRunner(SessionRunnerBase):
     ):
         """Called after a node is run.
 
-        - Emits an invocation complete event.
+        - Emits an invocation complete event once the images the node saved have landed on disk, or fails the queue
+          item if they could not be written.
         - Run any callbacks registered for this event.
         """
 
@@ -258,12 +260,58 @@ class DefaultSessionRunner(SessionRunnerBase):
             f"On after run node: queue item {queue_item.item_id}, session {queue_item.session_id}, node {invocation.id} ({invocation.get_type()})"
         )
 
-        # Send complete event on successful runs
-        self._services.events.emit_invocation_complete(invocation=invocation, queue_item=queue_item, output=output)
+        # Images the node saved may still be being written in the background, and clients fetch them as soon as they
+        # get the complete event. The event is sent once they land, while the session moves on to the next node. The
+        # session's later events are deferred until then, so that clients still get them in order.
+        deferred_events = self._services.events.defer_thread_events()
+
+        def on_image_writes_done(error: Optional[BaseException]) -> None:
+            with deferred_events.send():
+                if error is None:
+                    # Send complete event on successful runs
+                    self._services.events.emit_invocation_complete(
+                        invocation=invocation, queue_item=queue_item, output=output
+                    )
+                else:
+                    self._on_image_write_error(invocation, queue_item, error)
+
+        self._services.image_files.after_thread_writes(on_image_writes_done)
 
         for callback in self._on_after_run_node_callbacks:
             callback(invocation=invocation, queue_item=queue_item, output=output)
 
+    def _on_image_write_error(
+        self, invocation: BaseInvocation, queue_item: SessionQueueItem, error: BaseException
+    ) -> None:
+        """Called when an image saved by a node could not be written. This may run after the session has moved on.
+
+        - Log the error.
+        - Fail the queue item.
+        - Emits an invocation error event.
+        """
+
+        error_type = error.__class__.__name__
+        error_message = str(error)
+        error_traceback = "".join(traceback.format_exception(error))
+        self._services.logger.error(
+            f"Error while writing the images of session {queue_item.session_id}, invocation {invocation.id} ({invocation.get_type()}): {error_message}"
+        )
+
+        try:
+            queue_item = self._services.session_queue.fail_queue_item(
+                queue_item.item_id, error_type, error_message, error_traceback
+            )
+        except SessionQueueItemNotFoundError:
+            return
+
+        self._services.events.emit_invocation_error(
+            queue_item=queue_item,
+            invocation=invocation,
+            error_type=error_type,
+            error_message=error_message,
+            error_traceback=error_traceback,
+        )
+
     def _on_node_error(
         self,
         invocation: BaseInvocation,
@@ -333,6 +381,7 @@ class DefaultSessionProcessor(SessionProcessorBase):
         self._on_non_fatal_processor_error_callbacks = on_non_fatal_processor_error_callbacks or []
         self._thread_limit = thread_limit
         self._polling_interval = polling_interval
+        self._model_prefetcher: Optional[ModelPrefetcher] = None
 
     def start(self, invoker: Invoker) -> None:
         self._invoker: Invoker = invoker
@@ -363,6 +412,16 @@ class DefaultSessionProcessor(SessionProcessorBase):
         )
 
         self.session_runner.start(services=invoker.services, cancel_event=self._cancel_event, profiler=self._profiler)
+
+        prefetch_queue_items = self._invoker.services.configuration.model_prefetch_queue_items
+        self._model_prefetcher = (
+            ModelPrefetcher(services=invoker.services, queue_items=prefetch_queue_items)
+            if prefetch_queue_items > 0
+            else None
+        )
+        if self._model_prefetcher is not None:
+            self._model_prefetcher.start()
+
         self._thread = Thread(
             name="session_processor",
             target=self._process,
@@ -378,6 +437,8 @@ class DefaultSessionProcessor(SessionProcessorBase):
 
     def stop(self, *args, **kwargs) -> None:
         self._stop_event.set()
+        if self._model_prefetcher is not None:
+            self._model_prefetcher.stop()
         # Cancel any in-progress generation so that long-running nodes (e.g. denoising) stop at
         # the next step boundary instead of running to completion. Without this, the generation
         # thread may still be executing CUDA operations when Python teardown begins, which can
@@ -480,6 +541,10 @@ class DefaultSessionProcessor(SessionProcessorBase):
                     )
                     cancel_event.clear()
 
+                    # Load the next items' models from disk while this one runs
+                    if self._model_prefetcher is not None:
+                        self._model_prefetcher.request_prefetch()
+
                     # Run the graph
                     self.workflow_call_queue_lifecycle.run_queue_item(self._queue_item)
 
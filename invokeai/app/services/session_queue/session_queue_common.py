@@ -1,7 +1,7 @@
 import datetime
 import json
 from itertools import chain, product
-from typing import Generator, Literal, Optional, TypeAlias, Union
+from typing import Any, Generator, Literal, Optional, TypeAlias, Union
 
 from pydantic import (
     AliasChoices,
@@ -442,6 +442,48 @@ class IsFullResult(BaseModel):
 # region Util
 
 
+def iter_node_field_values(batch: Batch, maximum: int) -> Generator[list[dict], None, None]:
+    """
+    Given a batch and a maximum number of sessions to create, generate the node-field-values to substitute into the
+    batch's graph for each session, as a list of dicts with node_path, field_name and value keys.
+
+    See `create_session_nfv_tuples()` for how the batch data is expanded into permutations.
+    """
+    data: list[list[tuple[dict]]] = []
+    batch_data_collection = batch.data if batch.data is not None else []
+
+    for batch_datum_list in batch_data_collection:
+        node_field_values_to_zip: list[list[dict]] = []
+        # Expand each BatchDatum into a list of dicts - one for each item in the BatchDatum
+        for batch_datum in batch_datum_list:
+            node_field_values = [
+                # Note: A tuple here is slightly faster than a dict, but we need the object in dict form to be inserted
+                # in the session_queue table anyways. So, overall creating NFVs as dicts is faster.
+                {"node_path": batch_datum.node_path, "field_name": batch_datum.field_name, "value": item}
+                for item in batch_datum.items
+            ]
+            node_field_values_to_zip.append(node_field_values)
+        # Zip the dicts together to create a list of dicts for each permutation
+        data.append(list(zip(*node_field_values_to_zip, strict=True)))  # type: ignore [arg-type]
+
+    count = 0
+
+    # Each batch may have multiple runs, so we need to generate the same number of sessions for each run. The total is
+    # still limited by the maximum number of sessions.
+    for _ in range(batch.runs):
+        for d in product(*data):
+            if count >= maximum:
+                # We've reached the maximum number of sessions we may generate
+                return
+
+            # Flatten the list of lists of dicts into a single list of dicts
+            # TODO(psyche): Is the a more efficient way to do this?
+            yield list(chain.from_iterable(d))
+
+            # Increment the count so we know when to stop
+            count += 1
+
+
 def create_session_nfv_tuples(batch: Batch, maximum: int) -> Generator[tuple[str, str, str], None, None]:
     """
     Given a batch and a maximum number of sessions to create, generate a tuple of session_id, session_json, and
@@ -472,23 +514,6 @@ def create_session_nfv_tuples(batch: Batch, maximum: int) -> Generator[tuple[str
 
     # TODO: Should this be a class method on Batch?
 
-    data: list[list[tuple[dict]]] = []
-    batch_data_collection = batch.data if batch.data is not None else []
-
-    for batch_datum_list in batch_data_collection:
-        node_field_values_to_zip: list[list[dict]] = []
-        # Expand each BatchDatum into a list of dicts - one for each item in the BatchDatum
-        for batch_datum in batch_datum_list:
-            node_field_values = [
-                # Note: A tuple here is slightly faster than a dict, but we need the object in dict form to be inserted
-                # in the session_queue table anyways. So, overall creating NFVs as dicts is faster.
-                {"node_path": batch_datum.node_path, "field_name": batch_datum.field_name, "value": item}
-                for item in batch_datum.items
-            ]
-            node_field_values_to_zip.append(node_field_values)
-        # Zip the dicts together to create a list of dicts for each permutation
-        data.append(list(zip(*node_field_values_to_zip, strict=True)))  # type: ignore [arg-type]
-
     # We serialize the graph and session once, then mutate the graph dict in place for each session.
     #
     # This sounds scary, but it's actually fine.
@@ -533,43 +558,27 @@ def create_session_nfv_tuples(batch: Batch, maximum: int) -> Generator[tuple[str
     session_dict = GraphExecutionState(graph=Graph()).model_dump(warnings=False, exclude_none=True)
 
     # Now we can create a generator that yields the session_id, session_json, and field_values_json for each session.
-    count = 0
+    for flat_node_field_values in iter_node_field_values(batch, maximum):
+        # Need a fresh ID for each session
+        session_id = uuid_string()
 
-    # Each batch may have multiple runs, so we need to generate the same number of sessions for each run. The total is
-    # still limited by the maximum number of sessions.
-    for _ in range(batch.runs):
-        for d in product(*data):
-            if count >= maximum:
-                # We've reached the maximum number of sessions we may generate
-                return
-
-            # Flatten the list of lists of dicts into a single list of dicts
-            # TODO(psyche): Is the a more efficient way to do this?
-            flat_node_field_values = list(chain.from_iterable(d))
-
-            # Need a fresh ID for each session
-            session_id = uuid_string()
+        # Mutate the session dict in place
+        session_dict["id"] = session_id
 
-            # Mutate the session dict in place
-            session_dict["id"] = session_id
+        # Substitute the values into the graph
+        for nfv in flat_node_field_values:
+            graph_as_dict["nodes"][nfv["node_path"]][nfv["field_name"]] = nfv["value"]
 
-            # Substitute the values into the graph
-            for nfv in flat_node_field_values:
-                graph_as_dict["nodes"][nfv["node_path"]][nfv["field_name"]] = nfv["value"]
+        # Mutate the session dict in place
+        session_dict["graph"] = graph_as_dict
 
-            # Mutate the session dict in place
-            session_dict["graph"] = graph_as_dict
+        # Serialize the session and field values
+        # Note the use of pydantic's to_jsonable_python to handle serialization of any python object, including sets.
+        session_json = json.dumps(session_dict, default=to_jsonable_python)
+        field_values_json = json.dumps(flat_node_field_values, default=to_jsonable_python)
 
-            # Serialize the session and field values
-            # Note the use of pydantic's to_jsonable_python to handle serialization of any python object, including sets.
-            session_json = json.dumps(session_dict, default=to_jsonable_python)
-            field_values_json = json.dumps(flat_node_field_values, default=to_jsonable_python)
-
-            # Yield the session_id, session_json, and field_values_json
-            yield (session_id, session_json, field_values_json)
-
-            # Increment the count so we know when to stop
-            count += 1
+        # Yield the session_id, session_json, and field_values_json
+        yield (session_id, session_json, field_values_json)
 
 
 def calc_session_count(batch: Batch) -> int:
@@ -609,6 +618,138 @@ ValueToInsertTuple: TypeAlias = tuple[
 """
 
 
+def iter_values_to_insert(
+    queue_id: str, batch: Batch, priority: int, max_new_queue_items: int, user_id: str = "system"
+) -> Generator[ValueToInsertTuple, None, None]:
+    """
+    Given a batch, lazily yield the values to insert into the session queue table, one queue item at a time. Sessions
+    are only serialized as they are consumed, so a large batch can be inserted in chunks without holding all of its
+    sessions in memory.
+
+    Args:
+        queue_id: The ID of the queue to insert the items into
+        batch: The batch to prepare the values for
+        priority: The priority of the queue items
+        max_new_queue_items: The maximum number of queue items to insert
+        user_id: The user ID who is creating these queue items
+
+    Yields:
+        A tuple to insert into the session queue table. See `prepare_values_to_insert` for its values.
+    """
+
+    # A tuple is a fast and memory-efficient way to store the values to insert. Previously, we used a NamedTuple, but
+    # measured a ~5% performance improvement by using a normal tuple instead. For very large batches (10k+ items), the
+    # this difference becomes noticeable.
+    #
+    # So, despite the inferior DX with normal tuples, we use one here for performance reasons.
+
+    # pydantic's to_jsonable_python handles serialization of any python object, including sets, which json.dumps does
+    # not support by default. Apparently there are sets somewhere in the graph.
+
+    # The same workflow is used for all sessions in the batch - serialize it once
+    workflow_json = json.dumps(batch.workflow, default=to_jsonable_python) if batch.workflow else None
+
+    for session_id, session_json, field_values_json in create_session_nfv_tuples(batch, max_new_queue_items):
+        yield (
+            queue_id,
+            session_json,
+            session_id,
+            batch.batch_id,
+            field_values_json,
+            priority,
+            workflow_json,
+            batch.origin,
+            batch.destination,
+            None,
+            user_id,
+        )
+
+
+TEMPLATED_SESSION = ""
+"""Sentinel stored in a queue item's session column when its session is built from the batch's session template."""
+
+
+def create_batch_template(batch: Batch) -> tuple[str, Optional[str]]:
+    """
+    Given a batch, serialize the session and workflow shared by all of its queue items. The session template has the
+    batch's graph with no field values substituted and an empty ID. Each queue item stores only its session ID and
+    field values, and its session is rebuilt with `build_session_from_template()`.
+
+    Args:
+        batch: The batch to create the template for
+
+    Returns:
+        A tuple of the session template (as stringified JSON) and the workflow (optional, as stringified JSON)
+    """
+    session_dict = GraphExecutionState(graph=Graph()).model_dump(warnings=False, exclude_none=True)
+    session_dict["id"] = TEMPLATED_SESSION
+    session_dict["graph"] = batch.graph.model_dump(warnings=False, exclude_none=True)
+    session_json = json.dumps(session_dict, default=to_jsonable_python)
+    workflow_json = json.dumps(batch.workflow, default=to_jsonable_python) if batch.workflow else None
+    return session_json, workflow_json
+
+
+def build_session_from_template(
+    session_template: Union[str, dict[str, Any]], session_id: str, field_values: Optional[str]
+) -> str:
+    """
+    Rebuild a queue item's session from its batch's session template.
+
+    Args:
+        session_template: The batch's session template (as stringified JSON, or already parsed). A parsed template is
+            not modified, so it can be reused for all of the batch's queue items.
+        session_id: The queue item's session ID
+        field_values: The queue item's field values (optional, as stringified JSON)
+
+    Returns:
+        The queue item's session (as stringified JSON)
+    """
+    template: dict[str, Any] = json.loads(session_template) if isinstance(session_template, str) else session_template
+    graph: dict[str, Any] = template["graph"]
+    graph_nodes: dict[str, dict[str, Any]] = dict(graph["nodes"])
+    for nfv in json.loads(field_values) if field_values is not None else []:
+        # Copy each node before substituting its field values, leaving the template's node as it was
+        node = graph_nodes[nfv["node_path"]] = dict(graph_nodes[nfv["node_path"]])
+        node[nfv["field_name"]] = nfv["value"]
+    return json.dumps({**template, "id": session_id, "graph": {**graph, "nodes": graph_nodes}})
+
+
+def iter_templated_values_to_insert(
+    queue_id: str, batch: Batch, priority: int, max_new_queue_items: int, user_id: str = "system"
+) -> Generator[ValueToInsertTuple, None, None]:
+    """
+    Given a batch, lazily yield the values to insert into the session queue table for queue items whose sessions are
+    built from the batch's session template. See `create_batch_template()` for the template.
+
+    The values are the same as those yielded by `iter_values_to_insert()`, except that the session is always
+    `TEMPLATED_SESSION` and the workflow is always None. Both are stored once for the batch instead.
+
+    Args:
+        queue_id: The ID of the queue to insert the items into
+        batch: The batch to prepare the values for
+        priority: The priority of the queue items
+        max_new_queue_items: The maximum number of queue items to insert
+        user_id: The user ID who is creating these queue items
+
+    Yields:
+        A tuple to insert into the session queue table. See `prepare_values_to_insert` for its values.
+    """
+    for flat_node_field_values in iter_node_field_values(batch, max_new_queue_items):
+        yield (
+            queue_id,
+            TEMPLATED_SESSION,
+            uuid_string(),
+            batch.batch_id,
+            json.dumps(flat_node_field_values, default=to_jsonable_python),
+            priority,
+            None,
+            batch.origin,
+            batch.destination,
+            None,
+            user_id,
+        )
+
+
 def prepare_values_to_insert(
     queue_id: str, batch: Batch, priority: int, max_new_queue_items: int, user_id: str = "system"
 ) -> list[ValueToInsertTuple]:
@@ -637,38 +778,7 @@ def prepare_values_to_insert(
         - retried_from_item_id (optional, this is always None for new items)
         - user_id
     """
-
-    # A tuple is a fast and memory-efficient way to store the values to insert. Previously, we used a NamedTuple, but
-    # measured a ~5% performance improvement by using a normal tuple instead. For very large batches (10k+ items), the
-    # this difference becomes noticeable.
-    #
-    # So, despite the inferior DX with normal tuples, we use one here for performance reasons.
-
-    values_to_insert: list[ValueToInsertTuple] = []
-
-    # pydantic's to_jsonable_python handles serialization of any python object, including sets, which json.dumps does
-    # not support by default. Apparently there are sets somewhere in the graph.
-
-    # The same workflow is used for all sessions in the batch - serialize it once
-    workflow_json = json.dumps(batch.workflow, default=to_jsonable_python) if batch.workflow else None
-
-    for session_id, session_json, field_values_json in create_session_nfv_tuples(batch, max_new_queue_items):
-        values_to_insert.append(
-            (
-                queue_id,
-                session_json,
-                session_id,
-                batch.batch_id,
-                field_values_json,
-                priority,
-                workflow_json,
-                batch.origin,
-                batch.destination,
-                None,
-                user_id,
-            )
-        )
-    return values_to_insert
+    return list(iter_values_to_insert(queue_id, batch, priority, max_new_queue_items, user_id))
 
 
 # endregion Util
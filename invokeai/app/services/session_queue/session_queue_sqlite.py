@@ -1,7 +1,10 @@
 import asyncio
 import json
 import sqlite3
-from collections.abc import Sequence
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator, Sequence
+from itertools import islice
 from typing import Any, Optional, Union, cast
 
 from pydantic_core import to_jsonable_python
@@ -11,6 +14,7 @@ from invokeai.app.services.session_queue.session_queue_base import SessionQueueB
 from invokeai.app.services.session_queue.session_queue_common import (
     DEFAULT_QUEUE_ID,
     QUEUE_ITEM_STATUS,
+    TEMPLATED_SESSION,
     Batch,
     BatchStatus,
     CancelAllExceptCurrentResult,
@@ -33,14 +37,24 @@ from invokeai.app.services.session_queue.session_queue_common import (
     SessionQueueStatus,
     TooManySessionsError,
     ValueToInsertTuple,
+    build_session_from_template,
     calc_session_count,
-    prepare_values_to_insert,
+    create_batch_template,
+    iter_templated_values_to_insert,
 )
 from invokeai.app.services.shared.graph import GraphExecutionState
 from invokeai.app.services.shared.pagination import CursorPaginatedResults
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
 
+# Batches are expanded and inserted in chunks of this many queue items. A large batch never holds all of its serialized
+# sessions in memory, and its first items can be dequeued while the rest are still being written.
+ENQUEUE_CHUNK_SIZE = 500
+
+# The session templates of the most recently read batches are cached, parsed, so that reading a batch's queue items one
+# after another doesn't load and parse its template for every item.
+BATCH_TEMPLATE_CACHE_SIZE = 16
+
 # Round-robin dequeue (multiuser fairness): pick the next pending item from the user who was
 # least-recently served.
 #
@@ -126,6 +140,8 @@ class SqliteSessionQueue(SessionQueueBase):
     def __init__(self, db: SqliteDatabase) -> None:
         super().__init__()
         self._db = db
+        self._batch_templates: OrderedDict[str, tuple[dict[str, Any], Optional[str]]] = OrderedDict()
+        self._batch_templates_lock = threading.Lock()
 
     def _set_in_progress_to_canceled(self) -> None:
         """
@@ -212,7 +228,7 @@ class SqliteSessionQueue(SessionQueueBase):
 
     def _get_current_queue_size(self, queue_id: str) -> int:
         """Gets the current number of pending queue items"""
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT count(*)
@@ -228,7 +244,7 @@ class SqliteSessionQueue(SessionQueueBase):
 
     def _get_highest_priority(self, queue_id: str) -> int:
         """Gets the highest priority value in the queue"""
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT MAX(priority)
@@ -257,44 +273,158 @@ class SqliteSessionQueue(SessionQueueBase):
             calc_session_count,
             batch=batch,
         )
-        values_to_insert = await asyncio.to_thread(
-            prepare_values_to_insert,
+        # The session and workflow are stored once for the batch, and each queue item only stores its field values
+        batch_template = await asyncio.to_thread(create_batch_template, batch)
+        values_to_insert = iter_templated_values_to_insert(
             queue_id=queue_id,
             batch=batch,
             priority=priority,
             max_new_queue_items=max_new_queue_items,
             user_id=user_id,
         )
-        enqueued_count = len(values_to_insert)
 
+        # Each chunk is committed on its own, and announced with a batch enqueued event so that the processor can start
+        # on it. The events report the running totals; the last one is the same as the returned result.
+        item_ids: list[int] = []
+        enqueue_result: Optional[EnqueueBatchResult] = None
+        rolled_back = threading.Event()
+        try:
+            while chunk_item_ids := await asyncio.to_thread(
+                self._insert_chunk, batch.batch_id, batch_template, values_to_insert, rolled_back
+            ):
+                item_ids = chunk_item_ids + item_ids
+                enqueue_result = EnqueueBatchResult(
+                    queue_id=queue_id,
+                    requested=requested_count,
+                    enqueued=len(item_ids),
+                    batch=batch,
+                    priority=priority,
+                    item_ids=item_ids,
+                )
+                self.__invoker.services.events.emit_batch_enqueued(enqueue_result, user_id=user_id)
+        except BaseException:
+            # Don't leave a partially enqueued batch behind, including when the request is cancelled. A cancelled
+            # request leaves its chunk's thread running, so stop it from inserting more items before deleting them.
+            # Items that were already dequeued are left alone.
+            rolled_back.set()
+            self._delete_pending_batch_items(queue_id, batch.batch_id)
+            raise
+
+        if enqueue_result is None:
+            enqueue_result = EnqueueBatchResult(
+                queue_id=queue_id,
+                requested=requested_count,
+                enqueued=0,
+                batch=batch,
+                priority=priority,
+                item_ids=[],
+            )
+            self.__invoker.services.events.emit_batch_enqueued(enqueue_result, user_id=user_id)
+        return enqueue_result
+
+    def _insert_chunk(
+        self,
+        batch_id: str,
+        batch_template: tuple[str, Optional[str]],
+        values_to_insert: Iterator[ValueToInsertTuple],
+        rolled_back: threading.Event,
+    ) -> list[int]:
+        """Inserts the next chunk of queue items, returning their IDs in descending order, or an empty list when done."""
+        chunk = list(islice(values_to_insert, ENQUEUE_CHUNK_SIZE))
+        if not chunk:
+            return []
         with self._db.transaction() as cursor:
+            # Checked in the transaction, so that the chunk is either inserted before the rollback or not at all
+            if rolled_back.is_set():
+                return []
+            # The template is inserted with the first chunk. It is deleted by a trigger along with the batch's last item.
+            cursor.execute(
+                """--sql
+                    INSERT OR IGNORE INTO session_queue_batches (batch_id, session, workflow)
+                    VALUES (?, ?, ?);
+                    """,
+                (batch_id, *batch_template),
+            )
             cursor.executemany(
                 """--sql
                     INSERT INTO session_queue (queue_id, session, session_id, batch_id, field_values, priority, workflow, origin, destination, retried_from_item_id, user_id)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                     """,
-                values_to_insert,
+                chunk,
             )
+            # The chunk was inserted in this transaction, so its items are the newest of the batch
             cursor.execute(
                 """--sql
                     SELECT item_id
                     FROM session_queue
                     WHERE batch_id = ?
-                    ORDER BY item_id DESC;
+                    ORDER BY item_id DESC
+                    LIMIT ?;
                     """,
-                (batch.batch_id,),
+                (batch_id, len(chunk)),
             )
-            item_ids = [row[0] for row in cursor.fetchall()]
-        enqueue_result = EnqueueBatchResult(
-            queue_id=queue_id,
-            requested=requested_count,
-            enqueued=enqueued_count,
-            batch=batch,
-            priority=priority,
-            item_ids=item_ids,
+            return [row[0] for row in cursor.fetchall()]
+
+    def _get_batch_template(self, cursor: sqlite3.Cursor, batch_id: str) -> tuple[dict[str, Any], Optional[str]]:
+        """Gets the parsed session template and the stringified workflow of a batch.
+
+        The template is read with the caller's cursor, in the same transaction as the queue item rows. A batch's
+        template is deleted along with its last queue item, so reading it in a later transaction could miss it.
+        """
+        with self._batch_templates_lock:
+            batch_template = self._batch_templates.get(batch_id)
+            if batch_template is not None:
+                self._batch_templates.move_to_end(batch_id)
+                return batch_template
+
+        cursor.execute(
+            """--sql
+            SELECT session, workflow
+            FROM session_queue_batches
+            WHERE batch_id = ?
+            """,
+            (batch_id,),
         )
-        self.__invoker.services.events.emit_batch_enqueued(enqueue_result, user_id=user_id)
-        return enqueue_result
+        result = cast(Union[sqlite3.Row, None], cursor.fetchone())
+        if result is None:
+            raise SessionQueueItemNotFoundError(f"No session template for batch {batch_id}")
+        batch_template = (json.loads(result[0]), result[1])
+
+        with self._batch_templates_lock:
+            self._batch_templates[batch_id] = batch_template
+            if len(self._batch_templates) > BATCH_TEMPLATE_CACHE_SIZE:
+                self._batch_templates.popitem(last=False)
+        return batch_template
+
+    def _queue_item_from_row(self, cursor: sqlite3.Cursor, row: sqlite3.Row) -> SessionQueueItem:
+        """Builds a queue item from a session_queue row, rebuilding its session from its batch's template if needed.
+
+        Must be called with the cursor of the transaction that read the row.
+        """
+        queue_item_dict = dict(row)
+        if queue_item_dict["session"] == TEMPLATED_SESSION:
+            session_template, workflow = self._get_batch_template(cursor, queue_item_dict["batch_id"])
+            queue_item_dict["session"] = build_session_from_template(
+                session_template, queue_item_dict["session_id"], queue_item_dict["field_values"]
+            )
+            queue_item_dict["workflow"] = workflow
+        return SessionQueueItem.queue_item_from_dict(queue_item_dict)
+
+    def _delete_pending_batch_items(self, queue_id: str, batch_id: str) -> None:
+        with self._db.transaction() as cursor:
+            where = """--sql
+                WHERE batch_id = ? AND status = 'pending'
+                """
+            deleted_item_ids_by_user = self._collect_item_ids_by_user(cursor, where, [batch_id])
+            cursor.execute(
+                f"""--sql
+                DELETE FROM session_queue
+                {where};
+                """,
+                (batch_id,),
+            )
+        # The items were announced by batch enqueued events, so the processor and clients must be told they are gone
+        self._emit_queue_items_canceled(queue_id, deleted_item_ids_by_user)
 
     def dequeue(self) -> Optional[SessionQueueItem]:
         config = self.__invoker.services.configuration
@@ -305,14 +435,14 @@ class SqliteSessionQueue(SessionQueueBase):
         with self._db.transaction() as cursor:
             cursor.execute(query)
             result = cast(Union[sqlite3.Row, None], cursor.fetchone())
-        if result is None:
-            return None
-        queue_item = SessionQueueItem.queue_item_from_dict(dict(result))
+            if result is None:
+                return None
+            queue_item = self._queue_item_from_row(cursor, result)
         queue_item = self._set_queue_item_status(item_id=queue_item.item_id, status="in_progress")
         return queue_item
 
     def get_next(self, queue_id: str) -> Optional[SessionQueueItem]:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT
@@ -332,12 +462,12 @@ class SqliteSessionQueue(SessionQueueBase):
                 (queue_id,),
             )
             result = cast(Union[sqlite3.Row, None], cursor.fetchone())
-        if result is None:
-            return None
-        return SessionQueueItem.queue_item_from_dict(dict(result))
+            if result is None:
+                return None
+            return self._queue_item_from_row(cursor, result)
 
     def get_current(self, queue_id: str) -> Optional[SessionQueueItem]:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT
@@ -354,9 +484,9 @@ class SqliteSessionQueue(SessionQueueBase):
                 (queue_id,),
             )
             result = cast(Union[sqlite3.Row, None], cursor.fetchone())
-        if result is None:
-            return None
-        return SessionQueueItem.queue_item_from_dict(dict(result))
+            if result is None:
+                return None
+            return self._queue_item_from_row(cursor, result)
 
     def _set_queue_item_status(
         self,
@@ -411,7 +541,7 @@ class SqliteSessionQueue(SessionQueueBase):
         return queue_item
 
     def _get_workflow_call_child_ids(self, item_id: int) -> list[int]:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT item_id
@@ -456,7 +586,7 @@ class SqliteSessionQueue(SessionQueueBase):
         if current_queue_item is not None:
             return set(self._get_workflow_call_chain_item_ids(current_queue_item.item_id))
 
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT child.item_id
@@ -477,7 +607,7 @@ class SqliteSessionQueue(SessionQueueBase):
         return set(self._get_workflow_call_chain_item_ids(cast(int, row[0])))
 
     def is_empty(self, queue_id: str) -> IsEmptyResult:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT count(*)
@@ -490,7 +620,7 @@ class SqliteSessionQueue(SessionQueueBase):
         return IsEmptyResult(is_empty=is_empty)
 
     def is_full(self, queue_id: str) -> IsFullResult:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT count(*)
@@ -895,7 +1025,7 @@ class SqliteSessionQueue(SessionQueueBase):
         return CancelAllExceptCurrentResult(canceled=count)
 
     def get_queue_item(self, item_id: int) -> SessionQueueItem:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             cursor.execute(
                 """--sql
                 SELECT
@@ -909,9 +1039,9 @@ class SqliteSessionQueue(SessionQueueBase):
                 (item_id,),
             )
             result = cast(Union[sqlite3.Row, None], cursor.fetchone())
-        if result is None:
-            raise SessionQueueItemNotFoundError(f"No queue item with id {item_id}")
-        return SessionQueueItem.queue_item_from_dict(dict(result))
+            if result is None:
+                raise SessionQueueItemNotFoundError(f"No queue item with id {item_id}")
+            return self._queue_item_from_row(cursor, result)
 
     def set_queue_item_session(self, item_id: int, session: GraphExecutionState) -> SessionQueueItem:
         with self._db.transaction() as cursor:
@@ -919,13 +1049,21 @@ class SqliteSessionQueue(SessionQueueBase):
             # when the graph is loaded. Graph execution occurs purely in memory - the session saved here is not referenced
             # during execution.
             session_json = session.model_dump_json(warnings=False, exclude_none=True)
+            # An item whose session was built from its batch's template gets its own copy of the batch's workflow too
             cursor.execute(
                 """--sql
                 UPDATE session_queue
-                SET session = ?
+                SET
+                    session = ?,
+                    workflow = CASE
+                        WHEN session = ? THEN (
+                            SELECT workflow FROM session_queue_batches WHERE batch_id = session_queue.batch_id
+                        )
+                        ELSE workflow
+                    END
                 WHERE item_id = ?
                 """,
-                (session_json, item_id),
+                (session_json, TEMPLATED_SESSION, item_id),
             )
         return self.get_queue_item(item_id)
 
@@ -1050,43 +1188,48 @@ class SqliteSessionQueue(SessionQueueBase):
         status: Optional[QUEUE_ITEM_STATUS] = None,
         destination: Optional[str] = None,
     ) -> CursorPaginatedResults[SessionQueueItem]:
-        with self._db.transaction() as cursor_:
+        with self._db.read_transaction() as cursor_:
             item_id = cursor
             query = """--sql
-                SELECT *
-                FROM session_queue
-                WHERE queue_id = ?
+                SELECT
+                    sq.*,
+                    u.display_name as user_display_name,
+                    u.email as user_email
+                FROM session_queue sq
+                LEFT JOIN users u ON sq.user_id = u.user_id
+                WHERE sq.queue_id = ?
             """
             params: list[Union[str, int]] = [queue_id]
 
             if status is not None:
                 query += """--sql
-                    AND status = ?
+                    AND sq.status = ?
                     """
                 params.append(status)
 
             if destination is not None:
                 query += """---sql
-                    AND destination = ?
+                    AND sq.destination = ?
                 """
                 params.append(destination)
 
+            # Seek past the last item of the previous page, which is served by the (queue_id, priority, item_id) index
             if item_id is not None:
                 query += """--sql
-                    AND (priority < ?) OR (priority = ? AND item_id > ?)
+                    AND ((sq.priority < ?) OR (sq.priority = ? AND sq.item_id > ?))
                     """
                 params.extend([priority, priority, item_id])
 
             query += """--sql
                 ORDER BY
-                    priority DESC,
-                    item_id ASC
+                    sq.priority DESC,
+                    sq.item_id ASC
                 LIMIT ?
                 """
             params.append(limit + 1)
             cursor_.execute(query, params)
             results = cast(list[sqlite3.Row], cursor_.fetchall())
-        items = [SessionQueueItem.queue_item_from_dict(dict(result)) for result in results]
+            items = [self._queue_item_from_row(cursor_, result) for result in results]
         has_more = False
         if len(items) > limit:
             # remove the extra item
@@ -1100,7 +1243,7 @@ class SqliteSessionQueue(SessionQueueBase):
         destination: Optional[str] = None,
     ) -> list[SessionQueueItem]:
         """Gets all queue items that match the given parameters"""
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             query = """--sql
                 SELECT
                     sq.*,
@@ -1126,7 +1269,7 @@ class SqliteSessionQueue(SessionQueueBase):
                 """
             cursor.execute(query, params)
             results = cast(list[sqlite3.Row], cursor.fetchall())
-        items = [SessionQueueItem.queue_item_from_dict(dict(result)) for result in results]
+            items = [self._queue_item_from_row(cursor, result) for result in results]
         return items
 
     def get_queue_item_ids(
@@ -1135,7 +1278,7 @@ class SqliteSessionQueue(SessionQueueBase):
         order_dir: SQLiteDirection = SQLiteDirection.Descending,
         user_id: Optional[str] = None,
     ) -> ItemIdsResult:
-        with self._db.transaction() as cursor_:
+        with self._db.read_transaction() as cursor_:
             query = """--sql
                 SELECT item_id
                 FROM session_queue
@@ -1162,7 +1305,7 @@ class SqliteSessionQueue(SessionQueueBase):
         acting_user_id: Optional[str] = None,
         is_admin: bool = False,
     ) -> SessionQueueStatus:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             # Aggregate counts are always global (across all users). This lets a non-admin's
             # badge show "own / total" — their share of the whole queue — and lets the queue
             # list surface (redacted) entries belonging to other users.
@@ -1234,7 +1377,7 @@ class SqliteSessionQueue(SessionQueueBase):
         )
 
     def get_batch_status(self, queue_id: str, batch_id: str, user_id: Optional[str] = None) -> BatchStatus:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             query = """--sql
                 SELECT status, count(*), origin, destination
                 FROM session_queue
@@ -1269,7 +1412,7 @@ class SqliteSessionQueue(SessionQueueBase):
     def get_counts_by_destination(
         self, queue_id: str, destination: str, user_id: Optional[str] = None
     ) -> SessionQueueCountsByDestination:
-        with self._db.transaction() as cursor:
+        with self._db.read_transaction() as cursor:
             query = """--sql
                 SELECT status, count(*)
                 FROM session_queue
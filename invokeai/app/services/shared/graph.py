@@ -1,10 +1,11 @@
 # Copyright (c) 2022 Kyle Schouviller (https://github.com/kyle0654)
 
 import copy
+import heapq
 import itertools
-from collections import deque
+from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Any, Deque, Iterable, Literal, Optional, Type, TypeVar, Union, get_args, get_origin
+from typing import Any, Container, Deque, Iterable, Literal, Optional, Type, TypeVar, Union, get_args, get_origin
 
 import networkx as nx
 from pydantic import (
@@ -178,6 +179,189 @@ class _PreparedExecRegistry:
         self.get_metadata(exec_node_id).iteration_path = iteration_path
 
 
+class _SourceGraphIndex:
+    """Precomputed topology of the source graph, and incremental tracking of which source nodes can be materialized.
+
+    A source node can be materialized once none of its upstream iterators are pending, and an iterator additionally
+    waits for all of its parents. Each source node counts the nodes it is still waiting on. When a source node
+    finishes executing, the counts of the nodes waiting on it are decremented, and nodes that reach zero are pushed to
+    a heap ordered by topological position. This way the materializer does not re-sort the graph or search ancestors
+    on every call.
+
+    The index is derived from the source graph and rebuilt if the graph changes.
+    """
+
+    def __init__(self, graph: "Graph", prepared: Container[str], executed: Container[str]) -> None:
+        nx_graph = graph.nx_graph_flat()
+        self.nx_graph = nx_graph
+        self.output_edges: dict[str, list[Edge]] = defaultdict(list)
+        for edge in graph.edges:
+            self.output_edges[edge.source.node_id].append(edge)
+        self._node_count = len(graph.nodes)
+        self._edge_count = len(graph.edges)
+        self._prepared = prepared
+
+        topological_order: list[str] = list(nx.topological_sort(nx_graph))
+        self._topological_order = topological_order
+        self._topological_index = {node_id: i for i, node_id in enumerate(topological_order)}
+        self.parents: dict[str, list[str]] = {node_id: list(nx_graph.predecessors(node_id)) for node_id in nx_graph}
+        iterators = {node_id for node_id, node in graph.nodes.items() if isinstance(node, IterateInvocation)}
+
+        # All iterators upstream of each node, including through collectors
+        self._upstream_iterators: dict[str, set[str]] = {}
+        for node_id in topological_order:
+            upstream: set[str] = set()
+            for parent_id in self.parents[node_id]:
+                upstream.update(self._upstream_iterators[parent_id])
+                if parent_id in iterators:
+                    upstream.add(parent_id)
+            self._upstream_iterators[node_id] = upstream
+
+        # The iterators a node is expanded for. Collectors end iterations, so their inputs are not followed.
+        iterator_graph = nx_graph.copy()
+        for node_id, node in graph.nodes.items():
+            if isinstance(node, CollectInvocation):
+                iterator_graph.remove_edges_from(list(iterator_graph.in_edges(node_id)))
+        iterator_topological_index = {node_id: i for i, node_id in enumerate(nx.topological_sort(iterator_graph))}
+        node_iterators: dict[str, set[str]] = {}
+        for node_id in topological_order:
+            active: set[str] = set()
+            for parent_id in iterator_graph.predecessors(node_id):
+                active.update(node_iterators[parent_id])
+                if parent_id in iterators:
+                    active.add(parent_id)
+            node_iterators[node_id] = active
+        self._node_iterators = {
+            node_id: sorted(active, key=iterator_topological_index.__getitem__)
+            for node_id, active in node_iterators.items()
+        }
+
+        self._dependents: dict[str, list[str]] = defaultdict(list)
+        self._pending_count: dict[str, int] = {}
+        for node_id in topological_order:
+            waiting_on = list(self._upstream_iterators[node_id])
+            if node_id in iterators:
+                waiting_on.extend(self.parents[node_id])
+            for waiting_on_id in waiting_on:
+                self._dependents[waiting_on_id].append(node_id)
+            self._pending_count[node_id] = sum(1 for waiting_on_id in waiting_on if waiting_on_id not in executed)
+        self._released = {node_id for node_id in topological_order if node_id in executed}
+        self._ready = [
+            self._topological_index[node_id]
+            for node_id in topological_order
+            if self._pending_count[node_id] == 0 and node_id not in prepared
+        ]
+        heapq.heapify(self._ready)
+
+        # Filled in lazily by the If scheduler: the source If nodes whose exclusive branches contain each node
+        self.branch_if_ids: Optional[dict[str, list[str]]] = None
+
+    def is_stale(self, graph: "Graph") -> bool:
+        return len(graph.nodes) != self._node_count or len(graph.edges) != self._edge_count
+
+    def next_node_to_prepare(self) -> Optional[str]:
+        """Returns the first source node, in topological order, that is unprepared and not waiting on any node."""
+        while self._ready:
+            node_id = self._topological_order[self._ready[0]]
+            if node_id not in self._prepared:
+                return node_id
+            heapq.heappop(self._ready)
+        return None
+
+    def source_node_executed(self, node_id: str) -> None:
+        if node_id in self._released:
+            return
+        self._released.add(node_id)
+        for dependent_id in self._dependents.get(node_id, []):
+            self._pending_count[dependent_id] -= 1
+            if self._pending_count[dependent_id] == 0 and dependent_id not in self._prepared:
+                heapq.heappush(self._ready, self._topological_index[dependent_id])
+
+    def get_node_iterators(self, node_id: str) -> list[str]:
+        """Returns the iterators that a node is expanded for, outermost first."""
+        return self._node_iterators[node_id]
+
+    def is_downstream_of_iterator(self, node_id: str, iterator_id: str) -> bool:
+        return node_id == iterator_id or iterator_id in self._upstream_iterators[node_id]
+
+
+class _ExecutionGraphIndex:
+    """Edge adjacency and iterator ancestry for the execution graph.
+
+    The execution graph only grows by adding materialized nodes with their input edges, and only shrinks when an `If`
+    prunes its unselected input. Both are applied to this index as they happen, so looking up a node's edges, or
+    which iterator exec node it descends from, does not scan the edge list or search the graph.
+    """
+
+    def __init__(self, execution_graph: "Graph") -> None:
+        self._input_edges: dict[str, list[Edge]] = defaultdict(list)
+        self._output_edges: dict[str, list[Edge]] = defaultdict(list)
+        self._iterator_ancestors: dict[str, frozenset[str]] = {}
+        self._iterators: set[str] = set()
+        self._creation_index: dict[str, int] = {}
+
+        for node in execution_graph.nodes.values():
+            self.add_node(node)
+        for edge in execution_graph.edges:
+            self._input_edges[edge.destination.node_id].append(edge)
+            self._output_edges[edge.source.node_id].append(edge)
+        for node_id in nx.topological_sort(execution_graph.nx_graph_flat()):
+            self._update_iterator_ancestors(node_id)
+
+    def add_node(self, node: BaseInvocation) -> None:
+        if node.id in self._creation_index:
+            return
+        self._creation_index[node.id] = len(self._creation_index)
+        self._iterator_ancestors[node.id] = frozenset()
+        if isinstance(node, IterateInvocation):
+            self._iterators.add(node.id)
+
+    def add_edge(self, edge: Edge) -> None:
+        self._input_edges[edge.destination.node_id].append(edge)
+        self._output_edges[edge.source.node_id].append(edge)
+        self._refresh_iterator_ancestors(edge.destination.node_id)
+
+    def delete_edge(self, edge: Edge) -> None:
+        self._input_edges[edge.destination.node_id].remove(edge)
+        self._output_edges[edge.source.node_id].remove(edge)
+        self._refresh_iterator_ancestors(edge.destination.node_id)
+
+    def get_input_edges(self, node_id: str, field: Optional[str] = None) -> list[Edge]:
+        edges = self._input_edges.get(node_id, [])
+        return [e for e in edges if field is None or e.destination.field == field]
+
+    def get_output_edges(self, node_id: str) -> list[Edge]:
+        return list(self._output_edges.get(node_id, []))
+
+    def get_creation_index(self, node_id: str) -> int:
+        return self._creation_index[node_id]
+
+    def descends_from_iterator(self, node_id: str, iterator_exec_id: str) -> bool:
+        """Equivalent to `nx.has_path(execution_graph, iterator_exec_id, node_id)` for an iterator exec node."""
+        return node_id == iterator_exec_id or iterator_exec_id in self._iterator_ancestors.get(node_id, ())
+
+    def _update_iterator_ancestors(self, node_id: str) -> None:
+        ancestors: set[str] = set()
+        for edge in self._input_edges.get(node_id, []):
+            parent_id = edge.source.node_id
+            ancestors.update(self._iterator_ancestors.get(parent_id, ()))
+            if parent_id in self._iterators:
+                ancestors.add(parent_id)
+        self._iterator_ancestors[node_id] = frozenset(ancestors)
+
+    def _refresh_iterator_ancestors(self, node_id: str) -> None:
+        affected = {node_id}
+        pending = [node_id]
+        while pending:
+            for edge in self._output_edges.get(pending.pop(), []):
+                if edge.destination.node_id not in affected:
+                    affected.add(edge.destination.node_id)
+                    pending.append(edge.destination.node_id)
+        # Nodes are always created after their parents, so creation order is a topological order
+        for affected_id in sorted(affected, key=lambda n: self._creation_index.get(n, -1)):
+            self._update_iterator_ancestors(affected_id)
+
+
 class _IfBranchScheduler:
     """Applies lazy `If` semantics by deferring, releasing, and skipping branch-local exec nodes."""
 
@@ -189,15 +373,14 @@ class _IfBranchScheduler:
 
     def _expand_with_ancestors(self, node_ids: set[str]) -> set[str]:
         expanded = set(node_ids)
-        source_graph = self._state.graph.nx_graph_flat()
+        source_graph = self._state._source_index().nx_graph
         for node_id in list(expanded):
             expanded.update(nx.ancestors(source_graph, node_id))
         return expanded
 
     def _node_outputs_stay_in_branch(
-        self, node_id: str, if_node_id: str, branch_field: str, branch_nodes: set[str]
+        self, output_edges: list[Edge], if_node_id: str, branch_field: str, branch_nodes: set[str]
     ) -> bool:
-        output_edges = self._state.graph._get_output_edges(node_id)
         return all(
             edge.destination.node_id in branch_nodes
             or (edge.destination.node_id == if_node_id and edge.destination.field == branch_field)
@@ -207,12 +390,15 @@ class _IfBranchScheduler:
     def _prune_nonexclusive_branch_nodes(
         self, if_node_id: str, branch_field: str, candidate_nodes: set[str]
     ) -> set[str]:
+        output_edges = self._state._source_index().output_edges
         exclusive_nodes = set(candidate_nodes)
         changed = True
         while changed:
             changed = False
             for node_id in list(exclusive_nodes):
-                if self._node_outputs_stay_in_branch(node_id, if_node_id, branch_field, exclusive_nodes):
+                if self._node_outputs_stay_in_branch(
+                    output_edges.get(node_id, []), if_node_id, branch_field, exclusive_nodes
+                ):
                     continue
                 exclusive_nodes.remove(node_id)
                 changed = True
@@ -237,12 +423,12 @@ class _IfBranchScheduler:
         return selected_field, unselected_field
 
     def _prune_unselected_if_inputs(self, exec_node_id: str, unselected_field: str) -> None:
-        for edge in self._state.execution_graph._get_input_edges(exec_node_id, unselected_field):
+        for edge in self._state._get_exec_input_edges(exec_node_id, unselected_field):
             if edge.source.node_id not in self._state.executed:
                 if self._state.indegree[exec_node_id] == 0:
                     raise RuntimeError(f"indegree underflow for {exec_node_id} when pruning {unselected_field}")
                 self._state.indegree[exec_node_id] -= 1
-            self._state.execution_graph.delete_edge(edge)
+            self._state._delete_execution_edge(edge)
 
     def _apply_branch_resolution(
         self,
@@ -252,9 +438,16 @@ class _IfBranchScheduler:
         selected_field: str,
         unselected_field: str,
     ) -> None:
-        # This iterates over the stable prepared-source mapping while mutating per-exec runtime state such as ready
-        # queues, execution state, and prepared metadata. Branch resolution never adds or removes prepared exec nodes.
-        for prepared_id, prepared_source in self._state.prepared_source_mapping.items():
+        # Only the exec nodes of branch-exclusive sources are affected. They are visited in creation order, so ready
+        # queue insertion order matches the order in which the nodes were prepared.
+        registry = self._state._prepared_registry()
+        prepared_ids = {
+            prepared_id
+            for source_node_id in exclusive_sources[selected_field] | exclusive_sources[unselected_field]
+            for prepared_id in registry.get_prepared_ids(source_node_id)
+        }
+        for prepared_id in sorted(prepared_ids, key=self._state._execution_index().get_creation_index):
+            prepared_source = registry.get_source_node_id(prepared_id)
             if prepared_id in self._state.executed:
                 continue
             if self._state._get_iteration_path(prepared_id) != iteration_path:
@@ -280,21 +473,28 @@ class _IfBranchScheduler:
         self._state._if_branch_exclusive_sources[if_node_id] = branch_sources
         return branch_sources
 
+    def _get_branch_if_ids(self, source_node_id: str) -> list[str]:
+        """Gets the source If nodes that have source_node_id in one of their exclusive branches."""
+        index = self._state._source_index()
+        if index.branch_if_ids is None:
+            branch_if_ids: dict[str, list[str]] = defaultdict(list)
+            for source_if_id, source_if_node in self._state.graph.nodes.items():
+                if not isinstance(source_if_node, IfInvocation):
+                    continue
+                branches = self.get_branch_exclusive_sources(source_if_id)
+                for node_id in branches["true_input"] | branches["false_input"]:
+                    branch_if_ids[node_id].append(source_if_id)
+            index.branch_if_ids = dict(branch_if_ids)
+        return index.branch_if_ids.get(source_node_id, [])
+
     def is_deferred_by_unresolved_if(self, exec_node_id: str) -> bool:
         source_node_id = self._state._prepared_registry().get_source_node_id(exec_node_id)
-        iteration_path = self._state._get_iteration_path(exec_node_id)
-
-        for source_if_id, source_if_node in self._state.graph.nodes.items():
-            if not isinstance(source_if_node, IfInvocation):
-                continue
-
-            branches = self.get_branch_exclusive_sources(source_if_id)
-            if source_node_id not in branches["true_input"] and source_node_id not in branches["false_input"]:
-                continue
+        source_if_ids = self._get_branch_if_ids(source_node_id)
+        if not source_if_ids:
+            return False
 
-            if self._has_unresolved_matching_if(source_if_id, iteration_path):
-                return True
-        return False
+        iteration_path = self._state._get_iteration_path(exec_node_id)
+        return any(self._has_unresolved_matching_if(source_if_id, iteration_path) for source_if_id in source_if_ids)
 
     def mark_exec_node_skipped(self, exec_node_id: str) -> None:
         state = self._state._get_prepared_exec_metadata(exec_node_id).state
@@ -310,8 +510,7 @@ class _IfBranchScheduler:
         prepared_nodes = registry.get_prepared_ids(source_node_id)
         if all(n in self._state.executed for n in prepared_nodes):
             if source_node_id not in self._state.executed:
-                self._state.executed.add(source_node_id)
-                self._state.executed_history.append(source_node_id)
+                self._state._mark_source_node_executed(source_node_id)
 
     def try_resolve_if_node(self, exec_node_id: str) -> None:
         if exec_node_id in self._state._resolved_if_exec_branches:
@@ -391,13 +590,13 @@ class _ExecutionMaterializer:
         if isinstance(new_node, IterateInvocation):
             new_node.index = iteration_index
 
-        self._state.execution_graph.add_node(new_node)
+        self._state._add_execution_node(new_node)
         self._state._register_prepared_exec_node(new_node.id, node_id)
         return new_node
 
     def _attach_execution_edges(self, exec_node_id: str, new_edges: list[Edge]) -> None:
         for edge in new_edges:
-            self._state.execution_graph.add_edge(
+            self._state._add_execution_edge(
                 Edge(
                     source=edge.source,
                     destination=EdgeConnection(node_id=exec_node_id, field=edge.destination.field),
@@ -405,7 +604,7 @@ class _ExecutionMaterializer:
             )
 
     def _initialize_execution_node(self, exec_node_id: str) -> None:
-        inputs = self._state.execution_graph._get_input_edges(exec_node_id)
+        inputs = self._state._get_exec_input_edges(exec_node_id)
         unmet = sum(1 for edge in inputs if edge.source.node_id not in self._state.executed)
         self._state.indegree[exec_node_id] = unmet
         self._state._try_resolve_if_node(exec_node_id)
@@ -523,29 +722,26 @@ class _ExecutionMaterializer:
                 mappings.append(mapping)
         return mappings
 
-    def _get_parent_iteration_mappings(self, next_node_id: str, graph: nx.DiGraph) -> list[list[tuple[str, str]]]:
-        parent_node_ids = [source_id for source_id, _ in graph.in_edges(next_node_id)]
-        iterator_graph = self.iterator_graph(graph)
-        iterator_nodes = self.get_node_iterators(next_node_id, iterator_graph)
+    def _get_parent_iteration_mappings(self, next_node_id: str) -> list[list[tuple[str, str]]]:
+        parent_node_ids = self._state._source_index().parents[next_node_id]
+        iterator_nodes = self.get_node_iterators(next_node_id)
         if not iterator_nodes:
             return self._get_parent_iteration_mappings_without_iterators(parent_node_ids)
 
         iterator_nodes_prepared = [list(self._state.source_prepared_mapping[node_id]) for node_id in iterator_nodes]
         iterator_node_prepared_combinations = list(itertools.product(*iterator_nodes_prepared))
 
-        execution_graph = self._state.execution_graph.nx_graph_flat()
-        prepared_parent_mappings = [
-            [
-                (node_id, self.get_iteration_node(node_id, graph, execution_graph, prepared_iterators))
-                for node_id in parent_node_ids
-            ]
-            for prepared_iterators in iterator_node_prepared_combinations
-        ]
-        return [
-            mapping
-            for mapping in prepared_parent_mappings
-            if all(prepared_id is not None for _, prepared_id in mapping)
-        ]
+        mappings: list[list[tuple[str, str]]] = []
+        for prepared_iterators in iterator_node_prepared_combinations:
+            mapping: list[tuple[str, str]] = []
+            for node_id in parent_node_ids:
+                prepared_id = self.get_iteration_node(node_id, list(prepared_iterators))
+                if prepared_id is None:
+                    break
+                mapping.append((node_id, prepared_id))
+            if len(mapping) == len(parent_node_ids):
+                mappings.append(mapping)
+        return mappings
 
     def create_execution_node(
         self,
@@ -572,45 +768,36 @@ class _ExecutionMaterializer:
 
         return new_nodes
 
-    def iterator_graph(self, base: Optional[nx.DiGraph] = None) -> nx.DiGraph:
-        """Gets a DiGraph with edges to collectors removed so an ancestor search produces all active iterators for any node"""
-        g = base.copy() if base is not None else self._state.graph.nx_graph_flat()
-        collectors = (
-            n for n in self._state.graph.nodes if isinstance(self._state.graph.get_node(n), CollectInvocation)
-        )
-        for c in collectors:
-            g.remove_edges_from(list(g.in_edges(c)))
-        return g
-
-    def get_node_iterators(self, node_id: str, it_graph: Optional[nx.DiGraph] = None) -> list[str]:
-        g = it_graph or self.iterator_graph()
-        return [n for n in nx.ancestors(g, node_id) if isinstance(self._state.graph.get_node(n), IterateInvocation)]
+    def get_node_iterators(self, node_id: str) -> list[str]:
+        """Gets the iterators a node is expanded for, i.e. its iterator ancestors not separated from it by a collector"""
+        return self._state._source_index().get_node_iterators(node_id)
 
     def _get_prepared_nodes_for_source(self, source_node_id: str) -> set[str]:
+        registry = self._state._prepared_registry()
         return {
             exec_node_id
             for exec_node_id in self._state.source_prepared_mapping[source_node_id]
-            if self._state._get_prepared_exec_metadata(exec_node_id).state != "skipped"
+            if registry.get_metadata(exec_node_id).state != "skipped"
         }
 
     def _get_parent_iterator_exec_nodes(
-        self, source_node_id: str, graph: nx.DiGraph, prepared_iterator_nodes: list[str]
+        self, source_node_id: str, prepared_iterator_nodes: list[str]
     ) -> list[tuple[str, str]]:
         iterator_source_node_mapping = [
             (prepared_exec_node_id, self._state.prepared_source_mapping[prepared_exec_node_id])
             for prepared_exec_node_id in prepared_iterator_nodes
         ]
+        source_index = self._state._source_index()
         return [
             iterator_mapping
             for iterator_mapping in iterator_source_node_mapping
-            if nx.has_path(graph, iterator_mapping[1], source_node_id)
+            if source_index.is_downstream_of_iterator(source_node_id, iterator_mapping[1])
         ]
 
-    def _matches_parent_iterators(
-        self, candidate_exec_node_id: str, parent_iterators: list[tuple[str, str]], execution_graph: nx.DiGraph
-    ) -> bool:
+    def _matches_parent_iterators(self, candidate_exec_node_id: str, parent_iterators: list[tuple[str, str]]) -> bool:
+        execution_index = self._state._execution_index()
         return all(
-            nx.has_path(execution_graph, parent_iterator_exec_id, candidate_exec_node_id)
+            execution_index.descends_from_iterator(candidate_exec_node_id, parent_iterator_exec_id)
             for parent_iterator_exec_id, _ in parent_iterators
         )
 
@@ -619,73 +806,44 @@ class _ExecutionMaterializer:
         prepared_nodes: set[str],
         prepared_iterator_nodes: list[str],
         parent_iterators: list[tuple[str, str]],
-        execution_graph: nx.DiGraph,
     ) -> Optional[str]:
         prepared_iterator = next((node_id for node_id in prepared_nodes if node_id in prepared_iterator_nodes), None)
         if prepared_iterator is None:
             return None
-        if self._matches_parent_iterators(prepared_iterator, parent_iterators, execution_graph):
+        if self._matches_parent_iterators(prepared_iterator, parent_iterators):
             return prepared_iterator
         return None
 
     def _find_prepared_node_matching_iterators(
-        self, prepared_nodes: set[str], parent_iterators: list[tuple[str, str]], execution_graph: nx.DiGraph
+        self, prepared_nodes: set[str], parent_iterators: list[tuple[str, str]]
     ) -> Optional[str]:
         return next(
-            (
-                node_id
-                for node_id in prepared_nodes
-                if self._matches_parent_iterators(node_id, parent_iterators, execution_graph)
-            ),
+            (node_id for node_id in prepared_nodes if self._matches_parent_iterators(node_id, parent_iterators)),
             None,
         )
 
-    def get_iteration_node(
-        self,
-        source_node_id: str,
-        graph: nx.DiGraph,
-        execution_graph: nx.DiGraph,
-        prepared_iterator_nodes: list[str],
-    ) -> Optional[str]:
+    def get_iteration_node(self, source_node_id: str, prepared_iterator_nodes: list[str]) -> Optional[str]:
         prepared_nodes = self._get_prepared_nodes_for_source(source_node_id)
         if len(prepared_nodes) == 1 and not prepared_iterator_nodes:
             return next(iter(prepared_nodes))
 
-        parent_iterators = self._get_parent_iterator_exec_nodes(source_node_id, graph, prepared_iterator_nodes)
+        parent_iterators = self._get_parent_iterator_exec_nodes(source_node_id, prepared_iterator_nodes)
         if len(prepared_nodes) == 1:
             prepared_node_id = next(iter(prepared_nodes))
-            if self._matches_parent_iterators(prepared_node_id, parent_iterators, execution_graph):
+            if self._matches_parent_iterators(prepared_node_id, parent_iterators):
                 return prepared_node_id
             return None
 
         direct_iterator_match = self._get_direct_prepared_iterator_match(
-            prepared_nodes, prepared_iterator_nodes, parent_iterators, execution_graph
+            prepared_nodes, prepared_iterator_nodes, parent_iterators
         )
         if direct_iterator_match is not None:
             return direct_iterator_match
 
-        return self._find_prepared_node_matching_iterators(prepared_nodes, parent_iterators, execution_graph)
-
-    def prepare(self, base_g: Optional[nx.DiGraph] = None) -> Optional[str]:
-        g = base_g or self._state.graph.nx_graph_flat()
-        next_node_id = next(
-            (
-                node_id
-                for node_id in nx.topological_sort(g)
-                if node_id not in self._state.source_prepared_mapping
-                and (
-                    not isinstance(self._state.graph.get_node(node_id), IterateInvocation)
-                    or all(source_id in self._state.executed for source_id, _ in g.in_edges(node_id))
-                )
-                and not any(
-                    isinstance(self._state.graph.get_node(ancestor_id), IterateInvocation)
-                    and ancestor_id not in self._state.executed
-                    for ancestor_id in nx.ancestors(g, node_id)
-                )
-            ),
-            None,
-        )
+        return self._find_prepared_node_matching_iterators(prepared_nodes, parent_iterators)
 
+    def prepare(self) -> Optional[str]:
+        next_node_id = self._state._source_index().next_node_to_prepare()
         if next_node_id is None:
             return None
 
@@ -700,7 +858,7 @@ class _ExecutionMaterializer:
                 if create_results is not None:
                     new_node_ids.extend(create_results)
         else:
-            for iteration_mappings in self._get_parent_iteration_mappings(next_node_id, g):
+            for iteration_mappings in self._get_parent_iteration_mappings(next_node_id):
                 create_results = self.create_execution_node(next_node_id, iteration_mappings)
                 if create_results is not None:
                     new_node_ids.extend(create_results)
@@ -732,12 +890,12 @@ class _ExecutionScheduler:
         return self.queue_for(self._state._type_key(node_obj))
 
     def _insert_ready_node(self, queue: Deque[str], exec_node_id: str) -> None:
+        # Queues are kept sorted by iteration path, and nodes mostly become ready in that order, so search from the end
         exec_node_path = self._state._get_iteration_path(exec_node_id)
-        for i, existing in enumerate(queue):
-            if self._state._get_iteration_path(existing) > exec_node_path:
-                queue.insert(i, exec_node_id)
-                return
-        queue.append(exec_node_id)
+        i = len(queue)
+        while i > 0 and self._state._get_iteration_path(queue[i - 1]) > exec_node_path:
+            i -= 1
+        queue.insert(i, exec_node_id)
 
     def _record_completed_node(self, exec_node_id: str, output: BaseInvocationOutput) -> None:
         self._state._set_prepared_exec_state(exec_node_id, "executed")
@@ -749,8 +907,7 @@ class _ExecutionScheduler:
         source_node_id = registry.get_source_node_id(exec_node_id)
         prepared_nodes = registry.get_prepared_ids(source_node_id)
         if all(node_id in self._state.executed for node_id in prepared_nodes):
-            self._state.executed.add(source_node_id)
-            self._state.executed_history.append(source_node_id)
+            self._state._mark_source_node_executed(source_node_id)
 
     def _decrement_child_indegree(self, child_exec_node_id: str, parent_exec_node_id: str) -> None:
         if child_exec_node_id not in self._state.indegree:
@@ -760,7 +917,7 @@ class _ExecutionScheduler:
         self._state.indegree[child_exec_node_id] -= 1
 
     def _release_downstream_nodes(self, exec_node_id: str) -> None:
-        for edge in self._state.execution_graph._get_output_edges(exec_node_id):
+        for edge in self._state._get_exec_output_edges(exec_node_id):
             child = edge.destination.node_id
             self._decrement_child_indegree(child, exec_node_id)
             self._state._try_resolve_if_node(child)
@@ -852,32 +1009,20 @@ class _ExecutionRuntime:
         return self._state._prepared_registry().get_source_node_id(exec_node_id)
 
     def _get_ordered_iterator_sources(self, source_node_id: str) -> list[str]:
-        iterator_graph = self._state._iterator_graph(self._state.graph.nx_graph())
-        iterator_sources = [
-            node_id
-            for node_id in nx.ancestors(iterator_graph, source_node_id)
-            if isinstance(self._state.graph.get_node(node_id), IterateInvocation)
-        ]
-
-        topo = list(nx.topological_sort(iterator_graph))
-        topo_index = {node_id: i for i, node_id in enumerate(topo)}
-        iterator_sources.sort(key=lambda node_id: topo_index.get(node_id, 0))
-        return iterator_sources
+        return self._state._source_index().get_node_iterators(source_node_id)
 
-    def _get_iterator_exec_id(
-        self, iterator_source_id: str, exec_node_id: str, execution_graph: nx.DiGraph
-    ) -> Optional[str]:
+    def _get_iterator_exec_id(self, iterator_source_id: str, exec_node_id: str) -> Optional[str]:
         prepared = self._state.source_prepared_mapping.get(iterator_source_id)
         if not prepared:
             return None
-        return next((pid for pid in prepared if nx.has_path(execution_graph, pid, exec_node_id)), None)
+        execution_index = self._state._execution_index()
+        return next((pid for pid in prepared if execution_index.descends_from_iterator(exec_node_id, pid)), None)
 
     def _build_iteration_path(self, exec_node_id: str, source_node_id: str) -> tuple[int, ...]:
         iterator_sources = self._get_ordered_iterator_sources(source_node_id)
-        execution_graph = self._state.execution_graph.nx_graph()
         path: list[int] = []
         for iterator_source_id in iterator_sources:
-            iterator_exec_id = self._get_iterator_exec_id(iterator_source_id, exec_node_id, execution_graph)
+            iterator_exec_id = self._get_iterator_exec_id(iterator_source_id, exec_node_id)
             if iterator_exec_id is None:
                 continue
             iterator_node = self._state.execution_graph.nodes.get(iterator_exec_id)
@@ -972,7 +1117,7 @@ class _ExecutionRuntime:
         self._set_node_inputs(node, input_edges)
 
     def prepare_inputs(self, node: BaseInvocation) -> None:
-        input_edges = self._state.execution_graph._get_input_edges(node.id)
+        input_edges = self._state._get_exec_input_edges(node.id)
 
         if isinstance(node, CollectInvocation):
             self._prepare_collect_inputs(node, input_edges)
@@ -1975,6 +2120,8 @@ class GraphExecutionState(BaseModel):
     _resolved_if_exec_branches: dict[str, str] = PrivateAttr(default_factory=dict)
     _prepared_exec_metadata: dict[str, _PreparedExecNodeMetadata] = PrivateAttr(default_factory=dict)
     _prepared_exec_registry: Optional[_PreparedExecRegistry] = PrivateAttr(default=None)
+    _source_graph_index: Optional[_SourceGraphIndex] = PrivateAttr(default=None)
+    _execution_graph_index: Optional[_ExecutionGraphIndex] = PrivateAttr(default=None)
     _if_branch_scheduler: Optional[_IfBranchScheduler] = PrivateAttr(default=None)
     _execution_materializer: Optional[_ExecutionMaterializer] = PrivateAttr(default=None)
     _execution_scheduler: Optional[_ExecutionScheduler] = PrivateAttr(default=None)
@@ -1992,6 +2139,50 @@ class GraphExecutionState(BaseModel):
             )
         return self._prepared_exec_registry
 
+    def _source_index(self) -> _SourceGraphIndex:
+        if self._source_graph_index is None or self._source_graph_index.is_stale(self.graph):
+            self._source_graph_index = _SourceGraphIndex(
+                self.graph, prepared=self.source_prepared_mapping, executed=self.executed
+            )
+        return self._source_graph_index
+
+    def _execution_index(self) -> _ExecutionGraphIndex:
+        if self._execution_graph_index is None:
+            self._execution_graph_index = _ExecutionGraphIndex(self.execution_graph)
+        return self._execution_graph_index
+
+    def _invalidate_source_graph_index(self) -> None:
+        self._source_graph_index = None
+        self._if_branch_exclusive_sources = {}
+
+    def _add_execution_node(self, node: BaseInvocation) -> None:
+        execution_index = self._execution_index()
+        self.execution_graph.add_node(node)
+        execution_index.add_node(node)
+
+    def _add_execution_edge(self, edge: Edge) -> None:
+        # Execution edges are copies of validated source graph edges into newly created nodes, so they are not
+        # validated again. Validation rebuilds the whole execution graph, which is quadratic over a session.
+        execution_index = self._execution_index()
+        self.execution_graph.edges.append(edge)
+        execution_index.add_edge(edge)
+
+    def _delete_execution_edge(self, edge: Edge) -> None:
+        execution_index = self._execution_index()
+        self.execution_graph.delete_edge(edge)
+        execution_index.delete_edge(edge)
+
+    def _get_exec_input_edges(self, exec_node_id: str, field: Optional[str] = None) -> list[Edge]:
+        return self._execution_index().get_input_edges(exec_node_id, field)
+
+    def _get_exec_output_edges(self, exec_node_id: str) -> list[Edge]:
+        return self._execution_index().get_output_edges(exec_node_id)
+
+    def _mark_source_node_executed(self, source_node_id: str) -> None:
+        self.executed.add(source_node_id)
+        self.executed_history.append(source_node_id)
+        self._source_index().source_node_executed(source_node_id)
+
     def _if_scheduler(self) -> _IfBranchScheduler:
         if self._if_branch_scheduler is None:
             self._if_branch_scheduler = _IfBranchScheduler(self)
@@ -2046,12 +2237,11 @@ class GraphExecutionState(BaseModel):
         self._scheduler().enqueue_if_ready(nid)
 
     def _prepare_until_node_ready(self) -> Optional[BaseInvocation]:
-        base_graph = self.graph.nx_graph_flat()
-        prepared_id = self._materializer().prepare(base_graph)
+        prepared_id = self._materializer().prepare()
         next_node: Optional[BaseInvocation] = None
 
         while prepared_id is not None:
-            prepared_id = self._materializer().prepare(base_graph)
+            prepared_id = self._materializer().prepare()
             if next_node is None:
                 next_node = self._get_next_node()
 
@@ -2065,6 +2255,8 @@ class GraphExecutionState(BaseModel):
         self._resolved_if_exec_branches = {}
         self._prepared_exec_metadata = {}
         self._prepared_exec_registry = None
+        self._source_graph_index = None
+        self._execution_graph_index = None
         self._if_branch_scheduler = None
         self._execution_materializer = None
         self._execution_scheduler = None
@@ -2084,7 +2276,7 @@ class GraphExecutionState(BaseModel):
                 metadata.state = "pending"
 
     def _apply_if_condition_inputs(self, exec_node_id: str, node: IfInvocation) -> bool:
-        condition_edges = self.execution_graph._get_input_edges(exec_node_id, "condition")
+        condition_edges = self._get_exec_input_edges(exec_node_id, "condition")
         if any(edge.source.node_id not in self.executed for edge in condition_edges):
             return False
 
@@ -2338,23 +2530,14 @@ class GraphExecutionState(BaseModel):
     def _create_execution_node(self, node_id: str, iteration_node_map: list[tuple[str, str]]) -> list[str]:
         return self._materializer().create_execution_node(node_id, iteration_node_map)
 
-    def _iterator_graph(self, base: Optional[nx.DiGraph] = None) -> nx.DiGraph:
-        return self._materializer().iterator_graph(base)
-
-    def _get_node_iterators(self, node_id: str, it_graph: Optional[nx.DiGraph] = None) -> list[str]:
-        return self._materializer().get_node_iterators(node_id, it_graph)
+    def _get_node_iterators(self, node_id: str) -> list[str]:
+        return self._materializer().get_node_iterators(node_id)
 
-    def _prepare(self, base_g: Optional[nx.DiGraph] = None) -> Optional[str]:
-        return self._materializer().prepare(base_g)
+    def _prepare(self) -> Optional[str]:
+        return self._materializer().prepare()
 
-    def _get_iteration_node(
-        self,
-        source_node_id: str,
-        graph: nx.DiGraph,
-        execution_graph: nx.DiGraph,
-        prepared_iterator_nodes: list[str],
-    ) -> Optional[str]:
-        return self._materializer().get_iteration_node(source_node_id, graph, execution_graph, prepared_iterator_nodes)
+    def _get_iteration_node(self, source_node_id: str, prepared_iterator_nodes: list[str]) -> Optional[str]:
+        return self._materializer().get_iteration_node(source_node_id, prepared_iterator_nodes)
 
     def _get_next_node(self) -> Optional[BaseInvocation]:
         return self._scheduler().get_next_node()
@@ -2382,6 +2565,7 @@ class GraphExecutionState(BaseModel):
 
     def add_node(self, node: BaseInvocation) -> None:
         self.graph.add_node(node)
+        self._invalidate_source_graph_index()
 
     def update_node(self, node_id: str, new_node: BaseInvocation) -> None:
         if not self._is_node_updatable(node_id):
@@ -2389,6 +2573,7 @@ class GraphExecutionState(BaseModel):
                 f"Node {node_id} has already been prepared or executed and cannot be updated"
             )
         self.graph.update_node(node_id, new_node)
+        self._invalidate_source_graph_index()
 
     def delete_node(self, node_id: str) -> None:
         if not self._is_node_updatable(node_id):
@@ -2396,6 +2581,7 @@ class GraphExecutionState(BaseModel):
                 f"Node {node_id} has already been prepared or executed and cannot be deleted"
             )
         self.graph.delete_node(node_id)
+        self._invalidate_source_graph_index()
 
     def add_edge(self, edge: Edge) -> None:
         if not self._is_node_updatable(edge.destination.node_id):
@@ -2403,6 +2589,7 @@ class GraphExecutionState(BaseModel):
                 f"Destination node {edge.destination.node_id} has already been prepared or executed and cannot be linked to"
             )
         self.graph.add_edge(edge)
+        self._invalidate_source_graph_index()
 
     def delete_edge(self, edge: Edge) -> None:
         if not self._is_node_updatable(edge.destination.node_id):
@@ -2410,3 +2597,4 @@ class GraphExecutionState(BaseModel):
                 f"Destination node {edge.destination.node_id} has already been prepared or executed and cannot have a source edge deleted"
             )
         self.graph.delete_edge(edge)
+        self._invalidate_source_graph_index()
@@ -18,7 +18,7 @@ from invokeai.app.services.invocation_services import InvocationServices
 from invokeai.app.services.model_records.model_records_base import UnknownModelException
 from invokeai.app.services.session_processor.session_processor_common import ProgressImage
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
-from invokeai.app.util.step_callback import diffusion_step_callback
+from invokeai.app.util.step_callback import ProgressPreviewEncoder, diffusion_step_callback
 from invokeai.backend.model_manager.configs.base import Config_Base
 from invokeai.backend.model_manager.configs.factory import AnyModelConfig
 from invokeai.backend.model_manager.load.load_base import LoadedModel, LoadedModelWithoutConfig
@@ -597,6 +597,7 @@ class UtilInterface(InvocationContextInterface):
     ) -> None:
         super().__init__(services, data)
         self._is_canceled = is_canceled
+        self._preview_encoder = ProgressPreviewEncoder()
 
     def is_canceled(self) -> bool:
         """Checks if the current session has been canceled.
@@ -623,6 +624,7 @@ class UtilInterface(InvocationContextInterface):
             intermediate_state=intermediate_state,
             base_model=base_model,
             is_canceled=self.is_canceled,
+            preview_encoder=self._preview_encoder,
         )
 
     def flux_step_callback(self, intermediate_state: PipelineIntermediateState) -> None:
@@ -641,6 +643,7 @@ class UtilInterface(InvocationContextInterface):
             intermediate_state=intermediate_state,
             base_model=BaseModelType.Flux,
             is_canceled=self.is_canceled,
+            preview_encoder=self._preview_encoder,
         )
 
     def flux2_step_callback(self, intermediate_state: PipelineIntermediateState) -> None:
@@ -656,13 +659,14 @@ class UtilInterface(InvocationContextInterface):
             intermediate_state=intermediate_state,
             base_model=BaseModelType.Flux2,
             is_canceled=self.is_canceled,
+            preview_encoder=self._preview_encoder,
         )
 
     def signal_progress(
         self,
         message: str,
         percentage: float | None = None,
-        image: Image | None = None,
+        image: Image | ProgressImage | None = None,
         image_size: tuple[int, int] | None = None,
     ) -> None:
         """Signals the progress of some long-running invocation. The progress is displayed in the UI.
@@ -707,7 +711,8 @@ class UtilInterface(InvocationContextInterface):
         Args:
             message: A message describing the current status. Do not include the percentage in this message.
             percentage: The current percentage completion for the process. Omit for indeterminate progress.
-            image: An optional image to display.
+            image: An optional image to display. This may also be an already-encoded `ProgressImage`, in which case
+                `image_size` is ignored.
             image_size: The optional size of the image to display. If omitted, the image will be displayed at its
                 original size.
         """
@@ -717,7 +722,9 @@ class UtilInterface(InvocationContextInterface):
             invocation=self._data.invocation,
             message=message,
             percentage=percentage,
-            image=ProgressImage.build(image, image_size) if image else None,
+            image=image
+            if isinstance(image, ProgressImage) or image is None
+            else ProgressImage.build(image, image_size),
         )
 
 
@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar
+from typing import Generic, Optional, TypeVar
 
 from pydantic import BaseModel, Field
 
@@ -16,6 +16,18 @@ class CursorPaginatedResults(BaseModel, Generic[GenericBaseModel]):
     items: list[GenericBaseModel] = Field(..., description="Items")
 
 
+class KeysetPaginatedResults(BaseModel, Generic[GenericBaseModel]):
+    """
+    Keyset-paginated results
+    Generic must be a Pydantic model
+    """
+
+    limit: int = Field(description="Limit of items to get")
+    next_cursor: Optional[str] = Field(description="Cursor from which to retrieve the next page, if there is one")
+    total: Optional[int] = Field(description="Total number of items in result, if it was requested")
+    items: list[GenericBaseModel] = Field(description="Items")
+
+
 class OffsetPaginatedResults(BaseModel, Generic[GenericBaseModel]):
     """
     Offset-paginated results
@@ -1,3 +1,4 @@
+import queue
 import sqlite3
 import threading
 from collections.abc import Generator
@@ -15,24 +16,37 @@ class SqliteDatabase:
     :param db_path: Path to the database file. If None, an in-memory database is used.
     :param logger: Logger to use for logging.
     :param verbose: Whether to log SQL statements. Provides `logger.debug` as the SQLite trace callback.
+    :param read_pool_size: The maximum number of read-only connections to open. Ignored for in-memory databases.
 
     This is a light wrapper around the `sqlite3` module, providing a few conveniences:
     - The database file is written to disk if it does not exist.
     - Foreign key constraints are enabled by default.
     - The connection is configured to use the `sqlite3.Row` row factory.
 
+    There is a single writer connection, guarded by a re-entrant lock. Because the database is in WAL mode, readers do
+    not block the writer (or each other), so file-backed databases also have a pool of read-only connections. Use
+    `read_transaction()` for work that only reads, and `write_transaction()` (or `transaction()`) for everything else.
+
+    In-memory databases cannot be shared between connections, so all of their work goes through the writer connection.
+
     In addition to the constructor args, the instance provides the following attributes and methods:
     - `conn`: A `sqlite3.Connection` object. Note that the connection must never be closed if the database is in-memory.
     - `lock`: A shared re-entrant lock, used to approximate thread safety.
     - `clean()`: Runs the SQL `VACUUM;` command and reports on the freed space.
     """
 
-    def __init__(self, db_path: Path | None, logger: Logger, verbose: bool = False) -> None:
+    def __init__(self, db_path: Path | None, logger: Logger, verbose: bool = False, read_pool_size: int = 4) -> None:
         """Initializes the database. This is used internally by the class constructor."""
         self._logger = logger
         self._db_path = db_path
         self._verbose = verbose
         self._lock = threading.RLock()
+        # Tracks whether the current thread is inside a write transaction, so nested reads can see uncommitted writes
+        self._local = threading.local()
+        self._read_pool_size = read_pool_size if self._db_path else 0
+        self._read_pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._read_conn_count = 0
+        self._read_pool_lock = threading.Lock()
 
         if not self._db_path:
             logger.info("Initializing in-memory database")
@@ -75,13 +89,48 @@ class SqliteDatabase:
             self._logger.error(f"Error cleaning database: {e}")
             raise
 
+    def _connect_reader(self) -> sqlite3.Connection:
+        assert self._db_path is not None
+        conn = sqlite3.connect(database=self._db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self._verbose:
+            conn.set_trace_callback(self._logger.debug)
+        # Any attempt to write through a reader is an error
+        conn.execute("PRAGMA query_only = ON;")
+        conn.execute("PRAGMA busy_timeout = 5000;")  # 5 seconds
+        return conn
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        try:
+            return self._read_pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._read_pool_lock:
+            if self._read_conn_count < self._read_pool_size:
+                self._read_conn_count += 1
+                return self._connect_reader()
+        # The pool is exhausted - wait for another reader to finish
+        return self._read_pool.get()
+
     @contextmanager
     def transaction(self) -> Generator[sqlite3.Cursor, None, None]:
         """
         Thread-safe context manager for DB work.
         Acquires the RLock, yields a Cursor, then commits or rolls back.
+
+        This is the same as `write_transaction()`.
+        """
+        with self.write_transaction() as cursor:
+            yield cursor
+
+    @contextmanager
+    def write_transaction(self) -> Generator[sqlite3.Cursor, None, None]:
+        """
+        Thread-safe context manager for DB work that writes.
+        Acquires the RLock, yields a Cursor on the writer connection, then commits or rolls back.
         """
         with self._lock:
+            self._local.write_depth = getattr(self._local, "write_depth", 0) + 1
             cursor = self._conn.cursor()
             try:
                 yield cursor
@@ -91,3 +140,30 @@ class SqliteDatabase:
                 raise
             finally:
                 cursor.close()
+                self._local.write_depth -= 1
+
+    @contextmanager
+    def read_transaction(self) -> Generator[sqlite3.Cursor, None, None]:
+        """
+        Context manager for DB work that only reads.
+        Yields a Cursor on a pooled read-only connection, so it does not wait for the writer lock.
+
+        Falls back to the writer connection for in-memory databases, and when the current thread is already inside a
+        write transaction (so that it sees its own uncommitted writes).
+        """
+        if self._read_pool_size == 0 or getattr(self._local, "write_depth", 0) > 0:
+            with self.write_transaction() as cursor:
+                yield cursor
+            return
+
+        conn = self._acquire_reader()
+        cursor = conn.cursor()
+        try:
+            # An explicit transaction gives all the queries in the block a consistent snapshot
+            cursor.execute("BEGIN;")
+            yield cursor
+        finally:
+            cursor.close()
+            # End the read transaction so the next user of this connection sees a fresh snapshot
+            conn.rollback()
+            self._read_pool.put(conn)
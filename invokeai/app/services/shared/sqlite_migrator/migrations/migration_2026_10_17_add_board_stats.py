@@ -0,0 +1,204 @@
+"""Add the board_stats table.
+
+Listing boards used to count each board's images and assets, and rank its images to find its cover image, every time.
+Both get slower as boards grow. The board_stats table holds each board's image and asset counts and its cover image,
+so listing boards reads one row per board.
+
+The table is maintained by triggers on the boards, board_images and images tables, so every change to a board's images
+updates its stats in the same transaction. The stats of the existing boards are computed from their images.
+"""
+
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.sqlite_migrator_common import Migration
+
+# Must match IMAGE_CATEGORIES and ASSETS_CATEGORIES in image_records_common.py
+_IMAGE_CATEGORIES = "('general')"
+_ASSETS_CATEGORIES = "('control', 'mask', 'user', 'other')"
+
+
+def _count(image_name: str, categories: str) -> str:
+    """1 if the image is counted in the categories, otherwise 0."""
+    return f"""
+        (SELECT COUNT(*) FROM images
+        WHERE images.image_name = {image_name}
+        AND images.is_intermediate = FALSE AND images.image_category IN {categories})
+    """
+
+
+def _cover_image_name(board_id: str) -> str:
+    """The board's cover image, ranked in the same order as get_most_recent_image_for_board()."""
+    return f"""
+        (SELECT images.image_name FROM images
+        JOIN board_images ON images.image_name = board_images.image_name
+        WHERE board_images.board_id = {board_id} AND images.is_intermediate = FALSE
+        ORDER BY images.starred DESC, images.created_at DESC, images.image_name DESC
+        LIMIT 1)
+    """
+
+
+def _ranks_above_cover_image(image_name: str) -> str:
+    """Whether the image ranks above the cover image of the board_stats row being updated."""
+    return f"""
+        EXISTS (
+            SELECT 1 FROM images AS image
+            WHERE image.image_name = {image_name} AND image.is_intermediate = FALSE
+            AND NOT EXISTS (
+                SELECT 1 FROM images AS cover_image
+                WHERE cover_image.image_name = board_stats.cover_image_name
+                AND (cover_image.starred, cover_image.created_at, cover_image.image_name)
+                    >= (image.starred, image.created_at, image.image_name)
+            )
+        )
+    """
+
+
+def _add_image(board_id: str, image_name: str) -> str:
+    return f"""--sql
+        UPDATE board_stats
+        SET image_count = image_count + {_count(image_name, _IMAGE_CATEGORIES)},
+            asset_count = asset_count + {_count(image_name, _ASSETS_CATEGORIES)},
+            cover_image_name = CASE
+                WHEN {_ranks_above_cover_image(image_name)} THEN {image_name}
+                ELSE cover_image_name
+            END,
+            updated_at = STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW')
+        WHERE board_id = {board_id};
+    """
+
+
+def _remove_image(board_id: str, image_name: str) -> str:
+    # Only runs once the image has left the board, so a new cover image is found among the remaining images
+    return f"""--sql
+        UPDATE board_stats
+        SET image_count = image_count - {_count(image_name, _IMAGE_CATEGORIES)},
+            asset_count = asset_count - {_count(image_name, _ASSETS_CATEGORIES)},
+            cover_image_name = CASE
+                WHEN cover_image_name = {image_name} THEN {_cover_image_name(board_id)}
+                ELSE cover_image_name
+            END,
+            updated_at = STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW')
+        WHERE board_id = {board_id};
+    """
+
+
+def _is_counted(image: str, categories: str) -> str:
+    return f"({image}.is_intermediate = FALSE AND {image}.image_category IN {categories})"
+
+
+class AddBoardStatsCallback:
+    """Create the board_stats table and its triggers, and compute the stats of the existing boards."""
+
+    def __call__(self, cursor: sqlite3.Cursor) -> None:
+        self._create_board_stats(cursor)
+        self._create_triggers(cursor)
+        self._compute_board_stats(cursor)
+
+    def _create_board_stats(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            """--sql
+            CREATE TABLE IF NOT EXISTS board_stats (
+                board_id TEXT NOT NULL PRIMARY KEY,
+                image_count INTEGER NOT NULL DEFAULT 0,
+                asset_count INTEGER NOT NULL DEFAULT 0,
+                cover_image_name TEXT,
+                updated_at DATETIME NOT NULL DEFAULT(STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW')),
+                FOREIGN KEY (board_id) REFERENCES boards (board_id) ON DELETE CASCADE
+            );
+            """
+        )
+
+    def _create_triggers(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            """--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_board_insert
+            AFTER INSERT ON boards
+            BEGIN
+                INSERT OR IGNORE INTO board_stats (board_id) VALUES (NEW.board_id);
+            END;
+            """
+        )
+        cursor.execute(
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_board_image_insert
+            AFTER INSERT ON board_images
+            BEGIN
+                {_add_image("NEW.board_id", "NEW.image_name")}
+            END;
+            """
+        )
+        cursor.execute(
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_board_image_delete
+            AFTER DELETE ON board_images
+            BEGIN
+                {_remove_image("OLD.board_id", "OLD.image_name")}
+            END;
+            """
+        )
+        # Moving an image to another board updates its board_images row
+        cursor.execute(
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_board_image_move
+            AFTER UPDATE OF board_id ON board_images
+            WHEN OLD.board_id != NEW.board_id
+            BEGIN
+                {_remove_image("OLD.board_id", "OLD.image_name")}
+                {_add_image("NEW.board_id", "NEW.image_name")}
+            END;
+            """
+        )
+        # The board_images row of a deleted image would be deleted by its foreign key after the image, when the image
+        # can no longer be counted. Deleting it first updates the stats while the image still exists.
+        cursor.execute(
+            """--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_image_delete
+            BEFORE DELETE ON images
+            BEGIN
+                DELETE FROM board_images WHERE image_name = OLD.image_name;
+            END;
+            """
+        )
+        cursor.execute(
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_board_stats_image_update
+            AFTER UPDATE OF image_category, is_intermediate, starred, created_at ON images
+            BEGIN
+                UPDATE board_stats
+                SET image_count = image_count
+                        - {_is_counted("OLD", _IMAGE_CATEGORIES)} + {_is_counted("NEW", _IMAGE_CATEGORIES)},
+                    asset_count = asset_count
+                        - {_is_counted("OLD", _ASSETS_CATEGORIES)} + {_is_counted("NEW", _ASSETS_CATEGORIES)},
+                    cover_image_name = CASE
+                        WHEN cover_image_name = NEW.image_name THEN {_cover_image_name("board_stats.board_id")}
+                        WHEN {_ranks_above_cover_image("NEW.image_name")} THEN NEW.image_name
+                        ELSE cover_image_name
+                    END,
+                    updated_at = STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW')
+                WHERE board_id = (SELECT board_id FROM board_images WHERE image_name = NEW.image_name);
+            END;
+            """
+        )
+
+    def _compute_board_stats(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            f"""--sql
+            INSERT OR REPLACE INTO board_stats (board_id, image_count, asset_count, cover_image_name)
+            SELECT
+                boards.board_id,
+                (SELECT COUNT(*) FROM board_images JOIN images ON board_images.image_name = images.image_name
+                WHERE board_images.board_id = boards.board_id AND {_is_counted("images", _IMAGE_CATEGORIES)}),
+                (SELECT COUNT(*) FROM board_images JOIN images ON board_images.image_name = images.image_name
+                WHERE board_images.board_id = boards.board_id AND {_is_counted("images", _ASSETS_CATEGORIES)}),
+                {_cover_image_name("boards.board_id")}
+            FROM boards;
+            """
+        )
+
+
+def build_migration() -> Migration:
+    return Migration(
+        id="2026_10_17_add_board_stats",
+        depends_on="2026_10_17_add_pagination_indexes",
+        callback=AddBoardStatsCallback(),
+    )
@@ -0,0 +1,145 @@
+"""Add a full-text search index over image metadata.
+
+Gallery search used to match the search term against the whole metadata JSON of every image with LIKE, which scans
+and parses every row of the images table. The image_search table holds the searchable fields extracted from each
+image's metadata, and the image_search_fts table indexes them by trigram, so any substring of at least three
+characters is found through the index.
+
+Besides the common fields, every string and number in the metadata is indexed in the metadata_values column, so that
+searches for e.g. LoRA names or schedulers still match. Unlike the old search, the metadata's keys are not matched.
+
+Both tables are maintained by triggers on the images table, and are filled from the existing images.
+"""
+
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.sqlite_migrator_common import Migration
+
+_SEARCH_COLUMNS = "positive_prompt, negative_prompt, model, seed, metadata_values, created_at"
+
+
+def _extract_search_fields(image: str) -> str:
+    """The values of the search columns for a row of the images table. Invalid metadata is not indexed."""
+    return f"""
+        CASE WHEN json_valid({image}.metadata) THEN json_extract({image}.metadata, '$.positive_prompt') END,
+        CASE WHEN json_valid({image}.metadata) THEN json_extract({image}.metadata, '$.negative_prompt') END,
+        CASE WHEN json_valid({image}.metadata) THEN json_extract({image}.metadata, '$.model.name') END,
+        CASE WHEN json_valid({image}.metadata) THEN json_extract({image}.metadata, '$.seed') END,
+        CASE WHEN json_valid({image}.metadata) THEN (
+            SELECT group_concat(value, ' ') FROM json_tree({image}.metadata) WHERE type IN ('text', 'integer', 'real')
+        ) END,
+        {image}.created_at
+    """
+
+
+class AddImageSearchIndexCallback:
+    """Create the image_search and image_search_fts tables, their triggers, and index the existing images."""
+
+    def __call__(self, cursor: sqlite3.Cursor) -> None:
+        self._create_tables(cursor)
+        self._create_triggers(cursor)
+        self._index_images(cursor)
+
+    def _create_tables(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            """--sql
+            CREATE TABLE IF NOT EXISTS image_search (
+                id INTEGER PRIMARY KEY,
+                image_name TEXT NOT NULL UNIQUE,
+                positive_prompt TEXT,
+                negative_prompt TEXT,
+                model TEXT,
+                seed TEXT,
+                metadata_values TEXT,
+                created_at TEXT
+            );
+            """
+        )
+        # An external content table - the text is stored once, in image_search
+        cursor.execute(
+            f"""--sql
+            CREATE VIRTUAL TABLE IF NOT EXISTS image_search_fts USING fts5(
+                {_SEARCH_COLUMNS},
+                content='image_search',
+                content_rowid='id',
+                tokenize='trigram'
+            );
+            """
+        )
+
+    def _create_triggers(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_image_search_insert
+            AFTER INSERT ON images
+            BEGIN
+                INSERT INTO image_search (image_name, {_SEARCH_COLUMNS})
+                VALUES (NEW.image_name, {_extract_search_fields("NEW")});
+            END;
+            """
+        )
+        cursor.execute(
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_image_search_update
+            AFTER UPDATE OF metadata, created_at ON images
+            BEGIN
+                DELETE FROM image_search WHERE image_name = OLD.image_name;
+                INSERT INTO image_search (image_name, {_SEARCH_COLUMNS})
+                VALUES (NEW.image_name, {_extract_search_fields("NEW")});
+            END;
+            """
+        )
+        cursor.execute(
+            """--sql
+            CREATE TRIGGER IF NOT EXISTS tg_image_search_delete
+            AFTER DELETE ON images
+            BEGIN
+                DELETE FROM image_search WHERE image_name = OLD.image_name;
+            END;
+            """
+        )
+
+        # Keep the full-text index in sync with its content table
+        cursor.execute(
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_image_search_fts_insert
+            AFTER INSERT ON image_search
+            BEGIN
+                INSERT INTO image_search_fts (rowid, {_SEARCH_COLUMNS})
+                VALUES (
+                    NEW.id, NEW.positive_prompt, NEW.negative_prompt, NEW.model, NEW.seed, NEW.metadata_values,
+                    NEW.created_at
+                );
+            END;
+            """
+        )
+        cursor.execute(
+            f"""--sql
+            CREATE TRIGGER IF NOT EXISTS tg_image_search_fts_delete
+            AFTER DELETE ON image_search
+            BEGIN
+                INSERT INTO image_search_fts (image_search_fts, rowid, {_SEARCH_COLUMNS})
+                VALUES (
+                    'delete', OLD.id, OLD.positive_prompt, OLD.negative_prompt, OLD.model, OLD.seed, OLD.metadata_values,
+                    OLD.created_at
+                );
+            END;
+            """
+        )
+
+    def _index_images(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            f"""--sql
+            INSERT OR IGNORE INTO image_search (image_name, {_SEARCH_COLUMNS})
+            SELECT images.image_name, {_extract_search_fields("images")}
+            FROM images;
+            """
+        )
+
+
+def build_migration() -> Migration:
+    return Migration(
+        id="2026_10_17_add_image_search_index",
+        depends_on="2026_10_17_add_model_scan_cache",
+        callback=AddImageSearchIndexCallback(),
+    )
@@ -0,0 +1,38 @@
+"""Add the model_hash_cache table.
+
+Model installs and library rehashes read every byte of every weight file. This table stores the digest of each file
+along with its size, modification time and inode, so a file that has not changed since it was last hashed is not
+read again.
+"""
+
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.sqlite_migrator_common import Migration
+
+
+class AddModelHashCacheCallback:
+    """Create the model_hash_cache table."""
+
+    def __call__(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            """--sql
+            CREATE TABLE IF NOT EXISTS model_hash_cache (
+                path TEXT NOT NULL,
+                algorithm TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                digest TEXT NOT NULL,
+                updated_at DATETIME NOT NULL DEFAULT(STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW')),
+                PRIMARY KEY (path, algorithm)
+            );
+            """
+        )
+
+
+def build_migration() -> Migration:
+    return Migration(
+        id="2026_10_17_add_model_hash_cache",
+        depends_on="2026_07_03_round_robin_indexes",
+        callback=AddModelHashCacheCallback(),
+    )
@@ -0,0 +1,37 @@
+"""Add the model_scan_cache table.
+
+Scanning the models directory lists every directory below it. This table stores the model files and subdirectories
+found in each directory along with the directory's modification time and size, so a directory that has not changed
+since it was last scanned is not listed again.
+"""
+
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.sqlite_migrator_common import Migration
+
+
+class AddModelScanCacheCallback:
+    """Create the model_scan_cache table."""
+
+    def __call__(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            """--sql
+            CREATE TABLE IF NOT EXISTS model_scan_cache (
+                path TEXT NOT NULL PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                is_model BOOLEAN NOT NULL,
+                model_files TEXT NOT NULL,
+                subdirectories TEXT NOT NULL,
+                updated_at DATETIME NOT NULL DEFAULT(STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW'))
+            );
+            """
+        )
+
+
+def build_migration() -> Migration:
+    return Migration(
+        id="2026_10_17_add_model_scan_cache",
+        depends_on="2026_10_17_add_session_queue_batch_templates",
+        callback=AddModelScanCacheCallback(),
+    )
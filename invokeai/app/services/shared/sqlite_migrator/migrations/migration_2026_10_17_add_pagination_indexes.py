@@ -0,0 +1,44 @@
+"""Add composite indexes matching the gallery and queue sort orders.
+
+By default, the gallery lists images ordered by ``starred DESC, created_at DESC, image_name DESC`` and the queue lists
+items ordered by ``priority DESC, item_id ASC``. Both can be paged with a cursor, which seeks to the last row of the
+previous page. With only single-column indexes, each page sorts every matching row before skipping to the cursor.
+
+``idx_images_starred_created_at_image_name`` (read backwards) and ``idx_session_queue_queue_id_priority_item_id`` hold
+the rows in sort order, so a page is read by seeking to the cursor and scanning forward.
+"""
+
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.sqlite_migrator_common import Migration
+
+
+class AddPaginationIndexesCallback:
+    """Add composite indexes matching the gallery and queue sort orders."""
+
+    def __call__(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            """--sql
+            CREATE INDEX IF NOT EXISTS idx_images_starred_created_at_image_name
+            ON images (starred, created_at, image_name);
+            """
+        )
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='session_queue';")
+        if cursor.fetchone() is None:
+            return
+
+        cursor.execute(
+            """--sql
+            CREATE INDEX IF NOT EXISTS idx_session_queue_queue_id_priority_item_id
+            ON session_queue (queue_id, priority DESC, item_id ASC);
+            """
+        )
+
+
+def build_migration() -> Migration:
+    return Migration(
+        id="2026_10_17_add_pagination_indexes",
+        depends_on="2026_10_17_add_image_search_index",
+        callback=AddPaginationIndexesCallback(),
+    )
@@ -0,0 +1,131 @@
+"""Add the session_queue_batches table.
+
+Every queue item of a batch used to store a full copy of the batch's session and workflow, which only differ in the
+handful of fields substituted from the batch data. This table stores the session template and workflow once per batch.
+Queue items of the batch store an empty session and no workflow, and their sessions are rebuilt from the template and
+their session ID and field values when they are read.
+
+Pending queue items are converted to the new format. Items that have already started keep their full sessions, which
+hold their execution state.
+"""
+
+import json
+import sqlite3
+from typing import Any, Optional, cast
+
+from invokeai.app.services.shared.sqlite_migrator.sqlite_migrator_common import Migration
+
+# Must match TEMPLATED_SESSION in session_queue_common.py
+_TEMPLATED_SESSION = ""
+
+
+def _build_session(session_template: dict[str, Any], session_id: str, field_values: Optional[str]) -> dict[str, Any]:
+    # A frozen copy of build_session_from_template() from session_queue_common.py
+    session = cast(dict[str, Any], json.loads(json.dumps(session_template)))
+    session["id"] = session_id
+    for nfv in json.loads(field_values) if field_values is not None else []:
+        session["graph"]["nodes"][nfv["node_path"]][nfv["field_name"]] = nfv["value"]
+    return session
+
+
+class AddSessionQueueBatchTemplatesCallback:
+    """Create the session_queue_batches table and convert pending queue items to use it."""
+
+    def __call__(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='session_queue';")
+        if cursor.fetchone() is None:
+            return
+
+        self._create_session_queue_batches(cursor)
+        self._convert_pending_queue_items(cursor)
+
+    def _create_session_queue_batches(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            """--sql
+            CREATE TABLE IF NOT EXISTS session_queue_batches (
+                batch_id TEXT NOT NULL PRIMARY KEY,
+                session TEXT NOT NULL,
+                workflow TEXT,
+                created_at DATETIME NOT NULL DEFAULT(STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW'))
+            );
+            """
+        )
+
+        # A batch's template is deleted along with the last of its queue items
+        cursor.execute(
+            """--sql
+            CREATE TRIGGER IF NOT EXISTS tg_session_queue_batches_cleanup
+            AFTER DELETE ON session_queue
+            FOR EACH ROW
+            WHEN NOT EXISTS (SELECT 1 FROM session_queue WHERE batch_id = OLD.batch_id)
+            BEGIN
+                DELETE FROM session_queue_batches WHERE batch_id = OLD.batch_id;
+            END;
+            """
+        )
+
+    def _convert_pending_queue_items(self, cursor: sqlite3.Cursor) -> None:
+        cursor.execute(
+            """--sql
+            SELECT DISTINCT batch_id
+            FROM session_queue
+            WHERE status = 'pending' AND parent_item_id IS NULL AND session != ?;
+            """,
+            (_TEMPLATED_SESSION,),
+        )
+        batch_ids = [row[0] for row in cursor.fetchall()]
+
+        for batch_id in batch_ids:
+            cursor.execute(
+                """--sql
+                SELECT item_id, session, session_id, field_values, workflow
+                FROM session_queue
+                WHERE batch_id = ? AND status = 'pending' AND parent_item_id IS NULL AND session != ?
+                ORDER BY item_id ASC;
+                """,
+                (batch_id, _TEMPLATED_SESSION),
+            )
+            rows = cursor.fetchall()
+
+            # The template is the first item's session without its ID. Every item of the batch substitutes values into
+            # the same fields, so the first item's values are overwritten when the other items' sessions are rebuilt.
+            session_template = json.loads(rows[0][1])
+            session_template["id"] = _TEMPLATED_SESSION
+            workflow = rows[0][4]
+
+            # Only convert the items whose sessions are rebuilt exactly. Retried items and items from older versions
+            # may not match the template, and keep their full sessions.
+            item_ids: list[int] = []
+            for item_id, session, session_id, field_values, item_workflow in rows:
+                if item_workflow != workflow:
+                    continue
+                if _build_session(session_template, session_id, field_values) != json.loads(session):
+                    continue
+                item_ids.append(item_id)
+
+            if not item_ids:
+                continue
+
+            cursor.execute(
+                """--sql
+                INSERT OR IGNORE INTO session_queue_batches (batch_id, session, workflow)
+                VALUES (?, ?, ?);
+                """,
+                (batch_id, json.dumps(session_template), workflow),
+            )
+            cursor.executemany(
+                """--sql
+                UPDATE session_queue
+                SET session = ?, workflow = NULL
+                WHERE item_id = ?;
+                """,
+                [(_TEMPLATED_SESSION, item_id) for item_id in item_ids],
+            )
+
+
+def build_migration() -> Migration:
+    return Migration(
+        id="2026_10_17_add_session_queue_batch_templates",
+        depends_on="2026_10_17_add_model_hash_cache",
+        callback=AddSessionQueueBatchTemplatesCallback(),
+    )
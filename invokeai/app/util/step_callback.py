@@ -1,12 +1,17 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from math import floor
 from typing import Callable, Optional, TypeAlias
 
 import torch
 from PIL import Image
 
-from invokeai.app.services.session_processor.session_processor_common import CanceledException
+from invokeai.app.services.session_processor.session_processor_common import CanceledException, ProgressImage
 from invokeai.backend.model_manager.taxonomy import BaseModelType
 from invokeai.backend.stable_diffusion.diffusers_pipeline import PipelineIntermediateState
+from invokeai.backend.util.logging import InvokeAILogger
+
+logger = InvokeAILogger.get_logger()
 
 # See scripts/generate_vae_linear_approximation.py for generating these factors.
 
@@ -224,26 +229,23 @@ def calc_percentage(intermediate_state: PipelineIntermediateState) -> float:
     return step / total_steps
 
 
-SignalProgressFunc: TypeAlias = Callable[[str, float | None, Image.Image | None, tuple[int, int] | None], None]
+SignalProgressFunc: TypeAlias = Callable[
+    [str, float | None, Image.Image | ProgressImage | None, tuple[int, int] | None], None
+]
 
+# Latents larger than twice this size (in either dimension) are downsampled by a whole factor before they are projected
+# to RGB, so previews are between this size and twice this size.
+PREVIEW_MAX_LATENT_SIZE = 128
 
-def diffusion_step_callback(
-    signal_progress: SignalProgressFunc,
-    intermediate_state: PipelineIntermediateState,
-    base_model: BaseModelType,
-    is_canceled: Callable[[], bool],
-) -> None:
-    if is_canceled():
-        raise CanceledException
 
-    # Some schedulers report not only the noisy latents at the current timestep,
-    # but also their estimate so far of what the de-noised latents will be. Use
-    # that estimate if it is available.
-    if intermediate_state.predicted_original is not None:
-        sample = intermediate_state.predicted_original
-    else:
-        sample = intermediate_state.latents
+@lru_cache(maxsize=None)
+def get_latent_rgb_projection(
+    base_model: BaseModelType, device: torch.device, dtype: torch.dtype
+) -> tuple[torch.Tensor, Optional[torch.Tensor], Optional[torch.Tensor]]:
+    """Gets the latent to RGB factors, smoothing kernel and bias for a base model, as tensors on the given device.
 
+    The tensors are created once per base model, device and dtype.
+    """
     smooth_matrix: list[list[float]] | None = None
     latent_rgb_bias: list[float] | None = None
     if base_model in [BaseModelType.StableDiffusion1, BaseModelType.StableDiffusion2]:
@@ -273,22 +275,125 @@ def diffusion_step_callback(
     else:
         raise ValueError(f"Unsupported base model: {base_model}")
 
-    latent_rgb_factors_torch = torch.tensor(latent_rgb_factors, dtype=sample.dtype, device=sample.device)
-    smooth_matrix_torch = (
-        torch.tensor(smooth_matrix, dtype=sample.dtype, device=sample.device) if smooth_matrix else None
-    )
-    latent_rgb_bias_torch = (
-        torch.tensor(latent_rgb_bias, dtype=sample.dtype, device=sample.device) if latent_rgb_bias else None
-    )
-    image = sample_to_lowres_estimated_image(
-        samples=sample,
-        latent_rgb_factors=latent_rgb_factors_torch,
-        smooth_matrix=smooth_matrix_torch,
-        latent_rgb_bias=latent_rgb_bias_torch,
-    )
+    latent_rgb_factors_torch = torch.tensor(latent_rgb_factors, dtype=dtype, device=device)
+    smooth_matrix_torch = torch.tensor(smooth_matrix, dtype=dtype, device=device) if smooth_matrix else None
+    latent_rgb_bias_torch = torch.tensor(latent_rgb_bias, dtype=dtype, device=device) if latent_rgb_bias else None
+    return latent_rgb_factors_torch, smooth_matrix_torch, latent_rgb_bias_torch
+
+
+def downsample_latents_for_preview(samples: torch.Tensor, max_size: int = PREVIEW_MAX_LATENT_SIZE) -> torch.Tensor:
+    """Average-pools latents by a whole factor so that neither dimension is at least twice `max_size`.
+
+    Projecting to RGB is linear, so pooling first gives the same preview as pooling the projected image, for less work.
+    """
+    factor = max(samples.shape[-2:]) // max_size
+    if factor <= 1:
+        return samples
+    return torch.nn.functional.avg_pool2d(samples, kernel_size=factor, ceil_mode=True)
+
+
+class ProgressPreviewEncoder:
+    """Encodes progress preview images on a worker thread.
+
+    One preview is encoded at a time. Previews made while the previous one is still being encoded are skipped. An
+    encoded preview is sent with the progress event of a later step, so that encoding overlaps with denoising while
+    progress events are still sent, in order, from the generation thread. Steps without a new preview repeat the last
+    one, so the UI keeps showing it.
+    """
+
+    _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="progress_preview")
+
+    def __init__(self) -> None:
+        self._future: Optional[Future[ProgressImage]] = None
+        self._last_image: Optional[ProgressImage] = None
+
+    @property
+    def is_busy(self) -> bool:
+        """Whether a preview is being encoded."""
+        return self._future is not None and not self._future.done()
+
+    def latest(self) -> Optional[ProgressImage]:
+        """Gets the most recently encoded preview. If encoding the newest preview failed, the previous one is kept."""
+        if self._future is not None and self._future.done():
+            future, self._future = self._future, None
+            try:
+                self._last_image = future.result()
+            except Exception as e:
+                # A preview is not worth failing the generation over
+                logger.warning(f"Failed to encode progress preview: {e}")
+        return self._last_image
+
+    def submit(self, image: Image.Image, image_size: tuple[int, int]) -> None:
+        """Starts encoding a preview, unless the previous one is still being encoded."""
+        if self.is_busy:
+            return
+        # Keep the previous preview if it has been encoded but not sent yet
+        self.latest()
+        self._future = self._executor.submit(ProgressImage.build, image, image_size)
+
+    def encode(self, image: Image.Image, image_size: tuple[int, int]) -> ProgressImage:
+        """Encodes a preview right away. A preview still being encoded is older, so it is discarded."""
+        self._future = None
+        self._last_image = ProgressImage.build(image, image_size)
+        return self._last_image
+
+
+def diffusion_step_callback(
+    signal_progress: SignalProgressFunc,
+    intermediate_state: PipelineIntermediateState,
+    base_model: BaseModelType,
+    is_canceled: Callable[[], bool],
+    preview_encoder: Optional[ProgressPreviewEncoder] = None,
+) -> None:
+    """Signals denoising progress with a preview image estimated from the latents.
+
+    If a preview encoder is given, the previews of the steps in between the first and last are encoded on its worker
+    thread, and each step is sent with the latest preview encoded so far. The first and last steps are encoded right
+    away, so that a new denoising run doesn't show the previous run's preview, and it ends on the final latents.
+    Without an encoder, every step is sent with its own preview.
+    """
+    if is_canceled():
+        raise CanceledException
 
-    width = image.width * 8
-    height = image.height * 8
+    # Some schedulers report not only the noisy latents at the current timestep,
+    # but also their estimate so far of what the de-noised latents will be. Use
+    # that estimate if it is available.
+    if intermediate_state.predicted_original is not None:
+        sample = intermediate_state.predicted_original
+    else:
+        sample = intermediate_state.latents
+
+    height, width = sample.shape[-2:]
+    image_size = (width * 8, height * 8)
     percentage = calc_percentage(intermediate_state)
 
-    signal_progress("Denoising", percentage, image, (width, height))
+    if preview_encoder is None:
+        signal_progress("Denoising", percentage, _build_preview_image(sample, base_model), image_size)
+        return
+
+    # Callers count steps either from 0 or from 1, so the last step is either total_steps - 1 or total_steps
+    is_first_or_last_step = (
+        intermediate_state.step == 0 or intermediate_state.step >= intermediate_state.total_steps - 1
+    )
+    progress_image: Optional[ProgressImage]
+    if is_first_or_last_step:
+        progress_image = preview_encoder.encode(_build_preview_image(sample, base_model), image_size)
+    else:
+        # Skip this step's preview while the previous one is still being encoded
+        if not preview_encoder.is_busy:
+            preview_encoder.submit(_build_preview_image(sample, base_model), image_size)
+        progress_image = preview_encoder.latest()
+    signal_progress("Denoising", percentage, progress_image, None)
+
+
+def _build_preview_image(sample: torch.Tensor, base_model: BaseModelType) -> Image.Image:
+    latent_rgb_factors, smooth_matrix, latent_rgb_bias = get_latent_rgb_projection(
+        base_model, sample.device, sample.dtype
+    )
+    image: Image.Image = sample_to_lowres_estimated_image(
+        samples=downsample_latents_for_preview(sample),
+        latent_rgb_factors=latent_rgb_factors,
+        smooth_matrix=smooth_matrix,
+        latent_rgb_bias=latent_rgb_bias,
+    )
+    return image
@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class FileIdentity:
+    """Identifies the contents of a file by its path and stat metadata, without reading it."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    inode: int
+
+    @classmethod
+    def from_path(cls, path: Path) -> "FileIdentity":
+        stat = path.stat()
+        return cls(path=str(path.resolve()), size=stat.st_size, mtime_ns=stat.st_mtime_ns, inode=stat.st_ino)
+
+
+class FileHashCache(ABC):
+    """A cache of file digests, used by ModelHash to skip re-hashing files that have not changed.
+
+    An entry is only valid for a file with the same path, size, modification time and inode as when it was hashed.
+    """
+
+    @abstractmethod
+    def get(self, file: FileIdentity, algorithm: str) -> Optional[str]:
+        """Gets the cached digest of a file, or None if the file has not been hashed or has changed since."""
+        pass
+
+    @abstractmethod
+    def put(self, file: FileIdentity, algorithm: str, digest: str) -> None:
+        """Caches the digest of a file."""
+        pass
+
+    @abstractmethod
+    def prune(self) -> int:
+        """Deletes the entries of files that no longer exist or have changed since they were hashed.
+
+        Returns the number of entries deleted.
+        """
+        pass
@@ -3,12 +3,13 @@
 import hashlib
 import os
 from pathlib import Path
-from typing import Callable, Literal, Optional, Union
+from typing import Callable, Literal, Optional, Protocol, Union
 
 from blake3 import blake3
 from tqdm import tqdm
 
 from invokeai.app.util.misc import uuid_string
+from invokeai.backend.model_hash.hash_cache import FileHashCache, FileIdentity
 
 HASHING_ALGORITHMS = Literal[
     "blake3_multi",
@@ -32,6 +33,14 @@ HASHING_ALGORITHMS = Literal[
 MODEL_FILE_EXTENSIONS = (".ckpt", ".safetensors", ".bin", ".pt", ".pth")
 
 
+class FileHasher(Protocol):
+    """An incremental hasher, fed a file's contents in order."""
+
+    def update(self, data: bytes, /) -> object: ...
+
+    def hexdigest(self) -> str: ...
+
+
 class ModelHash:
     """
     Creates a hash of a model using a specified algorithm. The hash is prefixed by the algorithm used.
@@ -39,6 +48,8 @@ class ModelHash:
     Args:
         algorithm: Hashing algorithm to use. Defaults to BLAKE3.
         file_filter: A function that takes a file name and returns True if the file should be included in the hash.
+        hash_cache: An optional cache of file digests. Files whose path, size, modification time and inode match a
+            cached entry are not re-read.
 
     If the model is a single file, it is hashed directly using the provided algorithm.
 
@@ -61,7 +72,10 @@ class ModelHash:
     """
 
     def __init__(
-        self, algorithm: HASHING_ALGORITHMS = "blake3_single", file_filter: Optional[Callable[[str], bool]] = None
+        self,
+        algorithm: HASHING_ALGORITHMS = "blake3_single",
+        file_filter: Optional[Callable[[str], bool]] = None,
+        hash_cache: Optional[FileHashCache] = None,
     ) -> None:
         self.algorithm: HASHING_ALGORITHMS = algorithm
         if algorithm == "blake3_multi":
@@ -75,6 +89,10 @@ class ModelHash:
         else:
             raise ValueError(f"Algorithm {algorithm} not available")
 
+        # "random" is not a hash, so there is nothing to cache
+        if hash_cache is not None and algorithm != "random":
+            self._hash_file = self._get_cached_hasher(self._hash_file, algorithm, hash_cache)
+
         self._file_filter = file_filter or self._default_file_filter
 
     def hash(self, model_path: Union[str, Path]) -> str:
@@ -203,6 +221,51 @@ class ModelHash:
 
         return hashlib_hasher
 
+    @staticmethod
+    def _get_cached_hasher(
+        hash_file: Callable[[Path], str], algorithm: HASHING_ALGORITHMS, hash_cache: FileHashCache
+    ) -> Callable[[Path], str]:
+        """Wraps a file hashing function so that it uses the given cache.
+
+        Args:
+            hash_file: The function that hashes a file
+            algorithm: The hashing algorithm used by the function
+            hash_cache: The cache to use
+
+        Returns:
+            A function that returns the cached digest of a file if it is unchanged, otherwise hashes and caches it
+        """
+
+        def cached_hasher(file_path: Path) -> str:
+            # The file is identified before it is read, so a file that changes while being hashed is cached under
+            # its old identity and will miss the next time
+            identity = FileIdentity.from_path(file_path)
+            digest = hash_cache.get(identity, algorithm)
+            if digest is None:
+                digest = hash_file(file_path)
+                hash_cache.put(identity, algorithm, digest)
+            return digest
+
+        return cached_hasher
+
+    @staticmethod
+    def get_file_hasher(algorithm: HASHING_ALGORITHMS) -> Optional[FileHasher]:
+        """Return an incremental hasher whose digest matches the file digest computed by ModelHash with the given algorithm.
+
+        This is used to hash a file while it is being written. Returns None for "random", which is not a hash.
+
+        Args:
+            algorithm: Hashing algorithm to use
+
+        Returns:
+            A new hasher, or None
+        """
+        if algorithm == "blake3_multi" or algorithm == "blake3_single":
+            return blake3()
+        elif algorithm in hashlib.algorithms_available:
+            return hashlib.new(algorithm)
+        return None
+
     @staticmethod
     def _random(_file_path: Path) -> str:
         """Returns a random string. This is not a hash.
@@ -10,6 +10,7 @@ from typing_extensions import Annotated, Any
 
 from invokeai.app.services.config.config_default import get_config
 from invokeai.app.util.misc import uuid_string
+from invokeai.backend.model_hash.hash_cache import FileHashCache
 from invokeai.backend.model_hash.model_hash import HASHING_ALGORITHMS
 from invokeai.backend.model_manager.configs.base import Config_Base
 from invokeai.backend.model_manager.configs.clip_embed import CLIPEmbed_Diffusers_G_Config, CLIPEmbed_Diffusers_L_Config
@@ -479,6 +480,7 @@ class ModelConfigFactory:
         override_fields: dict[str, Any] | None = None,
         hash_algo: HASHING_ALGORITHMS = "blake3_single",
         allow_unknown: bool = True,
+        hash_cache: FileHashCache | None = None,
     ) -> ModelClassificationResult:
         """Classify a model on disk and return the best matching model config.
 
@@ -488,6 +490,7 @@ class ModelConfigFactory:
                 over the values extracted from the model on disk, but this cannot force a match if the
                 model on disk doesn't actually match the config class.
             hash_algo: The hashing algorithm to use when computing the model hash if needed.
+            hash_cache: An optional cache of file digests to use when computing the model hash.
 
         Returns:
             A ModelClassificationResult containing the best matching model config (or None if no match)
@@ -498,7 +501,7 @@ class ModelConfigFactory:
             ValueError: If the provided path doesn't look like a model.
         """
         if isinstance(mod, Path | str):
-            mod = ModelOnDisk(Path(mod), hash_algo)
+            mod = ModelOnDisk(Path(mod), hash_algo, hash_cache)
 
         # Perform basic sanity checks before attempting any config matching
         # This rejects obviously non-model paths early, saving time
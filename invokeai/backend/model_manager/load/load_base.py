@@ -132,6 +132,15 @@ class ModelLoaderBase(ABC):
         """
         pass
 
+    @abstractmethod
+    def prefetch_model(self, model_config: AnyModelConfig, submodel_type: Optional[SubModelType] = None) -> bool:
+        """
+        Load a model into the RAM cache ahead of use, without dropping any cached models to make room.
+
+        Returns True if the model was loaded.
+        """
+        pass
+
     @abstractmethod
     def get_size_fs(
         self, config: AnyModelConfig, model_path: Path, submodel_type: Optional[SubModelType] = None
@@ -2,6 +2,7 @@
 """Default implementation of model loading in InvokeAI."""
 
 import re
+import time
 from logging import Logger
 from pathlib import Path
 from typing import Optional
@@ -89,6 +90,48 @@ class ModelLoader(ModelLoaderBase):
             cache_record = self._load_and_cache(model_config, submodel_type)
         return LoadedModel(config=model_config, cache_record=cache_record, cache=self._ram_cache)
 
+    def prefetch_model(self, model_config: AnyModelConfig, submodel_type: Optional[SubModelType] = None) -> bool:
+        """
+        Load a model into the RAM cache ahead of use, if it fits without dropping other models.
+
+        :param model config: Configuration record for this model
+        :param submodel_type: an ModelType enum indicating the portion of
+               the model to retrieve (e.g. ModelType.Vae)
+        :return: True if the model was loaded, False if it was already cached, missing, too large or preempted by a
+                 foreground load.
+        """
+        cache_key = get_model_cache_key(model_config.key, submodel_type)
+        if self._ram_cache.contains(cache_key):
+            return False
+
+        model_path = self._get_model_path(model_config)
+        if not model_path.exists():
+            return False
+        # Hold the room while we read from disk, so that other prefetches cannot claim it. A foreground load that needs
+        # the room, or the same model, cancels the reservation and the loaded model is discarded.
+        reservation = self._ram_cache.reserve(cache_key, self.get_size_fs(model_config, model_path, submodel_type))
+        if reservation is None:
+            return False
+
+        try:
+            model_config.path = str(model_path)
+            start_time = time.perf_counter()
+            with skip_torch_weight_init():
+                loaded_model = self._load_model(model_config, submodel_type)
+            load_time_s = time.perf_counter() - start_time
+
+            # The model can be larger in RAM than on disk, so this can still fail.
+            added: bool = self._ram_cache.put_if_room(
+                cache_key,
+                model=loaded_model,
+                execution_device=self._get_execution_device(model_config, submodel_type),
+                load_time_s=load_time_s,
+                reservation=reservation,
+            )
+            return added
+        finally:
+            self._ram_cache.release(reservation)
+
     @property
     def ram_cache(self) -> ModelCache:
         """Return the ram cache associated with this loader."""
@@ -131,7 +174,9 @@ class ModelLoader(ModelLoaderBase):
 
         config.path = str(self._get_model_path(config))
         self._ram_cache.make_room(self.get_size_fs(config, Path(config.path), submodel_type))
+        start_time = time.perf_counter()
         loaded_model = self._load_model(config, submodel_type)
+        load_time_s = time.perf_counter() - start_time
 
         # Determine execution device from model config, considering submodel type
         execution_device = self._get_execution_device(config, submodel_type)
@@ -140,6 +185,7 @@ class ModelLoader(ModelLoaderBase):
             get_model_cache_key(config.key, submodel_type),
             model=loaded_model,
             execution_device=execution_device,
+            load_time_s=load_time_s,
         )
 
         return self._ram_cache.get(key=get_model_cache_key(config.key, submodel_type), stats_name=stats_name)
@@ -2,6 +2,18 @@ from dataclasses import dataclass, field
 from typing import Dict
 
 
+@dataclass
+class EvictionPolicyStats(object):
+    """Lifetime counters for a model cache eviction policy, used to compare policies."""
+
+    policy: str  # name of the eviction policy
+    hits: int = 0  # cache hits
+    misses: int = 0  # cache misses
+    bytes_loaded: int = 0  # bytes of models added to the cache, i.e. read from disk
+    evictions: int = 0  # number of models dropped to make space
+    bytes_evicted: int = 0  # bytes of models dropped to make space
+
+
 @dataclass
 class CacheStats(object):
     """Collect statistics on cache performance."""
@@ -12,4 +24,7 @@ class CacheStats(object):
     in_cache: int = 0  # number of models in cache
     cleared: int = 0  # number of models cleared to make space
     cache_size: int = 0  # total size of cache
+    bytes_loaded: int = 0  # bytes of models added to the cache
+    eviction_policy: str = ""  # name of the eviction policy in use
     loaded_model_sizes: Dict[str, int] = field(default_factory=dict)
+    policy_stats: Dict[str, EvictionPolicyStats] = field(default_factory=dict)  # lifetime counters, by policy
@@ -0,0 +1,170 @@
+"""Policies that decide which models are dropped from the model cache's RAM tier when room is needed."""
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import ClassVar, Dict, Literal, Optional, Type
+
+from invokeai.backend.model_manager.load.model_cache.cache_stats import EvictionPolicyStats
+
+EVICTION_POLICY_NAME = Literal["lru", "lfu", "greedy_dual", "load_time"]
+
+# When a model's load time was not measured, it is estimated from its size using this disk throughput.
+FALLBACK_LOAD_BYTES_PER_SECOND = 2**30
+
+
+@dataclass
+class _Entry:
+    size_bytes: int
+    load_time_s: float
+    last_access: int
+    access_count: int = 1
+    priority: float = 0.0
+
+
+class EvictionPolicy(ABC):
+    """Orders the models in the RAM cache for eviction.
+
+    The cache notifies the policy when a model is added, used or removed. When the cache needs room, it walks
+    `eviction_order()` and drops unlocked models until enough memory has been freed.
+
+    The cache also keeps a set of counters for the policy in `stats`, so that policies can be compared.
+    """
+
+    name: ClassVar[EVICTION_POLICY_NAME]
+
+    def __init__(self) -> None:
+        self.stats = EvictionPolicyStats(policy=self.name)
+        # Kept in order of recency, least recently used first.
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._clock = 0
+
+    def add(self, key: str, size_bytes: int, load_time_s: Optional[float] = None) -> None:
+        """Called when a model is added to the cache. `load_time_s` is how long it took to load, if measured."""
+        if load_time_s is None:
+            load_time_s = size_bytes / FALLBACK_LOAD_BYTES_PER_SECOND
+        self._entries[key] = _Entry(size_bytes=size_bytes, load_time_s=load_time_s, last_access=self._tick())
+        self._entries.move_to_end(key)
+
+    def access(self, key: str) -> None:
+        """Called when a cached model is used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.last_access = self._tick()
+        entry.access_count += 1
+        self._entries.move_to_end(key)
+
+    def demote(self, key: str) -> None:
+        """Make a model the first candidate for eviction, until it is next used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        entry.last_access = -self._tick()
+        entry.access_count = 0
+        self._entries.move_to_end(key, last=False)
+
+    def remove(self, key: str, evicted: bool = False) -> None:
+        """Called when a model leaves the cache. `evicted` is True if it was dropped to make room."""
+        self._entries.pop(key, None)
+
+    @abstractmethod
+    def eviction_order(self) -> list[str]:
+        """Return the keys of all cached models, in the order they should be dropped."""
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+
+class LRUEvictionPolicy(EvictionPolicy):
+    """Drop the least recently used model first. This is the cache's historical behaviour."""
+
+    name = "lru"
+
+    def eviction_order(self) -> list[str]:
+        return list(self._entries)
+
+
+class LFUEvictionPolicy(EvictionPolicy):
+    """Drop the least frequently used model first, breaking ties by recency."""
+
+    name = "lfu"
+
+    def eviction_order(self) -> list[str]:
+        return sorted(self._entries, key=lambda k: (self._entries[k].access_count, self._entries[k].last_access))
+
+
+class GreedyDualEvictionPolicy(EvictionPolicy):
+    """GreedyDual-Size: drop the model with the lowest load cost per byte, aged so that idle models eventually go.
+
+    Each model gets a priority of `L + load_time / size` when it is added or used, where `L` is the priority of the
+    last evicted model. Models that are cheap to reload relative to the memory they occupy are dropped first, and
+    raising `L` on every eviction ensures that expensive models that are no longer used do not stay forever.
+    """
+
+    name = "greedy_dual"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._inflation = 0.0
+
+    def add(self, key: str, size_bytes: int, load_time_s: Optional[float] = None) -> None:
+        super().add(key, size_bytes, load_time_s)
+        self._update_priority(self._entries[key])
+
+    def access(self, key: str) -> None:
+        super().access(key)
+        if key in self._entries:
+            self._update_priority(self._entries[key])
+
+    def demote(self, key: str) -> None:
+        super().demote(key)
+        if key in self._entries:
+            self._entries[key].priority = self._inflation
+
+    def remove(self, key: str, evicted: bool = False) -> None:
+        entry = self._entries.get(key)
+        if entry is not None and evicted:
+            self._inflation = max(self._inflation, entry.priority)
+        super().remove(key, evicted)
+
+    def eviction_order(self) -> list[str]:
+        return sorted(self._entries, key=lambda k: (self._entries[k].priority, self._entries[k].last_access))
+
+    def _update_priority(self, entry: _Entry) -> None:
+        entry.priority = self._inflation + entry.load_time_s / max(entry.size_bytes, 1)
+
+
+class LoadTimeEvictionPolicy(EvictionPolicy):
+    """Drop the model that is cheapest to bring back, weighing its measured load time against how long it has idled.
+
+    A model's score is its load time divided by the number of cache operations since it was last used, so a model
+    that is slow to load survives longer, but not indefinitely once it stops being used. Unlike GreedyDual, the size of
+    the model is not taken into account.
+    """
+
+    name = "load_time"
+
+    def eviction_order(self) -> list[str]:
+        return sorted(self._entries, key=lambda k: (self._score(self._entries[k]), self._entries[k].last_access))
+
+    def _score(self, entry: _Entry) -> float:
+        if entry.access_count == 0:
+            # Demoted
+            return -1.0
+        return entry.load_time_s / (self._clock - entry.last_access + 1)
+
+
+EVICTION_POLICIES: Dict[EVICTION_POLICY_NAME, Type[EvictionPolicy]] = {
+    policy.name: policy
+    for policy in (LRUEvictionPolicy, LFUEvictionPolicy, GreedyDualEvictionPolicy, LoadTimeEvictionPolicy)
+}
+
+
+def build_eviction_policy(name: EVICTION_POLICY_NAME) -> EvictionPolicy:
+    """Create an eviction policy by name."""
+    try:
+        return EVICTION_POLICIES[name]()
+    except KeyError as e:
+        raise ValueError(f"Unknown model cache eviction policy: {name}") from e
@@ -5,7 +5,7 @@ import time
 from dataclasses import dataclass
 from functools import wraps
 from logging import Logger
-from typing import Any, Callable, Dict, List, Optional, Protocol
+from typing import Any, Callable, Dict, Optional, Protocol
 
 import psutil
 import torch
@@ -19,6 +19,7 @@ from invokeai.backend.model_manager.load.model_cache.cached_model.cached_model_o
 from invokeai.backend.model_manager.load.model_cache.cached_model.cached_model_with_partial_load import (
     CachedModelWithPartialLoad,
 )
+from invokeai.backend.model_manager.load.model_cache.eviction_policy import EvictionPolicy, LRUEvictionPolicy
 from invokeai.backend.model_manager.load.model_cache.torch_module_autocast.torch_module_autocast import (
     apply_custom_layers_to_model,
 )
@@ -77,6 +78,15 @@ class CacheEntrySnapshot:
     current_vram_bytes: int
 
 
+@dataclass
+class CacheReservation:
+    """RAM set aside for a model that is being loaded in the background. See `ModelCache.reserve()`."""
+
+    key: str
+    bytes_reserved: int
+    cancelled: bool = False
+
+
 class CacheMissCallback(Protocol):
     def __call__(
         self,
@@ -119,11 +129,12 @@ class ModelCache:
 
     Models are moved between the storage_device and the execution_device as necessary. Cache size limits are enforced
     on both the storage_device and the execution_device. The execution_device cache uses a smallest-first offload
-    policy. The storage_device cache uses a least-recently-used (LRU) offload policy.
+    policy. The storage_device cache uses a pluggable eviction policy (see `eviction_policy.py`), least-recently-used
+    (LRU) by default.
 
-    Note: Neither of these offload policies has really been compared against alternatives. It's likely that different
-    policies would be better, although the optimal policies are likely heavily dependent on usage patterns and HW
-    configuration.
+    Note: The execution_device offload policy has not really been compared against alternatives. The optimal policies
+    are likely heavily dependent on usage patterns and HW configuration, which is why the storage_device policy can be
+    changed. Each policy keeps hit/miss/load counters in `CacheStats.policy_stats` so they can be compared.
 
     The cache returns context manager generators designed to load the model into the execution device (often GPU) within
     the context, and unload outside the context.
@@ -148,6 +159,7 @@ class ModelCache:
         log_memory_usage: bool = False,
         logger: Optional[Logger] = None,
         keep_alive_minutes: float = 0,
+        eviction_policy: Optional[EvictionPolicy] = None,
     ):
         """Initialize the model RAM cache.
 
@@ -168,6 +180,7 @@ class ModelCache:
             behaviour.
         :param logger: InvokeAILogger to use (otherwise creates one)
         :param keep_alive_minutes: How long to keep models in cache after last use (in minutes). 0 means keep indefinitely.
+        :param eviction_policy: The policy that decides which models are dropped from RAM to make room (default LRU).
         """
         self._enable_partial_loading = enable_partial_loading
         self._keep_ram_copy_of_weights = keep_ram_copy_of_weights
@@ -185,7 +198,8 @@ class ModelCache:
         self._stats: Optional[CacheStats] = None
 
         self._cached_models: Dict[str, CacheRecord] = {}
-        self._cache_stack: List[str] = []
+        self._eviction_policy: EvictionPolicy = eviction_policy or LRUEvictionPolicy()
+        self._reservations: Dict[str, CacheReservation] = {}
 
         self._ram_cache_size_bytes = self._calc_ram_available_to_model_cache()
 
@@ -243,6 +257,13 @@ class ModelCache:
         # Populate the cache size in the stats object when it's set
         if self._stats is not None:
             self._stats.cache_size = self._ram_cache_size_bytes
+            self._stats.eviction_policy = self._eviction_policy.name
+            self._stats.policy_stats[self._eviction_policy.name] = self._eviction_policy.stats
+
+    @property
+    def eviction_policy(self) -> EvictionPolicy:
+        """The policy that decides which models are dropped from RAM to make room."""
+        return self._eviction_policy
 
     def _record_activity(self) -> None:
         """Record model activity and reset the timeout timer if configured.
@@ -316,7 +337,13 @@ class ModelCache:
 
     @synchronized
     @record_activity
-    def put(self, key: str, model: AnyModel, execution_device: Optional[torch.device] = None) -> None:
+    def put(
+        self,
+        key: str,
+        model: AnyModel,
+        execution_device: Optional[torch.device] = None,
+        load_time_s: Optional[float] = None,
+    ) -> None:
         """Add a model to the cache.
 
         Args:
@@ -324,6 +351,7 @@ class ModelCache:
             model: The model to cache
             execution_device: Optional device to use for this specific model. If None, uses the cache's default
                 execution_device. Use torch.device("cpu") to force a model to run on CPU.
+            load_time_s: How long it took to load the model from disk, if measured. Used by the eviction policy.
         """
         if key in self._cached_models:
             self._logger.debug(
@@ -359,11 +387,87 @@ class ModelCache:
 
         cache_record = CacheRecord(key=key, cached_model=wrapped_model)
         self._cached_models[key] = cache_record
-        self._cache_stack.append(key)
+        self._eviction_policy.add(key, size, load_time_s)
+        self._eviction_policy.stats.bytes_loaded += size
+        if self.stats:
+            self.stats.bytes_loaded += size
         self._logger.debug(
             f"Added model {key} (Type: {model.__class__.__name__}, Wrap mode: {wrapped_model.__class__.__name__}, Model size: {size / MB:.2f}MB)"
         )
 
+    @synchronized
+    def put_if_room(
+        self,
+        key: str,
+        model: AnyModel,
+        execution_device: Optional[torch.device] = None,
+        load_time_s: Optional[float] = None,
+        reservation: Optional[CacheReservation] = None,
+    ) -> bool:
+        """Add a model to the cache only if it fits without dropping any other models.
+
+        This is used to warm the cache ahead of time, so it must never displace a model that may be in use. The model is
+        demoted in the eviction policy, making it the first to be dropped if room is needed before it is used. It is
+        treated like any other model from its first `get()`.
+
+        If the room for the model was reserved with `reserve()`, pass the reservation. It is released, and the model is
+        not added if the reservation was cancelled in the meantime.
+
+        Returns True if the model was added, False if it was already cached, its reservation was cancelled or there was
+        not enough room.
+        """
+        if reservation is not None:
+            self._release_internal(reservation)
+            if reservation.cancelled:
+                return False
+        if key in self._cached_models:
+            return False
+        if calc_model_size_by_data(self._logger, model) > self._get_ram_available():
+            return False
+        self.put(key, model, execution_device, load_time_s)
+        self._eviction_policy.demote(key)
+        return True
+
+    @synchronized
+    def contains(self, key: str) -> bool:
+        """Return True if the model is in the cache. Unlike `get()`, this is not counted as a cache hit or miss."""
+        return key in self._cached_models
+
+    @synchronized
+    def has_room(self, bytes_needed: int) -> bool:
+        """Return True if a model of the indicated size fits in the RAM cache without dropping any models."""
+        return bytes_needed <= self._get_ram_available()
+
+    @synchronized
+    def reserve(self, key: str, bytes_needed: int) -> Optional[CacheReservation]:
+        """Set aside room for a model that is about to be loaded in the background, without dropping any models.
+
+        The reserved RAM is not handed to other background loads, but a foreground load takes precedence: the
+        reservation is cancelled if the foreground load needs the room, or misses on the same key. The caller must
+        `release()` the reservation (or pass it to `put_if_room()`) when it is done, whether or not the load succeeded.
+
+        Returns None if the model is already cached or being loaded, or if there is not enough room.
+        """
+        if key in self._cached_models or key in self._reservations or bytes_needed > self._get_ram_available():
+            return None
+        reservation = CacheReservation(key=key, bytes_reserved=bytes_needed)
+        self._reservations[key] = reservation
+        return reservation
+
+    @synchronized
+    def release(self, reservation: CacheReservation) -> None:
+        """Release a reservation made with `reserve()`. Releasing it more than once is harmless."""
+        self._release_internal(reservation)
+
+    def _release_internal(self, reservation: CacheReservation) -> None:
+        if self._reservations.get(reservation.key) is reservation:
+            del self._reservations[reservation.key]
+
+    def _cancel_reservation(self, reservation: CacheReservation) -> None:
+        self._logger.debug(f"Cancelling the background load of {reservation.key} in favour of a foreground load.")
+        reservation.cancelled = True
+        self._release_internal(reservation)
+
     @synchronized
     def _get_cache_snapshot(self) -> dict[str, CacheEntrySnapshot]:
         overview: dict[str, CacheEntrySnapshot] = {}
@@ -389,14 +493,20 @@ class ModelCache:
         Raises IndexError if the model is not in the cache.
         """
         if key in self._cached_models:
+            self._eviction_policy.stats.hits += 1
             if self.stats:
                 self.stats.hits += 1
         else:
+            self._eviction_policy.stats.misses += 1
             for cb in self._on_cache_miss_callbacks:
                 cb(model_key=key, cache_snapshot=self._get_cache_snapshot())
             if self.stats:
                 self.stats.misses += 1
             self._logger.debug(f"Cache miss: {key}")
+            # The caller is about to load the model itself, so a background load of the same model is wasted.
+            reservation = self._reservations.get(key)
+            if reservation is not None:
+                self._cancel_reservation(reservation)
             raise IndexError(f"The model with key {key} is not in the cache.")
 
         cache_entry = self._cached_models[key]
@@ -410,9 +520,7 @@ class ModelCache:
                 self.stats.loaded_model_sizes.get(stats_name, 0), cache_entry.cached_model.total_bytes()
             )
 
-        # This moves the entry to the top (right end) of the stack.
-        self._cache_stack = [k for k in self._cache_stack if k != key]
-        self._cache_stack.append(key)
+        self._eviction_policy.access(key)
 
         self._logger.debug(f"Cache hit: {key} (Type: {cache_entry.cached_model.model.__class__.__name__})")
         for cb in self._on_cache_hit_callbacks:
@@ -713,9 +821,13 @@ class ModelCache:
         """Get the amount of RAM currently in use."""
         return sum(ce.cached_model.total_bytes() for ce in self._cached_models.values())
 
+    def _get_ram_reserved(self) -> int:
+        """Get the amount of RAM reserved for models that are being loaded in the background."""
+        return sum(reservation.bytes_reserved for reservation in self._reservations.values())
+
     def _get_ram_available(self) -> int:
         """Get the amount of RAM available for the cache to use."""
-        return self._ram_cache_size_bytes - self._get_ram_in_use()
+        return self._ram_cache_size_bytes - self._get_ram_in_use() - self._get_ram_reserved()
 
     def _capture_memory_snapshot(self) -> Optional[MemorySnapshot]:
         if self._log_memory_usage:
@@ -777,7 +889,7 @@ class ModelCache:
 
         ram_in_use_bytes = self._get_ram_in_use()
         ram_available_bytes = self._get_ram_available()
-        ram_size_bytes = ram_in_use_bytes + ram_available_bytes
+        ram_size_bytes = ram_in_use_bytes + ram_available_bytes + self._get_ram_reserved()
         ram_in_use_bytes_percent = ram_in_use_bytes / ram_size_bytes if ram_size_bytes > 0 else 0
         ram_available_bytes_percent = ram_available_bytes / ram_size_bytes if ram_size_bytes > 0 else 0
         log += log_format.format(
@@ -847,26 +959,32 @@ class ModelCache:
         self._logger.debug(f"Making room for {bytes_needed / MB:.2f}MB of RAM.")
         self._log_cache_state(title="Before dropping models:")
 
+        # Background loads give way before any cached model is dropped.
+        for reservation in list(self._reservations.values()):
+            if bytes_needed <= self._get_ram_available():
+                break
+            self._cancel_reservation(reservation)
+
         ram_bytes_available = self._get_ram_available()
         ram_bytes_to_free = max(0, bytes_needed - ram_bytes_available)
 
         ram_bytes_freed = 0
-        pos = 0
         models_cleared = 0
-        while ram_bytes_freed < ram_bytes_to_free and pos < len(self._cache_stack):
-            model_key = self._cache_stack[pos]
-            cache_entry = self._cached_models[model_key]
-
-            if not cache_entry.is_locked:
-                ram_bytes_freed += cache_entry.cached_model.total_bytes()
-                self._logger.debug(
-                    f"Dropping {model_key} from RAM cache to free {(cache_entry.cached_model.total_bytes() / MB):.2f}MB."
-                )
-                self._delete_cache_entry(cache_entry)
+        if ram_bytes_to_free > 0:
+            for model_key in self._eviction_policy.eviction_order():
+                if ram_bytes_freed >= ram_bytes_to_free:
+                    break
+                cache_entry = self._cached_models[model_key]
+                if cache_entry.is_locked:
+                    continue
+                entry_bytes = cache_entry.cached_model.total_bytes()
+                ram_bytes_freed += entry_bytes
+                self._logger.debug(f"Dropping {model_key} from RAM cache to free {(entry_bytes / MB):.2f}MB.")
+                self._delete_cache_entry(cache_entry, evicted=True)
+                self._eviction_policy.stats.evictions += 1
+                self._eviction_policy.stats.bytes_evicted += entry_bytes
                 del cache_entry
                 models_cleared += 1
-            else:
-                pos += 1
 
         if models_cleared > 0:
             # There would likely be some 'garbage' to be collected regardless of whether a model was cleared or not, but
@@ -895,9 +1013,9 @@ class ModelCache:
         self._logger.debug(f"Dropped {models_cleared} models to free {ram_bytes_freed / MB:.2f}MB of RAM.")
         self._log_cache_state(title="After dropping models:")
 
-    def _delete_cache_entry(self, cache_entry: CacheRecord) -> None:
+    def _delete_cache_entry(self, cache_entry: CacheRecord, evicted: bool = False) -> None:
         """Delete cache_entry from the cache if it exists. No exception is thrown if it doesn't exist."""
-        self._cache_stack = [key for key in self._cache_stack if key != cache_entry.key]
+        self._eviction_policy.remove(cache_entry.key, evicted=evicted)
         self._cached_models.pop(cache_entry.key, None)
 
     @synchronized
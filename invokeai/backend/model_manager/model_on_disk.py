@@ -7,9 +7,10 @@ from picklescan.scanner import scan_file_path
 from safetensors import safe_open
 
 from invokeai.app.services.config.config_default import get_config
+from invokeai.backend.model_hash.hash_cache import FileHashCache
 from invokeai.backend.model_hash.model_hash import HASHING_ALGORITHMS, ModelHash
 from invokeai.backend.model_manager.taxonomy import ModelRepoVariant
-from invokeai.backend.quantization.gguf.loaders import gguf_sd_loader
+from invokeai.backend.model_manager.util.lazy_state_dict import LazyStateDict
 from invokeai.backend.util.logging import InvokeAILogger
 from invokeai.backend.util.silence_warnings import SilenceWarnings
 
@@ -21,20 +22,26 @@ logger = InvokeAILogger.get_logger()
 class ModelOnDisk:
     """A utility class representing a model stored on disk."""
 
-    def __init__(self, path: Path, hash_algo: HASHING_ALGORITHMS = "blake3_single"):
+    def __init__(
+        self,
+        path: Path,
+        hash_algo: HASHING_ALGORITHMS = "blake3_single",
+        hash_cache: Optional[FileHashCache] = None,
+    ):
         self.path = path
         if self.path.suffix in {".safetensors", ".bin", ".pt", ".ckpt"}:
             self.name = path.stem
         else:
             self.name = path.name
         self.hash_algo = hash_algo
+        self.hash_cache = hash_cache
         # Having a cache helps users of ModelOnDisk (i.e. configs) to save state
         # This prevents redundant computations during matching and parsing
         self._state_dict_cache: dict[Path, Any] = {}
         self._metadata_cache: dict[Path, Any] = {}
 
     def hash(self) -> str:
-        return ModelHash(algorithm=self.hash_algo).hash(self.path)
+        return ModelHash(algorithm=self.hash_algo, hash_cache=self.hash_cache).hash(self.path)
 
     def size(self) -> int:
         if self.path.is_file():
@@ -79,6 +86,11 @@ class ModelOnDisk:
         return ModelRepoVariant.Default
 
     def load_state_dict(self, path: Optional[Path] = None) -> StateDict:
+        """Loads the state dict of a weight file, for identification.
+
+        Safetensors and GGUF files are read from their headers alone: the values are meta tensors with the shapes and
+        dtypes of the stored tensors, but no data (see `LazyStateDict`). Pickled checkpoints are loaded in full.
+        """
         if path in self._state_dict_cache:
             return self._state_dict_cache[path]
 
@@ -111,9 +123,12 @@ class ModelOnDisk:
                 checkpoint = torch.load(path, map_location="cpu")
                 assert isinstance(checkpoint, dict)
             elif path.suffix.endswith(".gguf"):
-                checkpoint = gguf_sd_loader(path, compute_dtype=torch.float32)
+                checkpoint = LazyStateDict.from_gguf(path, compute_dtype=torch.float32)
             elif path.suffix.endswith(".safetensors"):
-                checkpoint = safetensors.torch.load_file(path)
+                try:
+                    checkpoint = LazyStateDict.from_safetensors(path)
+                except ValueError:
+                    checkpoint = safetensors.torch.load_file(path)
             else:
                 raise ValueError(f"Unrecognized model extension: {path.suffix}")
 
@@ -21,12 +21,64 @@ Example usage:
 """
 
 import os
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, Optional
 
 from invokeai.backend.util.logging import InvokeAILogger
 
+MODEL_DIRECTORY_MARKERS = (
+    "config.json",
+    "model_index.json",
+    "learned_embeds.bin",
+    "pytorch_lora_weights.bin",
+    "image_encoder.txt",
+)
+MODEL_FILE_EXTENSIONS = (".ckpt", ".bin", ".pth", ".safetensors", ".pt", ".gguf")
+
+
+@dataclass(frozen=True)
+class DirectoryState:
+    """The models and subdirectories found in a directory, along with the directory's stat metadata when it was listed.
+
+    Whether an entry is a model only depends on the names of the directory's entries. Adding, removing or renaming an
+    entry changes the directory's modification time, so the listing is valid for as long as the stat metadata is.
+
+    Attributes:
+        mtime_ns: the directory's modification time
+        size: the directory's size
+        is_model: whether the directory itself is a model (e.g. a diffusers model)
+        model_files: names of the model files in the directory
+        subdirectories: names of the subdirectories to search
+    """
+
+    mtime_ns: int
+    size: int
+    is_model: bool
+    model_files: tuple[str, ...]
+    subdirectories: tuple[str, ...]
+
+
+class DirectoryStateCache(ABC):
+    """A cache of directory listings, used by ModelSearch to skip listing directories that have not changed."""
+
+    @abstractmethod
+    def get_all(self, root: Path) -> dict[str, DirectoryState]:
+        """Gets the cached states of a directory and all directories below it, keyed by path."""
+        pass
+
+    @abstractmethod
+    def put_all(self, states: dict[str, DirectoryState]) -> None:
+        """Caches the states of directories, keyed by path."""
+        pass
+
+    @abstractmethod
+    def delete_all(self, paths: set[str]) -> None:
+        """Removes the cached states of directories that no longer exist."""
+        pass
+
 
 @dataclass
 class SearchStats:
@@ -57,6 +109,9 @@ class ModelSearch:
         on_search_started: Optional[Callable[[Path], None]] = None,
         on_model_found: Optional[Callable[[Path], bool]] = None,
         on_search_completed: Optional[Callable[[set[Path]], None]] = None,
+        max_workers: Optional[int] = None,
+        directory_cache: Optional[DirectoryStateCache] = None,
+        excluded_directory_prefixes: tuple[str, ...] = (),
     ) -> None:
         """Create a new ModelSearch object.
 
@@ -65,6 +120,10 @@ class ModelSearch:
             on_model_found: callback to be invoked when a model is found. The callback should return True if the model
                 should be included in the results.
             on_search_completed: callback to be invoked when the search is completed
+            max_workers: number of threads listing directories in parallel. Defaults to the ThreadPoolExecutor default.
+            directory_cache: optional cache of directory listings. Directories that have not changed since they were
+                last searched are not listed again.
+            excluded_directory_prefixes: subdirectories whose names start with any of these prefixes are not searched.
         """
         self.stats = SearchStats()
         self.logger = InvokeAILogger.get_logger()
@@ -72,6 +131,9 @@ class ModelSearch:
         self.on_model_found = on_model_found
         self.on_search_completed = on_search_completed
         self.models_found: set[Path] = set()
+        self._max_workers = max_workers
+        self._directory_cache = directory_cache
+        self._excluded_directory_prefixes = excluded_directory_prefixes
 
     def search_started(self) -> None:
         self.models_found = set()
@@ -93,50 +155,84 @@ class ModelSearch:
         self._directory = self._directory.resolve()
         self.stats = SearchStats()  # zero out
         self.search_started()  # This will initialize _models_found to empty
-        self._walk_directory(self._directory)
-        self.search_completed()
-        return self.models_found
-
-    def _walk_directory(self, path: Path, max_depth: int = 20) -> None:
-        """Recursively walk the directory tree, looking for models."""
-        absolute_path = Path(path)
-        if (
-            len(absolute_path.parts) - len(self._directory.parts) > max_depth
-            or not absolute_path.exists()
-            or absolute_path.parent in self.models_found
-        ):
-            return
-        entries = os.scandir(absolute_path.as_posix())
-        entries = [entry for entry in entries if not entry.name.startswith(".")]
-        dirs = [entry for entry in entries if entry.is_dir()]
-        file_names = [entry.name for entry in entries if entry.is_file()]
-        if any(
-            x in file_names
-            for x in [
-                "config.json",
-                "model_index.json",
-                "learned_embeds.bin",
-                "pytorch_lora_weights.bin",
-                "image_encoder.txt",
-            ]
-        ):
+        # Directories are listed in parallel, but the callbacks are always invoked on the calling thread
+        for model in sorted(self._walk_directory(self._directory)):
             try:
-                self.model_found(absolute_path)
-                return
+                self.model_found(model)
             except KeyboardInterrupt:
                 raise
             except Exception as e:
                 self.logger.warning(str(e))
-                return
-
-        for n in file_names:
-            if n.endswith((".ckpt", ".bin", ".pth", ".safetensors", ".pt", ".gguf")):
-                try:
-                    self.model_found(absolute_path / n)
-                except KeyboardInterrupt:
-                    raise
-                except Exception as e:
-                    self.logger.warning(str(e))
-
-        for d in dirs:
-            self._walk_directory(absolute_path / d)
+        self.search_completed()
+        return self.models_found
+
+    def _walk_directory(self, root: Path, max_depth: int = 20) -> list[Path]:
+        """Walk the directory tree, listing directories in parallel, and return the paths of the models found."""
+        cached_states = self._directory_cache.get_all(root) if self._directory_cache is not None else {}
+        new_states: dict[str, DirectoryState] = {}
+        searched: set[str] = set()
+        models: list[Path] = []
+
+        with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="model_search") as executor:
+            pending: dict[Future[Optional[DirectoryState]], tuple[Path, int]] = {
+                executor.submit(self._get_directory_state, root, cached_states.get(str(root))): (root, 0)
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, depth = pending.pop(future)
+                    state = future.result()
+                    if state is None:
+                        continue
+                    self.stats.items_scanned += 1
+                    searched.add(str(path))
+                    if cached_states.get(str(path)) != state:
+                        new_states[str(path)] = state
+
+                    if state.is_model:
+                        models.append(path)
+                        continue
+                    models.extend(path / name for name in state.model_files)
+                    if depth >= max_depth:
+                        continue
+                    for name in state.subdirectories:
+                        if self._excluded_directory_prefixes and name.startswith(self._excluded_directory_prefixes):
+                            continue
+                        subdirectory = path / name
+                        future = executor.submit(
+                            self._get_directory_state, subdirectory, cached_states.get(str(subdirectory))
+                        )
+                        pending[future] = (subdirectory, depth + 1)
+
+        if self._directory_cache is not None:
+            if new_states:
+                self._directory_cache.put_all(new_states)
+            # Forget directories below the root that were removed, or are no longer searched
+            removed = set(cached_states) - searched
+            if removed:
+                self._directory_cache.delete_all(removed)
+
+        return models
+
+    @staticmethod
+    def _get_directory_state(path: Path, cached_state: Optional[DirectoryState]) -> Optional[DirectoryState]:
+        """Lists a directory, or reuses its cached listing if it has not changed. Returns None if it doesn't exist."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        if cached_state is not None and (cached_state.mtime_ns, cached_state.size) == (stat.st_mtime_ns, stat.st_size):
+            return cached_state
+
+        with os.scandir(path.as_posix()) as it:
+            entries = [entry for entry in it if not entry.name.startswith(".")]
+        subdirectories = sorted(entry.name for entry in entries if entry.is_dir())
+        file_names = sorted(entry.name for entry in entries if entry.is_file())
+        is_model = any(x in file_names for x in MODEL_DIRECTORY_MARKERS)
+        return DirectoryState(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            is_model=is_model,
+            model_files=() if is_model else tuple(n for n in file_names if n.endswith(MODEL_FILE_EXTENSIONS)),
+            subdirectories=() if is_model else tuple(subdirectories),
+        )
@@ -0,0 +1,87 @@
+"""A state dict read from a checkpoint's header, used to identify models without loading their weights."""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, cast
+
+import torch
+from safetensors import safe_open
+
+from invokeai.backend.quantization.gguf.loaders import gguf_sd_meta_loader, gguf_tensor_loader
+
+SAFETENSORS_DTYPES: dict[str, torch.dtype] = {
+    "BOOL": torch.bool,
+    "U8": torch.uint8,
+    "I8": torch.int8,
+    "U16": torch.uint16,
+    "I16": torch.int16,
+    "U32": torch.uint32,
+    "I32": torch.int32,
+    "U64": torch.uint64,
+    "I64": torch.int64,
+    "F16": torch.float16,
+    "BF16": torch.bfloat16,
+    "F32": torch.float32,
+    "F64": torch.float64,
+    "F8_E4M3": torch.float8_e4m3fn,
+    "F8_E5M2": torch.float8_e5m2,
+}
+
+
+def read_safetensors_header(path: Path) -> tuple[dict[str, dict[str, Any]], dict[str, str]]:
+    """Reads the header of a safetensors file.
+
+    :param path: The path to the safetensors file.
+    :return: A tuple of the tensor index (tensor name to `dtype`, `shape` and `data_offsets`) and the file metadata.
+    """
+    with open(path, "rb") as f:
+        header_len = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_len))
+    metadata = header.pop("__metadata__", None) or {}
+    return header, metadata
+
+
+class LazyStateDict(dict[str, torch.Tensor]):
+    """A state dict built from a checkpoint's header alone.
+
+    The values are meta tensors: they have the keys, shapes and dtypes of the checkpoint's tensors but no data, so
+    building one takes milliseconds and almost no memory, regardless of the size of the checkpoint. This is all that is
+    needed to identify a model. Use `load_tensor()` to read a tensor's data from disk.
+    """
+
+    def __init__(self, path: Path, tensors: dict[str, torch.Tensor], loader: Callable[[Path, str], torch.Tensor]):
+        super().__init__(tensors)
+        self.path = path
+        self._loader = loader
+
+    def load_tensor(self, key: str) -> torch.Tensor:
+        """Reads a tensor's data from disk."""
+        if key not in self:
+            raise KeyError(key)
+        return self._loader(self.path, key)
+
+    @classmethod
+    def from_safetensors(cls, path: Path) -> "LazyStateDict":
+        """Builds a lazy state dict from a safetensors file. Raises a ValueError if a tensor has an unsupported dtype."""
+        header, _ = read_safetensors_header(path)
+        tensors: dict[str, torch.Tensor] = {}
+        for key, info in header.items():
+            dtype = SAFETENSORS_DTYPES.get(info["dtype"])
+            if dtype is None:
+                raise ValueError(f"Unsupported safetensors dtype {info['dtype']} for tensor {key}")
+            tensors[key] = torch.empty(info["shape"], dtype=dtype, device="meta")
+        return cls(path, tensors, _load_safetensors_tensor)
+
+    @classmethod
+    def from_gguf(cls, path: Path, compute_dtype: torch.dtype) -> "LazyStateDict":
+        """Builds a lazy state dict from a GGUF file. The values are GGMLTensors wrapping meta tensors."""
+
+        def _loader(p: Path, key: str) -> torch.Tensor:
+            return gguf_tensor_loader(p, key, compute_dtype=compute_dtype)
+
+        return cls(path, dict(gguf_sd_meta_loader(path, compute_dtype=compute_dtype)), _loader)
+
+
+def _load_safetensors_tensor(path: Path, key: str) -> torch.Tensor:
+    with safe_open(path, framework="pt", device="cpu") as f:
+        return cast(torch.Tensor, f.get_tensor(key))
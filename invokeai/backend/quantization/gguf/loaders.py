@@ -2,6 +2,7 @@ import gc
 from pathlib import Path
 
 import gguf
+import numpy as np
 import torch
 
 from invokeai.backend.quantization.gguf.ggml_tensor import GGMLTensor
@@ -36,22 +37,50 @@ class WrappedGGUFReader:
         gc.collect()
 
 
+def _to_ggml_tensor(tensor: gguf.ReaderTensor, compute_dtype: torch.dtype, meta: bool = False) -> GGMLTensor:
+    if meta:
+        # Only the dtype and shape of the memory-mapped array are read, not its data
+        dtype = torch.from_numpy(np.empty(0, dtype=tensor.data.dtype)).dtype
+        torch_tensor = torch.empty(tensor.data.shape, dtype=dtype, device="meta")
+    else:
+        # Use .copy() to create a true copy of the data, not a view.
+        # This is critical on Windows where the memory-mapped file cannot be deleted
+        # while tensors still hold references to the mapped memory.
+        torch_tensor = torch.from_numpy(tensor.data.copy())
+
+    shape = torch.Size(tuple(int(v) for v in reversed(tensor.shape)))
+    if tensor.tensor_type in TORCH_COMPATIBLE_QTYPES:
+        torch_tensor = torch_tensor.view(*shape)
+    return GGMLTensor(
+        torch_tensor,
+        ggml_quantization_type=tensor.tensor_type,
+        tensor_shape=shape,
+        compute_dtype=compute_dtype,
+    )
+
+
 def gguf_sd_loader(path: Path, compute_dtype: torch.dtype) -> dict[str, GGMLTensor]:
     with WrappedGGUFReader(path) as reader:
         sd: dict[str, GGMLTensor] = {}
         for tensor in reader.tensors:
-            # Use .copy() to create a true copy of the data, not a view.
-            # This is critical on Windows where the memory-mapped file cannot be deleted
-            # while tensors still hold references to the mapped memory.
-            torch_tensor = torch.from_numpy(tensor.data.copy())
-
-            shape = torch.Size(tuple(int(v) for v in reversed(tensor.shape)))
-            if tensor.tensor_type in TORCH_COMPATIBLE_QTYPES:
-                torch_tensor = torch_tensor.view(*shape)
-            sd[tensor.name] = GGMLTensor(
-                torch_tensor,
-                ggml_quantization_type=tensor.tensor_type,
-                tensor_shape=shape,
-                compute_dtype=compute_dtype,
-            )
+            sd[tensor.name] = _to_ggml_tensor(tensor, compute_dtype)
         return sd
+
+
+def gguf_sd_meta_loader(path: Path, compute_dtype: torch.dtype) -> dict[str, GGMLTensor]:
+    """Reads the tensor index of a GGUF file without reading any tensor data.
+
+    The returned GGMLTensors wrap meta tensors, so they report the same shapes, dtypes and quantization types as the
+    ones returned by `gguf_sd_loader`, but hold no data.
+    """
+    with WrappedGGUFReader(path) as reader:
+        return {tensor.name: _to_ggml_tensor(tensor, compute_dtype, meta=True) for tensor in reader.tensors}
+
+
+def gguf_tensor_loader(path: Path, name: str, compute_dtype: torch.dtype) -> GGMLTensor:
+    """Reads a single tensor from a GGUF file."""
+    with WrappedGGUFReader(path) as reader:
+        for tensor in reader.tensors:
+            if tensor.name == name:
+                return _to_ggml_tensor(tensor, compute_dtype)
+    raise KeyError(name)
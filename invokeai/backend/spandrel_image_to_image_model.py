@@ -131,6 +131,18 @@ class SpandrelImageToImageModel(RawModel):
         """The scale of the model (e.g. 1x, 2x, 4x, etc.)."""
         return self._spandrel_model.scale
 
+    def estimate_working_memory(self, height: int, width: int) -> int:
+        """Estimate the working memory required to run the model on a single image of the given size, in bytes.
+
+        This is a rough, architecture-independent estimate. Most spandrel architectures (e.g. ESRGAN) run their body
+        on ~64 feature channels at the input resolution, keeping a few dozen feature maps alive at once, and only
+        upsample at the end. The estimate errs on the generous side so that batches of tiles fit comfortably.
+        """
+        element_size = torch.finfo(self.dtype).bits // 8
+        input_pixels = height * width
+        output_pixels = input_pixels * self.scale * self.scale
+        return input_pixels * element_size * 1024 + output_pixels * element_size * 64
+
     def calc_size(self) -> int:
         """Get size of the model in memory in bytes."""
         # HACK(ryand): Fix this issue with circular imports.
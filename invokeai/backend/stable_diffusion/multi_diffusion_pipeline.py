@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import copy
+import dataclasses
 from dataclasses import dataclass
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Hashable, Optional
 
 import torch
 from diffusers.schedulers.scheduling_utils import SchedulerMixin
@@ -12,7 +13,11 @@ from invokeai.backend.stable_diffusion.diffusers_pipeline import (
     PipelineIntermediateState,
     StableDiffusionGeneratorPipeline,
 )
-from invokeai.backend.stable_diffusion.diffusion.conditioning_data import TextConditioningData
+from invokeai.backend.stable_diffusion.diffusion.conditioning_data import (
+    BasicConditioningInfo,
+    SDXLConditioningInfo,
+    TextConditioningData,
+)
 from invokeai.backend.tiles.utils import Tile
 
 
@@ -46,7 +51,14 @@ class MultiDiffusionPipeline(StableDiffusionGeneratorPipeline):
         timesteps: torch.Tensor,
         init_timestep: torch.Tensor,
         callback: Callable[[PipelineIntermediateState], None],
+        max_region_batch_size: int = 1,
     ) -> torch.Tensor:
+        """Denoise the latents with Multi-Diffusion.
+
+        With max_region_batch_size > 1, regions of the same size that use the same conditioning are denoised together
+        in a single forward pass, in batches of up to max_region_batch_size regions. The result matches denoising the
+        regions one at a time, except for schedulers that add random noise at each step.
+        """
         self._check_regional_prompting(multi_diffusion_conditioning)
 
         if init_timestep.shape[0] == 0:
@@ -67,6 +79,27 @@ class MultiDiffusionPipeline(StableDiffusionGeneratorPipeline):
         # cropping into regions.
         self._adjust_memory_efficient_attention(latents)
 
+        # The blend weights of the regions do not change from step to step, so they are only built once.
+        region_weights = [
+            self._build_region_weight(region_conditioning.region, latents)
+            for region_conditioning in multi_diffusion_conditioning
+        ]
+        merged_latents_weights = torch.zeros(
+            (1, 1, latent_height, latent_width), device=latents.device, dtype=latents.dtype
+        )
+        for region_conditioning, region_weight in zip(multi_diffusion_conditioning, region_weights, strict=True):
+            region = region_conditioning.region
+            merged_latents_weights[
+                :, :, region.coords.top : region.coords.bottom, region.coords.left : region.coords.right
+            ] += region_weight
+
+        # Regions that can share a UNet forward pass are stacked into region batches of up to max_region_batch_size.
+        region_batches = self._batch_regions(multi_diffusion_conditioning, max_region_batch_size)
+        region_batch_conditioning = [
+            self._stack_region_conditioning([multi_diffusion_conditioning[idx] for idx in region_batch])
+            for region_batch in region_batches
+        ]
+
         # Many of the diffusers schedulers are stateful (i.e. they update internal state in each call to step()). Since
         # we are calling step() multiple times at the same timestep (once for each region batch), we must maintain a
         # separate scheduler state for each region batch.
@@ -75,9 +108,7 @@ class MultiDiffusionPipeline(StableDiffusionGeneratorPipeline):
         # as Multi-Diffusion blending is applied (e.g. the PNDMScheduler). This can result in a blurring effect when
         # multiple MultiDiffusion regions overlap. Solving this properly would require a case-by-case review of each
         # scheduler to determine how it's state needs to be updated for compatibilty with Multi-Diffusion.
-        region_batch_schedulers: list[SchedulerMixin] = [
-            copy.deepcopy(self.scheduler) for _ in multi_diffusion_conditioning
-        ]
+        region_batch_schedulers: list[SchedulerMixin] = [copy.deepcopy(self.scheduler) for _ in region_batches]
 
         callback(
             PipelineIntermediateState(
@@ -90,85 +121,50 @@ class MultiDiffusionPipeline(StableDiffusionGeneratorPipeline):
         )
 
         for i, t in enumerate(self.progress_bar(timesteps)):
-            batched_t = t.expand(batch_size)
-
             merged_latents = torch.zeros_like(latents)
-            merged_latents_weights = torch.zeros(
-                (1, 1, latent_height, latent_width), device=latents.device, dtype=latents.dtype
-            )
             merged_pred_original: torch.Tensor | None = None
-            for region_idx, region_conditioning in enumerate(multi_diffusion_conditioning):
+            for batch_idx, region_batch in enumerate(region_batches):
                 # Switch to the scheduler for the region batch.
-                self.scheduler = region_batch_schedulers[region_idx]
+                self.scheduler = region_batch_schedulers[batch_idx]
 
-                # Crop the inputs to the region.
-                region_latents = latents[
-                    :,
-                    :,
-                    region_conditioning.region.coords.top : region_conditioning.region.coords.bottom,
-                    region_conditioning.region.coords.left : region_conditioning.region.coords.right,
-                ]
+                # Crop the inputs to the regions, and stack them along the batch dimension.
+                region_coords = [multi_diffusion_conditioning[idx].region.coords for idx in region_batch]
+                region_latents = torch.cat([latents[:, :, c.top : c.bottom, c.left : c.right] for c in region_coords])
 
-                # Run the denoising step on the region.
+                # Run the denoising step on the region batch.
+                batch_conditioning = region_batch_conditioning[batch_idx]
                 step_output = self.step(
-                    t=batched_t,
+                    t=t.expand(region_latents.shape[0]),
                     latents=region_latents,
-                    conditioning_data=region_conditioning.text_conditioning_data,
+                    conditioning_data=batch_conditioning.text_conditioning_data,
                     step_index=i,
                     total_step_count=len(timesteps),
                     scheduler_step_kwargs=scheduler_step_kwargs,
                     mask_guidance=None,
                     mask=None,
                     masked_latents=None,
-                    control_data=region_conditioning.control_data,
+                    control_data=batch_conditioning.control_data,
                 )
 
-                # Build a region_weight matrix that applies gradient blending to the edges of the region.
-                region = region_conditioning.region
-                _, _, region_height, region_width = step_output.prev_sample.shape
-                region_weight = torch.ones(
-                    (1, 1, region_height, region_width),
-                    dtype=latents.dtype,
-                    device=latents.device,
-                )
-                if region.overlap.left > 0:
-                    left_grad = torch.linspace(
-                        0, 1, region.overlap.left, device=latents.device, dtype=latents.dtype
-                    ).view((1, 1, 1, -1))
-                    region_weight[:, :, :, : region.overlap.left] *= left_grad
-                if region.overlap.top > 0:
-                    top_grad = torch.linspace(
-                        0, 1, region.overlap.top, device=latents.device, dtype=latents.dtype
-                    ).view((1, 1, -1, 1))
-                    region_weight[:, :, : region.overlap.top, :] *= top_grad
-                if region.overlap.right > 0:
-                    right_grad = torch.linspace(
-                        1, 0, region.overlap.right, device=latents.device, dtype=latents.dtype
-                    ).view((1, 1, 1, -1))
-                    region_weight[:, :, :, -region.overlap.right :] *= right_grad
-                if region.overlap.bottom > 0:
-                    bottom_grad = torch.linspace(
-                        1, 0, region.overlap.bottom, device=latents.device, dtype=latents.dtype
-                    ).view((1, 1, -1, 1))
-                    region_weight[:, :, -region.overlap.bottom :, :] *= bottom_grad
+                # If one region has pred_original_sample, then we can assume that all regions will have it, because
+                # they all use the same scheduler.
+                prev_samples = step_output.prev_sample.chunk(len(region_batch))
+                pred_orig_sample = getattr(step_output, "pred_original_sample", None)
+                pred_orig_samples = pred_orig_sample.chunk(len(region_batch)) if pred_orig_sample is not None else None
 
                 # Update the merged results with the region results.
-                merged_latents[
-                    :, :, region.coords.top : region.coords.bottom, region.coords.left : region.coords.right
-                ] += step_output.prev_sample * region_weight
-                merged_latents_weights[
-                    :, :, region.coords.top : region.coords.bottom, region.coords.left : region.coords.right
-                ] += region_weight
-
-                pred_orig_sample = getattr(step_output, "pred_original_sample", None)
-                if pred_orig_sample is not None:
-                    # If one region has pred_original_sample, then we can assume that all regions will have it, because
-                    # they all use the same scheduler.
-                    if merged_pred_original is None:
-                        merged_pred_original = torch.zeros_like(latents)
-                    merged_pred_original[
+                for batch_pos, region_idx in enumerate(region_batch):
+                    region = multi_diffusion_conditioning[region_idx].region
+                    merged_latents[
                         :, :, region.coords.top : region.coords.bottom, region.coords.left : region.coords.right
-                    ] += pred_orig_sample
+                    ] += prev_samples[batch_pos] * region_weights[region_idx]
+
+                    if pred_orig_samples is not None:
+                        if merged_pred_original is None:
+                            merged_pred_original = torch.zeros_like(latents)
+                        merged_pred_original[
+                            :, :, region.coords.top : region.coords.bottom, region.coords.left : region.coords.right
+                        ] += pred_orig_samples[batch_pos]
 
             # Normalize the merged results.
             latents = torch.where(merged_latents_weights > 0, merged_latents / merged_latents_weights, merged_latents)
@@ -192,3 +188,125 @@ class MultiDiffusionPipeline(StableDiffusionGeneratorPipeline):
             )
 
         return latents
+
+    @staticmethod
+    def _build_region_weight(region: Tile, latents: torch.Tensor) -> torch.Tensor:
+        """Build a region_weight matrix that applies gradient blending to the edges of the region."""
+        region_weight = torch.ones(
+            (1, 1, region.coords.bottom - region.coords.top, region.coords.right - region.coords.left),
+            dtype=latents.dtype,
+            device=latents.device,
+        )
+        if region.overlap.left > 0:
+            left_grad = torch.linspace(0, 1, region.overlap.left, device=latents.device, dtype=latents.dtype).view(
+                (1, 1, 1, -1)
+            )
+            region_weight[:, :, :, : region.overlap.left] *= left_grad
+        if region.overlap.top > 0:
+            top_grad = torch.linspace(0, 1, region.overlap.top, device=latents.device, dtype=latents.dtype).view(
+                (1, 1, -1, 1)
+            )
+            region_weight[:, :, : region.overlap.top, :] *= top_grad
+        if region.overlap.right > 0:
+            right_grad = torch.linspace(1, 0, region.overlap.right, device=latents.device, dtype=latents.dtype).view(
+                (1, 1, 1, -1)
+            )
+            region_weight[:, :, :, -region.overlap.right :] *= right_grad
+        if region.overlap.bottom > 0:
+            bottom_grad = torch.linspace(1, 0, region.overlap.bottom, device=latents.device, dtype=latents.dtype).view(
+                (1, 1, -1, 1)
+            )
+            region_weight[:, :, -region.overlap.bottom :, :] *= bottom_grad
+        return region_weight
+
+    @staticmethod
+    def _batch_regions(
+        multi_diffusion_conditioning: list[MultiDiffusionRegionConditioning], max_region_batch_size: int
+    ) -> list[list[int]]:
+        """Group the regions into batches that can be denoised in a single forward pass.
+
+        Returns a list of region batches, each a list of indices into multi_diffusion_conditioning.
+        """
+        groups: dict[Hashable, list[int]] = {}
+        for region_idx, region_conditioning in enumerate(multi_diffusion_conditioning):
+            key = (
+                MultiDiffusionPipeline._get_region_batch_key(region_conditioning) if max_region_batch_size > 1 else None
+            )
+            # Regions that cannot be batched get a group of their own.
+            groups.setdefault(key if key is not None else ("region", region_idx), []).append(region_idx)
+
+        region_batches: list[list[int]] = []
+        for group in groups.values():
+            for start in range(0, len(group), max_region_batch_size):
+                region_batches.append(group[start : start + max_region_batch_size])
+        return region_batches
+
+    @staticmethod
+    def _get_region_batch_key(region_conditioning: MultiDiffusionRegionConditioning) -> Optional[Hashable]:
+        """Get a key that is equal for regions that can share a forward pass, or None if the region cannot be batched."""
+        coords = region_conditioning.region.coords
+        control_keys: list[Hashable] = []
+        for control_datum in region_conditioning.control_data:
+            if control_datum.control_mode in ("more_control", "unbalanced"):
+                # With cfg_injection, the ControlNet only runs on the conditioned half of the batch.
+                return None
+            weight = control_datum.weight
+            control_keys.append(
+                (
+                    id(control_datum.model),
+                    tuple(weight) if isinstance(weight, list) else weight,
+                    control_datum.begin_step_percent,
+                    control_datum.end_step_percent,
+                    control_datum.control_mode,
+                    tuple(control_datum.image_tensor.shape),
+                )
+            )
+        return (
+            coords.bottom - coords.top,
+            coords.right - coords.left,
+            id(region_conditioning.text_conditioning_data),
+            tuple(control_keys),
+        )
+
+    @staticmethod
+    def _stack_region_conditioning(
+        region_batch: list[MultiDiffusionRegionConditioning],
+    ) -> MultiDiffusionRegionConditioning:
+        """Build the conditioning for a region batch, with each tensor repeated or stacked to match the batch size."""
+        first = region_batch[0]
+        if len(region_batch) == 1:
+            return first
+
+        n = len(region_batch)
+        text_conditioning_data = copy.copy(first.text_conditioning_data)
+        text_conditioning_data.uncond_text = _repeat_conditioning_info(text_conditioning_data.uncond_text, n)
+        text_conditioning_data.cond_text = _repeat_conditioning_info(text_conditioning_data.cond_text, n)
+
+        control_data: list[ControlNetData] = []
+        for control_idx, control_datum in enumerate(first.control_data):
+            # The control images are prepared for classifier-free guidance as [uncond, cond]. The UNet input for the
+            # batch is [uncond regions, cond regions], so the control images are stacked in the same order.
+            uncond_images, cond_images = zip(
+                *(region.control_data[control_idx].image_tensor.chunk(2) for region in region_batch), strict=True
+            )
+            stacked_control_datum = copy.copy(control_datum)
+            stacked_control_datum.image_tensor = torch.cat([*uncond_images, *cond_images])
+            control_data.append(stacked_control_datum)
+
+        return MultiDiffusionRegionConditioning(
+            region=first.region, text_conditioning_data=text_conditioning_data, control_data=control_data
+        )
+
+
+def _repeat_conditioning_info(
+    conditioning_info: BasicConditioningInfo | SDXLConditioningInfo, n: int
+) -> BasicConditioningInfo | SDXLConditioningInfo:
+    """Repeat the text conditioning along the batch dimension, once for each region in a region batch."""
+    if isinstance(conditioning_info, SDXLConditioningInfo):
+        return dataclasses.replace(
+            conditioning_info,
+            embeds=conditioning_info.embeds.repeat(n, 1, 1),
+            pooled_embeds=conditioning_info.pooled_embeds.repeat(n, 1),
+            add_time_ids=conditioning_info.add_time_ids.repeat(n, 1),
+        )
+    return dataclasses.replace(conditioning_info, embeds=conditioning_info.embeds.repeat(n, 1, 1))
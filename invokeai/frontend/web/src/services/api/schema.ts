@@ -916,6 +916,32 @@ export type paths = {
         patch?: never;
         trace?: never;
     };
+    "/api/v2/models/sync/rehash": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Rehash Models
+         * @description Recompute the hashes of all installed models and update any that have changed.
+         *
+         *     Files that have not changed since they were last hashed are not read again. Cached hashes of files that no longer
+         *     exist or have changed are removed first.
+         *
+         *     Returns:
+         *         Response listing the models whose hash changed
+         */
+        post: operations["rehash_models"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/v1/download_queue/": {
         parameters: {
             query?: never;
@@ -1203,6 +1229,8 @@ export type paths = {
          *     via <img src> tags which cannot send Bearer tokens. Image names are UUIDs,
          *     providing security through unguessability. Returns 409 while image storage
          *     maintenance is active.
+         *
+         *     The file is streamed, and supports conditional and range requests.
          */
         get: operations["get_image_full"];
         put?: never;
@@ -1217,6 +1245,8 @@ export type paths = {
          *     via <img src> tags which cannot send Bearer tokens. Image names are UUIDs,
          *     providing security through unguessability. Returns 409 while image storage
          *     maintenance is active.
+         *
+         *     The file is streamed, and supports conditional and range requests.
          */
         head: operations["get_image_full_head"];
         patch?: never;
@@ -1237,6 +1267,8 @@ export type paths = {
          *     via <img src> tags which cannot send Bearer tokens. Image names are UUIDs,
          *     providing security through unguessability. Returns 409 while image storage
          *     maintenance is active.
+         *
+         *     The file is streamed, and supports conditional and range requests.
          */
         get: operations["get_image_thumbnail"];
         put?: never;
@@ -1267,6 +1299,26 @@ export type paths = {
         patch?: never;
         trace?: never;
     };
+    "/api/v1/images/cursor": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * List Image Dtos By Cursor
+         * @description Gets a page of image DTOs for the current user. Unlike list_image_dtos, deep pages are as fast as the first.
+         */
+        get: operations["list_image_dtos_by_cursor"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/v1/images/delete": {
         parameters: {
             query?: never;
@@ -1368,6 +1420,8 @@ export type paths = {
          *
          *     Requires authentication.  The caller must be the user who initiated the
          *     download (tracked by the bulk download service) or an admin.
+         *
+         *     Streamed bulk downloads are sent as the zip file is built.
          */
         get: operations["get_bulk_download_item"];
         put?: never;
@@ -1490,6 +1544,29 @@ export type paths = {
         patch?: never;
         trace?: never;
     };
+    "/api/v1/boards/repair_stats": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        get?: never;
+        put?: never;
+        /**
+         * Repair Board Stats
+         * @description Recomputes the stored image counts and cover images of all boards from their images.
+         *
+         *     The stats are kept up to date as images change, so this is only needed if they were changed outside the app, e.g.
+         *     by editing the database by hand.
+         */
+        post: operations["repair_board_stats"];
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/v1/board_images/": {
         parameters: {
             query?: never;
@@ -1923,6 +2000,26 @@ export type paths = {
         patch?: never;
         trace?: never;
     };
+    "/api/v1/queue/{queue_id}/list": {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        /**
+         * List Queue Items
+         * @description Gets a page of queue items, ordered by priority and then by item id
+         */
+        get: operations["list_queue_items"];
+        put?: never;
+        post?: never;
+        delete?: never;
+        options?: never;
+        head?: never;
+        patch?: never;
+        trace?: never;
+    };
     "/api/v1/queue/{queue_id}/item_ids": {
         parameters: {
             query?: never;
@@ -4406,6 +4503,12 @@ export type components = {
              * @description The board from which image should be downloaded
              */
             board_id?: string | null;
+            /**
+             * Stream
+             * @description Whether to stream the zip file from the download endpoint as it is built, instead of preparing it in the background
+             * @default false
+             */
+            stream?: boolean;
         };
         /** Body_enqueue_batch */
         Body_enqueue_batch: {
@@ -4880,6 +4983,53 @@ export type components = {
              */
             error: string;
         };
+        /**
+         * BulkDownloadProgressEvent
+         * @description Event model for bulk_download_progress
+         */
+        BulkDownloadProgressEvent: {
+            /**
+             * Timestamp
+             * @description The timestamp of the event
+             */
+            timestamp: number;
+            /**
+             * Bulk Download Id
+             * @description The ID of the bulk image download
+             */
+            bulk_download_id: string;
+            /**
+             * Bulk Download Item Id
+             * @description The ID of the bulk image download item
+             */
+            bulk_download_item_id: string;
+            /**
+             * Bulk Download Item Name
+             * @description The name of the bulk image download item
+             */
+            bulk_download_item_name: string;
+            /**
+             * User Id
+             * @description The ID of the user who initiated the download
+             * @default system
+             */
+            user_id: string;
+            /**
+             * Images Written
+             * @description The number of images written to the zip file so far
+             */
+            images_written: number;
+            /**
+             * Total Images
+             * @description The total number of images in the zip file
+             */
+            total_images: number;
+            /**
+             * Bytes Written
+             * @description The number of bytes of the zip file sent so far
+             */
+            bytes_written: number;
+        };
         /**
          * BulkDownloadStartedEvent
          * @description Event model for bulk_download_started
@@ -5368,10 +5518,24 @@ export type components = {
              * @default 0
              */
             cache_size?: number;
+            /**
+             * Bytes Loaded
+             * @default 0
+             */
+            bytes_loaded?: number;
+            /**
+             * Eviction Policy
+             * @default
+             */
+            eviction_policy?: string;
             /** Loaded Model Sizes */
             loaded_model_sizes?: {
                 [key: string]: number;
             };
+            /** Policy Stats */
+            policy_stats?: {
+                [key: string]: components["schemas"]["EvictionPolicyStats"];
+            };
         };
         /**
          * Calculate Image Tiles Even Split
@@ -8339,6 +8503,24 @@ export type components = {
              */
             type: "crop_latents";
         };
+        /** CursorPaginatedResults[SessionQueueItem] */
+        CursorPaginatedResults_SessionQueueItem_: {
+            /**
+             * Limit
+             * @description Limit of items to get
+             */
+            limit: number;
+            /**
+             * Has More
+             * @description Whether there are more items available
+             */
+            has_more: boolean;
+            /**
+             * Items
+             * @description Items
+             */
+            items: components["schemas"]["SessionQueueItem"][];
+        };
         /**
          * OpenCV Inpaint
          * @description Simple inpaint using opencv.
@@ -9066,6 +9248,11 @@ export type components = {
              * @default 10
              */
             priority?: number;
+            /**
+             * Hash Algorithm
+             * @description If set, the file is hashed with this algorithm as it is downloaded
+             */
+            hash_algorithm?: ("blake3_multi" | "blake3_single" | "random" | "md5" | "sha1" | "sha224" | "sha256" | "sha384" | "sha512" | "blake2b" | "blake2s" | "sha3_224" | "sha3_256" | "sha3_384" | "sha3_512" | "shake_128" | "shake_256") | null;
             /**
              * Job Started
              * @description Timestamp for when the download job started
@@ -9117,6 +9304,11 @@ export type components = {
              * @description Message explaining why resume is required
              */
             resume_message?: string | null;
+            /**
+             * Content Hash
+             * @description Digest of the downloaded file with hash_algorithm, without the algorithm prefix, if it was computed during the download
+             */
+            content_hash?: string | null;
             /**
              * Resume From Scratch
              * @description True if resume metadata existed but the partial file was missing and the download restarted from the beginning
@@ -9359,6 +9551,39 @@ export type components = {
              */
             item_ids: number[];
         };
+        /**
+         * EvictionPolicyStats
+         * @description Lifetime counters for a model cache eviction policy, used to compare policies.
+         */
+        EvictionPolicyStats: {
+            /** Policy */
+            policy: string;
+            /**
+             * Hits
+             * @default 0
+             */
+            hits?: number;
+            /**
+             * Misses
+             * @default 0
+             */
+            misses?: number;
+            /**
+             * Bytes Loaded
+             * @default 0
+             */
+            bytes_loaded?: number;
+            /**
+             * Evictions
+             * @default 0
+             */
+            evictions?: number;
+            /**
+             * Bytes Evicted
+             * @default 0
+             */
+            bytes_evicted?: number;
+        };
         /**
          * Expand Mask with Fade
          * @description Expands a mask with a fade effect. The mask uses black to indicate areas to keep from the generated image and white for areas to discard.
@@ -16030,6 +16255,11 @@ export type components = {
              * @description The maximum size of the invocation cache
              */
             max_size: number;
+            /**
+             * Index Size
+             * @description The number of referenced object names tracked for cache invalidation
+             */
+            index_size: number;
         };
         /**
          * InvocationCompleteEvent
@@ -16609,6 +16839,8 @@ export type components = {
          *         device_working_mem_gb: The amount of working memory to keep available on the compute device (in GB). Has no effect if running on CPU. If you are experiencing OOM errors, try increasing this value.
          *         enable_partial_loading: Enable partial loading of models. This enables models to run with reduced VRAM requirements (at the cost of slower speed) by streaming the model from RAM to VRAM as its used. In some edge cases, partial loading can cause models to run more slowly if they were previously being fully loaded into VRAM.
          *         keep_ram_copy_of_weights: Whether to keep a full RAM copy of a model's weights when the model is loaded in VRAM. Keeping a RAM copy increases average RAM usage, but speeds up model switching and LoRA patching (assuming there is sufficient RAM). Set this to False if RAM pressure is consistently high.
+         *         model_cache_eviction_policy: The policy used to choose which models are dropped from the RAM cache to make room. `lru` drops the least recently used model, `lfu` the least frequently used, `greedy_dual` the model with the lowest load time per byte (aged so that unused models eventually go), and `load_time` the model that is quickest to load again relative to how long it has been idle.<br>Valid values: `lru`, `lfu`, `greedy_dual`, `load_time`
+         *         model_prefetch_queue_items: Number of upcoming queue items whose models are loaded into the RAM cache in the background while the current item runs. Models are only prefetched if they fit in the cache without dropping other models. Set to 0 (the default) to disable prefetching.
          *         ram: DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_ram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.
          *         vram: DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_vram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.
          *         lazy_offload: DEPRECATED: This setting is no longer used. Lazy-offloading is enabled by default. This config setting will be removed once the new model cache behavior is stable.
@@ -16620,6 +16852,7 @@ export type components = {
          *         attention_slice_size: Slice size, valid when attention_type=="sliced".<br>Valid values: `auto`, `balanced`, `max`, `1`, `2`, `3`, `4`, `5`, `6`, `7`, `8`
          *         force_tiled_decode: Whether to enable tiled VAE decode (reduces memory consumption with some performance penalty).
          *         pil_compress_level: The compress_level setting of PIL.Image.save(), used for PNG encoding. All settings are lossless. 0 = no compression, 1 = fastest with slightly larger filesize, 9 = slowest with smallest filesize. 1 is typically the best setting.
+         *         image_write_workers: Number of background threads used to encode and write generated images and thumbnails. If 0, images are written on the generation thread before the node completes.
          *         max_queue_size: Maximum number of items in the session queue.
          *         session_queue_mode: Session queue mode. Use 'FIFO' for traditional first-in-first-out, or 'round_robin' to serve each user's jobs in turn. In single-user mode, FIFO is always used regardless of this setting.<br>Valid values: `FIFO`, `round_robin`
          *         clear_queue_on_startup: Empties session queue on startup. If true, disables `max_queue_history`.
@@ -16627,9 +16860,14 @@ export type components = {
          *         allow_nodes: List of nodes to allow. Omit to allow all.
          *         deny_nodes: List of nodes to deny. Omit to deny none.
          *         node_cache_size: How many cached nodes to keep in memory.
+         *         node_cache_type: Where to store cached node outputs. 'memory' keeps them in RAM for the lifetime of the process. 'sqlite' persists them to a database in the `db_dir`, so they survive restarts.<br>Valid values: `memory`, `sqlite`
+         *         node_cache_max_age_hours: The maximum age of a cached node output in hours. Older outputs are evicted. If unset, outputs are only evicted when the cache is full. Only used when `node_cache_type` is 'sqlite'.
          *         hashing_algorithm: Model hashing algorthim for model installs. 'blake3_multi' is best for SSDs. 'blake3_single' is best for spinning disk HDDs. 'random' disables hashing, instead assigning a UUID to models. Useful when using a memory db to reduce model installation time, or if you don't care about storing stable hashes for models. Alternatively, any other hashlib algorithm is accepted, though these are not nearly as performant as blake3.<br>Valid values: `blake3_multi`, `blake3_single`, `random`, `md5`, `sha1`, `sha224`, `sha256`, `sha384`, `sha512`, `blake2b`, `blake2s`, `sha3_224`, `sha3_256`, `sha3_384`, `sha3_512`, `shake_128`, `shake_256`
+         *         hashing_concurrency: Maximum number of models hashed at once when rehashing the model library. Raise this for SSDs; keep it at 1 for spinning disk HDDs.
+         *         download_segments: Number of connections used to download each large model file. If the server supports range requests, a file is split into this many byte ranges that are fetched at once. 1 downloads each file over a single connection.
          *         remote_api_tokens: List of regular expression and token pairs used when downloading models from URLs. The download URL is tested against the regex, and if it matches, the token is provided in as a Bearer token.
          *         scan_models_on_startup: Scan the models directory on startup, registering orphaned models. This is typically only used in conjunction with `use_memory_db` for testing purposes.
+         *         scan_models_interval: Re-scan the models directory at this interval in seconds while the app is running, registering models that were added and warning about models that went missing. Directories that have not changed since the last scan are not listed again. Leave unset to disable.
          *         unsafe_disable_picklescan: UNSAFE. Disable the picklescan security check during model installation. Recommended only for development and testing purposes. This will allow arbitrary code execution during model installation, so should never be used in production.
          *         allow_unknown_models: Allow installation of models that we are unable to identify. If enabled, models will be marked as `unknown` in the database, and will not have any metadata associated with them. If disabled, unknown models will be rejected during installation.
          *         multiuser: Enable multiuser support. When disabled, the application runs in single-user mode using a default system account with administrator privileges. When enabled, requires user authentication and authorization.
@@ -16644,6 +16882,7 @@ export type components = {
          *         external_seedream_base_url: Base URL override for Seedream image generation.
          *         base_url: Public base path when running behind a reverse proxy under a sub-path, e.g. `/invoke`. Set only when the proxy PRESERVES the sub-path (the backend receives `/invoke/api/...`). Leave unset when the proxy strips the sub-path or when serving at the domain root.
          *         forwarded_allow_ips: Comma-separated list of IPs (or `*`) allowed to set X-Forwarded-* headers. Set to the reverse proxy's IP. Only used when `base_url` is set.
+         *         progress_event_interval: Minimum time in seconds between progress events sent for the same invocation. Progress events that arrive in between are coalesced, and only the latest one is sent. Set to 0 to send every progress event.
          */
         InvokeAIAppConfig: {
             /**
@@ -16718,6 +16957,12 @@ export type components = {
              * @default 127.0.0.1
              */
             forwarded_allow_ips?: string;
+            /**
+             * Progress Event Interval
+             * @description Minimum time in seconds between progress events sent for the same invocation. Progress events that arrive in between are coalesced, and only the latest one is sent. Set to 0 to send every progress event.
+             * @default 0.1
+             */
+            progress_event_interval?: number;
             /**
              * Log Tokenization
              * @description Enable logging of parsed prompt tokens.
@@ -16905,6 +17150,19 @@ export type components = {
              * @default true
              */
             keep_ram_copy_of_weights?: boolean;
+            /**
+             * Model Cache Eviction Policy
+             * @description The policy used to choose which models are dropped from the RAM cache to make room. `lru` drops the least recently used model, `lfu` the least frequently used, `greedy_dual` the model with the lowest load time per byte (aged so that unused models eventually go), and `load_time` the model that is quickest to load again relative to how long it has been idle.
+             * @default lru
+             * @enum {string}
+             */
+            model_cache_eviction_policy?: "lru" | "lfu" | "greedy_dual" | "load_time";
+            /**
+             * Model Prefetch Queue Items
+             * @description Number of upcoming queue items whose models are loaded into the RAM cache in the background while the current item runs. Models are only prefetched if they fit in the cache without dropping other models. Set to 0 (the default) to disable prefetching.
+             * @default 0
+             */
+            model_prefetch_queue_items?: number;
             /**
              * Ram
              * @description DEPRECATED: This setting is no longer used. It has been replaced by `max_cache_ram_gb`, but most users will not need to use this config since automatic cache size limits should work well in most cases. This config setting will be removed once the new model cache behavior is stable.
@@ -16971,6 +17229,12 @@ export type components = {
              * @default 1
              */
             pil_compress_level?: number;
+            /**
+             * Image Write Workers
+             * @description Number of background threads used to encode and write generated images and thumbnails. If 0, images are written on the generation thread before the node completes.
+             * @default 0
+             */
+            image_write_workers?: number;
             /**
              * Max Queue Size
              * @description Maximum number of items in the session queue.
@@ -17011,6 +17275,18 @@ export type components = {
              * @default 512
              */
             node_cache_size?: number;
+            /**
+             * Node Cache Type
+             * @description Where to store cached node outputs. 'memory' keeps them in RAM for the lifetime of the process. 'sqlite' persists them to a database in the `db_dir`, so they survive restarts.
+             * @default memory
+             * @enum {string}
+             */
+            node_cache_type?: "memory" | "sqlite";
+            /**
+             * Node Cache Max Age Hours
+             * @description The maximum age of a cached node output in hours. Older outputs are evicted. If unset, outputs are only evicted when the cache is full. Only used when `node_cache_type` is 'sqlite'.
+             */
+            node_cache_max_age_hours?: number | null;
             /**
              * Hashing Algorithm
              * @description Model hashing algorthim for model installs. 'blake3_multi' is best for SSDs. 'blake3_single' is best for spinning disk HDDs. 'random' disables hashing, instead assigning a UUID to models. Useful when using a memory db to reduce model installation time, or if you don't care about storing stable hashes for models. Alternatively, any other hashlib algorithm is accepted, though these are not nearly as performant as blake3.
@@ -17018,6 +17294,18 @@ export type components = {
              * @enum {string}
              */
             hashing_algorithm?: "blake3_multi" | "blake3_single" | "random" | "md5" | "sha1" | "sha224" | "sha256" | "sha384" | "sha512" | "blake2b" | "blake2s" | "sha3_224" | "sha3_256" | "sha3_384" | "sha3_512" | "shake_128" | "shake_256";
+            /**
+             * Hashing Concurrency
+             * @description Maximum number of models hashed at once when rehashing the model library. Raise this for SSDs; keep it at 1 for spinning disk HDDs.
+             * @default 1
+             */
+            hashing_concurrency?: number;
+            /**
+             * Download Segments
+             * @description Number of connections used to download each large model file. If the server supports range requests, a file is split into this many byte ranges that are fetched at once. 1 downloads each file over a single connection.
+             * @default 1
+             */
+            download_segments?: number;
             /**
              * Remote Api Tokens
              * @description List of regular expression and token pairs used when downloading models from URLs. The download URL is tested against the regex, and if it matches, the token is provided in as a Bearer token.
@@ -17029,6 +17317,11 @@ export type components = {
              * @default false
              */
             scan_models_on_startup?: boolean;
+            /**
+             * Scan Models Interval
+             * @description Re-scan the models directory at this interval in seconds while the app is running, registering models that were added and warning about models that went missing. Directories that have not changed since the last scan are not listed again. Leave unset to disable.
+             */
+            scan_models_interval?: number | null;
             /**
              * Unsafe Disable Picklescan
              * @description UNSAFE. Disable the picklescan security check during model installation. Recommended only for development and testing purposes. This will allow arbitrary code execution during model installation, so should never be used in production.
@@ -17706,6 +17999,29 @@ export type components = {
             type: "iterate_output";
         };
         JsonValue: unknown;
+        /** KeysetPaginatedResults[ImageDTO] */
+        KeysetPaginatedResults_ImageDTO_: {
+            /**
+             * Limit
+             * @description Limit of items to get
+             */
+            limit: number;
+            /**
+             * Next Cursor
+             * @description Cursor from which to retrieve the next page, if there is one
+             */
+            next_cursor: string | null;
+            /**
+             * Total
+             * @description Total number of items in result, if it was requested
+             */
+            total: number | null;
+            /**
+             * Items
+             * @description Items
+             */
+            items: components["schemas"]["ImageDTO"][];
+        };
         /**
          * LaMa Infill
          * @description Infills transparent areas of an image using the LaMa model
@@ -27102,6 +27418,19 @@ export type components = {
              */
             image_name: string;
         };
+        /**
+         * RehashModelsResponse
+         * @description Response from rehashing the installed models.
+         */
+        RehashModelsResponse: {
+            /**
+             * Changed
+             * @description The keys of models whose hash changed, with their new hash
+             */
+            changed: {
+                [key: string]: string;
+            };
+        };
         /**
          * RemoteModelFile
          * @description Information about a downloadable file that forms part of a model.
@@ -27144,6 +27473,14 @@ export type components = {
              */
             removed_images: string[];
         };
+        /** RepairBoardStatsResult */
+        RepairBoardStatsResult: {
+            /**
+             * Repaired Boards
+             * @description The number of boards whose image counts or cover image were wrong.
+             */
+            repaired_boards: number;
+        };
         /**
          * Resize Latents
          * @description Resizes latents to explicit width/height (in pixels). Provided dimensions are floor-divided by 8.
@@ -35902,6 +36239,26 @@ export interface operations {
             };
         };
     };
+    rehash_models: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["RehashModelsResponse"];
+                };
+            };
+        };
+    };
     list_downloads: {
         parameters: {
             query?: never;
@@ -36646,6 +37003,56 @@ export interface operations {
             };
         };
     };
+    list_image_dtos_by_cursor: {
+        parameters: {
+            query?: {
+                /** @description The origin of images to list. */
+                image_origin?: components["schemas"]["ResourceOrigin"] | null;
+                /** @description The categories of image to include. */
+                categories?: components["schemas"]["ImageCategory"][] | null;
+                /** @description Whether to list intermediate images. */
+                is_intermediate?: boolean | null;
+                /** @description The board id to filter by. Use 'none' to find images without a board. */
+                board_id?: string | null;
+                /** @description The cursor returned with the previous page. Omit to get the first page. */
+                cursor?: string | null;
+                /** @description The number of images per page */
+                limit?: number;
+                /** @description The order of sort */
+                order_dir?: components["schemas"]["SQLiteDirection"];
+                /** @description Whether to sort by starred images first */
+                starred_first?: boolean;
+                /** @description The term to search for */
+                search_term?: string | null;
+                /** @description Whether to count the total number of images. Only needed for the first page. */
+                include_total?: boolean;
+            };
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["KeysetPaginatedResults_ImageDTO_"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     delete_images_from_list: {
         parameters: {
             query?: never;
@@ -37128,6 +37535,26 @@ export interface operations {
             };
         };
     };
+    repair_board_stats: {
+        parameters: {
+            query?: never;
+            header?: never;
+            path?: never;
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["RepairBoardStatsResult"];
+                };
+            };
+        };
+    };
     add_image_to_board: {
         parameters: {
             query?: never;
@@ -37950,6 +38377,49 @@ export interface operations {
             };
         };
     };
+    list_queue_items: {
+        parameters: {
+            query?: {
+                /** @description The number of items to fetch */
+                limit?: number;
+                /** @description The status of items to fetch */
+                status?: ("pending" | "in_progress" | "waiting" | "completed" | "failed" | "canceled") | null;
+                /** @description The item_id of the last item of the previous page */
+                cursor?: number | null;
+                /** @description The priority of the last item of the previous page */
+                priority?: number;
+                /** @description The destination of queue items to fetch */
+                destination?: string | null;
+            };
+            header?: never;
+            path: {
+                /** @description The queue id to perform this operation on */
+                queue_id: string;
+            };
+            cookie?: never;
+        };
+        requestBody?: never;
+        responses: {
+            /** @description Successful Response */
+            200: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["CursorPaginatedResults_SessionQueueItem_"];
+                };
+            };
+            /** @description Validation Error */
+            422: {
+                headers: {
+                    [name: string]: unknown;
+                };
+                content: {
+                    "application/json": components["schemas"]["HTTPValidationError"];
+                };
+            };
+        };
+    };
     get_queue_item_ids: {
         parameters: {
             query?: {
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+benchmark_queue_and_graph.py
+
+Benchmark the CPU-only core of the app: the graph executor and the session queue.
+
+Synthetic graphs (wide iterate/collect fan-outs, deep chains and nested if branches) are executed to completion with
+`GraphExecutionState.next()`/`complete()`, and a large batch is expanded, enqueued and dequeued with an in-memory
+`SqliteSessionQueue`. The graphs are built from trivial built-in invocations (integer math, ranges, booleans and ifs)
+that are invoked without a context, so the timings are dominated by scheduler and queue overhead.
+
+Each scenario is run `--repeat` times and reports the min and median time spent in each phase. A separate, final run
+is traced with `tracemalloc` to report the peak traced memory and net allocated blocks for each phase, so that the
+tracing overhead does not skew the timings.
+
+The report is printed as JSON (or written to `--output`), so it can be stored and compared across commits:
+
+    python scripts/benchmark_queue_and_graph.py --output benchmark.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Iterator
+
+from invokeai.app.invocations.baseinvocation import BaseInvocation
+from invokeai.app.invocations.collections import RangeInvocation
+from invokeai.app.invocations.logic import IfInvocation
+from invokeai.app.invocations.math import AddInvocation
+from invokeai.app.invocations.primitives import BooleanInvocation
+from invokeai.app.services.config.config_default import InvokeAIAppConfig
+from invokeai.app.services.events.events_base import EventServiceBase
+from invokeai.app.services.image_files.image_files_disk import DiskImageFileStorage
+from invokeai.app.services.session_queue.session_queue_common import (
+    DEFAULT_QUEUE_ID,
+    Batch,
+    BatchDatum,
+    prepare_values_to_insert,
+)
+from invokeai.app.services.session_queue.session_queue_sqlite import SqliteSessionQueue
+from invokeai.app.services.shared.graph import (
+    CollectInvocation,
+    Edge,
+    EdgeConnection,
+    Graph,
+    GraphExecutionState,
+    IterateInvocation,
+    _ExecutionMaterializer,
+)
+from invokeai.app.services.shared.sqlite.sqlite_util import init_db
+from invokeai.version import __version__
+
+SCHEMA_VERSION = 1
+
+
+class PhaseTimer:
+    """Accumulates the time spent in, and the number of calls to, named phases."""
+
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.calls: dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+            self.calls[name] += 1
+
+
+class AllocationTracker:
+    """Records the peak traced memory and net allocated blocks of named phases, while tracemalloc is running."""
+
+    def __init__(self) -> None:
+        self.peak_bytes: dict[str, int] = defaultdict(int)
+        self.net_blocks: dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        tracemalloc.reset_peak()
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        start_blocks = sys.getallocatedblocks()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            self.peak_bytes[name] = max(self.peak_bytes[name], peak - start_bytes)
+            self.net_blocks[name] += sys.getallocatedblocks() - start_blocks
+
+
+Recorder = PhaseTimer | AllocationTracker
+
+
+def _edge(source: str, source_field: str, destination: str, destination_field: str) -> Edge:
+    return Edge(
+        source=EdgeConnection(node_id=source, field=source_field),
+        destination=EdgeConnection(node_id=destination, field=destination_field),
+    )
+
+
+def build_wide_fanout_graph(width: int) -> Graph:
+    """range -> iterate -> add -> collect, with `width` iterations."""
+    graph = Graph()
+    graph.add_node(RangeInvocation(id="range", start=0, stop=width, step=1))
+    graph.add_node(IterateInvocation(id="iterate"))
+    graph.add_node(AddInvocation(id="add", b=1))
+    graph.add_node(CollectInvocation(id="collect"))
+    graph.add_edge(_edge("range", "collection", "iterate", "collection"))
+    graph.add_edge(_edge("iterate", "item", "add", "a"))
+    graph.add_edge(_edge("add", "value", "collect", "item"))
+    return graph
+
+
+def build_deep_chain_graph(depth: int) -> Graph:
+    """A single chain of `depth` add nodes."""
+    graph = Graph()
+    graph.add_node(AddInvocation(id="add-0", a=0, b=1))
+    for i in range(1, depth):
+        graph.add_node(AddInvocation(id=f"add-{i}", b=1))
+        graph.add_edge(_edge(f"add-{i - 1}", "value", f"add-{i}", "a"))
+    return graph
+
+
+def build_nested_if_graph(depth: int, branch_length: int) -> Graph:
+    """`depth` nested ifs. Each if selects between the previous if's output and a chain of `branch_length` adds.
+
+    The conditions alternate, so half of the branches are skipped.
+    """
+    graph = Graph()
+    graph.add_node(AddInvocation(id="seed", a=0, b=1))
+    previous = "seed"
+    for i in range(depth):
+        graph.add_node(BooleanInvocation(id=f"condition-{i}", value=i % 2 == 0))
+        graph.add_node(AddInvocation(id=f"branch-{i}-0", a=i, b=1))
+        for j in range(1, branch_length):
+            graph.add_node(AddInvocation(id=f"branch-{i}-{j}", b=1))
+            graph.add_edge(_edge(f"branch-{i}-{j - 1}", "value", f"branch-{i}-{j}", "a"))
+        graph.add_node(IfInvocation(id=f"if-{i}"))
+        graph.add_edge(_edge(f"condition-{i}", "value", f"if-{i}", "condition"))
+        graph.add_edge(_edge(previous, "value", f"if-{i}", "true_input"))
+        graph.add_edge(_edge(f"branch-{i}-{branch_length - 1}", "value", f"if-{i}", "false_input"))
+        previous = f"if-{i}"
+    return graph
+
+
+@contextmanager
+def _record_materializer(recorder: Recorder) -> Iterator[None]:
+    original_prepare = _ExecutionMaterializer.prepare
+
+    def prepare(self: _ExecutionMaterializer, *args: Any, **kwargs: Any) -> Any:
+        with recorder.phase("materializer_prepare"):
+            return original_prepare(self, *args, **kwargs)
+
+    _ExecutionMaterializer.prepare = prepare  # type: ignore[method-assign]
+    try:
+        yield
+    finally:
+        _ExecutionMaterializer.prepare = original_prepare  # type: ignore[method-assign]
+
+
+def run_graph(graph: Graph, recorder: Recorder) -> int:
+    """Execute a graph to completion, recording each phase. Returns the number of nodes executed."""
+    executed = 0
+    with _record_materializer(recorder):
+        with recorder.phase("create_state"):
+            state = GraphExecutionState(graph=graph)
+        while True:
+            with recorder.phase("next"):
+                invocation: BaseInvocation | None = state.next()
+            if invocation is None:
+                break
+            with recorder.phase("invoke"):
+                output = invocation.invoke(None)  # type: ignore[arg-type]
+            with recorder.phase("complete"):
+                state.complete(invocation.id, output)
+            executed += 1
+    return executed
+
+
+def _build_session_queue(config: InvokeAIAppConfig, image_dir: Path) -> SqliteSessionQueue:
+    logger = logging.getLogger("benchmark")
+    db = init_db(config=config, logger=logger, image_files=DiskImageFileStorage(image_dir))
+    queue = SqliteSessionQueue(db=db)
+    services = SimpleNamespace(configuration=config, events=EventServiceBase(), logger=logger)
+    queue.start(SimpleNamespace(services=services))  # type: ignore[arg-type]
+    return queue
+
+
+def build_batch(size: int) -> Batch:
+    graph = Graph()
+    graph.add_node(AddInvocation(id="add", a=0, b=1))
+    graph.add_node(AddInvocation(id="add-2", b=1))
+    graph.add_edge(_edge("add", "value", "add-2", "a"))
+    return Batch(graph=graph, data=[[BatchDatum(node_path="add", field_name="a", items=list(range(size)))]])
+
+
+def run_queue(batch: Batch, recorder: Recorder) -> int:
+    """Expand, enqueue and dequeue a batch with an in-memory session queue. Returns the number of items dequeued."""
+    size = len(batch.data[0][0].items) if batch.data else batch.runs
+    config = InvokeAIAppConfig(use_memory_db=True, max_queue_size=size)
+    with tempfile.TemporaryDirectory() as image_dir:
+        queue = _build_session_queue(config, Path(image_dir))
+        with recorder.phase("prepare_values_to_insert"):
+            prepare_values_to_insert(
+                queue_id=DEFAULT_QUEUE_ID, batch=batch, priority=0, max_new_queue_items=config.max_queue_size
+            )
+        with recorder.phase("enqueue_batch"):
+            asyncio.run(queue.enqueue_batch(queue_id=DEFAULT_QUEUE_ID, batch=batch, prepend=False))
+        dequeued = 0
+        while True:
+            with recorder.phase("dequeue"):
+                queue_item = queue.dequeue()
+            if queue_item is None:
+                break
+            dequeued += 1
+    return dequeued
+
+
+def _measure(run: Callable[[Recorder], int], repeat: int) -> dict[str, Any]:
+    totals: dict[str, list[float]] = defaultdict(list)
+    calls: dict[str, int] = {}
+    count = 0
+    for _ in range(repeat):
+        timer = PhaseTimer()
+        start = time.perf_counter()
+        count = run(timer)
+        totals["total"].append(time.perf_counter() - start)
+        for name, seconds in timer.seconds.items():
+            totals[name].append(seconds)
+        calls = dict(timer.calls)
+
+    allocations = AllocationTracker()
+    tracemalloc.start()
+    try:
+        run(allocations)
+    finally:
+        tracemalloc.stop()
+
+    phases: dict[str, Any] = {}
+    for name, samples in totals.items():
+        phases[name] = {
+            "calls": calls.get(name, 1),
+            "min_seconds": min(samples),
+            "median_seconds": statistics.median(samples),
+        }
+        if name in allocations.peak_bytes:
+            phases[name]["peak_traced_bytes"] = allocations.peak_bytes[name]
+            phases[name]["net_allocated_blocks"] = allocations.net_blocks[name]
+    return {"count": count, "phases": phases}
+
+
+def run_benchmarks(
+    repeat: int = 5,
+    fanout_width: int = 200,
+    chain_depth: int = 200,
+    if_depth: int = 50,
+    if_branch_length: int = 3,
+    batch_size: int = 1000,
+) -> dict[str, Any]:
+    """Run all scenarios and return the report."""
+    graph_scenarios: dict[str, tuple[dict[str, int], Callable[[], Graph]]] = {
+        "wide_fanout": ({"width": fanout_width}, lambda: build_wide_fanout_graph(fanout_width)),
+        "deep_chain": ({"depth": chain_depth}, lambda: build_deep_chain_graph(chain_depth)),
+        "nested_if": (
+            {"depth": if_depth, "branch_length": if_branch_length},
+            lambda: build_nested_if_graph(if_depth, if_branch_length),
+        ),
+    }
+
+    scenarios: dict[str, Any] = {}
+    for name, (params, build_graph) in graph_scenarios.items():
+        graph = build_graph()
+        result = _measure(lambda recorder, graph=graph: run_graph(graph, recorder), repeat)
+        scenarios[name] = {"params": params, "nodes_executed": result["count"], "phases": result["phases"]}
+
+    batch = build_batch(batch_size)
+    result = _measure(lambda recorder: run_queue(batch, recorder), repeat)
+    scenarios["large_batch"] = {
+        "params": {"batch_size": batch_size},
+        "items_dequeued": result["count"],
+        "phases": result["phases"],
+    }
+
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "invokeai_version": __version__,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "scenarios": scenarios,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", type=Path, help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of timed runs per scenario")
+    parser.add_argument("--fanout-width", type=int, default=200, help="Number of iterations in the fan-out graph")
+    parser.add_argument("--chain-depth", type=int, default=200, help="Number of nodes in the chain graph")
+    parser.add_argument("--if-depth", type=int, default=50, help="Number of nested ifs")
+    parser.add_argument("--if-branch-length", type=int, default=3, help="Number of nodes in each if branch")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Number of queue items in the batch")
+    args = parser.parse_args()
+
+    report = run_benchmarks(
+        repeat=args.repeat,
+        fanout_width=args.fanout_width,
+        chain_depth=args.chain_depth,
+        if_depth=args.if_depth,
+        if_branch_length=args.if_branch_length,
+        batch_size=args.batch_size,
+    )
+    report_json = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(report_json + "\n")
+    else:
+        print(report_json)
+
+
+if __name__ == "__main__":
+    main()
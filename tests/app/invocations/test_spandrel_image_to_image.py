@@ -0,0 +1,132 @@
+"""Tests for batched tile inference in SpandrelImageToImageInvocation."""
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from invokeai.app.invocations.spandrel_image_to_image import SpandrelImageToImageInvocation
+from invokeai.app.services.session_processor.session_processor_common import CanceledException
+from invokeai.backend.spandrel_image_to_image_model import SpandrelImageToImageModel
+from invokeai.backend.util.devices import TorchDevice
+
+
+class FakeSpandrelModel:
+    """Stands in for a spandrel ImageModelDescriptor. Upscales 2x, and pushes some values out of range to be clamped."""
+
+    scale = 2
+    dtype = torch.float32
+
+    def __init__(self) -> None:
+        self.batch_sizes: list[int] = []
+
+    def __call__(self, image_tensor: torch.Tensor) -> torch.Tensor:
+        self.batch_sizes.append(image_tensor.shape[0])
+        upscaled = torch.nn.functional.interpolate(image_tensor, scale_factor=2, mode="bicubic", align_corners=False)
+        return upscaled * 1.2 - 0.1
+
+
+def _image(width: int, height: int) -> Image.Image:
+    rng = np.random.default_rng(0)
+    return Image.fromarray(rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8))
+
+
+def _upscale(image: Image.Image, tile_size: int, max_batch_size: int) -> tuple[Image.Image, list[int]]:
+    fake_model = FakeSpandrelModel()
+    output = SpandrelImageToImageInvocation.upscale_image(
+        image,
+        tile_size,
+        SpandrelImageToImageModel(fake_model),  # type: ignore[arg-type]
+        is_canceled=lambda: False,
+        step_callback=lambda step, total_steps: None,
+        max_batch_size=max_batch_size,
+    )
+    return output, fake_model.batch_sizes
+
+
+@pytest.mark.parametrize("max_batch_size", [2, 4, 100])
+def test_batched_upscale_matches_sequential_upscale(max_batch_size: int):
+    image = _image(300, 200)
+
+    sequential_output, sequential_batch_sizes = _upscale(image, tile_size=96, max_batch_size=1)
+    batched_output, batched_batch_sizes = _upscale(image, tile_size=96, max_batch_size=max_batch_size)
+
+    assert sequential_output.size == (600, 400)
+    assert batched_output.tobytes() == sequential_output.tobytes()
+    assert set(sequential_batch_sizes) == {1}
+    assert sum(batched_batch_sizes) == len(sequential_batch_sizes)
+    assert max(batched_batch_sizes) == min(max_batch_size, len(sequential_batch_sizes))
+
+
+def test_upscale_without_tiling_runs_one_tile():
+    image = _image(64, 48)
+
+    output, batch_sizes = _upscale(image, tile_size=0, max_batch_size=4)
+
+    assert output.size == (128, 96)
+    assert batch_sizes == [1]
+
+
+def test_upscale_reports_progress_per_tile_and_can_be_canceled():
+    image = _image(300, 200)
+    steps: list[tuple[int, int]] = []
+
+    SpandrelImageToImageInvocation.upscale_image(
+        image,
+        96,
+        SpandrelImageToImageModel(FakeSpandrelModel()),  # type: ignore[arg-type]
+        is_canceled=lambda: False,
+        step_callback=lambda step, total_steps: steps.append((step, total_steps)),
+        max_batch_size=4,
+    )
+    total_steps = steps[0][1]
+    assert steps == [(step, total_steps) for step in range(total_steps + 1)]
+
+    with pytest.raises(CanceledException):
+        SpandrelImageToImageInvocation.upscale_image(
+            image,
+            96,
+            SpandrelImageToImageModel(FakeSpandrelModel()),  # type: ignore[arg-type]
+            is_canceled=lambda: True,
+            step_callback=lambda step, total_steps: None,
+            max_batch_size=4,
+        )
+
+
+def test_calc_max_batch_size_fits_working_memory_budget(monkeypatch: pytest.MonkeyPatch):
+    image = _image(300, 200)
+    spandrel_model = SpandrelImageToImageModel(FakeSpandrelModel())  # type: ignore[arg-type]
+    tile_memory = spandrel_model.estimate_working_memory(96, 96)
+
+    # Batching is only used on accelerators
+    monkeypatch.setattr(TorchDevice, "choose_torch_device", lambda: torch.device("cpu"))
+    assert SpandrelImageToImageInvocation.calc_max_batch_size(image, 96, spandrel_model, tile_memory * 3) == 1
+
+    monkeypatch.setattr(TorchDevice, "choose_torch_device", lambda: torch.device("cuda"))
+    assert SpandrelImageToImageInvocation.calc_max_batch_size(image, 96, spandrel_model, tile_memory * 3) == 3
+    assert SpandrelImageToImageInvocation.calc_max_batch_size(image, 96, spandrel_model, tile_memory // 2) == 1
+
+
+@pytest.mark.cuda
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="Requires CUDA device.")
+@pytest.mark.parametrize("max_batch_size", [2, 100])
+def test_batched_upscale_on_cuda_matches_sequential_upscale(monkeypatch: pytest.MonkeyPatch, max_batch_size: int):
+    """On CUDA, output tiles are copied to the host on a side stream while the next batch runs."""
+    monkeypatch.setattr(TorchDevice, "choose_torch_device", lambda: torch.device("cuda"))
+    copy_to_host = SpandrelImageToImageInvocation._copy_to_host
+    copy_events: list[torch.cuda.Event | None] = []
+
+    def spy_copy_to_host(tensor: torch.Tensor, copy_stream: torch.cuda.Stream | None):
+        host_tensor, copied = copy_to_host(tensor, copy_stream)
+        copy_events.append(copied)
+        return host_tensor, copied
+
+    monkeypatch.setattr(SpandrelImageToImageInvocation, "_copy_to_host", staticmethod(spy_copy_to_host))
+    image = _image(300, 200)
+
+    sequential_output, sequential_batch_sizes = _upscale(image, tile_size=96, max_batch_size=1)
+    batched_output, batched_batch_sizes = _upscale(image, tile_size=96, max_batch_size=max_batch_size)
+
+    assert copy_events and all(copied is not None for copied in copy_events)
+    assert len(copy_events) == len(sequential_batch_sizes) + len(batched_batch_sizes)
+    assert batched_output.tobytes() == sequential_output.tobytes()
@@ -675,3 +675,13 @@ def test_admin_can_change_any_board_visibility(client: TestClient, admin_token:
     )
     assert response.status_code == status.HTTP_201_CREATED
     assert response.json()["board_visibility"] == "public"
+
+
+def test_repair_board_stats_admin_only(client: TestClient, admin_token: str, user1_token: str):
+    """Test that only an admin can repair the stored stats of the boards."""
+    response = client.post("/api/v1/boards/repair_stats", headers={"Authorization": f"Bearer {user1_token}"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.post("/api/v1/boards/repair_stats", headers={"Authorization": f"Bearer {admin_token}"})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"repaired_boards": 0}
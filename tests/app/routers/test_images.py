@@ -220,3 +220,160 @@ def test_get_bulk_download_image_image_deleted_after_response(
     client.get("/api/v1/images/download/test.zip")
 
     assert not (tmp_path / "test.zip").exists()
+
+
+def prepare_image_file_test(monkeypatch: Any, mock_invoker: Invoker, tmp_path: Path) -> Path:
+    image_file = tmp_path / "test.png"
+    image_file.write_bytes(b"0123456789" * 10)
+    mock_deps = MockApiDependencies(mock_invoker)
+    monkeypatch.setattr("invokeai.app.api.routers.images.ApiDependencies", mock_deps)
+    monkeypatch.setattr(mock_invoker.services.images, "get_path", lambda *args, **kwargs: str(image_file))
+    monkeypatch.setattr(
+        mock_invoker.services.image_records, "get", MagicMock(return_value=MagicMock(created_at="2024-01-01"))
+    )
+    return image_file
+
+
+@pytest.mark.parametrize("url", ["/api/v1/images/i/test.png/full", "/api/v1/images/i/test.png/thumbnail"])
+def test_get_image_file_is_streamed_with_validators(
+    url: str, monkeypatch: Any, mock_invoker: Invoker, tmp_path: Path, client: TestClient
+) -> None:
+    image_file = prepare_image_file_test(monkeypatch, mock_invoker, tmp_path)
+
+    response = client.get(url)
+
+    assert response.status_code == 200
+    assert response.content == image_file.read_bytes()
+    assert response.headers["etag"].startswith('"')
+    assert response.headers["last-modified"]
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["cache-control"].startswith("max-age=")
+
+
+def test_get_image_full_etag_depends_on_variant(
+    monkeypatch: Any, mock_invoker: Invoker, tmp_path: Path, client: TestClient
+) -> None:
+    prepare_image_file_test(monkeypatch, mock_invoker, tmp_path)
+
+    full = client.get("/api/v1/images/i/test.png/full")
+    thumbnail = client.get("/api/v1/images/i/test.png/thumbnail")
+
+    assert full.headers["etag"] != thumbnail.headers["etag"]
+    assert full.headers["content-disposition"] == 'inline; filename="test.png"'
+    assert "content-disposition" not in thumbnail.headers
+
+
+def test_get_image_full_reads_image_record_once(
+    monkeypatch: Any, mock_invoker: Invoker, tmp_path: Path, client: TestClient
+) -> None:
+    prepare_image_file_test(monkeypatch, mock_invoker, tmp_path)
+    get_path = MagicMock(return_value=str(tmp_path / "test.png"))
+    monkeypatch.setattr(mock_invoker.services.images, "get_path", get_path)
+
+    response = client.get("/api/v1/images/i/test.png/full")
+
+    assert response.status_code == 200
+    mock_invoker.services.image_records.get.assert_called_once_with("test.png")
+    assert get_path.call_args.kwargs["image_record"] is mock_invoker.services.image_records.get.return_value
+
+
+@pytest.mark.parametrize("if_none_match", ["{etag}", "W/{etag}", '"other", {etag}', "*"])
+def test_get_image_full_if_none_match(
+    if_none_match: str, monkeypatch: Any, mock_invoker: Invoker, tmp_path: Path, client: TestClient
+) -> None:
+    prepare_image_file_test(monkeypatch, mock_invoker, tmp_path)
+    etag = client.get("/api/v1/images/i/test.png/full").headers["etag"]
+
+    response = client.get("/api/v1/images/i/test.png/full", headers={"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_get_image_full_if_none_match_changed(
+    monkeypatch: Any, mock_invoker: Invoker, tmp_path: Path, client: TestClient
+) -> None:
+    prepare_image_file_test(monkeypatch, mock_invoker, tmp_path)
+    last_modified = client.get("/api/v1/images/i/test.png/full").headers["last-modified"]
+
+    # If-None-Match takes precedence over If-Modified-Since
+    response = client.get(
+        "/api/v1/images/i/test.png/full",
+        headers={"If-None-Match": '"stale"', "If-Modified-Since": last_modified},
+    )
+
+    assert response.status_code == 200
+
+
+def test_get_image_full_if_modified_since(
+    monkeypatch: Any, mock_invoker: Invoker, tmp_path: Path, client: TestClient
+) -> None:
+    image_file = prepare_image_file_test(monkeypatch, mock_invoker, tmp_path)
+    last_modified = client.get("/api/v1/images/i/test.png/full").headers["last-modified"]
+
+    response = client.get("/api/v1/images/i/test.png/full", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+    os.utime(image_file, (image_file.stat().st_atime, image_file.stat().st_mtime + 60))
+    response = client.get("/api/v1/images/i/test.png/full", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 200
+
+
+def test_get_image_full_range(monkeypatch: Any, mock_invoker: Invoker, tmp_path: Path, client: TestClient) -> None:
+    image_file = prepare_image_file_test(monkeypatch, mock_invoker, tmp_path)
+
+    response = client.get("/api/v1/images/i/test.png/full", headers={"Range": "bytes=10-19"})
+
+    assert response.status_code == 206
+    assert response.content == image_file.read_bytes()[10:20]
+    assert response.headers["content-range"] == "bytes 10-19/100"
+
+
+def test_get_image_full_not_found(monkeypatch: Any, mock_invoker: Invoker, tmp_path: Path, client: TestClient) -> None:
+    prepare_image_file_test(monkeypatch, mock_invoker, tmp_path).unlink()
+
+    response = client.get("/api/v1/images/i/test.png/full")
+
+    assert response.status_code == 404
+
+
+def test_download_images_stream(monkeypatch: Any, mock_invoker: Invoker, client: TestClient) -> None:
+    prepare_download_images_test(monkeypatch, mock_invoker)
+    create_stream = MagicMock(return_value="test.zip")
+    monkeypatch.setattr(mock_invoker.services.bulk_download, "create_stream", create_stream)
+
+    response = client.post("/api/v1/images/download", json={"image_names": ["test.png"], "stream": True})
+
+    assert response.status_code == 202
+    assert response.json()["bulk_download_item_name"] == "test.zip"
+    create_stream.assert_called_once_with(["test.png"], None, "test", "system")
+
+
+def test_get_bulk_download_item_stream(monkeypatch: Any, mock_invoker: Invoker, client: TestClient) -> None:
+    mock_deps = MockApiDependencies(mock_invoker)
+    monkeypatch.setattr("invokeai.app.api.routers.images.ApiDependencies", mock_deps)
+    monkeypatch.setattr("invokeai.app.api.auth_dependencies.ApiDependencies", mock_deps)
+    monkeypatch.setattr(mock_invoker.services.bulk_download, "get_stream", lambda x: iter([b"con", b"tents"]))
+    delete = MagicMock()
+    monkeypatch.setattr(mock_invoker.services.bulk_download, "delete", delete)
+
+    response = client.get("/api/v1/images/download/test.zip")
+
+    assert response.status_code == 200
+    assert response.content == b"contents"
+    assert response.headers["content-type"] == "application/zip"
+    delete.assert_not_called()
+
+
+def test_list_image_dtos_by_cursor(monkeypatch: Any, mock_invoker: Invoker, client: TestClient) -> None:
+    mock_deps = MockApiDependencies(mock_invoker)
+    monkeypatch.setattr("invokeai.app.api.routers.images.ApiDependencies", mock_deps)
+    monkeypatch.setattr("invokeai.app.api.auth_dependencies.ApiDependencies", mock_deps)
+
+    response = client.get("/api/v1/images/cursor", params={"include_total": True})
+    assert response.status_code == 200
+    assert response.json() == {"limit": 10, "next_cursor": None, "total": 0, "items": []}
+
+    response = client.get("/api/v1/images/cursor", params={"cursor": "not a cursor"})
+    assert response.status_code == 400
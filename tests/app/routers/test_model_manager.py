@@ -187,3 +187,19 @@ def test_model_manager_gemini_starter_model_applies_reference_and_resolution_ove
         "16:9",
         "21:9",
     ]
+
+
+def test_rehash_models(monkeypatch: Any, client: TestClient, mm2_model_manager: Any, mm2_app_config: Any) -> None:
+    services = type("Services", (), {})()
+    services.model_manager = mm2_model_manager
+    services.configuration = mm2_app_config
+
+    invoker = DummyInvoker(services)
+    monkeypatch.setattr("invokeai.app.api.routers.model_manager.ApiDependencies", MockApiDependencies(invoker))
+    monkeypatch.setattr("invokeai.app.api.auth_dependencies.ApiDependencies", MockApiDependencies(invoker))
+    monkeypatch.setattr(mm2_model_manager.install, "rehash_models", lambda: {"model_key": "blake3:new"})
+
+    response = client.post("/api/v2/models/sync/rehash")
+
+    assert response.status_code == 200
+    assert response.json() == {"changed": {"model_key": "blake3:new"}}
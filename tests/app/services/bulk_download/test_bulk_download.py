@@ -1,17 +1,23 @@
+import io
+import itertools
 import os
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from typing import Any
-from zipfile import ZipFile
+from typing import Any, Generator
+from zipfile import ZIP_STORED, ZipFile
 
 import pytest
 
 from invokeai.app.services.board_records.board_records_common import BoardRecord, BoardRecordNotFoundException
-from invokeai.app.services.bulk_download.bulk_download_common import BulkDownloadTargetException
-from invokeai.app.services.bulk_download.bulk_download_default import BulkDownloadService
+from invokeai.app.services.bulk_download.bulk_download_common import (
+    BulkDownloadParametersException,
+    BulkDownloadTargetException,
+)
+from invokeai.app.services.bulk_download.bulk_download_default import STREAM_TTL_SECONDS, BulkDownloadService
 from invokeai.app.services.events.events_common import (
     BulkDownloadCompleteEvent,
     BulkDownloadErrorEvent,
+    BulkDownloadProgressEvent,
     BulkDownloadStartedEvent,
 )
 from invokeai.app.services.image_records.image_records_common import (
@@ -248,11 +254,11 @@ def prepare_handler_test(tmp_path: Path, monkeypatch: Any, mock_image_dto: Image
         tmp_path / "bulk_downloads" / mock_image_dto.image_category.value / mock_image_dto.image_name
     )
 
-    # Mock the get_dto method so that when the image dto needs to be retrieved it is returned
-    def mock_get_dto(*args, **kwargs):
-        return mock_image_dto
+    # Mock the get_dtos method so that when the image dtos need to be retrieved they are returned
+    def mock_get_dtos(*args, **kwargs):
+        return [mock_image_dto]
 
-    monkeypatch.setattr(mock_invoker.services.images, "get_dto", mock_get_dto)
+    monkeypatch.setattr(mock_invoker.services.images, "get_dtos", mock_get_dtos)
 
     # This is used when preparing all images for a given board
     def mock_get_all_board_image_names_for_board(*args, **kwargs):
@@ -309,10 +315,10 @@ def test_handler_on_image_not_found(tmp_path: Path, monkeypatch: Any, mock_image
     """Test that the handler emits an error event when the image is not found."""
     exception: Exception = ImageRecordNotFoundException("Image not found")
 
-    def mock_get_dto(*args, **kwargs):
+    def mock_get_dtos(*args, **kwargs):
         raise exception
 
-    monkeypatch.setattr(mock_invoker.services.images, "get_dto", mock_get_dto)
+    monkeypatch.setattr(mock_invoker.services.images, "get_dtos", mock_get_dtos)
 
     execute_handler_test_on_error(tmp_path, monkeypatch, mock_image_dto, mock_invoker, exception)
 
@@ -325,7 +331,7 @@ def test_handler_on_board_not_found(tmp_path: Path, monkeypatch: Any, mock_image
     def mock_get_board_name(*args, **kwargs):
         raise exception
 
-    monkeypatch.setattr(mock_invoker.services.images, "get_dto", mock_get_board_name)
+    monkeypatch.setattr(mock_invoker.services.images, "get_dtos", mock_get_board_name)
 
     execute_handler_test_on_error(tmp_path, monkeypatch, mock_image_dto, mock_invoker, exception)
 
@@ -340,7 +346,7 @@ def test_handler_on_generic_exception(
     def mock_get_board_name(*args, **kwargs):
         raise exception
 
-    monkeypatch.setattr(mock_invoker.services.images, "get_dto", mock_get_board_name)
+    monkeypatch.setattr(mock_invoker.services.images, "get_dtos", mock_get_board_name)
 
     with pytest.raises(Exception):  # noqa: B017
         execute_handler_test_on_error(tmp_path, monkeypatch, mock_image_dto, mock_invoker, exception)
@@ -396,3 +402,123 @@ def test_stop(tmp_path: Path):
     bulk_download_service.stop()
 
     assert not (tmp_path / "bulk_downloads").exists()
+
+
+def test_stream(tmp_path: Path, monkeypatch: Any, mock_image_dto: ImageDTO, mock_invoker: Invoker):
+    """Test that a streamed bulk download yields a valid zip file without writing it to disk."""
+
+    _, _, mock_image_contents = prepare_handler_test(tmp_path, monkeypatch, mock_image_dto, mock_invoker)
+
+    bulk_download_service = BulkDownloadService()
+    bulk_download_service.start(mock_invoker)
+    bulk_download_item_name = bulk_download_service.create_stream([mock_image_dto.image_name], None, None, "user")
+
+    assert bulk_download_item_name == "test.zip"
+    assert bulk_download_service.get_owner(bulk_download_item_name) == "user"
+
+    stream = bulk_download_service.get_stream(bulk_download_item_name)
+    assert stream is not None
+    contents = b"".join(stream)
+
+    assert not (tmp_path / "bulk_downloads" / bulk_download_item_name).exists()
+    with ZipFile(io.BytesIO(contents), "r") as zip_file:
+        image_zip_path = f"{mock_image_dto.image_category.value}/{mock_image_dto.image_name}"
+        assert zip_file.read(image_zip_path).decode() == mock_image_contents
+        assert zip_file.getinfo(image_zip_path).compress_type == ZIP_STORED
+
+    event_bus: TestEventService = mock_invoker.services.events
+    assert isinstance(event_bus.events[0], BulkDownloadStartedEvent)
+    assert isinstance(event_bus.events[-2], BulkDownloadProgressEvent)
+    assert event_bus.events[-2].images_written == 1
+    assert event_bus.events[-2].bytes_written == len(contents)
+    assert isinstance(event_bus.events[-1], BulkDownloadCompleteEvent)
+
+    # A stream can only be fetched once
+    assert bulk_download_service.get_stream(bulk_download_item_name) is None
+    assert bulk_download_service.get_owner(bulk_download_item_name) is None
+
+
+def test_stream_sends_chunks(tmp_path: Path, monkeypatch: Any, mock_image_dto: ImageDTO, mock_invoker: Invoker):
+    """Test that a streamed bulk download is sent in chunks, with a progress event for each."""
+
+    prepare_handler_test(tmp_path, monkeypatch, mock_image_dto, mock_invoker)
+    monkeypatch.setattr("invokeai.app.services.bulk_download.bulk_download_default.STREAM_CHUNK_SIZE", 4)
+
+    bulk_download_service = BulkDownloadService()
+    bulk_download_service.start(mock_invoker)
+    stream = bulk_download_service.get_stream(bulk_download_service.create_stream(["a", "b"], None, None))
+    assert stream is not None
+    chunks = list(stream)
+
+    assert len(chunks) > 2
+    event_bus: TestEventService = mock_invoker.services.events
+    progress_events = [e for e in event_bus.events if isinstance(e, BulkDownloadProgressEvent)]
+    assert len(progress_events) == len(chunks)
+    assert [e.bytes_written for e in progress_events] == list(itertools.accumulate(len(c) for c in chunks))
+    assert progress_events[-1].images_written == progress_events[-1].total_images == 1
+
+
+def test_stream_on_image_not_found(tmp_path: Path, monkeypatch: Any, mock_image_dto: ImageDTO, mock_invoker: Invoker):
+    """Test that a streamed bulk download fails before streaming when an image is not found."""
+
+    exception: Exception = ImageRecordNotFoundException("Image not found")
+
+    def mock_get_dtos(*args, **kwargs):
+        raise exception
+
+    monkeypatch.setattr(mock_invoker.services.images, "get_dtos", mock_get_dtos)
+
+    bulk_download_service = BulkDownloadService()
+    bulk_download_service.start(mock_invoker)
+    bulk_download_item_name = bulk_download_service.create_stream([mock_image_dto.image_name], None, None)
+
+    with pytest.raises(ImageRecordNotFoundException):
+        bulk_download_service.get_stream(bulk_download_item_name)
+
+    event_bus: TestEventService = mock_invoker.services.events
+    assert len(event_bus.events) == 2
+    assert isinstance(event_bus.events[0], BulkDownloadStartedEvent)
+    assert isinstance(event_bus.events[1], BulkDownloadErrorEvent)
+
+
+def test_create_stream_without_images():
+    """Test that a streamed bulk download needs image names or a board id."""
+
+    with pytest.raises(BulkDownloadParametersException):
+        BulkDownloadService().create_stream(None, None, None)
+
+
+def test_stream_closed_before_complete(
+    tmp_path: Path, monkeypatch: Any, mock_image_dto: ImageDTO, mock_invoker: Invoker
+):
+    """Test that a streamed bulk download that is closed part way through signals an error."""
+
+    prepare_handler_test(tmp_path, monkeypatch, mock_image_dto, mock_invoker)
+    monkeypatch.setattr("invokeai.app.services.bulk_download.bulk_download_default.STREAM_CHUNK_SIZE", 4)
+
+    bulk_download_service = BulkDownloadService()
+    bulk_download_service.start(mock_invoker)
+    bulk_download_item_name = bulk_download_service.create_stream(["a"], None, None)
+    stream = bulk_download_service.get_stream(bulk_download_item_name)
+    assert isinstance(stream, Generator)
+    next(stream)
+    stream.close()
+
+    event_bus: TestEventService = mock_invoker.services.events
+    assert isinstance(event_bus.events[-1], BulkDownloadErrorEvent)
+    assert not any(isinstance(e, BulkDownloadCompleteEvent) for e in event_bus.events)
+    assert bulk_download_service.get_owner(bulk_download_item_name) is None
+
+
+def test_unfetched_stream_expires():
+    """Test that a streamed bulk download that is never fetched is forgotten once it expires."""
+
+    bulk_download_service = BulkDownloadService()
+    expired_item_name = bulk_download_service.create_stream(["a"], None, None, "user")
+    bulk_download_service._streams[expired_item_name].created_at -= STREAM_TTL_SECONDS + 1
+
+    new_item_name = bulk_download_service.create_stream(["b"], None, None, "user")
+
+    assert bulk_download_service.get_owner(expired_item_name) is None
+    assert bulk_download_service.get_stream(expired_item_name) is None
+    assert bulk_download_service.get_owner(new_item_name) == "user"
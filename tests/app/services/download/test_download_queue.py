@@ -1,19 +1,25 @@
 """Test the queued download facility"""
 
+import hashlib
+import os
 import re
+import threading
 import time
 from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Any, Generator, Optional
 
 import pytest
+from blake3 import blake3
 from pydantic.networks import AnyHttpUrl
 from requests.sessions import Session
 from requests_testadapter import TestAdapter
 
 from invokeai.app.services.config import get_config
-from invokeai.app.services.config.config_default import URLRegexTokenPair
+from invokeai.app.services.config.config_default import InvokeAIAppConfig, URLRegexTokenPair
 from invokeai.app.services.download import DownloadJob, DownloadJobStatus, DownloadQueueService, MultiFileDownloadJob
+from invokeai.app.services.download.download_default import SegmentedDownloadState
 from invokeai.app.services.events.events_common import (
     DownloadCancelledEvent,
     DownloadCompleteEvent,
@@ -355,3 +361,192 @@ def test_tokens(tmp_path: Path, mm2_session: Session):
         assert job1.access_token == "cv_12345"
         assert job2.access_token is None
         queue.stop()
+
+
+class _RangeServer(ThreadingHTTPServer):
+    """A local stand-in for a model host that supports range requests."""
+
+    def __init__(self, payload: bytes) -> None:
+        super().__init__(("127.0.0.1", 0), _RangeRequestHandler)
+        self.payload = payload
+        self.etag = '"v1"'
+        self.ranges: list[Optional[str]] = []
+        self.failing_ranges: set[str] = set()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}/model.safetensors"
+
+
+class _RangeRequestHandler(BaseHTTPRequestHandler):
+    server: _RangeServer
+
+    def do_GET(self) -> None:
+        payload = self.server.payload
+        byte_range = self.headers.get("Range")
+        self.server.ranges.append(byte_range)
+        if byte_range in self.server.failing_ranges:
+            self.send_error(500)
+            return
+
+        if_range = self.headers.get("If-Range")
+        if byte_range and (if_range is None or if_range == self.server.etag):
+            start, _, end = byte_range.removeprefix("bytes=").partition("-")
+            first, last = int(start), int(end) if end else len(payload) - 1
+            body = payload[first : last + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {first}-{last}/{len(payload)}")
+        else:
+            body = payload
+            self.send_response(200)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", self.server.etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def range_server() -> Generator[_RangeServer, None, None]:
+    server = _RangeServer(os.urandom(10_000))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def segmented_queue(monkeypatch: Any) -> Generator[DownloadQueueService, None, None]:
+    monkeypatch.setattr("invokeai.app.services.download.download_default.SEGMENT_MIN_SIZE", 1000)
+    queue = DownloadQueueService(app_config=InvokeAIAppConfig(download_segments=4))
+    queue.start()
+    yield queue
+    queue.stop()
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_segmented_download(tmp_path: Path, range_server: _RangeServer, segmented_queue: DownloadQueueService) -> None:
+    dest = tmp_path / "model.safetensors"
+    job = segmented_queue.download(source=AnyHttpUrl(range_server.url), dest=dest)
+    segmented_queue.join()
+
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert dest.read_bytes() == range_server.payload
+    assert job.bytes == job.total_bytes == len(range_server.payload)
+    # one request to find the size of the file, then one per segment
+    assert sorted(r for r in range_server.ranges if r) == [
+        "bytes=0-2499",
+        "bytes=2500-4999",
+        "bytes=5000-7499",
+        "bytes=7500-9999",
+    ]
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_segmented_download_resume(
+    tmp_path: Path, range_server: _RangeServer, segmented_queue: DownloadQueueService
+) -> None:
+    dest = tmp_path / "model.safetensors"
+    range_server.failing_ranges = {"bytes=2500-4999"}
+    job = segmented_queue.download(source=AnyHttpUrl(range_server.url), dest=dest)
+    segmented_queue.join()
+
+    assert job.status == DownloadJobStatus.ERROR
+    assert not dest.exists()
+    assert (tmp_path / "model.safetensors.downloading").stat().st_size == len(range_server.payload)
+    segment_state = SegmentedDownloadState.model_validate_json(
+        (tmp_path / "model.safetensors.downloading.segments").read_text()
+    )
+    incomplete_ranges = [f"bytes={s.start + s.written}-{s.end}" for s in segment_state.segments if not s.complete]
+    assert "bytes=2500-4999" in incomplete_ranges
+
+    # Only the rest of the incomplete segments is fetched again
+    range_server.failing_ranges = set()
+    range_server.ranges.clear()
+    job = segmented_queue.download(source=AnyHttpUrl(range_server.url), dest=dest)
+    segmented_queue.join()
+
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert dest.read_bytes() == range_server.payload
+    assert sorted(range_server.ranges) == sorted(incomplete_ranges)
+    assert list(tmp_path.iterdir()) == [dest]
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_segmented_download_resume_after_remote_change(
+    tmp_path: Path, range_server: _RangeServer, segmented_queue: DownloadQueueService
+) -> None:
+    dest = tmp_path / "model.safetensors"
+    range_server.failing_ranges = {"bytes=0-2499"}
+    segmented_queue.download(source=AnyHttpUrl(range_server.url), dest=dest)
+    segmented_queue.join()
+
+    range_server.failing_ranges = set()
+    range_server.etag = '"v2"'
+    job = segmented_queue.download(source=AnyHttpUrl(range_server.url), dest=dest)
+    segmented_queue.join()
+
+    assert job.status == DownloadJobStatus.PAUSED
+    assert job.resume_required
+    assert not dest.exists()
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_segmented_download_small_file(
+    tmp_path: Path, range_server: _RangeServer, segmented_queue: DownloadQueueService
+) -> None:
+    range_server.payload = os.urandom(1500)
+    dest = tmp_path / "model.safetensors"
+    job = segmented_queue.download(source=AnyHttpUrl(range_server.url), dest=dest)
+    segmented_queue.join()
+
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert dest.read_bytes() == range_server.payload
+    assert range_server.ranges == [None]
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_download_hashes_content(tmp_path: Path, range_server: _RangeServer) -> None:
+    queue = DownloadQueueService()
+    queue.start()
+    dest = tmp_path / "model.safetensors"
+    job = DownloadJob(source=AnyHttpUrl(range_server.url), dest=dest, hash_algorithm="blake3_single")
+    queue.submit_download_job(job)
+    queue.join()
+    queue.stop()
+
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert job.content_hash == blake3(range_server.payload).hexdigest()
+
+
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_download_hashes_resumed_content(tmp_path: Path, range_server: _RangeServer) -> None:
+    queue = DownloadQueueService()
+    queue.start()
+    dest = tmp_path / "model.safetensors"
+    (tmp_path / "model.safetensors.downloading").write_bytes(range_server.payload[:4000])
+    job = DownloadJob(source=AnyHttpUrl(range_server.url), dest=dest, etag=range_server.etag, hash_algorithm="sha256")
+    queue.submit_download_job(job)
+    queue.join()
+    queue.stop()
+
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert range_server.ranges == ["bytes=4000-"]
+    assert dest.read_bytes() == range_server.payload
+    assert job.content_hash == hashlib.sha256(range_server.payload).hexdigest()
+
+
+def test_download_without_hash_algorithm(tmp_path: Path, mm2_session: Session) -> None:
+    queue = DownloadQueueService(requests_session=mm2_session)
+    queue.start()
+    job = queue.download(source=AnyHttpUrl("http://www.civitai.com/models/12345"), dest=tmp_path)
+    queue.join()
+    queue.stop()
+
+    assert job.status == DownloadJobStatus.COMPLETED
+    assert job.content_hash is None
@@ -0,0 +1,174 @@
+"""Tests for coalescing of invocation progress events and deferral of events in FastAPIEventService."""
+
+import asyncio
+import threading
+from typing import Iterator
+
+import pytest
+
+from invokeai.app.services.events import events_fastapievents
+from invokeai.app.services.events.events_common import (
+    EventBase,
+    InvocationCompleteEvent,
+    InvocationProgressEvent,
+)
+from invokeai.app.services.events.events_base import DeferredThreadEvents
+from invokeai.app.services.events.events_fastapievents import FastAPIEventService
+from invokeai.app.services.session_processor.session_processor_common import ProgressImage
+
+_COMMON_FIELDS = {
+    "queue_id": "default",
+    "item_id": 1,
+    "batch_id": "batch-1",
+    "user_id": "owner-1",
+    "session_id": "session-1",
+    "invocation": {"type": "add", "id": "node-1", "a": 1, "b": 2},
+    "invocation_source_id": "node-1",
+}
+
+
+@pytest.fixture
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    loop = asyncio.new_event_loop()
+    yield loop
+    # Cancel the event service's dispatch task, so it isn't left pending on a closed loop
+    tasks = asyncio.all_tasks(loop)
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
+
+
+@pytest.fixture
+def dispatched(monkeypatch: pytest.MonkeyPatch) -> list[EventBase]:
+    dispatched: list[EventBase] = []
+    monkeypatch.setattr(events_fastapievents, "dispatch", lambda event, **kwargs: dispatched.append(event))
+    return dispatched
+
+
+def _progress_event(percentage: float, item_id: int = 1, image: ProgressImage | None = None) -> InvocationProgressEvent:
+    return InvocationProgressEvent(
+        **{**_COMMON_FIELDS, "item_id": item_id}, message="denoising", percentage=percentage, image=image
+    )
+
+
+def _run(loop: asyncio.AbstractEventLoop, seconds: float) -> None:
+    loop.run_until_complete(asyncio.sleep(seconds))
+
+
+def test_progress_events_are_not_coalesced_without_interval(
+    loop: asyncio.AbstractEventLoop, dispatched: list[EventBase]
+):
+    events = FastAPIEventService(0, loop=loop)
+    progress_events = [_progress_event(i / 10) for i in range(10)]
+
+    for event in progress_events:
+        events.dispatch(event)
+    _run(loop, 0.01)
+
+    assert dispatched == progress_events
+    assert events.coalesced_event_count == 0
+
+
+def test_progress_events_are_coalesced_within_interval(loop: asyncio.AbstractEventLoop, dispatched: list[EventBase]):
+    events = FastAPIEventService(0, loop=loop, progress_event_interval=0.2)
+    progress_events = [_progress_event(i / 10) for i in range(10)]
+
+    events.dispatch(progress_events[0])
+    _run(loop, 0.01)
+    for event in progress_events[1:]:
+        events.dispatch(event)
+    _run(loop, 0.01)
+
+    # The first event is sent right away, the others wait for the interval to pass
+    assert dispatched == [progress_events[0]]
+
+    _run(loop, 0.3)
+
+    # Only the latest of the waiting events is sent
+    assert dispatched == [progress_events[0], progress_events[-1]]
+    assert events.coalesced_event_count == 8
+
+
+def test_coalesced_progress_event_keeps_latest_image(loop: asyncio.AbstractEventLoop, dispatched: list[EventBase]):
+    events = FastAPIEventService(0, loop=loop, progress_event_interval=0.2)
+    image = ProgressImage(width=8, height=8, dataURL="data:image/jpeg;base64,")
+
+    events.dispatch(_progress_event(0.1))
+    _run(loop, 0.01)
+    events.dispatch(_progress_event(0.2, image=image))
+    events.dispatch(_progress_event(0.3))
+    _run(loop, 0.3)
+
+    assert len(dispatched) == 2
+    sent_event = dispatched[-1]
+    assert isinstance(sent_event, InvocationProgressEvent)
+    assert sent_event.percentage == 0.3
+    assert sent_event.image == image
+
+
+def test_progress_events_are_coalesced_per_queue_item(loop: asyncio.AbstractEventLoop, dispatched: list[EventBase]):
+    events = FastAPIEventService(0, loop=loop, progress_event_interval=0.2)
+    progress_events = [_progress_event(0.1, item_id=1), _progress_event(0.1, item_id=2)]
+
+    for event in progress_events:
+        events.dispatch(event)
+    _run(loop, 0.01)
+
+    assert dispatched == progress_events
+    assert events.coalesced_event_count == 0
+
+
+def test_pending_progress_event_is_dropped_when_invocation_completes(
+    loop: asyncio.AbstractEventLoop, dispatched: list[EventBase]
+):
+    events = FastAPIEventService(0, loop=loop, progress_event_interval=0.2)
+    first_progress_event = _progress_event(0.1)
+    complete_event = InvocationCompleteEvent(**_COMMON_FIELDS, result={"type": "integer_output", "value": 3})
+
+    events.dispatch(first_progress_event)
+    _run(loop, 0.01)
+    events.dispatch(_progress_event(0.9))
+    events.dispatch(complete_event)
+    _run(loop, 0.3)
+
+    assert dispatched == [first_progress_event, complete_event]
+    assert events.dropped_event_count == 1
+
+
+def _in_thread(target) -> None:
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+
+def test_deferred_events_are_sent_in_order(loop: asyncio.AbstractEventLoop, dispatched: list[EventBase]):
+    events = FastAPIEventService(0, loop=loop)
+    progress_events = [_progress_event(i / 10) for i in range(6)]
+
+    def send(deferral: DeferredThreadEvents, event: EventBase) -> None:
+        with deferral.send():
+            events.dispatch(event)
+
+    first_deferral = events.defer_thread_events()
+    events.dispatch(progress_events[1])
+    second_deferral = events.defer_thread_events()
+    events.dispatch(progress_events[3])
+
+    # Events of other threads are not held back
+    _in_thread(lambda: events.dispatch(progress_events[5]))
+    _run(loop, 0.01)
+    assert dispatched == [progress_events[5]]
+
+    # The second deferral is sent first, but its events wait for the first deferral
+    _in_thread(lambda: send(second_deferral, progress_events[2]))
+    _run(loop, 0.01)
+    assert dispatched == [progress_events[5]]
+
+    _in_thread(lambda: send(first_deferral, progress_events[0]))
+    _run(loop, 0.01)
+    assert dispatched == [progress_events[5], *progress_events[:4]]
+
+    events.dispatch(progress_events[4])
+    _run(loop, 0.01)
+    assert dispatched == [progress_events[5], *progress_events[:5]]
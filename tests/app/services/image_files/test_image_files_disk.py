@@ -1,12 +1,15 @@
 import hashlib
 import platform
+import threading
 import zlib
 from pathlib import Path
+from typing import Optional
 from unittest.mock import MagicMock, patch
 
 import pytest
 from PIL import Image
 
+from invokeai.app.services.image_files.image_files_common import ImageFileSaveException
 from invokeai.app.services.image_files.image_files_disk import DiskImageFileStorage, _should_use_png_rle
 from invokeai.app.util.thumbnails import get_thumbnail_name
 
@@ -252,3 +255,116 @@ class TestSaveDeleteRoundTrip:
         assert flat_path.exists()
         assert nested_path.exists()
         assert flat_path.parent != nested_path.parent
+
+
+class TestBackgroundWrites:
+    """Saving with a background writer pool."""
+
+    @pytest.fixture
+    def async_storage(self, tmp_path: Path):
+        storage = DiskImageFileStorage(tmp_path, max_write_workers=1)
+        mock_invoker = MagicMock()
+        mock_invoker.services.configuration.pil_compress_level = 1
+        storage._DiskImageFileStorage__invoker = mock_invoker  # type: ignore
+        yield storage
+        storage.stop(mock_invoker)
+
+    def test_pending_write_is_served_from_memory_and_waited_for(self, async_storage: DiskImageFileStorage):
+        release = threading.Event()
+        original_save = Image.Image.save
+
+        def _blocking_save(self, *args, **kwargs):
+            release.wait(timeout=5)
+            return original_save(self, *args, **kwargs)
+
+        with patch.object(Image.Image, "save", _blocking_save):
+            async_storage.save(image=Image.new("RGB", (32, 32), color="red"), image_name="pending.png", metadata="{}")
+            image_path = async_storage.get_path("pending.png")
+
+            assert not image_path.exists()
+            loaded = async_storage.get("pending.png")
+            assert loaded.size == (32, 32)
+            assert loaded.info["invokeai_metadata"] == "{}"
+
+            release.set()
+            assert async_storage.validate_path(image_path)
+
+        assert async_storage.get_path("pending.png", thumbnail=True).exists()
+
+    def test_after_thread_writes_only_waits_for_own_writes(self, async_storage: DiskImageFileStorage):
+        release = threading.Event()
+        original_save = Image.Image.save
+        errors: list[Optional[BaseException]] = []
+
+        def _blocking_save(self, *args, **kwargs):
+            release.wait(timeout=5)
+            return original_save(self, *args, **kwargs)
+
+        with patch.object(Image.Image, "save", _blocking_save):
+            other_thread = threading.Thread(
+                target=lambda: async_storage.save(image=Image.new("RGB", (32, 32)), image_name="other.png")
+            )
+            other_thread.start()
+            other_thread.join()
+
+            # The other thread's write is still blocked, but this thread has nothing to wait for
+            async_storage.after_thread_writes(errors.append)
+            assert errors == [None]
+            assert not async_storage.get_path("other.png").exists()
+
+            async_storage.save(image=Image.new("RGB", (32, 32)), image_name="own.png")
+            async_storage.after_thread_writes(errors.append)
+            # The callback does not block the calling thread
+            assert errors == [None]
+
+            release.set()
+            # Wait for the writer thread to finish running the write's callbacks
+            async_storage._DiskImageFileStorage__write_executor.shutdown(wait=True)  # type: ignore
+            assert errors == [None, None]
+            assert async_storage.get_path("own.png").exists()
+            assert async_storage.get_path("own.png", thumbnail=True).exists()
+
+    def test_delete_waits_for_pending_write(self, async_storage: DiskImageFileStorage):
+        async_storage.save(image=Image.new("RGB", (32, 32)), image_name="deleted.png")
+        async_storage.delete("deleted.png")
+        async_storage.flush()
+        assert not async_storage.get_path("deleted.png").exists()
+        assert not async_storage.get_path("deleted.png", thumbnail=True).exists()
+
+    def test_failed_write_is_reported(self, async_storage: DiskImageFileStorage):
+        release = threading.Event()
+        errors: list[Optional[BaseException]] = []
+
+        def _failing_save(self, *args, **kwargs):
+            release.wait(timeout=5)
+            raise OSError("No space left on device")
+
+        with patch.object(Image.Image, "save", _failing_save):
+            async_storage.save(image=Image.new("RGB", (32, 32)), image_name="broken.png")
+            async_storage.after_thread_writes(errors.append)
+            release.set()
+            with pytest.raises(ImageFileSaveException) as exc_info:
+                async_storage.flush()
+            assert isinstance(exc_info.value.__cause__, OSError)
+            async_storage._DiskImageFileStorage__write_executor.shutdown(wait=True)  # type: ignore
+
+        assert len(errors) == 1
+        assert isinstance(errors[0], OSError)
+        assert not async_storage.validate_path(async_storage.get_path("broken.png"))
+        services = async_storage._DiskImageFileStorage__invoker.services  # type: ignore
+        services.logger.error.assert_called_once()
+        # No record is left behind without a file
+        services.image_records.delete.assert_called_once_with("broken.png")
+
+    def test_failed_write_is_reported_to_thread_after_it_lands(self, async_storage: DiskImageFileStorage):
+        errors: list[Optional[BaseException]] = []
+
+        with patch(
+            "invokeai.app.services.image_files.image_files_disk.make_thumbnail", side_effect=RuntimeError("boom")
+        ):
+            async_storage.save(image=Image.new("RGB", (32, 32)), image_name="broken.png")
+            async_storage._DiskImageFileStorage__write_executor.shutdown(wait=True)  # type: ignore
+
+        async_storage.after_thread_writes(errors.append)
+        assert len(errors) == 1
+        assert isinstance(errors[0], RuntimeError)
@@ -5,12 +5,19 @@ get_many(), and delete_intermediates() against a real (in-memory) SQLite databas
 and that get_many()/get_image_names() enforce per-user ownership isolation.
 """
 
+import json
+
 import pytest
 
 from invokeai.app.services.board_image_records.board_image_records_sqlite import SqliteBoardImageRecordStorage
 from invokeai.app.services.board_records.board_records_sqlite import SqliteBoardRecordStorage
 from invokeai.app.services.config.config_default import InvokeAIAppConfig
-from invokeai.app.services.image_records.image_records_common import ImageCategory, ResourceOrigin
+from invokeai.app.services.image_records.image_records_common import (
+    ImageCategory,
+    ImageRecordChanges,
+    InvalidImageCursorException,
+    ResourceOrigin,
+)
 from invokeai.app.services.image_records.image_records_sqlite import SqliteImageRecordStorage
 from invokeai.app.services.shared.sqlite.sqlite_common import SQLiteDirection
 from invokeai.backend.util.logging import InvokeAILogger
@@ -44,6 +51,7 @@ def _save(
     subfolder: str = "",
     is_intermediate: bool = False,
     user_id: str | None = None,
+    metadata: str | None = None,
 ) -> None:
     store.save(
         image_name=name,
@@ -55,6 +63,7 @@ def _save(
         is_intermediate=is_intermediate,
         image_subfolder=subfolder,
         user_id=user_id,
+        metadata=metadata,
     )
 
 
@@ -93,6 +102,287 @@ class TestGetManySubfolder:
         assert by_name["hashed.png"] == "ab"
 
 
+class TestGetByNames:
+    """get_by_names() fetches many records in one query, in the requested order."""
+
+    def test_returns_records_in_order(self, store: SqliteImageRecordStorage) -> None:
+        for name in ("a.png", "b.png", "c.png"):
+            _save(store, name)
+
+        records = store.get_by_names(["c.png", "a.png", "b.png"])
+
+        assert [r.image_name for r in records] == ["c.png", "a.png", "b.png"]
+
+    def test_missing_image_raises(self, store: SqliteImageRecordStorage) -> None:
+        from invokeai.app.services.image_records.image_records_common import ImageRecordNotFoundException
+
+        _save(store, "a.png")
+
+        with pytest.raises(ImageRecordNotFoundException):
+            store.get_by_names(["a.png", "missing.png"])
+
+    def test_get_boards_for_images(
+        self,
+        stores: tuple[SqliteImageRecordStorage, SqliteBoardRecordStorage, SqliteBoardImageRecordStorage],
+    ) -> None:
+        image_store, board_store, board_image_store = stores
+        _save(image_store, "boarded.png")
+        _save(image_store, "uncat.png")
+        board = board_store.save("board", "user1")
+        board_image_store.add_image_to_board(board.board_id, "boarded.png")
+
+        assert board_image_store.get_boards_for_images(["boarded.png", "uncat.png"]) == {"boarded.png": board.board_id}
+
+
+class TestGetManyByCursor:
+    """get_many_by_cursor() pages through the same images, in the same order, as get_image_names()."""
+
+    @staticmethod
+    def _list_pages(store: SqliteImageRecordStorage, limit: int, **kwargs) -> list[list[str]]:
+        pages: list[list[str]] = []
+        cursor: str | None = None
+        while True:
+            page = store.get_many_by_cursor(cursor=cursor, limit=limit, **kwargs)
+            pages.append([r.image_name for r in page.items])
+            if page.next_cursor is None:
+                return pages
+            cursor = page.next_cursor
+
+    @pytest.mark.parametrize("starred_first", [True, False])
+    @pytest.mark.parametrize("order_dir", [SQLiteDirection.Descending, SQLiteDirection.Ascending])
+    def test_pages_follow_gallery_order(
+        self, store: SqliteImageRecordStorage, starred_first: bool, order_dir: SQLiteDirection
+    ) -> None:
+        # Images saved in the same millisecond share a created_at, so some of these tie on it
+        for i in range(7):
+            _save(store, f"img{i}.png")
+        store.update("img2.png", ImageRecordChanges(starred=True))
+        store.update("img5.png", ImageRecordChanges(starred=True))
+
+        pages = self._list_pages(store, limit=3, starred_first=starred_first, order_dir=order_dir)
+
+        assert [len(page) for page in pages] == [3, 3, 1]
+        records = {r.image_name: r for r in store.get_by_names([f"img{i}.png" for i in range(7)])}
+        expected = sorted(
+            records,
+            key=lambda name: (records[name].created_at, name),
+            reverse=order_dir is SQLiteDirection.Descending,
+        )
+        if starred_first:
+            expected.sort(key=lambda name: not records[name].starred)
+        assert [name for page in pages for name in page] == expected
+
+    def test_pages_keep_filters(self, store: SqliteImageRecordStorage) -> None:
+        for i in range(4):
+            _save(store, f"img{i}.png")
+            _save(store, f"tmp{i}.png", is_intermediate=True)
+
+        pages = self._list_pages(store, limit=1, is_intermediate=False)
+
+        assert sorted(name for page in pages for name in page) == [f"img{i}.png" for i in range(4)]
+
+    def test_total_is_only_counted_on_request(self, store: SqliteImageRecordStorage) -> None:
+        for i in range(3):
+            _save(store, f"img{i}.png")
+
+        assert store.get_many_by_cursor(limit=1).total is None
+        assert store.get_many_by_cursor(limit=1, include_total=True).total == 3
+
+    @pytest.mark.parametrize("cursor", ["not a cursor", "WzEsIDJd", "bnVsbA=="])
+    def test_invalid_cursor_raises(self, store: SqliteImageRecordStorage, cursor: str) -> None:
+        with pytest.raises(InvalidImageCursorException):
+            store.get_many_by_cursor(cursor=cursor)
+
+
+class TestSearch:
+    """Searches match a substring of the indexed metadata fields, through the full-text index."""
+
+    @staticmethod
+    def _seed(store: SqliteImageRecordStorage) -> None:
+        _save(
+            store,
+            "banana.png",
+            metadata=json.dumps(
+                {"positive_prompt": "Banana Sushi", "negative_prompt": "blurry", "model": {"name": "Juggernaut XL"}}
+            ),
+        )
+        _save(
+            store,
+            "grape.png",
+            metadata=json.dumps({"positive_prompt": "grape sushi", "seed": 123456, "scheduler": "lms"}),
+        )
+        _save(store, "no_metadata.png")
+        _save(store, "invalid_metadata.png", metadata="not json")
+
+    def test_search_matches_substrings_of_metadata_fields(self, store: SqliteImageRecordStorage) -> None:
+        self._seed(store)
+
+        assert set(store.get_image_names(search_term="sushi").image_names) == {"banana.png", "grape.png"}
+        assert store.get_image_names(search_term="nana su").image_names == ["banana.png"]
+        assert store.get_image_names(search_term="BLURRY").image_names == ["banana.png"]
+        assert store.get_image_names(search_term="juggernaut").image_names == ["banana.png"]
+        assert store.get_image_names(search_term="3456").image_names == ["grape.png"]
+        assert store.get_image_names(search_term="apple").image_names == []
+        # Other metadata values are indexed too
+        assert store.get_image_names(search_term="lms").image_names == ["grape.png"]
+
+        result = store.get_many(search_term="sushi", limit=1)
+        assert len(result.items) == 1
+        assert result.total == 2
+
+    def test_search_matches_short_terms(self, store: SqliteImageRecordStorage) -> None:
+        self._seed(store)
+
+        assert store.get_image_names(search_term="XL").image_names == ["banana.png"]
+        assert store.get_image_names(search_term="ms").image_names == ["grape.png"]
+
+    def test_search_terms_are_not_parsed_as_queries(self, store: SqliteImageRecordStorage) -> None:
+        _save(store, "quoted.png", metadata=json.dumps({"positive_prompt": 'a "quoted" OR NOT prompt*'}))
+
+        assert store.get_image_names(search_term='"quoted" OR NOT').image_names == ["quoted.png"]
+        assert store.get_image_names(search_term="prompt*").image_names == ["quoted.png"]
+
+    def test_search_matches_creation_date(self, store: SqliteImageRecordStorage) -> None:
+        self._seed(store)
+        created_at = store.get("grape.png").created_at
+
+        result = store.get_image_names(search_term=str(created_at)[:10])
+
+        assert result.total_count == 4
+
+    def test_deleted_images_are_not_found(self, store: SqliteImageRecordStorage) -> None:
+        self._seed(store)
+
+        store.delete("banana.png")
+
+        assert store.get_image_names(search_term="sushi").image_names == ["grape.png"]
+
+
+def _assert_board_stats_match_images(
+    stores: tuple[SqliteImageRecordStorage, SqliteBoardRecordStorage, SqliteBoardImageRecordStorage],
+    board_ids: list[str],
+) -> None:
+    image_store, _, board_image_store = stores
+    cover_image_names = image_store.get_most_recent_image_names_for_boards(board_ids)
+    counts = board_image_store.get_counts_for_boards(board_ids)
+    for board_id in board_ids:
+        cover_image = image_store.get_most_recent_image_for_board(board_id)
+        assert cover_image_names.get(board_id) == (cover_image.image_name if cover_image else None)
+        assert counts[board_id] == (
+            board_image_store.get_image_count_for_board(board_id),
+            board_image_store.get_asset_count_for_board(board_id),
+        )
+
+
+class TestBoardSummaries:
+    """Cover images and counts read from the stored board stats match those computed from the boards' images."""
+
+    def test_matches_per_board_queries(
+        self,
+        stores: tuple[SqliteImageRecordStorage, SqliteBoardRecordStorage, SqliteBoardImageRecordStorage],
+    ) -> None:
+        image_store, board_store, board_image_store = stores
+        full = board_store.save("full", "user1")
+        empty = board_store.save("empty", "user1")
+        intermediates_only = board_store.save("intermediates only", "user1")
+
+        for name in ("a.png", "b.png", "c.png"):
+            _save(image_store, name)
+            board_image_store.add_image_to_board(full.board_id, name)
+        image_store.save(
+            image_name="asset.png",
+            image_origin=ResourceOrigin.EXTERNAL,
+            image_category=ImageCategory.USER,
+            width=64,
+            height=64,
+            has_workflow=False,
+        )
+        board_image_store.add_image_to_board(full.board_id, "asset.png")
+        image_store.update("b.png", ImageRecordChanges(starred=True))
+        _save(image_store, "tmp.png", is_intermediate=True)
+        board_image_store.add_image_to_board(intermediates_only.board_id, "tmp.png")
+
+        board_ids = [full.board_id, empty.board_id, intermediates_only.board_id]
+        cover_image_names = image_store.get_most_recent_image_names_for_boards(board_ids)
+        counts = board_image_store.get_counts_for_boards(board_ids)
+
+        assert cover_image_names == {full.board_id: "b.png"}
+        assert counts == {full.board_id: (3, 1), empty.board_id: (0, 0), intermediates_only.board_id: (0, 0)}
+        _assert_board_stats_match_images(stores, board_ids)
+
+    def test_stats_follow_image_changes(
+        self,
+        stores: tuple[SqliteImageRecordStorage, SqliteBoardRecordStorage, SqliteBoardImageRecordStorage],
+    ) -> None:
+        image_store, board_store, board_image_store = stores
+        first = board_store.save("first", "user1")
+        second = board_store.save("second", "user1")
+        board_ids = [first.board_id, second.board_id]
+        for name in ("a.png", "b.png", "c.png", "d.png"):
+            _save(image_store, name)
+            board_image_store.add_image_to_board(first.board_id, name)
+
+        image_store.update("a.png", ImageRecordChanges(starred=True))
+        _assert_board_stats_match_images(stores, board_ids)
+        assert image_store.get_most_recent_image_names_for_boards(board_ids) == {first.board_id: "a.png"}
+
+        # Moving the cover image picks a new cover image for both boards
+        board_image_store.add_image_to_board(second.board_id, "a.png")
+        _assert_board_stats_match_images(stores, board_ids)
+
+        image_store.update("b.png", ImageRecordChanges(is_intermediate=True))
+        image_store.update("c.png", ImageRecordChanges(image_category=ImageCategory.USER))
+        _assert_board_stats_match_images(stores, board_ids)
+
+        board_image_store.remove_image_from_board("d.png")
+        _assert_board_stats_match_images(stores, board_ids)
+
+        image_store.delete("a.png")
+        image_store.delete_many(["b.png", "c.png"])
+        _assert_board_stats_match_images(stores, board_ids)
+        assert board_image_store.get_counts_for_boards(board_ids) == {first.board_id: (0, 0), second.board_id: (0, 0)}
+
+    def test_repair_board_stats_fixes_drift(
+        self,
+        stores: tuple[SqliteImageRecordStorage, SqliteBoardRecordStorage, SqliteBoardImageRecordStorage],
+    ) -> None:
+        image_store, board_store, board_image_store = stores
+        drifted = board_store.save("drifted", "user1")
+        correct = board_store.save("correct", "user1")
+        _save(image_store, "a.png")
+        board_image_store.add_image_to_board(drifted.board_id, "a.png")
+        _save(image_store, "b.png")
+        board_image_store.add_image_to_board(correct.board_id, "b.png")
+
+        assert board_image_store.repair_board_stats() == 0
+
+        with board_image_store._db.transaction() as cursor:
+            cursor.execute(
+                "UPDATE board_stats SET image_count = 7, cover_image_name = NULL WHERE board_id = ?;",
+                (drifted.board_id,),
+            )
+
+        assert board_image_store.repair_board_stats() == 1
+        _assert_board_stats_match_images(stores, [drifted.board_id, correct.board_id])
+
+    def test_cover_image_ties_are_broken_by_image_name(
+        self,
+        stores: tuple[SqliteImageRecordStorage, SqliteBoardRecordStorage, SqliteBoardImageRecordStorage],
+    ) -> None:
+        image_store, board_store, board_image_store = stores
+        board = board_store.save("board", "user1")
+        for name in ("b.png", "c.png", "a.png"):
+            _save(image_store, name)
+            board_image_store.add_image_to_board(board.board_id, name)
+
+        with image_store._db.transaction() as cursor:
+            cursor.execute("UPDATE images SET created_at = '2026-01-01 00:00:00.000';")
+
+        assert image_store.get_most_recent_image_names_for_boards([board.board_id]) == {board.board_id: "c.png"}
+        assert board_image_store.repair_board_stats() == 0
+        _assert_board_stats_match_images(stores, [board.board_id])
+
+
 class TestDeleteIntermediatesSubfolder:
     """delete_intermediates() returns (name, subfolder) pairs and removes rows."""
 
@@ -0,0 +1,68 @@
+import os
+from logging import Logger
+from pathlib import Path
+
+import pytest
+
+from invokeai.app.services.config.config_default import InvokeAIAppConfig
+from invokeai.app.services.model_hash_cache.model_hash_cache_sqlite import SqliteModelHashCache
+from invokeai.backend.model_hash.hash_cache import FileIdentity
+from invokeai.backend.util.logging import InvokeAILogger
+from tests.fixtures.sqlite_database import create_mock_sqlite_database
+
+
+@pytest.fixture
+def logger() -> Logger:
+    return InvokeAILogger.get_logger()
+
+
+@pytest.fixture
+def hash_cache(logger: Logger) -> SqliteModelHashCache:
+    db = create_mock_sqlite_database(InvokeAIAppConfig(use_memory_db=True), logger)
+    return SqliteModelHashCache(db=db)
+
+
+def test_get_and_put(hash_cache: SqliteModelHashCache, tmp_path: Path):
+    file = tmp_path / "model.safetensors"
+    file.write_text("data")
+    identity = FileIdentity.from_path(file)
+
+    assert hash_cache.get(identity, "blake3_single") is None
+    hash_cache.put(identity, "blake3_single", "abc")
+    assert hash_cache.get(identity, "blake3_single") == "abc"
+    # Digests are per algorithm
+    assert hash_cache.get(identity, "md5") is None
+
+
+def test_changed_file_misses_and_is_replaced(hash_cache: SqliteModelHashCache, tmp_path: Path):
+    file = tmp_path / "model.safetensors"
+    file.write_text("data")
+    old_identity = FileIdentity.from_path(file)
+    hash_cache.put(old_identity, "md5", "abc")
+
+    file.write_text("more data")
+    os.utime(file, ns=(old_identity.mtime_ns + 1_000_000_000, old_identity.mtime_ns + 1_000_000_000))
+    new_identity = FileIdentity.from_path(file)
+    assert new_identity != old_identity
+    assert hash_cache.get(new_identity, "md5") is None
+
+    hash_cache.put(new_identity, "md5", "def")
+    assert hash_cache.get(new_identity, "md5") == "def"
+    assert hash_cache.get(old_identity, "md5") is None
+
+
+def test_prune_deletes_entries_of_missing_and_changed_files(hash_cache: SqliteModelHashCache, tmp_path: Path):
+    unchanged, changed, deleted = (tmp_path / f"{name}.safetensors" for name in ("unchanged", "changed", "deleted"))
+    for file in (unchanged, changed, deleted):
+        file.write_text("data")
+        hash_cache.put(FileIdentity.from_path(file), "md5", file.stem)
+
+    changed_identity = FileIdentity.from_path(changed)
+    changed.write_text("more data")
+    os.utime(changed, ns=(changed_identity.mtime_ns + 1_000_000_000, changed_identity.mtime_ns + 1_000_000_000))
+    deleted.unlink()
+
+    assert hash_cache.prune() == 2
+    assert hash_cache.get(FileIdentity.from_path(unchanged), "md5") == "unchanged"
+    assert hash_cache.get(changed_identity, "md5") is None
+    assert hash_cache.prune() == 0
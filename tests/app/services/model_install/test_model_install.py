@@ -36,7 +36,9 @@ from invokeai.app.services.model_install.model_install_common import (
     ModelInstallJob,
     URLModelSource,
 )
+from invokeai.app.services.model_install.model_install_default import TMPDIR_PREFIX
 from invokeai.app.services.model_records import ModelRecordChanges, UnknownModelException
+from invokeai.backend.model_hash.model_hash import ModelHash
 from invokeai.backend.model_manager.configs.external_api import ExternalApiModelConfig
 from invokeai.backend.model_manager.taxonomy import (
     BaseModelType,
@@ -46,6 +48,8 @@ from invokeai.backend.model_manager.taxonomy import (
     ModelType,
 )
 from tests.backend.model_manager.model_manager_fixtures import *  # noqa F403
+from tests.test_model_hash import DictHashCache
+from tests.test_model_search import InMemoryDirectoryStateCache
 from tests.test_nodes import TestEventService
 
 OS = platform.uname().system
@@ -102,6 +106,17 @@ def test_install(
     assert model_record.source == embedding_file.as_posix()
 
 
+def test_rehash_models(mm2_installer: ModelInstallServiceBase, embedding_file: Path) -> None:
+    store = mm2_installer.record_store
+    key = mm2_installer.install_path(embedding_file)
+    original_hash = store.get_model(key).hash
+    store.update_model(key, ModelRecordChanges(hash="blake3:stale"))
+
+    assert mm2_installer.rehash_models() == {key: original_hash}
+    assert store.get_model(key).hash == original_hash
+    assert mm2_installer.rehash_models() == {}
+
+
 def test_rename(
     mm2_installer: ModelInstallServiceBase, embedding_file: Path, mm2_app_config: InvokeAIAppConfig
 ) -> None:
@@ -323,6 +338,43 @@ def test_simple_download(mm2_installer: ModelInstallServiceBase, mm2_app_config:
     assert isinstance(bus.events[4], ModelInstallCompleteEvent)  # install completed
 
 
+@pytest.mark.timeout(timeout=10, method="thread")
+def test_download_seeds_hash_cache(
+    mm2_app_config: InvokeAIAppConfig,
+    mm2_record_store,
+    mm2_download_queue,
+    mm2_session,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    hash_cache = DictHashCache()
+    installer = ModelInstallService(
+        app_config=mm2_app_config,
+        record_store=mm2_record_store,
+        download_queue=mm2_download_queue,
+        event_bus=TestEventService(),
+        session=mm2_session,
+        hash_cache=hash_cache,
+    )
+    installer.start()
+    # The file was hashed as it downloaded, so it must not be read again to hash it
+    monkeypatch.setattr(ModelHash, "_get_hashlib", staticmethod(lambda algorithm: pytest.fail))
+    monkeypatch.setattr(ModelHash, "_blake3", staticmethod(pytest.fail))
+    monkeypatch.setattr(ModelHash, "_blake3_single", staticmethod(pytest.fail))
+    try:
+        source = URLModelSource(url=Url("https://www.test.foo/download/test_embedding.safetensors"))
+        job = installer.import_model(source)
+        installer.wait_for_installs(timeout=10)
+    finally:
+        installer.stop()
+
+    assert job.complete
+    assert job.config_out
+    assert hash_cache.misses == 0
+    model_path = mm2_app_config.models_path / job.config_out.path
+    monkeypatch.undo()
+    assert job.config_out.hash == ModelHash(mm2_app_config.hashing_algorithm).hash(model_path)
+
+
 def test_import_waits_for_startup_restore(
     mm2_app_config: InvokeAIAppConfig,
     mm2_record_store,
@@ -598,3 +650,56 @@ def test_heuristic_import_with_type(mm2_installer: ModelInstallServiceBase, mode
     mm2_installer.wait_for_job(install_job2, timeout=10)
     assert install_job2.complete
     assert install_job2.config_out if model_params["type"] == "embedding" else not install_job2.config_out
+
+
+@pytest.mark.timeout(timeout=20, method="thread")
+def test_scan_models_periodically_registers_added_models(
+    mm2_app_config: InvokeAIAppConfig,
+    mm2_record_store,
+    mm2_download_queue,
+    mm2_session,
+    embedding_file: Path,
+) -> None:
+    mm2_app_config.scan_models_interval = 0.1
+    scan_cache = InMemoryDirectoryStateCache()
+    installer = ModelInstallService(
+        app_config=mm2_app_config,
+        record_store=mm2_record_store,
+        download_queue=mm2_download_queue,
+        event_bus=TestEventService(),
+        session=mm2_session,
+        scan_cache=scan_cache,
+    )
+    installer.start()
+    try:
+        added_file = mm2_app_config.models_path / "added" / embedding_file.name
+        added_file.parent.mkdir(parents=True)
+        shutil.copy(embedding_file, added_file)
+        while not installer.record_store.search_by_attr(model_name="test_embedding"):
+            time.sleep(0.1)
+    finally:
+        installer.stop()
+
+    assert len(installer.record_store.search_by_attr(model_name="test_embedding")) == 1
+    assert str(added_file.parent) in scan_cache.states
+
+
+def test_scan_skips_models_being_installed(mm2_installer: ModelInstallService, embedding_file: Path) -> None:
+    models_path = mm2_installer.app_config.models_path
+    # The temporary directory of an unfinished install, which is kept to resume it
+    tmpinstall_file = models_path / f"{TMPDIR_PREFIX}resumable" / "download" / embedding_file.name
+    tmpinstall_file.parent.mkdir(parents=True)
+    shutil.copy(embedding_file, tmpinstall_file)
+    # A model being moved into the models directory by an install
+    destination_file = models_path / "installing" / embedding_file.name
+    destination_file.parent.mkdir(parents=True)
+    shutil.copy(embedding_file, destination_file)
+    mm2_installer._install_destinations.add(destination_file.parent.resolve())
+
+    assert mm2_installer._register_orphaned_models() == 0
+    assert not mm2_installer.record_store.search_by_attr(model_name="test_embedding")
+
+    mm2_installer._install_destinations.clear()
+    assert mm2_installer._register_orphaned_models() == 1
+    [config] = mm2_installer.record_store.search_by_attr(model_name="test_embedding")
+    assert Path(config.path).parent.name == "installing"
@@ -0,0 +1,56 @@
+from logging import Logger
+from pathlib import Path
+
+import pytest
+
+from invokeai.app.services.config.config_default import InvokeAIAppConfig
+from invokeai.app.services.model_scan_cache.model_scan_cache_sqlite import SqliteModelScanCache
+from invokeai.backend.model_manager.search import DirectoryState, ModelSearch
+from invokeai.backend.util.logging import InvokeAILogger
+from tests.fixtures.sqlite_database import create_mock_sqlite_database
+
+
+@pytest.fixture
+def logger() -> Logger:
+    return InvokeAILogger.get_logger()
+
+
+@pytest.fixture
+def scan_cache(logger: Logger) -> SqliteModelScanCache:
+    db = create_mock_sqlite_database(InvokeAIAppConfig(use_memory_db=True), logger)
+    return SqliteModelScanCache(db=db)
+
+
+def _state(mtime_ns: int = 1) -> DirectoryState:
+    return DirectoryState(
+        mtime_ns=mtime_ns, size=4096, is_model=False, model_files=("a.safetensors",), subdirectories=("sub",)
+    )
+
+
+def test_put_get_and_delete(scan_cache: SqliteModelScanCache):
+    scan_cache.put_all({"/models": _state(), "/models/sub": _state(), "/models_other": _state(), "/other": _state()})
+
+    # Only the root and directories below it are returned
+    assert scan_cache.get_all(Path("/models")) == {"/models": _state(), "/models/sub": _state()}
+
+    scan_cache.put_all({"/models/sub": _state(mtime_ns=2)})
+    assert scan_cache.get_all(Path("/models/sub")) == {"/models/sub": _state(mtime_ns=2)}
+
+    scan_cache.delete_all({"/models/sub"})
+    assert scan_cache.get_all(Path("/models")) == {"/models": _state()}
+
+
+def test_wildcard_characters_in_root_are_literal(scan_cache: SqliteModelScanCache):
+    scan_cache.put_all({"/mod_%/a": _state(), "/models/a": _state()})
+
+    assert scan_cache.get_all(Path("/mod_%")) == {"/mod_%/a": _state()}
+
+
+def test_model_search_with_scan_cache(scan_cache: SqliteModelScanCache, tmp_path: Path):
+    model = tmp_path / "sub" / "model.safetensors"
+    model.parent.mkdir()
+    model.write_text("")
+
+    assert ModelSearch(directory_cache=scan_cache).search(tmp_path) == {model}
+    assert set(scan_cache.get_all(tmp_path)) == {str(tmp_path), str(tmp_path / "sub")}
+    assert ModelSearch(directory_cache=scan_cache).search(tmp_path) == {model}
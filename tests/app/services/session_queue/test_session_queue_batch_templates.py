@@ -0,0 +1,125 @@
+"""Tests for queue items whose sessions are built from their batch's session template."""
+
+import asyncio
+import logging
+
+import pytest
+
+from invokeai.app.services.invoker import Invoker
+from invokeai.app.services.session_queue.session_queue_common import TEMPLATED_SESSION, Batch, BatchDatum
+from invokeai.app.services.session_queue.session_queue_sqlite import SqliteSessionQueue
+from invokeai.app.services.shared.graph import Graph
+from invokeai.app.services.workflow_records.workflow_records_common import WorkflowWithoutID
+from tests.fixtures.sqlite_database import create_mock_sqlite_database
+from tests.test_nodes import PromptTestInvocation
+
+
+@pytest.fixture
+def session_queue(mock_invoker: Invoker) -> SqliteSessionQueue:
+    db = create_mock_sqlite_database(mock_invoker.services.configuration, logging.getLogger())
+    queue = SqliteSessionQueue(db=db)
+    queue.start(mock_invoker)
+    return queue
+
+
+def _batch() -> Batch:
+    graph = Graph()
+    graph.add_node(PromptTestInvocation(id="1", prompt="Banana sushi"))
+    graph.add_node(PromptTestInvocation(id="2", prompt="Strawberry sushi"))
+    workflow = WorkflowWithoutID(
+        name="Sushi",
+        author="",
+        description="",
+        version="1.0.0",
+        contact="",
+        tags="",
+        notes="",
+        exposedFields=[],
+        meta={"version": "3.0.0", "category": "user"},
+        nodes=[],
+        edges=[],
+    )
+    return Batch(
+        graph=graph,
+        data=[[BatchDatum(node_path="1", field_name="prompt", items=["Grape sushi", "Orange sushi", "Apple sushi"])]],
+        workflow=workflow,
+        runs=1,
+    )
+
+
+def _get_rows(queue: SqliteSessionQueue) -> list[tuple[str, str]]:
+    with queue._db.read_transaction() as cursor:
+        cursor.execute("SELECT session, workflow FROM session_queue ORDER BY item_id;")
+        return [tuple(row) for row in cursor.fetchall()]
+
+
+def _count_batch_templates(queue: SqliteSessionQueue) -> int:
+    with queue._db.read_transaction() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM session_queue_batches;")
+        return cursor.fetchone()[0]
+
+
+def test_enqueue_batch_stores_session_template_once(session_queue: SqliteSessionQueue):
+    asyncio.run(session_queue.enqueue_batch(queue_id="default", batch=_batch(), prepend=False))
+
+    assert _get_rows(session_queue) == [(TEMPLATED_SESSION, None)] * 3
+    assert _count_batch_templates(session_queue) == 1
+
+
+def test_queue_items_are_rebuilt_from_session_template(session_queue: SqliteSessionQueue):
+    batch = _batch()
+    result = asyncio.run(session_queue.enqueue_batch(queue_id="default", batch=batch, prepend=False))
+
+    queue_items = [session_queue.get_queue_item(item_id) for item_id in sorted(result.item_ids)]
+
+    assert [q.session.graph.get_node("1").prompt for q in queue_items] == ["Grape sushi", "Orange sushi", "Apple sushi"]
+    assert all(q.session.graph.get_node("2").prompt == "Strawberry sushi" for q in queue_items)
+    assert all(q.session.id == q.session_id for q in queue_items)
+    assert len({q.session_id for q in queue_items}) == 3
+    assert all(q.workflow == batch.workflow for q in queue_items)
+
+    listed = session_queue.list_all_queue_items("default")
+    assert [q.session.model_dump() for q in listed] == [q.session.model_dump() for q in queue_items]
+
+
+def test_dequeued_item_is_rebuilt_and_materialized_on_save(session_queue: SqliteSessionQueue):
+    batch = _batch()
+    asyncio.run(session_queue.enqueue_batch(queue_id="default", batch=batch, prepend=False))
+
+    queue_item = session_queue.dequeue()
+    assert queue_item is not None
+    assert queue_item.session.graph.get_node("1").prompt == "Grape sushi"
+
+    queue_item = session_queue.set_queue_item_session(queue_item.item_id, queue_item.session)
+
+    session, workflow = _get_rows(session_queue)[0]
+    assert session != TEMPLATED_SESSION
+    assert workflow is not None
+    assert queue_item.session.graph.get_node("1").prompt == "Grape sushi"
+    assert queue_item.workflow == batch.workflow
+
+
+def test_session_template_is_deleted_with_last_queue_item(session_queue: SqliteSessionQueue):
+    asyncio.run(session_queue.enqueue_batch(queue_id="default", batch=_batch(), prepend=False))
+    asyncio.run(session_queue.enqueue_batch(queue_id="default", batch=_batch(), prepend=False))
+    assert _count_batch_templates(session_queue) == 2
+
+    session_queue.clear("default")
+
+    assert _count_batch_templates(session_queue) == 0
+
+
+def test_listing_queue_items_reads_and_parses_each_template_once(session_queue: SqliteSessionQueue):
+    asyncio.run(session_queue.enqueue_batch(queue_id="default", batch=_batch(), prepend=False))
+    session_queue._batch_templates.clear()
+    statements: list[str] = []
+    session_queue._db._conn.set_trace_callback(statements.append)
+
+    page = session_queue.list_queue_items(queue_id="default", limit=10, priority=0)
+
+    session_queue._db._conn.set_trace_callback(None)
+    assert [q.session.graph.get_node("1").prompt for q in page.items] == ["Grape sushi", "Orange sushi", "Apple sushi"]
+    assert len([s for s in statements if "FROM session_queue_batches" in s]) == 1
+    # The cached template is parsed once, and left untouched by the queue items' field values
+    session_template, _ = next(iter(session_queue._batch_templates.values()))
+    assert session_template["graph"]["nodes"]["1"]["prompt"] == "Banana sushi"
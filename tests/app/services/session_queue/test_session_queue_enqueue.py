@@ -0,0 +1,131 @@
+"""Tests for enqueue_batch() against a file-backed database, where reads use the pooled read-only connections."""
+
+import asyncio
+import logging
+from pathlib import Path
+
+import pytest
+
+from invokeai.app.services.config.config_default import InvokeAIAppConfig
+from invokeai.app.services.events.events_common import BatchEnqueuedEvent, EventBase, QueueItemsCanceledEvent
+from invokeai.app.services.invoker import Invoker
+from invokeai.app.services.session_queue import session_queue_sqlite
+from invokeai.app.services.session_queue.session_queue_common import Batch
+from invokeai.app.services.session_queue.session_queue_sqlite import SqliteSessionQueue
+from invokeai.app.services.shared.graph import Graph
+from tests.fixtures.sqlite_database import create_mock_sqlite_database
+from tests.test_nodes import PromptTestInvocation, TestEventService
+
+
+def test_enqueue_batch_with_file_database(mock_invoker: Invoker, tmp_path: Path):
+    config = InvokeAIAppConfig(use_memory_db=False, node_cache_size=0)
+    config._root = tmp_path
+    db = create_mock_sqlite_database(config, logging.getLogger(__name__))
+    assert db._read_pool_size > 0
+    queue = SqliteSessionQueue(db=db)
+    queue.start(mock_invoker)
+
+    graph = Graph()
+    graph.add_node(PromptTestInvocation(id="1", prompt="Banana sushi"))
+    result = asyncio.run(queue.enqueue_batch(queue_id="default", batch=Batch(graph=graph, runs=3), prepend=False))
+
+    assert result.enqueued == 3
+    assert len(result.item_ids) == 3
+    assert queue.get_queue_status("default").pending == 3
+
+
+def _prompt_batch(runs: int) -> Batch:
+    graph = Graph()
+    graph.add_node(PromptTestInvocation(id="1", prompt="Banana sushi"))
+    return Batch(graph=graph, runs=runs)
+
+
+def test_enqueue_batch_in_chunks(mock_invoker: Invoker, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(session_queue_sqlite, "ENQUEUE_CHUNK_SIZE", 2)
+    queue = SqliteSessionQueue(db=create_mock_sqlite_database(mock_invoker.services.configuration, logging.getLogger()))
+    queue.start(mock_invoker)
+    events: TestEventService = mock_invoker.services.events
+
+    result = asyncio.run(queue.enqueue_batch(queue_id="default", batch=_prompt_batch(5), prepend=False))
+
+    assert result.enqueued == 5
+    assert result.item_ids == sorted(result.item_ids, reverse=True)
+    assert len(set(result.item_ids)) == 5
+    assert queue.get_queue_status("default").pending == 5
+    # One event per chunk, with running totals
+    batch_events = [e for e in events.events if isinstance(e, BatchEnqueuedEvent)]
+    assert [e.enqueued for e in batch_events] == [2, 4, 5]
+    assert all(e.requested == 5 for e in batch_events)
+
+
+def test_enqueue_batch_items_can_be_dequeued_before_batch_is_written(
+    mock_invoker: Invoker, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(session_queue_sqlite, "ENQUEUE_CHUNK_SIZE", 2)
+    queue = SqliteSessionQueue(db=create_mock_sqlite_database(mock_invoker.services.configuration, logging.getLogger()))
+    queue.start(mock_invoker)
+    dequeued: list[int] = []
+
+    def dispatch(event: EventBase) -> None:
+        if isinstance(event, BatchEnqueuedEvent) and event.enqueued == 2:
+            queue_item = queue.dequeue()
+            assert queue_item is not None
+            dequeued.append(queue_item.item_id)
+
+    monkeypatch.setattr(mock_invoker.services.events, "dispatch", dispatch)
+    result = asyncio.run(queue.enqueue_batch(queue_id="default", batch=_prompt_batch(5), prepend=False))
+
+    assert dequeued == [min(result.item_ids)]
+    assert queue.get_queue_status("default").pending == 4
+
+
+def test_enqueue_batch_removes_pending_items_on_error(mock_invoker: Invoker, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(session_queue_sqlite, "ENQUEUE_CHUNK_SIZE", 2)
+    iter_values_to_insert = session_queue_sqlite.iter_templated_values_to_insert
+
+    def failing_iter_values_to_insert(*args, **kwargs):
+        for i, values in enumerate(iter_values_to_insert(*args, **kwargs)):
+            if i == 3:
+                raise ValueError("Serialization failed")
+            yield values
+
+    monkeypatch.setattr(session_queue_sqlite, "iter_templated_values_to_insert", failing_iter_values_to_insert)
+    queue = SqliteSessionQueue(db=create_mock_sqlite_database(mock_invoker.services.configuration, logging.getLogger()))
+    queue.start(mock_invoker)
+
+    with pytest.raises(ValueError, match="Serialization failed"):
+        asyncio.run(queue.enqueue_batch(queue_id="default", batch=_prompt_batch(5), prepend=False))
+
+    assert queue.get_queue_status("default").total == 0
+
+    # The items that were announced by the batch enqueued event are withdrawn
+    events: TestEventService = mock_invoker.services.events
+    batch_events = [e for e in events.events if isinstance(e, BatchEnqueuedEvent)]
+    canceled_events = [e for e in events.events if isinstance(e, QueueItemsCanceledEvent)]
+    assert len(canceled_events) == 1
+    assert len(canceled_events[0].canceled_item_ids) == batch_events[-1].enqueued == 2
+
+
+def test_enqueue_batch_removes_pending_items_when_cancelled(mock_invoker: Invoker, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(session_queue_sqlite, "ENQUEUE_CHUNK_SIZE", 2)
+    queue = SqliteSessionQueue(db=create_mock_sqlite_database(mock_invoker.services.configuration, logging.getLogger()))
+    queue.start(mock_invoker)
+    events: TestEventService = mock_invoker.services.events
+
+    async def enqueue_and_cancel() -> None:
+        task = asyncio.create_task(queue.enqueue_batch(queue_id="default", batch=_prompt_batch(5), prepend=False))
+
+        def dispatch(event: EventBase) -> None:
+            events.events.append(event)
+            # Cancel the request while the next chunk is being inserted
+            if isinstance(event, BatchEnqueuedEvent) and event.enqueued == 2:
+                task.cancel()
+
+        monkeypatch.setattr(events, "dispatch", dispatch)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(enqueue_and_cancel())
+
+    assert queue.get_queue_status("default").total == 0
+    assert any(isinstance(e, QueueItemsCanceledEvent) for e in events.events)
@@ -0,0 +1,64 @@
+"""Tests for paging through the session queue with list_queue_items()."""
+
+import asyncio
+import logging
+
+import pytest
+
+from invokeai.app.services.invoker import Invoker
+from invokeai.app.services.session_queue.session_queue_common import Batch, SessionQueueItem
+from invokeai.app.services.session_queue.session_queue_sqlite import SqliteSessionQueue
+from invokeai.app.services.shared.graph import Graph
+from tests.fixtures.sqlite_database import create_mock_sqlite_database
+from tests.test_nodes import PromptTestInvocation
+
+
+@pytest.fixture
+def session_queue(mock_invoker: Invoker) -> SqliteSessionQueue:
+    db = create_mock_sqlite_database(mock_invoker.services.configuration, logging.getLogger())
+    queue = SqliteSessionQueue(db=db)
+    queue.start(mock_invoker)
+    return queue
+
+
+def _enqueue(queue: SqliteSessionQueue, queue_id: str, runs: int, prepend: bool = False) -> None:
+    graph = Graph()
+    graph.add_node(PromptTestInvocation(id="1", prompt="Banana sushi"))
+    asyncio.run(queue.enqueue_batch(queue_id=queue_id, batch=Batch(graph=graph, runs=runs), prepend=prepend))
+
+
+def _list_pages(queue: SqliteSessionQueue, queue_id: str, limit: int, **kwargs) -> list[list[SessionQueueItem]]:
+    pages: list[list[SessionQueueItem]] = []
+    cursor: int | None = None
+    priority = 0
+    while True:
+        page = queue.list_queue_items(queue_id=queue_id, limit=limit, priority=priority, cursor=cursor, **kwargs)
+        pages.append(page.items)
+        if not page.has_more:
+            return pages
+        cursor, priority = page.items[-1].item_id, page.items[-1].priority
+
+
+def test_pages_follow_queue_order(session_queue: SqliteSessionQueue):
+    _enqueue(session_queue, "default", runs=3)
+    _enqueue(session_queue, "default", runs=2, prepend=True)
+
+    pages = _list_pages(session_queue, "default", limit=2)
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    listed = [item.item_id for page in pages for item in page]
+    assert listed == [item.item_id for item in session_queue.list_all_queue_items("default")]
+    # Prepended items come first
+    assert [item.priority for page in pages for item in page] == [1, 1, 0, 0, 0]
+
+
+def test_pages_after_the_first_keep_filters(session_queue: SqliteSessionQueue):
+    _enqueue(session_queue, "default", runs=3)
+    _enqueue(session_queue, "other", runs=3)
+    session_queue.dequeue()
+
+    pages = _list_pages(session_queue, "default", limit=1, status="pending")
+
+    items = [item for page in pages for item in page]
+    assert len(items) == 2
+    assert all(item.queue_id == "default" and item.status == "pending" for item in items)
@@ -0,0 +1,77 @@
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> SqliteDatabase:
+    db = SqliteDatabase(db_path=tmp_path / "test.db", logger=logging.getLogger(__name__), read_pool_size=2)
+    with db.write_transaction() as cursor:
+        cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL);")
+        cursor.execute("INSERT INTO items (name) VALUES ('foo');")
+    return db
+
+
+def test_read_transaction_does_not_wait_for_writer(db: SqliteDatabase):
+    write_started = threading.Event()
+    read_done = threading.Event()
+
+    def write() -> None:
+        with db.write_transaction() as cursor:
+            cursor.execute("INSERT INTO items (name) VALUES ('bar');")
+            write_started.set()
+            # Hold the writer lock until the reader has finished
+            assert read_done.wait(timeout=5)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    assert write_started.wait(timeout=5)
+
+    with db.read_transaction() as cursor:
+        cursor.execute("SELECT name FROM items;")
+        # The uncommitted write is not visible to readers
+        assert [row["name"] for row in cursor.fetchall()] == ["foo"]
+    read_done.set()
+    writer.join()
+
+    with db.read_transaction() as cursor:
+        cursor.execute("SELECT name FROM items ORDER BY id;")
+        assert [row["name"] for row in cursor.fetchall()] == ["foo", "bar"]
+
+
+def test_read_transaction_is_read_only(db: SqliteDatabase):
+    with pytest.raises(sqlite3.OperationalError):
+        with db.read_transaction() as cursor:
+            cursor.execute("INSERT INTO items (name) VALUES ('bar');")
+
+
+def test_read_inside_write_transaction_sees_uncommitted_writes(db: SqliteDatabase):
+    with db.write_transaction() as cursor:
+        cursor.execute("INSERT INTO items (name) VALUES ('bar');")
+        with db.read_transaction() as read_cursor:
+            read_cursor.execute("SELECT COUNT(*) FROM items;")
+            assert read_cursor.fetchone()[0] == 2
+
+
+def test_read_pool_is_bounded(db: SqliteDatabase):
+    with db.read_transaction(), db.read_transaction():
+        pass
+    with db.read_transaction():
+        pass
+    assert db._read_conn_count == 2  # pyright: ignore[reportPrivateUsage]
+
+
+def test_in_memory_database_reads_through_writer():
+    db = SqliteDatabase(db_path=None, logger=logging.getLogger(__name__))
+    with db.write_transaction() as cursor:
+        cursor.execute("CREATE TABLE items (id INTEGER PRIMARY KEY);")
+        cursor.execute("INSERT INTO items DEFAULT VALUES;")
+    with db.read_transaction() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM items;")
+        assert cursor.fetchone()[0] == 1
+    assert db._read_conn_count == 0  # pyright: ignore[reportPrivateUsage]
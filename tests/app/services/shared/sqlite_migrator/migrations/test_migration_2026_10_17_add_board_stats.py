@@ -0,0 +1,146 @@
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.migrations.migration_2026_10_17_add_board_stats import (
+    AddBoardStatsCallback,
+    build_migration,
+)
+
+
+def _create_tables(cursor: sqlite3.Cursor) -> None:
+    cursor.execute("PRAGMA foreign_keys = ON;")
+    cursor.execute("CREATE TABLE boards (board_id TEXT NOT NULL PRIMARY KEY);")
+    cursor.execute(
+        """
+        CREATE TABLE images (
+            image_name TEXT NOT NULL PRIMARY KEY,
+            image_category TEXT NOT NULL,
+            is_intermediate BOOLEAN DEFAULT FALSE,
+            starred BOOLEAN DEFAULT FALSE,
+            created_at DATETIME NOT NULL
+        );
+        """
+    )
+    cursor.execute(
+        """
+        CREATE TABLE board_images (
+            board_id TEXT NOT NULL,
+            image_name TEXT NOT NULL,
+            PRIMARY KEY (image_name),
+            FOREIGN KEY (board_id) REFERENCES boards (board_id) ON DELETE CASCADE,
+            FOREIGN KEY (image_name) REFERENCES images (image_name) ON DELETE CASCADE
+        );
+        """
+    )
+
+
+def _insert_image(cursor: sqlite3.Cursor, board_id: str, image_name: str, created_at: str, **kwargs) -> None:
+    cursor.execute(
+        "INSERT INTO images (image_name, image_category, is_intermediate, starred, created_at) VALUES (?, ?, ?, ?, ?);",
+        (
+            image_name,
+            kwargs.get("image_category", "general"),
+            kwargs.get("is_intermediate", False),
+            kwargs.get("starred", False),
+            created_at,
+        ),
+    )
+    cursor.execute("INSERT INTO board_images (board_id, image_name) VALUES (?, ?);", (board_id, image_name))
+
+
+def _get_stats(cursor: sqlite3.Cursor) -> dict[str, tuple[int, int, str | None]]:
+    cursor.execute("SELECT board_id, image_count, asset_count, cover_image_name FROM board_stats;")
+    return {row[0]: (row[1], row[2], row[3]) for row in cursor.fetchall()}
+
+
+def test_computes_stats_of_existing_boards() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    _create_tables(cursor)
+    cursor.executemany("INSERT INTO boards (board_id) VALUES (?);", [("full",), ("empty",)])
+    _insert_image(cursor, "full", "a.png", "2026-01-01")
+    _insert_image(cursor, "full", "b.png", "2026-01-02")
+    _insert_image(cursor, "full", "mask.png", "2026-01-03", image_category="mask")
+    _insert_image(cursor, "full", "tmp.png", "2026-01-04", is_intermediate=True)
+
+    AddBoardStatsCallback()(cursor)
+
+    assert _get_stats(cursor) == {"full": (2, 1, "mask.png"), "empty": (0, 0, None)}
+
+    db.close()
+
+
+def test_triggers_maintain_stats() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    _create_tables(cursor)
+    AddBoardStatsCallback()(cursor)
+
+    cursor.executemany("INSERT INTO boards (board_id) VALUES (?);", [("first",), ("second",)])
+    assert _get_stats(cursor) == {"first": (0, 0, None), "second": (0, 0, None)}
+
+    _insert_image(cursor, "first", "a.png", "2026-01-01")
+    _insert_image(cursor, "first", "b.png", "2026-01-02")
+    _insert_image(cursor, "first", "c.png", "2026-01-03", image_category="user")
+    assert _get_stats(cursor) == {"first": (2, 1, "c.png"), "second": (0, 0, None)}
+
+    # Starring an older image makes it the cover image
+    cursor.execute("UPDATE images SET starred = TRUE WHERE image_name = 'a.png';")
+    assert _get_stats(cursor)["first"] == (2, 1, "a.png")
+
+    cursor.execute("UPDATE board_images SET board_id = 'second' WHERE image_name = 'a.png';")
+    assert _get_stats(cursor) == {"first": (1, 1, "c.png"), "second": (1, 0, "a.png")}
+
+    cursor.execute("UPDATE images SET is_intermediate = TRUE WHERE image_name = 'c.png';")
+    assert _get_stats(cursor)["first"] == (1, 0, "b.png")
+
+    cursor.execute("DELETE FROM images WHERE image_name = 'b.png';")
+    cursor.execute("DELETE FROM board_images WHERE image_name = 'a.png';")
+    assert _get_stats(cursor) == {"first": (0, 0, None), "second": (0, 0, None)}
+
+    cursor.execute("DELETE FROM boards WHERE board_id = 'first';")
+    assert _get_stats(cursor) == {"second": (0, 0, None)}
+
+    db.close()
+
+
+def test_cover_image_ties_are_broken_by_image_name() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    _create_tables(cursor)
+    cursor.executemany("INSERT INTO boards (board_id) VALUES (?);", [("existing",), ("new",)])
+    _insert_image(cursor, "existing", "b.png", "2026-01-01")
+    _insert_image(cursor, "existing", "a.png", "2026-01-01")
+
+    AddBoardStatsCallback()(cursor)
+
+    # Images added in either order end up with the same cover image as the computed stats
+    _insert_image(cursor, "new", "c.png", "2026-01-01")
+    _insert_image(cursor, "new", "d.png", "2026-01-01")
+    _insert_image(cursor, "new", "a2.png", "2026-01-01")
+    assert _get_stats(cursor) == {"existing": (2, 0, "b.png"), "new": (3, 0, "d.png")}
+
+    db.close()
+
+
+def test_migration_is_idempotent() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    _create_tables(cursor)
+    cursor.execute("INSERT INTO boards (board_id) VALUES ('board');")
+    _insert_image(cursor, "board", "a.png", "2026-01-01")
+
+    AddBoardStatsCallback()(cursor)
+    AddBoardStatsCallback()(cursor)
+
+    assert _get_stats(cursor) == {"board": (1, 0, "a.png")}
+
+    db.close()
+
+
+def test_build_migration_declares_stable_id_and_dependency() -> None:
+    migration = build_migration()
+
+    assert migration.id == "2026_10_17_add_board_stats"
+    assert migration.depends_on == "2026_10_17_add_pagination_indexes"
+    assert migration.from_version is None
+    assert migration.to_version is None
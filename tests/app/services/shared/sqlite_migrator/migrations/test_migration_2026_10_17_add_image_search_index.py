@@ -0,0 +1,126 @@
+import json
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.migrations.migration_2026_10_17_add_image_search_index import (
+    AddImageSearchIndexCallback,
+    build_migration,
+)
+
+
+def _create_images(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(
+        """
+        CREATE TABLE images (
+            image_name TEXT NOT NULL PRIMARY KEY,
+            metadata TEXT,
+            created_at DATETIME NOT NULL DEFAULT(STRFTIME('%Y-%m-%d %H:%M:%f', 'NOW'))
+        );
+        """
+    )
+
+
+def _insert(cursor: sqlite3.Cursor, image_name: str, metadata: str | None) -> None:
+    cursor.execute("INSERT INTO images (image_name, metadata) VALUES (?, ?);", (image_name, metadata))
+
+
+def _search(cursor: sqlite3.Cursor, term: str) -> list[str]:
+    cursor.execute(
+        """
+        SELECT image_search.image_name
+        FROM image_search_fts
+        JOIN image_search ON image_search.id = image_search_fts.rowid
+        WHERE image_search_fts MATCH ?
+        ORDER BY image_search.image_name;
+        """,
+        (f'"{term}"',),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def test_indexes_existing_images() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    _create_images(cursor)
+    _insert(cursor, "a.png", json.dumps({"positive_prompt": "banana sushi", "model": {"name": "Juggernaut"}}))
+    _insert(cursor, "b.png", json.dumps({"positive_prompt": "grape sushi", "seed": 42}))
+    _insert(cursor, "c.png", "not json")
+    _insert(cursor, "d.png", None)
+
+    AddImageSearchIndexCallback()(cursor)
+
+    assert _search(cursor, "sushi") == ["a.png", "b.png"]
+    assert _search(cursor, "juggernaut") == ["a.png"]
+    cursor.execute("SELECT COUNT(*) FROM image_search;")
+    assert cursor.fetchone()[0] == 4
+
+    db.close()
+
+
+def test_indexes_all_metadata_values() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    _create_images(cursor)
+    AddImageSearchIndexCallback()(cursor)
+
+    metadata = {
+        "scheduler": "dpmpp_2m_k",
+        "steps": 30,
+        "loras": [{"model": {"name": "Detail Tweaker"}, "weight": 0.75}],
+    }
+    _insert(cursor, "a.png", json.dumps(metadata))
+
+    assert _search(cursor, "dpmpp") == ["a.png"]
+    assert _search(cursor, "detail tweak") == ["a.png"]
+    assert _search(cursor, "0.75") == ["a.png"]
+    # Keys are not indexed
+    assert _search(cursor, "scheduler") == []
+
+    db.close()
+
+
+def test_triggers_keep_index_in_sync() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    _create_images(cursor)
+    AddImageSearchIndexCallback()(cursor)
+
+    _insert(cursor, "a.png", json.dumps({"positive_prompt": "banana sushi"}))
+    assert _search(cursor, "banana") == ["a.png"]
+
+    cursor.execute(
+        "UPDATE images SET metadata = ? WHERE image_name = 'a.png';", (json.dumps({"positive_prompt": "apple"}),)
+    )
+    assert _search(cursor, "banana") == []
+    assert _search(cursor, "apple") == ["a.png"]
+
+    cursor.execute("DELETE FROM images WHERE image_name = 'a.png';")
+    assert _search(cursor, "apple") == []
+    cursor.execute("SELECT COUNT(*) FROM image_search;")
+    assert cursor.fetchone()[0] == 0
+
+    db.close()
+
+
+def test_migration_is_idempotent() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    _create_images(cursor)
+    _insert(cursor, "a.png", json.dumps({"positive_prompt": "banana sushi"}))
+
+    AddImageSearchIndexCallback()(cursor)
+    AddImageSearchIndexCallback()(cursor)
+
+    assert _search(cursor, "banana") == ["a.png"]
+    cursor.execute("SELECT COUNT(*) FROM image_search;")
+    assert cursor.fetchone()[0] == 1
+
+    db.close()
+
+
+def test_build_migration_declares_stable_id_and_dependency() -> None:
+    migration = build_migration()
+
+    assert migration.id == "2026_10_17_add_image_search_index"
+    assert migration.depends_on == "2026_10_17_add_model_scan_cache"
+    assert migration.from_version is None
+    assert migration.to_version is None
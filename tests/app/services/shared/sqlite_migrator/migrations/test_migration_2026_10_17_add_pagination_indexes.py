@@ -0,0 +1,63 @@
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.migrations.migration_2026_10_17_add_pagination_indexes import (
+    AddPaginationIndexesCallback,
+    build_migration,
+)
+
+
+def _index_names(cursor: sqlite3.Cursor) -> set[str]:
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index';")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def test_creates_indexes_used_by_cursor_pagination() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    cursor.execute("CREATE TABLE images (image_name TEXT PRIMARY KEY, starred BOOLEAN, created_at DATETIME);")
+    cursor.execute("CREATE TABLE session_queue (item_id INTEGER PRIMARY KEY, queue_id TEXT, priority INTEGER);")
+
+    AddPaginationIndexesCallback()(cursor)
+    AddPaginationIndexesCallback()(cursor)
+
+    assert {
+        "idx_images_starred_created_at_image_name",
+        "idx_session_queue_queue_id_priority_item_id",
+    } <= _index_names(cursor)
+
+    # The default gallery order is read from the index, without sorting
+    cursor.execute(
+        """
+        EXPLAIN QUERY PLAN
+        SELECT image_name FROM images
+        WHERE (starred, created_at, image_name) < (1, '2026-01-01', 'a.png')
+        ORDER BY starred DESC, created_at DESC, image_name DESC
+        LIMIT 10;
+        """
+    )
+    plan = " ".join(row[3] for row in cursor.fetchall())
+    assert "idx_images_starred_created_at_image_name" in plan
+    assert "TEMP B-TREE" not in plan
+
+    db.close()
+
+
+def test_tolerates_missing_session_queue() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    cursor.execute("CREATE TABLE images (image_name TEXT PRIMARY KEY, starred BOOLEAN, created_at DATETIME);")
+
+    AddPaginationIndexesCallback()(cursor)
+
+    assert "idx_images_starred_created_at_image_name" in _index_names(cursor)
+
+    db.close()
+
+
+def test_build_migration_declares_stable_id_and_dependency() -> None:
+    migration = build_migration()
+
+    assert migration.id == "2026_10_17_add_pagination_indexes"
+    assert migration.depends_on == "2026_10_17_add_image_search_index"
+    assert migration.from_version is None
+    assert migration.to_version is None
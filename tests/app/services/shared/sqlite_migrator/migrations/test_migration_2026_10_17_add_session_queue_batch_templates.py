@@ -0,0 +1,130 @@
+import json
+import sqlite3
+
+from invokeai.app.services.shared.sqlite_migrator.migrations.migration_2026_10_17_add_session_queue_batch_templates import (
+    AddSessionQueueBatchTemplatesCallback,
+    build_migration,
+)
+
+
+def _session(session_id: str, prompt: str) -> str:
+    return json.dumps(
+        {
+            "id": session_id,
+            "graph": {"id": "graph", "nodes": {"1": {"id": "1", "type": "prompt", "prompt": prompt}}, "edges": []},
+            "executed": [],
+        }
+    )
+
+
+def _field_values(prompt: str) -> str:
+    return json.dumps([{"node_path": "1", "field_name": "prompt", "value": prompt}])
+
+
+def _create_session_queue(cursor: sqlite3.Cursor) -> None:
+    cursor.execute(
+        """
+        CREATE TABLE session_queue (
+            item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            batch_id TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            session TEXT NOT NULL,
+            session_id TEXT NOT NULL,
+            field_values TEXT,
+            workflow TEXT,
+            parent_item_id INTEGER
+        );
+        """
+    )
+
+
+def _insert(cursor: sqlite3.Cursor, batch_id: str, session: str, session_id: str, field_values: str, **kwargs) -> None:
+    cursor.execute(
+        """
+        INSERT INTO session_queue (batch_id, status, session, session_id, field_values, workflow, parent_item_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?);
+        """,
+        (
+            batch_id,
+            kwargs.get("status", "pending"),
+            session,
+            session_id,
+            field_values,
+            kwargs.get("workflow", '{"name": "Sushi"}'),
+            kwargs.get("parent_item_id"),
+        ),
+    )
+
+
+def test_converts_pending_queue_items_to_batch_templates() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    _create_session_queue(cursor)
+    _insert(cursor, "batch", _session("a", "Grape sushi"), "a", _field_values("Grape sushi"))
+    _insert(cursor, "batch", _session("b", "Apple sushi"), "b", _field_values("Apple sushi"))
+    # An item that has started keeps its session
+    _insert(cursor, "batch", _session("c", "Pear sushi"), "c", _field_values("Pear sushi"), status="in_progress")
+    # An item whose session doesn't match the template keeps its session
+    _insert(cursor, "batch", _session("d", "Kiwi sushi"), "d", _field_values("Plum sushi"))
+
+    AddSessionQueueBatchTemplatesCallback()(cursor)
+
+    cursor.execute("SELECT session_id, session, workflow FROM session_queue ORDER BY item_id;")
+    rows = cursor.fetchall()
+    assert [(row[0], row[1], row[2]) for row in rows[:2]] == [("a", "", None), ("b", "", None)]
+    assert rows[2][1] == _session("c", "Pear sushi")
+    assert rows[3][1] == _session("d", "Kiwi sushi")
+
+    cursor.execute("SELECT batch_id, session, workflow FROM session_queue_batches;")
+    batch_id, session_template, workflow = cursor.fetchone()
+    assert batch_id == "batch"
+    assert json.loads(session_template)["id"] == ""
+    assert workflow == '{"name": "Sushi"}'
+
+    db.close()
+
+
+def test_batch_template_is_deleted_with_last_queue_item() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+    _create_session_queue(cursor)
+    _insert(cursor, "batch", _session("a", "Grape sushi"), "a", _field_values("Grape sushi"))
+    _insert(cursor, "batch", _session("b", "Apple sushi"), "b", _field_values("Apple sushi"))
+    AddSessionQueueBatchTemplatesCallback()(cursor)
+
+    cursor.execute("DELETE FROM session_queue WHERE session_id = 'a';")
+    cursor.execute("SELECT COUNT(*) FROM session_queue_batches;")
+    assert cursor.fetchone()[0] == 1
+
+    cursor.execute("DELETE FROM session_queue WHERE session_id = 'b';")
+    cursor.execute("SELECT COUNT(*) FROM session_queue_batches;")
+    assert cursor.fetchone()[0] == 0
+
+    db.close()
+
+
+def test_migration_is_idempotent_and_tolerates_missing_session_queue() -> None:
+    db = sqlite3.connect(":memory:")
+    cursor = db.cursor()
+
+    AddSessionQueueBatchTemplatesCallback()(cursor)
+    _create_session_queue(cursor)
+    _insert(cursor, "batch", _session("a", "Grape sushi"), "a", _field_values("Grape sushi"))
+    AddSessionQueueBatchTemplatesCallback()(cursor)
+    AddSessionQueueBatchTemplatesCallback()(cursor)
+
+    cursor.execute("SELECT session FROM session_queue;")
+    assert cursor.fetchone()[0] == ""
+    cursor.execute("SELECT COUNT(*) FROM session_queue_batches;")
+    assert cursor.fetchone()[0] == 1
+
+    db.close()
+
+
+def test_build_migration_declares_stable_id_and_dependency() -> None:
+    migration = build_migration()
+
+    assert migration.id == "2026_10_17_add_session_queue_batch_templates"
+    assert migration.depends_on == "2026_10_17_add_model_hash_cache"
+    assert migration.from_version is None
+    assert migration.to_version is None
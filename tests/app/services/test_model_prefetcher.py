@@ -0,0 +1,133 @@
+import logging
+from types import SimpleNamespace
+from typing import Optional
+
+from invokeai.app.invocations.model import (
+    LoRACollectionLoader,
+    LoRAField,
+    MainModelLoaderInvocation,
+    ModelIdentifierField,
+)
+from invokeai.app.services.session_processor.model_prefetcher import ModelPrefetcher, get_model_identifiers
+from invokeai.app.services.shared.graph import Graph, GraphExecutionState
+from invokeai.backend.model_manager.taxonomy import BaseModelType, ModelType, SubModelType
+
+
+def _identifier(key: str, base: BaseModelType, type: ModelType) -> ModelIdentifierField:
+    return ModelIdentifierField(key=key, hash=f"hash-{key}", name=f"name-{key}", base=base, type=type)
+
+
+MAIN_MODEL = _identifier("main", BaseModelType.StableDiffusion1, ModelType.Main)
+FLUX_MODEL = _identifier("flux", BaseModelType.Flux, ModelType.Main)
+LORA = _identifier("lora", BaseModelType.StableDiffusion1, ModelType.LoRA)
+T5_ENCODER = _identifier("t5", BaseModelType.Any, ModelType.T5Encoder)
+
+
+def _graph(*models: ModelIdentifierField, loras: Optional[list[ModelIdentifierField]] = None) -> Graph:
+    graph = Graph()
+    for i, model in enumerate(models):
+        graph.add_node(MainModelLoaderInvocation(id=f"model-{i}", model=model))
+    if loras:
+        graph.add_node(LoRACollectionLoader(id="loras", loras=[LoRAField(lora=lora, weight=0.5) for lora in loras]))
+    return graph
+
+
+class _FakeModelLoad:
+    def __init__(self) -> None:
+        self.prefetched: list[tuple[str, Optional[SubModelType]]] = []
+        self.cached: set[tuple[str, Optional[SubModelType]]] = set()
+        self.ram_cache = SimpleNamespace(on_cache_hit=lambda cb: lambda: None, on_cache_miss=lambda cb: lambda: None)
+
+    def prefetch_model(self, model_config: SimpleNamespace, submodel_type: Optional[SubModelType] = None) -> bool:
+        if model_config.key == "broken":
+            raise RuntimeError("Failed to load")
+        self.prefetched.append((model_config.key, submodel_type))
+        if (model_config.key, submodel_type) in self.cached:
+            return False
+        self.cached.add((model_config.key, submodel_type))
+        return True
+
+
+class _FakeSessionQueue:
+    def __init__(self, graphs: list[Graph]) -> None:
+        self.graphs = graphs
+        self.calls: list[dict] = []
+
+    def list_queue_items(self, **kwargs) -> SimpleNamespace:
+        self.calls.append(kwargs)
+        items = [SimpleNamespace(session=GraphExecutionState(graph=graph)) for graph in self.graphs]
+        return SimpleNamespace(items=items[: kwargs["limit"]])
+
+
+def _prefetcher(graphs: list[Graph], queue_items: int = 2) -> tuple[ModelPrefetcher, _FakeModelLoad]:
+    load = _FakeModelLoad()
+    services = SimpleNamespace(
+        logger=logging.getLogger(__name__),
+        session_queue=_FakeSessionQueue(graphs),
+        model_manager=SimpleNamespace(
+            load=load,
+            store=SimpleNamespace(get_model=lambda key: SimpleNamespace(key=key)),
+        ),
+    )
+    return ModelPrefetcher(services=services, queue_items=queue_items), load  # type: ignore
+
+
+def test_get_model_identifiers_finds_nested_models():
+    graph = _graph(MAIN_MODEL, MAIN_MODEL, loras=[LORA])
+    assert get_model_identifiers(graph) == [MAIN_MODEL, LORA]
+
+
+def test_prefetch_loads_models_of_pending_items():
+    prefetcher, load = _prefetcher([_graph(MAIN_MODEL, loras=[LORA]), _graph(FLUX_MODEL), _graph(MAIN_MODEL)])
+
+    assert prefetcher.prefetch() == 5
+    assert load.prefetched == [
+        ("main", SubModelType.UNet),
+        ("main", SubModelType.TextEncoder),
+        ("main", SubModelType.VAE),
+        ("lora", None),
+        ("flux", SubModelType.Transformer),
+    ]
+    assert prefetcher._services.session_queue.calls == [
+        {"queue_id": "default", "limit": 2, "priority": 0, "status": "pending"}
+    ]
+
+    # Models that are already cached are not counted
+    assert prefetcher.prefetch() == 0
+
+
+def test_prefetch_uses_submodels_seen_in_the_cache():
+    prefetcher, load = _prefetcher([_graph(FLUX_MODEL, T5_ENCODER)])
+    prefetcher._on_model_used(model_key="flux", cache_snapshot={})
+    prefetcher._on_model_used(model_key="t5:text_encoder_2", cache_snapshot={})
+    prefetcher._on_model_used(model_key="t5:tokenizer_2", cache_snapshot={})
+
+    prefetcher.prefetch()
+    assert load.prefetched == [
+        ("flux", None),
+        ("t5", SubModelType.TextEncoder2),
+        ("t5", SubModelType.Tokenizer2),
+    ]
+
+
+def test_prefetch_skips_models_that_fail_to_load():
+    broken = _identifier("broken", BaseModelType.StableDiffusion1, ModelType.LoRA)
+    prefetcher, load = _prefetcher([_graph(T5_ENCODER, loras=[broken, LORA])])
+
+    assert prefetcher.prefetch() == 1
+    # T5 encoders are skipped until we have seen which submodels they are loaded with
+    assert load.prefetched == [("lora", None)]
+
+
+def test_prefetch_thread_runs_on_request():
+    prefetcher, load = _prefetcher([_graph(loras=[LORA])])
+    prefetcher.start()
+    try:
+        prefetcher.request_prefetch()
+        for _ in range(100):
+            if load.prefetched:
+                break
+            prefetcher._stop_event.wait(0.05)
+    finally:
+        prefetcher.stop()
+    assert load.prefetched == [("lora", None)]
@@ -15,6 +15,7 @@ from invokeai.app.invocations.workflow_return import (
     WorkflowReturnInvocation,
     WorkflowReturnOutput,
 )
+from invokeai.app.services.events.events_base import DeferredThreadEvents
 from invokeai.app.services.session_processor.session_processor_default import (
     DefaultSessionProcessor,
     DefaultSessionRunner,
@@ -83,6 +84,14 @@ class _DummyEvents:
     def emit_invocation_error(self, queue_item, invocation, error_type, error_message, error_traceback) -> None:
         self.errors.append((queue_item, invocation, error_type, error_message, error_traceback))
 
+    def defer_thread_events(self) -> DeferredThreadEvents:
+        return DeferredThreadEvents()
+
+
+class _DummyImageFiles:
+    def after_thread_writes(self, callback) -> None:
+        callback(None)
+
 
 class _DummyLogger:
     def debug(self, msg) -> None:
@@ -818,6 +827,7 @@ def _build_runner(monkeypatch: pytest.MonkeyPatch) -> DefaultSessionRunner:
                 "events": _DummyEvents(),
                 "logger": _DummyLogger(),
                 "configuration": _DummyConfig(),
+                "image_files": _DummyImageFiles(),
             },
         )(),
         cancel_event=Event(),
@@ -850,6 +860,7 @@ def _build_workflow_runner(monkeypatch: pytest.MonkeyPatch, session_queue=None):
                 "events": events,
                 "logger": _DummyLogger(),
                 "configuration": _DummyConfig(),
+                "image_files": _DummyImageFiles(),
                 "workflow_records": workflow_records,
                 "users": _DummyUsers(),
                 "board_images": _DummyBoardImages(),
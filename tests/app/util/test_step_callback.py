@@ -1,13 +1,24 @@
 """Tests for diffusion step callback preview image generation."""
 
+from concurrent.futures import Future
+
+import pytest
 import torch
 from PIL import Image
 
+from invokeai.app.services.session_processor.session_processor_common import ProgressImage
 from invokeai.app.util.step_callback import (
     QWEN_IMAGE_LATENT_RGB_BIAS,
     QWEN_IMAGE_LATENT_RGB_FACTORS,
+    SD1_5_LATENT_RGB_FACTORS,
+    ProgressPreviewEncoder,
+    diffusion_step_callback,
+    downsample_latents_for_preview,
+    get_latent_rgb_projection,
     sample_to_lowres_estimated_image,
 )
+from invokeai.backend.model_manager.taxonomy import BaseModelType
+from invokeai.backend.stable_diffusion.diffusers_pipeline import PipelineIntermediateState
 
 
 class TestSampleToLowresEstimatedImage:
@@ -117,3 +128,138 @@ class TestSampleToLowresEstimatedImage:
 
         assert isinstance(image, Image.Image)
         assert image.size == (4, 4)
+
+
+class TestLatentRgbProjection:
+    """Test the cached per-base projection tensors."""
+
+    def test_projection_is_cached(self):
+        projection = get_latent_rgb_projection(BaseModelType.StableDiffusionXL, torch.device("cpu"), torch.float32)
+
+        assert (
+            get_latent_rgb_projection(BaseModelType.StableDiffusionXL, torch.device("cpu"), torch.float32) is projection
+        )
+        factors, smooth_matrix, bias = projection
+        assert factors.shape == (4, 3)
+        assert smooth_matrix is not None
+        assert bias is None
+
+    def test_projection_matches_dtype(self):
+        factors, _, bias = get_latent_rgb_projection(BaseModelType.QwenImage, torch.device("cpu"), torch.bfloat16)
+
+        assert factors.dtype == torch.bfloat16
+        assert bias is not None and bias.dtype == torch.bfloat16
+
+    def test_unsupported_base_model_raises(self):
+        with pytest.raises(ValueError, match="Unsupported base model"):
+            get_latent_rgb_projection(BaseModelType.Any, torch.device("cpu"), torch.float32)
+
+
+class TestDownsampleLatentsForPreview:
+    """Test the downsampling of large latents before they are projected."""
+
+    def test_small_latents_are_not_downsampled(self):
+        sample = torch.randn(1, 4, 128, 255)
+
+        assert downsample_latents_for_preview(sample, max_size=128) is sample
+
+    def test_large_latents_are_downsampled_by_whole_factor(self):
+        sample = torch.randn(1, 4, 300, 520)
+
+        assert downsample_latents_for_preview(sample, max_size=128).shape == (1, 4, 75, 130)
+
+    def test_downsampling_commutes_with_projection(self):
+        torch.manual_seed(0)
+        sample = torch.randn(1, 4, 16, 16)
+        factors = torch.tensor(SD1_5_LATENT_RGB_FACTORS)
+
+        pooled_then_projected = downsample_latents_for_preview(sample, max_size=4)[0].permute(1, 2, 0) @ factors
+        projected_then_pooled = torch.nn.functional.avg_pool2d(
+            (sample[0].permute(1, 2, 0) @ factors).permute(2, 0, 1), kernel_size=4
+        ).permute(1, 2, 0)
+
+        torch.testing.assert_close(pooled_then_projected, projected_then_pooled)
+
+
+class TestDiffusionStepCallback:
+    """Test the progress signaled by the diffusion step callback."""
+
+    @staticmethod
+    def _intermediate_state(step: int) -> PipelineIntermediateState:
+        return PipelineIntermediateState(
+            step=step, order=1, total_steps=10, timestep=0, latents=torch.randn(1, 4, 8, 12)
+        )
+
+    def test_signals_preview_image(self):
+        signals = []
+
+        diffusion_step_callback(
+            signal_progress=lambda *args: signals.append(args),
+            intermediate_state=self._intermediate_state(1),
+            base_model=BaseModelType.StableDiffusion1,
+            is_canceled=lambda: False,
+        )
+
+        [(message, percentage, image, image_size)] = signals
+        assert (message, percentage) == ("Denoising", 0.1)
+        assert isinstance(image, Image.Image)
+        assert image.size == (12, 8)
+        assert image_size == (96, 64)
+
+    def _step(self, step: int, preview_encoder: ProgressPreviewEncoder) -> ProgressImage | None:
+        signals = []
+        diffusion_step_callback(
+            signal_progress=lambda *args: signals.append(args),
+            intermediate_state=self._intermediate_state(step),
+            base_model=BaseModelType.StableDiffusion1,
+            is_canceled=lambda: False,
+            preview_encoder=preview_encoder,
+        )
+        [(_, percentage, progress_image, _)] = signals
+        assert percentage == step / 10
+        return progress_image
+
+    def test_preview_encoder_sends_a_preview_with_every_step(self):
+        preview_encoder = ProgressPreviewEncoder()
+
+        progress_images = []
+        for step in range(11):
+            progress_images.append(self._step(step, preview_encoder))
+            if preview_encoder._future is not None:
+                preview_encoder._future.result()
+
+        for progress_image in progress_images:
+            assert isinstance(progress_image, ProgressImage)
+            assert (progress_image.width, progress_image.height) == (96, 64)
+        # The last step is encoded right away
+        assert preview_encoder._future is None
+        assert progress_images[-1] is preview_encoder.latest()
+
+    def test_preview_encoder_repeats_last_preview_while_busy(self):
+        preview_encoder = ProgressPreviewEncoder()
+        first_image = self._step(0, preview_encoder)
+        pending: Future[ProgressImage] = Future()
+        preview_encoder._future = pending
+
+        assert self._step(1, preview_encoder) is first_image
+        assert preview_encoder._future is pending
+
+        encoded_image = ProgressImage(width=96, height=64, dataURL="data:image/jpeg;base64,")
+        pending.set_result(encoded_image)
+        assert self._step(2, preview_encoder) is encoded_image
+        assert preview_encoder._future is not pending
+
+        # The last step's preview replaces the one being encoded
+        last_image = self._step(10, preview_encoder)
+        assert last_image is not encoded_image
+        assert preview_encoder.latest() is last_image
+
+    def test_preview_encoder_keeps_last_preview_if_encoding_fails(self):
+        preview_encoder = ProgressPreviewEncoder()
+        first_image = self._step(0, preview_encoder)
+        failed: Future[ProgressImage] = Future()
+        failed.set_exception(OSError("encoding failed"))
+        preview_encoder._future = failed
+
+        assert preview_encoder.latest() is first_image
+        assert preview_encoder._future is None
@@ -0,0 +1,171 @@
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+import torch
+
+from invokeai.backend.model_manager.load.model_cache.cache_stats import CacheStats
+from invokeai.backend.model_manager.load.model_cache.eviction_policy import (
+    EVICTION_POLICIES,
+    EvictionPolicy,
+    GreedyDualEvictionPolicy,
+    LFUEvictionPolicy,
+    LoadTimeEvictionPolicy,
+    LRUEvictionPolicy,
+    build_eviction_policy,
+)
+from invokeai.backend.model_manager.load.model_cache.model_cache import ModelCache
+from invokeai.backend.model_manager.load.model_util import calc_module_size
+
+MB = 2**20
+
+
+def test_lru_evicts_least_recently_used():
+    policy = LRUEvictionPolicy()
+    for key in ["a", "b", "c"]:
+        policy.add(key, MB)
+    policy.access("a")
+    assert policy.eviction_order() == ["b", "c", "a"]
+
+    policy.demote("a")
+    assert policy.eviction_order() == ["a", "b", "c"]
+
+    policy.remove("b")
+    assert policy.eviction_order() == ["a", "c"]
+
+
+def test_lfu_evicts_least_frequently_used():
+    policy = LFUEvictionPolicy()
+    for key in ["a", "b", "c"]:
+        policy.add(key, MB)
+    policy.access("a")
+    policy.access("a")
+    policy.access("b")
+    # c has the fewest uses; a and b are ordered by use count, not recency
+    policy.access("b")
+    policy.access("b")
+    assert policy.eviction_order() == ["c", "a", "b"]
+
+
+def test_greedy_dual_prefers_to_keep_expensive_models_per_byte():
+    policy = GreedyDualEvictionPolicy()
+    policy.add("slow", 100 * MB, load_time_s=10.0)
+    policy.add("fast", 100 * MB, load_time_s=1.0)
+    policy.add("big", 1000 * MB, load_time_s=5.0)
+    assert policy.eviction_order() == ["big", "fast", "slow"]
+
+
+def test_greedy_dual_ages_out_idle_models():
+    policy = GreedyDualEvictionPolicy()
+    policy.add("slow", MB, load_time_s=2.0)
+    policy.add("fast", MB, load_time_s=1.0)
+    policy.remove("fast", evicted=True)
+
+    # Each eviction raises the baseline, so that models added or used later outrank idle ones.
+    for i in range(3):
+        policy.add(f"new-{i}", MB, load_time_s=1.0)
+        policy.remove(f"new-{i}", evicted=True)
+    policy.add("recent", MB, load_time_s=1.0)
+    assert policy.eviction_order() == ["slow", "recent"]
+
+
+def test_load_time_weighs_load_time_against_idle_time():
+    policy = LoadTimeEvictionPolicy()
+    policy.add("slow", 10 * MB, load_time_s=10.0)
+    policy.add("fast", 10 * MB, load_time_s=1.0)
+    assert policy.eviction_order() == ["fast", "slow"]
+
+    # Once a slow model has been idle long enough, it goes before a fast one that is in use.
+    for _ in range(20):
+        policy.access("fast")
+    assert policy.eviction_order() == ["slow", "fast"]
+
+
+@pytest.mark.parametrize("name", list(EVICTION_POLICIES))
+def test_demoted_models_are_evicted_first(name: str):
+    policy = build_eviction_policy(name)  # type: ignore
+    for key in ["a", "b", "c"]:
+        policy.add(key, MB, load_time_s=1.0)
+        policy.access(key)
+    policy.add("prefetched", MB, load_time_s=1.0)
+    policy.demote("prefetched")
+    assert policy.eviction_order()[0] == "prefetched"
+
+
+def test_build_eviction_policy_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        build_eviction_policy("fifo")  # type: ignore
+
+
+def _model() -> torch.nn.Module:
+    return torch.nn.Linear(8, 8)
+
+
+MODEL_BYTES = calc_module_size(_model())
+
+
+def _cache(policy: EvictionPolicy) -> ModelCache:
+    logger = MagicMock()
+    logger.getEffectiveLevel.return_value = logging.INFO
+    return ModelCache(
+        execution_device_working_mem_gb=1.0,
+        enable_partial_loading=False,
+        keep_ram_copy_of_weights=True,
+        max_ram_cache_size_gb=2 * MODEL_BYTES / 2**30,
+        execution_device="cpu",
+        storage_device="cpu",
+        logger=logger,
+        eviction_policy=policy,
+    )
+
+
+def test_model_cache_evicts_in_policy_order():
+    cache = _cache(LFUEvictionPolicy())
+    cache.put("a", _model())
+    cache.put("b", _model())
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+
+    # LRU would drop "a", which is the least recently used, but it has been used more often than "b".
+    cache.put("c", _model())
+    assert cache.contains("a")
+    assert not cache.contains("b")
+    cache.shutdown()
+
+
+def test_model_cache_skips_locked_models():
+    cache = _cache(LRUEvictionPolicy())
+    cache.put("a", _model())
+    cache.put("b", _model())
+    cache.lock(cache.get("a"), None)
+
+    cache.put("c", _model())
+    assert cache.contains("a")
+    assert not cache.contains("b")
+    cache.shutdown()
+
+
+def test_model_cache_reports_policy_stats():
+    policy = GreedyDualEvictionPolicy()
+    cache = _cache(policy)
+    stats = CacheStats()
+    cache.stats = stats
+
+    cache.put("a", _model(), load_time_s=1.0)
+    cache.put("b", _model(), load_time_s=2.0)
+    cache.get("a")
+    with pytest.raises(IndexError):
+        cache.get("missing")
+    cache.put("c", _model())
+
+    assert stats.eviction_policy == "greedy_dual"
+    assert stats.bytes_loaded == 3 * MODEL_BYTES
+    policy_stats = stats.policy_stats["greedy_dual"]
+    assert policy_stats is policy.stats
+    assert (policy_stats.hits, policy_stats.misses) == (1, 1)
+    assert policy_stats.bytes_loaded == 3 * MODEL_BYTES
+    assert (policy_stats.evictions, policy_stats.bytes_evicted) == (1, MODEL_BYTES)
+    # The cheapest model to reload per byte goes first
+    assert not cache.contains("a")
+    cache.shutdown()
@@ -0,0 +1,137 @@
+"""Tests for `ModelCache.put_if_room` — used by the queue model prefetcher to warm the cache without displacing
+models that may be in use.
+"""
+
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+import torch
+
+from invokeai.backend.model_manager.load.model_cache.model_cache import ModelCache
+from invokeai.backend.model_manager.load.model_util import calc_module_size
+
+
+def _model() -> torch.nn.Module:
+    return torch.nn.Linear(8, 8)
+
+
+MODEL_BYTES = calc_module_size(_model())
+
+
+@pytest.fixture
+def cache():
+    logger = MagicMock()
+    logger.getEffectiveLevel.return_value = logging.INFO
+    cache = ModelCache(
+        execution_device_working_mem_gb=1.0,
+        enable_partial_loading=False,
+        keep_ram_copy_of_weights=True,
+        max_ram_cache_size_gb=3 * MODEL_BYTES / 2**30,
+        execution_device="cpu",
+        storage_device="cpu",
+        logger=logger,
+    )
+    yield cache
+    cache.shutdown()
+
+
+def test_put_if_room_adds_model_when_it_fits(cache: ModelCache):
+    assert cache.has_room(MODEL_BYTES)
+    assert cache.put_if_room("a", _model())
+    assert cache.contains("a")
+    assert not cache.put_if_room("a", _model())
+
+
+def test_put_if_room_never_evicts(cache: ModelCache):
+    cache.put("a", _model())
+    cache.put("b", _model())
+    cache.put("c", _model())
+    assert not cache.has_room(MODEL_BYTES)
+
+    assert not cache.put_if_room("d", _model())
+    assert not cache.contains("d")
+    assert all(cache.contains(key) for key in ["a", "b", "c"])
+
+
+def test_prefetched_model_is_dropped_first(cache: ModelCache):
+    cache.put("a", _model())
+    assert cache.put_if_room("prefetched", _model())
+    cache.put("b", _model())
+
+    # Room for one more model is made by dropping the prefetched model, not the least recently used one.
+    cache.put("c", _model())
+    assert not cache.contains("prefetched")
+    assert all(cache.contains(key) for key in ["a", "b", "c"])
+
+
+def test_prefetched_model_is_promoted_on_use(cache: ModelCache):
+    cache.put("a", _model())
+    assert cache.put_if_room("prefetched", _model())
+    cache.get("prefetched")
+    cache.put("b", _model())
+
+    cache.put("c", _model())
+    assert not cache.contains("a")
+    assert all(cache.contains(key) for key in ["prefetched", "b", "c"])
+
+
+def test_contains_is_not_counted_as_a_miss(cache: ModelCache):
+    on_miss = MagicMock()
+    cache.on_cache_miss(on_miss)
+    assert not cache.contains("a")
+    on_miss.assert_not_called()
+
+
+def test_reservation_holds_room_until_released(cache: ModelCache):
+    cache.put("a", _model())
+    reservation = cache.reserve("b", MODEL_BYTES)
+    assert reservation is not None
+    assert cache.reserve("b", MODEL_BYTES) is None
+    assert cache.has_room(MODEL_BYTES)
+    assert cache.reserve("c", MODEL_BYTES) is not None
+    assert not cache.has_room(MODEL_BYTES)
+    assert cache.reserve("d", MODEL_BYTES) is None
+
+    assert cache.put_if_room("b", _model(), reservation=reservation)
+    assert cache.contains("b")
+    # The reservation was handed over to the cached model.
+    assert not cache.has_room(MODEL_BYTES)
+
+
+def test_released_reservation_frees_room(cache: ModelCache):
+    cache.put("a", _model())
+    cache.put("b", _model())
+    reservation = cache.reserve("c", MODEL_BYTES)
+    assert reservation is not None
+    assert not cache.has_room(MODEL_BYTES)
+
+    cache.release(reservation)
+    cache.release(reservation)
+    assert cache.has_room(MODEL_BYTES)
+
+
+def test_foreground_load_cancels_reservation_before_evicting(cache: ModelCache):
+    cache.put("a", _model())
+    cache.put("b", _model())
+    reservation = cache.reserve("prefetched", MODEL_BYTES)
+    assert reservation is not None
+
+    cache.make_room(MODEL_BYTES)
+    assert reservation.cancelled
+    assert all(cache.contains(key) for key in ["a", "b"])
+
+    cache.put("c", _model())
+    assert not cache.put_if_room("prefetched", _model(), reservation=reservation)
+    assert not cache.contains("prefetched")
+    assert all(cache.contains(key) for key in ["a", "b", "c"])
+
+
+def test_miss_on_reserved_key_cancels_reservation(cache: ModelCache):
+    reservation = cache.reserve("a", MODEL_BYTES)
+    assert reservation is not None
+
+    with pytest.raises(IndexError):
+        cache.get("a")
+    assert reservation.cancelled
+    assert cache.reserve("a", MODEL_BYTES) is not None
@@ -0,0 +1,110 @@
+"""Tests for `ModelLoader.prefetch_model` running alongside a foreground `load_model` on another thread."""
+
+import logging
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Optional
+from unittest.mock import MagicMock
+
+import pytest
+import torch
+
+from invokeai.backend.model_manager.load.load_default import ModelLoader
+from invokeai.backend.model_manager.load.model_cache.model_cache import ModelCache
+from invokeai.backend.model_manager.load.model_util import calc_module_size
+from invokeai.backend.model_manager.taxonomy import SubModelType
+
+MODEL_BYTES = calc_module_size(torch.nn.Linear(8, 8))
+
+
+class _BlockingLoader(ModelLoader):
+    """Loads a small Linear model, blocking loads of the `blocked` model until `unblock` is set."""
+
+    blocked = "prefetched"
+    error: Optional[Exception] = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.loading = threading.Event()
+        self.unblock = threading.Event()
+
+    def get_size_fs(self, config: Any, model_path: Path, submodel_type: Optional[SubModelType] = None) -> int:
+        return MODEL_BYTES
+
+    def _load_model(self, config: Any, submodel_type: Optional[SubModelType] = None) -> torch.nn.Module:
+        if config.key == self.blocked:
+            self.loading.set()
+            assert self.unblock.wait(timeout=10)
+        if self.error is not None:
+            raise self.error
+        return torch.nn.Linear(8, 8)
+
+
+def _config(tmp_path: Path, key: str) -> Any:
+    (tmp_path / key).touch()
+    return SimpleNamespace(key=key, name=key, base="any", type="any", path=key, default_settings=None)
+
+
+@pytest.fixture
+def cache():
+    logger = MagicMock()
+    logger.getEffectiveLevel.return_value = logging.INFO
+    cache = ModelCache(
+        execution_device_working_mem_gb=1.0,
+        enable_partial_loading=False,
+        keep_ram_copy_of_weights=True,
+        max_ram_cache_size_gb=2 * MODEL_BYTES / 2**30,
+        execution_device="cpu",
+        storage_device="cpu",
+        logger=logger,
+    )
+    yield cache
+    cache.shutdown()
+
+
+@pytest.fixture
+def loader(tmp_path: Path, cache: ModelCache) -> _BlockingLoader:
+    return _BlockingLoader(app_config=SimpleNamespace(models_path=tmp_path), logger=MagicMock(), ram_cache=cache)
+
+
+def _prefetch_in_background(loader: _BlockingLoader, config: Any) -> tuple[threading.Thread, list[bool]]:
+    result: list[bool] = []
+    thread = threading.Thread(target=lambda: result.append(loader.prefetch_model(config)))
+    thread.start()
+    assert loader.loading.wait(timeout=10)
+    return thread, result
+
+
+@pytest.mark.parametrize("foreground_key", ["prefetched", "other"])
+def test_foreground_load_preempts_prefetch(tmp_path: Path, cache: ModelCache, loader: _BlockingLoader, foreground_key):
+    # Fill the cache so that only the room reserved by the prefetch is left.
+    loader.load_model(_config(tmp_path, "cached"))
+    thread, result = _prefetch_in_background(loader, _config(tmp_path, "prefetched"))
+    assert not cache.has_room(MODEL_BYTES)
+
+    if foreground_key == loader.blocked:
+        loader.blocked = ""
+    loaded = loader.load_model(_config(tmp_path, foreground_key))
+    loader.unblock.set()
+    thread.join(timeout=10)
+
+    assert result == [False]
+    # The foreground load took the reserved room instead of evicting the cached model.
+    assert cache.contains("cached")
+    assert cache.get(foreground_key) is loaded._cache_record
+    assert cache.contains("prefetched") == (foreground_key == "prefetched")
+    assert not cache.has_room(MODEL_BYTES)
+
+
+def test_prefetch_releases_reservation_on_failure(tmp_path: Path, cache: ModelCache, loader: _BlockingLoader):
+    config = _config(tmp_path, "prefetched")
+    loader.unblock.set()
+    loader.error = OSError("read failed")
+    with pytest.raises(OSError):
+        loader.prefetch_model(config)
+    assert cache.has_room(2 * MODEL_BYTES)
+
+    loader.error = None
+    assert loader.prefetch_model(config)
+    assert cache.contains("prefetched")
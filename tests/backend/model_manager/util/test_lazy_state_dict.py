@@ -0,0 +1,91 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import gguf
+import numpy as np
+import pytest
+import torch
+from safetensors.torch import save_file
+
+from invokeai.backend.model_manager.model_on_disk import ModelOnDisk
+from invokeai.backend.model_manager.util.lazy_state_dict import LazyStateDict, read_safetensors_header
+from invokeai.backend.quantization.gguf.ggml_tensor import GGMLTensor
+from invokeai.backend.quantization.gguf.loaders import gguf_sd_loader
+
+
+@pytest.fixture
+def safetensors_path(tmp_path: Path) -> Path:
+    path = tmp_path / "model.safetensors"
+    save_file(
+        {
+            "a.weight": torch.arange(12, dtype=torch.float32).reshape(3, 4),
+            "b.bias": torch.ones(5, dtype=torch.bfloat16),
+            "c.scale": torch.tensor([7], dtype=torch.uint8),
+        },
+        path,
+        metadata={"format": "pt", "foo": "bar"},
+    )
+    return path
+
+
+@pytest.fixture
+def gguf_path(tmp_path: Path) -> Path:
+    path = tmp_path / "model.gguf"
+    writer = gguf.GGUFWriter(path, "test")
+    writer.add_tensor("f32.weight", np.arange(64, dtype=np.float32).reshape(2, 32))
+    quantized = gguf.quants.quantize(np.ones((2, 32), dtype=np.float32), gguf.GGMLQuantizationType.Q8_0)
+    writer.add_tensor("q8.weight", quantized, raw_dtype=gguf.GGMLQuantizationType.Q8_0)
+    writer.write_header_to_file()
+    writer.write_kv_data_to_file()
+    writer.write_tensors_to_file()
+    writer.close()
+    return path
+
+
+def test_read_safetensors_header(safetensors_path: Path):
+    header, metadata = read_safetensors_header(safetensors_path)
+    assert metadata == {"format": "pt", "foo": "bar"}
+    assert header["a.weight"]["shape"] == [3, 4]
+    assert header["b.bias"]["dtype"] == "BF16"
+
+
+def test_safetensors_lazy_state_dict_reads_only_the_header(safetensors_path: Path):
+    sd = LazyStateDict.from_safetensors(safetensors_path)
+
+    assert set(sd.keys()) == {"a.weight", "b.bias", "c.scale"}
+    assert sd["a.weight"].shape == (3, 4)
+    assert sd["a.weight"].dtype == torch.float32
+    assert sd["b.bias"].dtype == torch.bfloat16
+    assert all(v.is_meta for v in sd.values())
+
+    loaded = sd.load_tensor("a.weight")
+    assert torch.equal(loaded, torch.arange(12, dtype=torch.float32).reshape(3, 4))
+    with pytest.raises(KeyError):
+        sd.load_tensor("missing")
+
+
+def test_gguf_lazy_state_dict_matches_full_load(gguf_path: Path):
+    sd = LazyStateDict.from_gguf(gguf_path, compute_dtype=torch.float32)
+    full = gguf_sd_loader(gguf_path, compute_dtype=torch.float32)
+
+    assert set(sd.keys()) == set(full.keys())
+    for key, tensor in sd.items():
+        assert isinstance(tensor, GGMLTensor)
+        assert tensor.quantized_data.is_meta
+        assert tensor.shape == full[key].shape
+        assert tensor.dtype == full[key].dtype
+        assert tensor.tensor_shape == full[key].tensor_shape
+        assert tensor._ggml_quantization_type == full[key]._ggml_quantization_type
+
+    loaded = sd.load_tensor("f32.weight")
+    assert torch.equal(loaded.quantized_data, full["f32.weight"].quantized_data)
+
+
+def test_model_on_disk_does_not_load_safetensors_weights(safetensors_path: Path):
+    mod = ModelOnDisk(safetensors_path)
+    with patch("safetensors.torch.load_file") as load_file:
+        sd = mod.load_state_dict()
+    load_file.assert_not_called()
+    assert isinstance(sd, LazyStateDict)
+    assert sd["a.weight"].shape == (3, 4)
+    assert mod.load_state_dict() is sd
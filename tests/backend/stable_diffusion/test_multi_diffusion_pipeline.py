@@ -0,0 +1,207 @@
+import copy
+from typing import Optional
+
+import pytest
+import torch
+from diffusers.models.unets.unet_2d_condition import UNet2DConditionModel
+from diffusers.schedulers.scheduling_ddim import DDIMScheduler
+from diffusers.schedulers.scheduling_euler_discrete import EulerDiscreteScheduler
+
+from invokeai.backend.stable_diffusion.diffusers_pipeline import ControlNetData
+from invokeai.backend.stable_diffusion.diffusion.conditioning_data import BasicConditioningInfo, TextConditioningData
+from invokeai.backend.stable_diffusion.multi_diffusion_pipeline import (
+    MultiDiffusionPipeline,
+    MultiDiffusionRegionConditioning,
+)
+from invokeai.backend.tiles.tiles import calc_tiles_min_overlap
+from invokeai.backend.tiles.utils import TBLR, Tile
+from invokeai.backend.util.hotfixes import ControlNetModel
+
+LATENT_HEIGHT = 16
+LATENT_WIDTH = 24
+
+
+class _FakeVae:
+    class _FakeVaeConfig:
+        block_out_channels = [0]
+
+    config = _FakeVaeConfig()
+
+
+def _tiny_unet() -> UNet2DConditionModel:
+    torch.manual_seed(0)
+    return UNet2DConditionModel(
+        sample_size=8,
+        in_channels=4,
+        out_channels=4,
+        layers_per_block=1,
+        block_out_channels=(8, 16),
+        down_block_types=("CrossAttnDownBlock2D", "DownBlock2D"),
+        up_block_types=("UpBlock2D", "CrossAttnUpBlock2D"),
+        cross_attention_dim=16,
+        attention_head_dim=4,
+        norm_num_groups=4,
+    ).eval()
+
+
+def _tiny_controlnet() -> ControlNetModel:
+    torch.manual_seed(0)
+    controlnet = ControlNetModel(
+        in_channels=4,
+        layers_per_block=1,
+        block_out_channels=(8, 16),
+        down_block_types=("CrossAttnDownBlock2D", "DownBlock2D"),
+        cross_attention_dim=16,
+        attention_head_dim=4,
+        norm_num_groups=4,
+        conditioning_embedding_out_channels=(4, 8, 8, 8),
+    ).eval()
+    # The output convolutions are initialized to zero, which would hide the control image.
+    zero_convs = [
+        controlnet.controlnet_cond_embedding.conv_out,
+        *controlnet.controlnet_down_blocks,
+        controlnet.controlnet_mid_block,
+    ]
+    for zero_conv in zero_convs:
+        torch.nn.init.normal_(zero_conv.weight)
+    return controlnet
+
+
+def _build_pipeline(unet: UNet2DConditionModel, scheduler) -> MultiDiffusionPipeline:
+    return MultiDiffusionPipeline(
+        vae=_FakeVae(),
+        text_encoder=None,
+        tokenizer=None,
+        unet=unet,
+        scheduler=scheduler,
+        safety_checker=None,
+        feature_extractor=None,
+        requires_safety_checker=False,
+    )
+
+
+def _build_conditioning(
+    tiles: list[Tile], controlnet: Optional[ControlNetModel] = None, control_mode: str = "balanced"
+) -> list[MultiDiffusionRegionConditioning]:
+    generator = torch.Generator().manual_seed(1)
+    text_conditioning_data = TextConditioningData(
+        uncond_text=BasicConditioningInfo(embeds=torch.randn((1, 7, 16), generator=generator)),
+        cond_text=BasicConditioningInfo(embeds=torch.randn((1, 5, 16), generator=generator)),
+        uncond_regions=None,
+        cond_regions=None,
+        guidance_scale=5.0,
+    )
+    # Coarse noise, so that the control image is different in every tile.
+    control_image = torch.rand((1, 3, LATENT_HEIGHT, LATENT_WIDTH), generator=generator)
+    control_image = control_image.repeat_interleave(8, dim=2).repeat_interleave(8, dim=3)
+    control_image = torch.cat([control_image] * 2)
+
+    conditioning: list[MultiDiffusionRegionConditioning] = []
+    for tile in tiles:
+        control_data: list[ControlNetData] = []
+        if controlnet is not None:
+            c = tile.coords
+            control_data.append(
+                ControlNetData(
+                    model=controlnet,
+                    image_tensor=control_image[:, :, c.top * 8 : c.bottom * 8, c.left * 8 : c.right * 8],
+                    weight=0.8,
+                    begin_step_percent=0.0,
+                    end_step_percent=1.0,
+                    control_mode=control_mode,
+                    resize_mode="just_resize",
+                )
+            )
+        conditioning.append(
+            MultiDiffusionRegionConditioning(
+                region=tile, text_conditioning_data=text_conditioning_data, control_data=control_data
+            )
+        )
+    return conditioning
+
+
+def _denoise(
+    scheduler,
+    conditioning: list[MultiDiffusionRegionConditioning],
+    max_region_batch_size: int,
+    unet: Optional[UNet2DConditionModel] = None,
+) -> tuple[torch.Tensor, int]:
+    unet = unet or _tiny_unet()
+    forward_calls = 0
+
+    def _count_forward(*args, **kwargs):
+        nonlocal forward_calls
+        forward_calls += 1
+
+    unet.register_forward_pre_hook(_count_forward)
+    scheduler = copy.deepcopy(scheduler)
+    pipeline = _build_pipeline(unet, scheduler)
+    scheduler.set_timesteps(4)
+    generator = torch.Generator().manual_seed(2)
+    noise = torch.randn((1, 4, LATENT_HEIGHT, LATENT_WIDTH), generator=generator)
+
+    with torch.no_grad():
+        latents = pipeline.multi_diffusion_denoise(
+            multi_diffusion_conditioning=conditioning,
+            target_overlap=2,
+            latents=torch.zeros_like(noise),
+            scheduler_step_kwargs={},
+            noise=noise,
+            timesteps=scheduler.timesteps,
+            init_timestep=scheduler.timesteps[:1],
+            callback=lambda state: None,
+            max_region_batch_size=max_region_batch_size,
+        )
+    return latents, forward_calls
+
+
+def _tiles() -> list[Tile]:
+    return calc_tiles_min_overlap(
+        image_height=LATENT_HEIGHT, image_width=LATENT_WIDTH, tile_height=8, tile_width=8, min_overlap=2
+    )
+
+
+@pytest.mark.parametrize("scheduler", [EulerDiscreteScheduler(), DDIMScheduler()], ids=["euler", "ddim"])
+def test_batched_regions_match_sequential(scheduler):
+    tiles = _tiles()
+    assert len(tiles) == 12
+    conditioning = _build_conditioning(tiles)
+
+    sequential, sequential_calls = _denoise(scheduler, conditioning, max_region_batch_size=1)
+    batched, batched_calls = _denoise(scheduler, conditioning, max_region_batch_size=5)
+
+    assert sequential_calls == 12 * 4
+    # 3 forward passes per step: two batches of 5 regions and one of 2 regions.
+    assert batched_calls == 3 * 4
+    torch.testing.assert_close(batched, sequential, rtol=1e-4, atol=1e-2)
+
+
+def test_batched_regions_match_sequential_with_controlnet():
+    unet = _tiny_unet()
+    controlnet = _tiny_controlnet()
+    conditioning = _build_conditioning(_tiles(), controlnet=controlnet)
+
+    sequential, _ = _denoise(EulerDiscreteScheduler(), conditioning, max_region_batch_size=1, unet=unet)
+    batched, batched_calls = _denoise(EulerDiscreteScheduler(), conditioning, max_region_batch_size=12, unet=unet)
+
+    assert batched_calls == 4
+    torch.testing.assert_close(batched, sequential, rtol=1e-4, atol=1e-2)
+
+
+def test_batch_regions_groups_by_size():
+    tiles = [
+        Tile(coords=TBLR(top=0, bottom=8, left=0, right=8), overlap=TBLR(top=0, bottom=0, left=0, right=2)),
+        Tile(coords=TBLR(top=0, bottom=8, left=6, right=12), overlap=TBLR(top=0, bottom=0, left=2, right=2)),
+        Tile(coords=TBLR(top=0, bottom=8, left=10, right=18), overlap=TBLR(top=0, bottom=0, left=2, right=0)),
+    ]
+    conditioning = _build_conditioning(tiles)
+
+    assert MultiDiffusionPipeline._batch_regions(conditioning, 4) == [[0, 2], [1]]
+    assert MultiDiffusionPipeline._batch_regions(conditioning, 1) == [[0], [1], [2]]
+
+
+def test_batch_regions_skips_cfg_injection_controlnets():
+    controlnet = _tiny_controlnet()
+    conditioning = _build_conditioning(_tiles()[:3], controlnet=controlnet, control_mode="more_control")
+
+    assert MultiDiffusionPipeline._batch_regions(conditioning, 4) == [[0], [1], [2]]
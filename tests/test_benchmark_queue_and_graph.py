@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+from pathlib import Path
+
+
+def _load_module(module_path: Path, module_name: str):
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    assert spec is not None
+    assert spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_benchmark_report_structure():
+    module = _load_module(Path("scripts/benchmark_queue_and_graph.py"), "benchmark_queue_and_graph")
+
+    report = module.run_benchmarks(
+        repeat=1, fanout_width=4, chain_depth=3, if_depth=2, if_branch_length=2, batch_size=5
+    )
+
+    assert set(report["scenarios"].keys()) == {"wide_fanout", "deep_chain", "nested_if", "large_batch"}
+    # range + 4 iterates + 4 adds + collect
+    assert report["scenarios"]["wide_fanout"]["nodes_executed"] == 10
+    assert report["scenarios"]["deep_chain"]["nodes_executed"] == 3
+    assert report["scenarios"]["large_batch"]["items_dequeued"] == 5
+
+    for scenario in report["scenarios"].values():
+        assert scenario["phases"]["total"]["min_seconds"] >= 0
+
+    graph_phases = report["scenarios"]["deep_chain"]["phases"]
+    assert {"next", "complete", "invoke", "materializer_prepare"} <= set(graph_phases.keys())
+    assert graph_phases["complete"]["calls"] == 3
+    assert "peak_traced_bytes" in graph_phases["next"]
+
+    queue_phases = report["scenarios"]["large_batch"]["phases"]
+    assert {"prepare_values_to_insert", "enqueue_batch", "dequeue"} <= set(queue_phases.keys())
+    # The final dequeue returns None
+    assert queue_phases["dequeue"]["calls"] == 6
+
+    json.dumps(report)
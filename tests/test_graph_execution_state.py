@@ -1,6 +1,7 @@
 from typing import Optional
 from unittest.mock import Mock
 
+import networkx as nx
 import pytest
 from pydantic import TypeAdapter
 
@@ -526,6 +527,58 @@ def test_if_graph_state_resumes_resolved_branch_after_json_round_trip():
     assert "false_value" not in executed_source_ids
 
 
+def test_graph_state_does_not_search_graphs_per_node(monkeypatch: pytest.MonkeyPatch):
+    graph = Graph()
+    graph.add_node(RangeInvocation(id="range", start=0, stop=20, step=1))
+    graph.add_node(IterateInvocation(id="iterate"))
+    graph.add_node(AddInvocation(id="add", b=1))
+    graph.add_node(CollectInvocation(id="collect"))
+    graph.add_edge(create_edge("range", "collection", "iterate", "collection"))
+    graph.add_edge(create_edge("iterate", "item", "add", "a"))
+    graph.add_edge(create_edge("add", "value", "collect", "item"))
+
+    g = GraphExecutionState(graph=graph)
+
+    topological_sort_calls = 0
+    topological_sort = nx.topological_sort
+
+    def counting_topological_sort(*args, **kwargs):
+        nonlocal topological_sort_calls
+        topological_sort_calls += 1
+        return topological_sort(*args, **kwargs)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the execution graph should not be searched")
+
+    monkeypatch.setattr(nx, "topological_sort", counting_topological_sort)
+    monkeypatch.setattr(nx, "has_path", fail)
+    monkeypatch.setattr(nx, "ancestors", fail)
+
+    execute_all_nodes(g)
+
+    collect_id = next(iter(g.source_prepared_mapping["collect"]))
+    assert g.results[collect_id].collection == list(range(1, 21))
+    # The graph indices are built once, rather than sorting the source graph for every prepared node
+    assert topological_sort_calls <= 3
+
+
+def test_graph_state_prepares_nodes_added_after_execution_started():
+    graph = Graph()
+    graph.add_node(PromptTestInvocation(id="1", prompt="Banana sushi"))
+
+    g = GraphExecutionState(graph=graph)
+    invoke_next(g)
+    assert g.next() is None
+
+    g.add_node(PromptTestInvocation(id="2", prompt="Cat sushi"))
+    g.add_edge(create_edge("1", "prompt", "2", "prompt"))
+    n, o = invoke_next(g)
+
+    assert n is not None
+    assert g.prepared_source_mapping[n.id] == "2"
+    assert g.is_complete()
+
+
 def test_graph_state_prepares_eagerly():
     """Tests that all prepareable nodes are prepared"""
     graph = Graph()
@@ -1447,7 +1500,7 @@ def test_get_iteration_node_ignores_skipped_prepared_exec_nodes():
     active_exec_id = g._create_execution_node("value", [])[0]
     g._set_prepared_exec_state(skipped_exec_id, "skipped")
 
-    selected_exec_id = g._get_iteration_node("value", graph.nx_graph_flat(), g.execution_graph.nx_graph_flat(), [])
+    selected_exec_id = g._get_iteration_node("value", [])
 
     assert selected_exec_id == active_exec_id
 
@@ -1460,7 +1513,7 @@ def test_get_iteration_node_returns_single_active_prepared_exec_node():
 
     active_exec_id = g._create_execution_node("value", [])[0]
 
-    selected_exec_id = g._get_iteration_node("value", graph.nx_graph_flat(), g.execution_graph.nx_graph_flat(), [])
+    selected_exec_id = g._get_iteration_node("value", [])
 
     assert selected_exec_id == active_exec_id
 
@@ -1474,7 +1527,7 @@ def test_get_iteration_node_returns_none_when_only_skipped_prepared_exec_nodes_e
     skipped_exec_id = g._create_execution_node("value", [])[0]
     g._set_prepared_exec_state(skipped_exec_id, "skipped")
 
-    selected_exec_id = g._get_iteration_node("value", graph.nx_graph_flat(), g.execution_graph.nx_graph_flat(), [])
+    selected_exec_id = g._get_iteration_node("value", [])
 
     assert selected_exec_id is None
 
@@ -1513,9 +1566,7 @@ def test_get_iteration_node_does_not_reuse_wrong_iterator_when_only_other_iterat
 
     g._set_prepared_exec_state(skipped_value_exec_id, "skipped")
 
-    selected_exec_id = g._get_iteration_node(
-        "value", graph.nx_graph_flat(), g.execution_graph.nx_graph_flat(), [first_iter_exec_id]
-    )
+    selected_exec_id = g._get_iteration_node("value", [first_iter_exec_id])
 
     assert selected_exec_id is None
     assert active_value_exec_id != skipped_value_exec_id
@@ -1,8 +1,9 @@
 # pyright: reportPrivateUsage=false
 from contextlib import suppress
+from unittest.mock import MagicMock
 
-from invokeai.app.invocations.fields import ImageField
-from invokeai.app.invocations.primitives import ImageOutput
+from invokeai.app.invocations.fields import ImageField, LatentsField
+from invokeai.app.invocations.primitives import ImageOutput, LatentsOutput
 from invokeai.app.services.invocation_cache.invocation_cache_memory import MemoryInvocationCache
 from tests.test_nodes import PromptTestInvocation
 
@@ -181,3 +182,27 @@ def test_invocation_cache_memory_status():
     assert status.hits == 0
     assert status.misses == 0
     assert status.max_size == 0
+
+
+def test_invocation_cache_memory_maintains_reverse_index():
+    cache = MemoryInvocationCache(max_cache_size=2)
+    cache.start(MagicMock())
+    output_1 = ImageOutput(image=ImageField(image_name="foo"), width=512, height=512)
+    output_2 = LatentsOutput(latents=LatentsField(latents_name="bar"), width=64, height=64)
+    output_3 = ImageOutput(image=ImageField(image_name="foo"), width=1024, height=1024)
+    cache.save(1, output_1)
+    cache.save(2, output_2)
+    assert cache._index == {"foo": {1}, "bar": {2}}
+    assert cache.get_status().index_size == 2
+    # Evicting the least recently used entry also removes it from the index
+    cache.save(3, output_3)
+    assert cache._index == {"bar": {2}, "foo": {3}}
+    cache.delete(2)
+    assert cache._index == {"foo": {3}}
+    # Only exact names are matched
+    cache._delete_by_match("fo")
+    assert cache.get(3) == output_3
+    cache._delete_by_match("foo")
+    assert cache.get(3) is None
+    assert cache._index == {}
+    assert cache.get_status().index_size == 0
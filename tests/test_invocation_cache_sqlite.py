@@ -0,0 +1,153 @@
+# pyright: reportPrivateUsage=false
+import logging
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from invokeai.app.invocations.fields import ImageField, LatentsField
+from invokeai.app.invocations.primitives import ImageOutput, LatentsOutput
+from invokeai.app.services.invocation_cache.invocation_cache_sqlite import SqliteInvocationCache
+from invokeai.app.services.shared.sqlite.sqlite_database import SqliteDatabase
+from tests.test_nodes import PromptTestInvocation
+
+
+def _make_db(db_path: Path | None = None) -> SqliteDatabase:
+    return SqliteDatabase(db_path=db_path, logger=logging.getLogger(__name__), verbose=False)
+
+
+def _keys(cache: SqliteInvocationCache) -> list[str]:
+    with cache._db.transaction() as cursor:
+        cursor.execute("SELECT key FROM invocation_cache ORDER BY accessed_at ASC;")
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _mock_invoker() -> MagicMock:
+    invoker = MagicMock()
+    invoker.services.logger = logging.getLogger(__name__)
+    return invoker
+
+
+def test_invocation_cache_sqlite_max_cache_size():
+    cache = SqliteInvocationCache(_make_db())
+    output_1 = ImageOutput(image=ImageField(image_name="foo"), width=512, height=512)
+    cache.save("1", output_1)
+    assert cache.get("1") is None
+    assert cache._hits == 0
+    assert cache._misses == 0
+    assert _keys(cache) == []
+
+
+def test_invocation_cache_sqlite_creates_stable_keys():
+    hash1 = SqliteInvocationCache.create_key(PromptTestInvocation(prompt="foo"))
+    hash2 = SqliteInvocationCache.create_key(PromptTestInvocation(prompt="foo"))
+    hash3 = SqliteInvocationCache.create_key(PromptTestInvocation(prompt="bar"))
+
+    assert hash1 == hash2
+    assert hash1 != hash3
+    # Must not depend on the per-process salt used by `hash()`
+    assert isinstance(hash1, str) and len(hash1) == 64
+
+
+def test_invocation_cache_sqlite_adds_invocation():
+    output_1 = ImageOutput(image=ImageField(image_name="foo"), width=512, height=512)
+    output_2 = ImageOutput(image=ImageField(image_name="bar"), width=512, height=512)
+    cache = SqliteInvocationCache(_make_db(), max_cache_size=5)
+    cache.save("1", output_1)
+    cache.save("2", output_2)
+    assert cache.get("1") == output_1
+    assert cache.get("2") == output_2
+    assert cache._hits == 2
+    assert cache.get("3") is None
+    assert cache._misses == 1
+
+
+def test_invocation_cache_sqlite_is_lru():
+    output_1 = ImageOutput(image=ImageField(image_name="foo"), width=512, height=512)
+    output_2 = ImageOutput(image=ImageField(image_name="bar"), width=512, height=512)
+    output_3 = ImageOutput(image=ImageField(image_name="baz"), width=512, height=512)
+    cache = SqliteInvocationCache(_make_db(), max_cache_size=2)
+    cache.save("1", output_1)
+    cache.save("2", output_2)
+    cache.save("3", output_3)
+    assert cache.get("1") is None
+    assert cache.get("2") == output_2
+    assert cache.get("3") == output_3
+    assert _keys(cache) == ["2", "3"]
+    cache.get("2")
+    assert _keys(cache) == ["3", "2"]
+
+
+def test_invocation_cache_sqlite_evicts_by_age(monkeypatch: pytest.MonkeyPatch):
+    now = 1000.0
+    monkeypatch.setattr("invokeai.app.services.invocation_cache.invocation_cache_sqlite.time.time", lambda: now)
+    output_1 = ImageOutput(image=ImageField(image_name="foo"), width=512, height=512)
+    output_2 = ImageOutput(image=ImageField(image_name="bar"), width=512, height=512)
+    cache = SqliteInvocationCache(_make_db(), max_cache_size=5, max_age=60)
+    cache.save("1", output_1)
+    now = 1030.0
+    cache.save("2", output_2)
+    now = 1070.0
+    assert cache.get("1") is None
+    assert cache.get("2") == output_2
+    assert _keys(cache) == ["2"]
+
+
+def test_invocation_cache_sqlite_persists_across_instances(tmp_path: Path):
+    db_path = tmp_path / "invocation_cache.db"
+    key = SqliteInvocationCache.create_key(PromptTestInvocation(prompt="foo"))
+    image_output = ImageOutput(image=ImageField(image_name="foo"), width=512, height=512)
+    latents_output = LatentsOutput(latents=LatentsField(latents_name="bar"), width=64, height=64)
+
+    cache = SqliteInvocationCache(_make_db(db_path), max_cache_size=5)
+    cache.save(key, image_output)
+    cache.save("latents", latents_output)
+    assert cache.get("latents") == latents_output
+
+    cache = SqliteInvocationCache(_make_db(db_path), max_cache_size=5)
+    cache.start(_mock_invoker())
+    assert cache.get(key) == image_output
+    # Latents live in an ephemeral directory, so they must not be served after a restart
+    assert cache.get("latents") is None
+
+
+def test_invocation_cache_sqlite_deletes_by_match():
+    cache = SqliteInvocationCache(_make_db(), max_cache_size=5)
+    cache.start(_mock_invoker())
+    output_1 = ImageOutput(image=ImageField(image_name="foo"), width=512, height=512)
+    output_2 = ImageOutput(image=ImageField(image_name="bar"), width=512, height=512)
+    cache.save("1", output_1)
+    cache.save("2", output_2)
+    assert cache.get_status().index_size == 2
+    cache._delete_by_match("ba")
+    assert _keys(cache) == ["1", "2"]
+    cache._delete_by_match("bar")
+    assert cache.get("1") == output_1
+    assert cache.get("2") is None
+    assert _keys(cache) == ["1"]
+    assert cache.get_status().index_size == 1
+    # shouldn't raise when nothing matches
+    cache._delete_by_match("bar")
+
+
+def test_invocation_cache_sqlite_disables_clears_and_reports_status():
+    output_1 = ImageOutput(image=ImageField(image_name="foo"), width=512, height=512)
+    output_2 = ImageOutput(image=ImageField(image_name="bar"), width=512, height=512)
+    cache = SqliteInvocationCache(_make_db(), max_cache_size=5)
+    cache.save("1", output_1)
+    cache.disable()
+    assert cache.get("1") is None
+    cache.save("2", output_2)
+    assert not cache.get_status().enabled
+    cache.enable()
+    assert cache.get("1") == output_1
+    status = cache.get_status()
+    assert status.enabled
+    assert status.size == 1
+    assert status.hits == 1
+    assert status.misses == 0
+    assert status.max_size == 5
+    cache.clear()
+    status = cache.get_status()
+    assert status.size == 0
+    assert status.hits == 0
@@ -1,11 +1,12 @@
 # pyright:reportPrivateUsage=false
 
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 import pytest
 from blake3 import blake3
 
+from invokeai.backend.model_hash.hash_cache import FileHashCache, FileIdentity
 from invokeai.backend.model_hash.model_hash import HASHING_ALGORITHMS, MODEL_FILE_EXTENSIONS, ModelHash
 
 test_cases: list[tuple[HASHING_ALGORITHMS, str]] = [
@@ -131,3 +132,83 @@ def test_model_hash_uses_custom_filter(tmp_path: Path):
         return file_path.endswith(".pickme")
 
     assert {p.name for p in ModelHash._get_file_paths(tmp_path, file_filter)} == {"file.pickme"}
+
+
+class DictHashCache(FileHashCache):
+    def __init__(self) -> None:
+        self.entries: dict[tuple[FileIdentity, str], str] = {}
+        self.misses = 0
+
+    def get(self, file: FileIdentity, algorithm: str) -> Optional[str]:
+        digest = self.entries.get((file, algorithm))
+        if digest is None:
+            self.misses += 1
+        return digest
+
+    def put(self, file: FileIdentity, algorithm: str, digest: str) -> None:
+        self.entries[(file, algorithm)] = digest
+
+    def prune(self) -> int:
+        return 0
+
+
+def test_model_hash_uses_cache_for_unchanged_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    cache = DictHashCache()
+    files = [Path(tmp_path, f"{i}.safetensors") for i in range(3)]
+    for f in files:
+        f.write_text("data")
+
+    model_hash = ModelHash("md5", hash_cache=cache)
+    hash_ = model_hash.hash(tmp_path)
+    assert cache.misses == 3
+    assert hash_ == ModelHash("md5").hash(tmp_path)
+
+    # A cache hit must not read the file
+    def _fail(file_path: Path) -> str:
+        pytest.fail(f"{file_path} was re-hashed")
+
+    monkeypatch.setattr(ModelHash, "_get_hashlib", staticmethod(lambda algorithm: _fail))
+    assert ModelHash("md5", hash_cache=cache).hash(tmp_path) == hash_
+    assert cache.misses == 3
+
+
+def test_model_hash_cache_misses_changed_files(tmp_path: Path):
+    cache = DictHashCache()
+    file = Path(tmp_path, "model.safetensors")
+    file.write_text("data")
+    model_hash = ModelHash("md5", hash_cache=cache)
+    hash_1 = model_hash.hash(file)
+
+    file.write_text("other data")
+    hash_2 = model_hash.hash(file)
+    assert cache.misses == 2
+    assert hash_1 != hash_2
+    assert hash_2 == ModelHash("md5").hash(file)
+
+
+def test_model_hash_does_not_cache_random(tmp_path: Path):
+    cache = DictHashCache()
+    file = Path(tmp_path, "model.safetensors")
+    file.write_text("data")
+    ModelHash("random", hash_cache=cache).hash(file)
+    assert cache.entries == {}
+
+
+@pytest.mark.parametrize("algorithm,expected_hash", test_cases)
+def test_model_hash_file_hasher_matches_file_hash(tmp_path: Path, algorithm: HASHING_ALGORITHMS, expected_hash: str):
+    hasher = ModelHash.get_file_hasher(algorithm)
+    assert hasher is not None
+    hasher.update(b"model ")
+    hasher.update(b"data")
+
+    # A digest computed while downloading, when cached, is used in place of reading the file
+    cache = DictHashCache()
+    file = Path(tmp_path / "test")
+    file.write_text("model data")
+    cache.put(FileIdentity.from_path(file), algorithm, hasher.hexdigest())
+    assert ModelHash(algorithm, hash_cache=cache).hash(file) == expected_hash
+    assert cache.misses == 0
+
+
+def test_model_hash_file_hasher_random():
+    assert ModelHash.get_file_hasher("random") is None
@@ -1,8 +1,25 @@
+import os
 from pathlib import Path
 
 import pytest
 
-from invokeai.backend.model_manager.search import ModelSearch
+from invokeai.backend.model_manager import search as search_module
+from invokeai.backend.model_manager.search import DirectoryState, DirectoryStateCache, ModelSearch
+
+
+class InMemoryDirectoryStateCache(DirectoryStateCache):
+    def __init__(self) -> None:
+        self.states: dict[str, DirectoryState] = {}
+
+    def get_all(self, root: Path) -> dict[str, DirectoryState]:
+        return {k: v for k, v in self.states.items() if k == str(root) or k.startswith(str(root) + os.sep)}
+
+    def put_all(self, states: dict[str, DirectoryState]) -> None:
+        self.states.update(states)
+
+    def delete_all(self, paths: set[str]) -> None:
+        for path in paths:
+            del self.states[path]
 
 
 @pytest.fixture
@@ -140,3 +157,97 @@ def test_model_search_handles_diffusers_model_dirs(model_search: tuple[ModelSear
     assert on_model_found_called_with == expected
     assert search.stats.models_found == 2
     assert search.stats.models_filtered == 2
+
+
+def _make_model_tree(root: Path) -> set[Path]:
+    models: set[Path] = set()
+    for i in range(4):
+        for j in range(3):
+            directory = root / f"dir{i}" / f"subdir{j}"
+            directory.mkdir(parents=True)
+            model = directory / f"model{i}{j}.safetensors"
+            model.write_text("")
+            models.add(model)
+    diffusers_dir = root / "dir0" / "diffusers"
+    diffusers_dir.mkdir()
+    (diffusers_dir / "model_index.json").write_text("")
+    models.add(diffusers_dir)
+    return models
+
+
+def test_model_search_parallel_walk_finds_all_models_in_order(tmp_path: Path):
+    expected = _make_model_tree(tmp_path)
+    found_order: list[Path] = []
+
+    def on_model_found_callback(path: Path) -> bool:
+        found_order.append(path)
+        return True
+
+    found = ModelSearch(on_model_found=on_model_found_callback, max_workers=4).search(tmp_path)
+
+    assert found == expected
+    # Callbacks are invoked one at a time, in a stable order
+    assert found_order == sorted(expected)
+    assert found == ModelSearch(max_workers=1).search(tmp_path)
+
+
+def test_model_search_skips_listing_unchanged_directories(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    expected = _make_model_tree(tmp_path)
+    cache = InMemoryDirectoryStateCache()
+    listed: list[str] = []
+    scandir = os.scandir
+
+    def counting_scandir(path: str):
+        listed.append(path)
+        return scandir(path)
+
+    monkeypatch.setattr(search_module.os, "scandir", counting_scandir)
+
+    assert ModelSearch(directory_cache=cache).search(tmp_path) == expected
+    assert len(listed) == 18  # the root, 4 dirs, 12 subdirs and the diffusers dir
+    assert len(cache.states) == 18
+
+    listed.clear()
+    assert ModelSearch(directory_cache=cache).search(tmp_path) == expected
+    assert listed == []
+
+    # Only the changed directory is listed again
+    new_model = tmp_path / "dir1" / "subdir2" / "new_model.gguf"
+    new_model.write_text("")
+    stat = new_model.parent.stat()
+    os.utime(new_model.parent, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    listed.clear()
+    assert ModelSearch(directory_cache=cache).search(tmp_path) == expected | {new_model}
+    assert listed == [(tmp_path / "dir1" / "subdir2").as_posix()]
+
+
+def test_model_search_forgets_removed_directories(tmp_path: Path):
+    _make_model_tree(tmp_path)
+    cache = InMemoryDirectoryStateCache()
+    ModelSearch(directory_cache=cache).search(tmp_path)
+
+    removed_dir = tmp_path / "dir3"
+    for subdir in removed_dir.iterdir():
+        for file in subdir.iterdir():
+            file.unlink()
+        subdir.rmdir()
+    removed_dir.rmdir()
+    stat = tmp_path.stat()
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    found = ModelSearch(directory_cache=cache).search(tmp_path)
+
+    assert not any(path.is_relative_to(removed_dir) for path in found)
+    assert not any(Path(path).is_relative_to(removed_dir) for path in cache.states)
+    assert len(cache.states) == 14
+
+
+def test_model_search_skips_excluded_directories(tmp_path: Path):
+    (tmp_path / "tmpinstall_abc").mkdir()
+    (tmp_path / "tmpinstall_abc" / "model.safetensors").touch()
+    (tmp_path / "models").mkdir()
+    (tmp_path / "models" / "model.safetensors").touch()
+
+    found = ModelSearch(excluded_directory_prefixes=("tmpinstall_",)).search(tmp_path)
+
+    assert found == {tmp_path / "models" / "model.safetensors"}
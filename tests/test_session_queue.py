@@ -8,7 +8,9 @@ from invokeai.app.services.session_queue.session_queue_common import (
     BatchDataCollection,
     BatchDatum,
     NodeFieldValue,
+    build_session_from_template,
     calc_session_count,
+    create_batch_template,
     create_session_nfv_tuples,
     prepare_values_to_insert,
 )
@@ -166,6 +168,32 @@ def test_prepare_values_to_insert(batch_data_collection, batch_graph):
     assert all(v[5] == 0 for v in values)
 
 
+def test_build_session_from_template(batch_data_collection, batch_graph):
+    b = Batch(graph=batch_graph, data=batch_data_collection, runs=2)
+    session_template, workflow = create_batch_template(b)
+    assert workflow is None
+
+    for session_id, session_json, field_values_json in create_session_nfv_tuples(b, maximum=1000):
+        session = json.loads(build_session_from_template(session_template, session_id, field_values_json))
+        expected = json.loads(session_json)
+        # The empty execution graph gets a random id when the sessions are created
+        session.pop("execution_graph")
+        expected.pop("execution_graph")
+        assert session == expected
+
+
+def test_build_session_from_parsed_template_leaves_template_unchanged(batch_data_collection, batch_graph):
+    b = Batch(graph=batch_graph, data=batch_data_collection, runs=2)
+    session_template, _ = create_batch_template(b)
+    parsed_template = json.loads(session_template)
+
+    for session_id, _, field_values_json in create_session_nfv_tuples(b, maximum=1000):
+        session = build_session_from_template(parsed_template, session_id, field_values_json)
+        assert session == build_session_from_template(session_template, session_id, field_values_json)
+
+    assert parsed_template == json.loads(session_template)
+
+
 def test_prepare_values_to_insert_with_priority(batch_data_collection, batch_graph):
     b = Batch(graph=batch_graph, data=batch_data_collection, runs=2)
     values = prepare_values_to_insert(queue_id="default", batch=b, priority=1, max_new_queue_items=1000)